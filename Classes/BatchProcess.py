@@ -0,0 +1,454 @@
+"""BatchProcess
+Headless batch processing of measurements. The measurements in a directory tree are discovered, processed with
+the QRev default settings in a pool of processes, and the XML output and/or a summary CSV file are written for
+each measurement. Measurements whose output files are newer than their data files are skipped so an interrupted
+batch can be resumed. The module does not import PyQt5 or matplotlib.
+
+Example
+-------
+
+python -m Classes.BatchProcess measurement_folder --output output_folder --workers 4
+
+from Classes.BatchProcess import BatchProcess
+
+batch = BatchProcess(root='measurement_folder', output='output_folder', n_workers=4)
+status = batch.run()
+"""
+import os
+import csv
+import sys
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import scipy.io as sio
+from Classes.Measurement import Measurement
+from Classes.MeasurementIndex import MeasurementIndex
+
+
+class BatchProcess(object):
+    """Class to discover and process many measurements without the user interface.
+
+    Attributes
+    ----------
+    root: str
+        Folder searched, including subfolders, for measurements
+    output: str
+        Folder for output files, subfolders of root are reproduced
+    outputs: list
+        Output files written for each measurement (xml, csv)
+    sources: list
+        Types of measurements processed (TRDI, Rowe, SonTek, QRev)
+    n_workers: int
+        Number of processes used to process measurements. None or 1 runs serially, 0 uses one process per cpu.
+    overwrite: bool
+        Indicates if measurements with current output files are processed
+    run_oursin: bool
+        Determines if the Oursin uncertainty model is run
+    version: str
+        QRev version written to the XML output
+    jobs: list
+        Dictionary for each measurement to be processed
+    """
+
+    # Name of the file, in the output folder, recording the result of processing each measurement
+    status_file = 'batch_status.csv'
+
+    def __init__(self, root, output=None, outputs=('xml', 'csv'), sources=('TRDI', 'Rowe', 'SonTek', 'QRev'),
+                 n_workers=None, overwrite=False, run_oursin=False, version=None):
+        """Initialize the batch and discover the measurements.
+
+        Parameters
+        ----------
+        root: str
+            Folder searched, including subfolders, for measurements
+        output: str
+            Folder for output files, if None output files are written in the folder of each measurement
+        outputs: list
+            Output files written for each measurement (xml, csv)
+        sources: list
+            Types of measurements processed (TRDI, Rowe, SonTek, QRev)
+        n_workers: int
+            Number of processes used to process measurements. None or 1 runs serially, 0 uses one process per cpu.
+        overwrite: bool
+            Indicates if measurements with current output files are processed
+        run_oursin: bool
+            Determines if the Oursin uncertainty model is run
+        version: str
+            QRev version written to the XML output, default Measurement.qrev_version
+        """
+
+        self.root = os.path.abspath(root)
+        self.output = os.path.abspath(output) if output is not None else self.root
+        self.outputs = list(outputs)
+        self.sources = list(sources)
+        self.n_workers = n_workers
+        self.overwrite = overwrite
+        self.run_oursin = run_oursin
+        self.version = version if version is not None else Measurement.qrev_version
+        self.jobs = []
+
+        for measurement in BatchProcess.discover(self.root):
+            if measurement['source'] in self.sources:
+                self.jobs.append(self.create_job(measurement))
+
+    @staticmethod
+    def discover(root):
+        """Searches a folder and its subfolders for measurements. A TRDI measurement is identified by a mmt file,
+        a Rowe measurement by a rtt file, and a QRev measurement by a file ending with _QRev.mat. The Matlab files
+        in a folder without mmt or rtt files, excluding QRev files and moving-bed tests, are the transects of a
+        SonTek measurement.
+
+        Parameters
+        ----------
+        root: str
+            Folder to be searched
+
+        Returns
+        -------
+        measurements: list
+            Dictionary for each measurement with the name, source, and files of the measurement
+        """
+
+        measurements = []
+        for path, folders, files in os.walk(root):
+            folders.sort()
+            files = sorted(files)
+            lower = [file.lower() for file in files]
+            sontek = []
+            for file, file_lower in zip(files, lower):
+                full_name = os.path.join(path, file)
+                if file_lower.endswith('.mmt'):
+                    measurements.append({'name': os.path.splitext(file)[0], 'source': 'TRDI',
+                                         'files': [full_name]})
+                elif file_lower.endswith('.rtt'):
+                    measurements.append({'name': os.path.splitext(file)[0], 'source': 'Rowe',
+                                         'files': [full_name]})
+                elif file_lower.endswith('_qrev.mat'):
+                    measurements.append({'name': file[:-len('_QRev.mat')], 'source': 'QRev',
+                                         'files': [full_name]})
+                elif file_lower.endswith('.mat') and not file_lower.startswith(('loop', 'smba')):
+                    sontek.append(full_name)
+
+            if len(sontek) > 0 and not any(file.endswith(('.mmt', '.rtt')) for file in lower):
+                measurements.append({'name': os.path.basename(path), 'source': 'SonTek', 'files': sontek})
+
+        return measurements
+
+    def create_job(self, measurement):
+        """Creates the job for processing a measurement.
+
+        Parameters
+        ----------
+        measurement: dict
+            Dictionary with the name, source, and files of the measurement
+
+        Returns
+        -------
+        job: dict
+            Dictionary with the measurement, output file names, and processing options
+        """
+
+        folder = os.path.join(self.output, os.path.relpath(os.path.dirname(measurement['files'][0]), self.root))
+        base_name = os.path.join(os.path.normpath(folder), measurement['name'] + '_batch')
+        job = dict(measurement)
+        job['output_files'] = {output: base_name + '.' + output for output in self.outputs}
+        job['run_oursin'] = self.run_oursin
+        job['version'] = self.version
+
+        return job
+
+    @staticmethod
+    def data_files(job):
+        """Determines the data files of a measurement, including the transect files referenced by a mmt or rtt file.
+
+        Parameters
+        ----------
+        job: dict
+            Dictionary with the measurement, output file names, and processing options
+
+        Returns
+        -------
+        files: list
+            Full names of the data files
+        """
+
+        files = list(job['files'])
+        if job['source'] in ('TRDI', 'Rowe'):
+            folder = os.path.dirname(job['files'][0])
+            project = MeasurementIndex.project_summary(job['files'][0], job['source'])
+            for transect in project.get('transects', []) + project.get('mbt_transects', []):
+                files.extend([os.path.join(folder, name) for name in transect['files']])
+
+        return files
+
+    @staticmethod
+    def is_current(job):
+        """Determines if the output files of a measurement are newer than the data files, including the transect
+        files of TRDI and Rowe measurements.
+
+        Parameters
+        ----------
+        job: dict
+            Dictionary with the measurement, output file names, and processing options
+
+        Returns
+        -------
+        current: bool
+            Indicates if all output files exist and are newer than the data files
+        """
+
+        output_files = list(job['output_files'].values())
+        if not all(os.path.exists(file) for file in output_files):
+            return False
+        newest_data = max(os.path.getmtime(file) for file in BatchProcess.data_files(job) if os.path.exists(file))
+        return min(os.path.getmtime(file) for file in output_files) >= newest_data
+
+    def run(self, progress=None):
+        """Processes the measurements that do not have current output files and records the result of each
+        measurement in the status file.
+
+        Parameters
+        ----------
+        progress: function
+            Function called with the number of completed measurements, the number of measurements, and the status
+            of the completed measurement. Default prints the progress.
+
+        Returns
+        -------
+        status: list
+            Dictionary for each measurement with the name, source, status, processing time, and error
+        """
+
+        if progress is None:
+            progress = BatchProcess.print_progress
+
+        status = []
+        jobs = []
+        for job in self.jobs:
+            if not self.overwrite and BatchProcess.is_current(job):
+                status.append({'name': job['name'], 'source': job['source'], 'files': job['files'],
+                               'status': 'skipped', 'time_s': 0., 'error': ''})
+                progress(len(status), len(self.jobs), status[-1])
+            else:
+                jobs.append(job)
+
+        os.makedirs(self.output, exist_ok=True)
+        with open(os.path.join(self.output, self.status_file), 'a', newline='') as status_file:
+            writer = csv.writer(status_file)
+            if status_file.tell() == 0:
+                writer.writerow(['Name', 'Source', 'Folder', 'Status', 'Time (s)', 'Error'])
+
+            for result in BatchProcess.process_jobs(jobs, self.n_workers):
+                status.append(result)
+                writer.writerow([result['name'], result['source'], os.path.dirname(result['files'][0]),
+                                 result['status'], '%.2f' % result['time_s'], result['error']])
+                status_file.flush()
+                progress(len(status), len(self.jobs), result)
+
+        return status
+
+    @staticmethod
+    def process_jobs(jobs, n_workers=None):
+        """Processes the jobs in the order they are completed using a pool of processes.
+
+        Parameters
+        ----------
+        jobs: list
+            List of dictionaries with the measurement, output file names, and processing options
+        n_workers: int
+            Number of processes. None or 1 runs serially, 0 uses one process per cpu.
+
+        Returns
+        -------
+        result: dict
+            Yields the status of each measurement as it is completed
+        """
+
+        if n_workers == 0:
+            n_workers = os.cpu_count()
+
+        if n_workers is None or n_workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                yield process_measurement(job)
+        else:
+            with ProcessPoolExecutor(max_workers=min(n_workers, len(jobs))) as executor:
+                futures = {executor.submit(process_measurement, job): job for job in jobs}
+                for future in as_completed(futures):
+                    try:
+                        yield future.result()
+                    except Exception as error:
+                        # A worker process that terminates abruptly fails its measurement and not the batch
+                        job = futures[future]
+                        yield {'name': job['name'], 'source': job['source'], 'files': job['files'],
+                               'status': 'failed', 'time_s': 0., 'error': repr(error)}
+
+    @staticmethod
+    def print_progress(n_completed, n_total, result):
+        """Prints the progress of the batch.
+
+        Parameters
+        ----------
+        n_completed: int
+            Number of completed measurements
+        n_total: int
+            Number of measurements
+        result: dict
+            Status of the completed measurement
+        """
+
+        message = '[%d/%d] %s %s (%s) %.1f s' % (n_completed, n_total, result['status'], result['name'],
+                                                 result['source'], result['time_s'])
+        if len(result['error']) > 0:
+            message = message + ': ' + result['error']
+        print(message, flush=True)
+
+    @staticmethod
+    def load_measurement(job):
+        """Loads and processes a measurement using the QRev default settings.
+
+        Parameters
+        ----------
+        job: dict
+            Dictionary with the measurement, output file names, and processing options
+
+        Returns
+        -------
+        meas: Measurement
+            Object of Measurement
+        """
+
+        if job['source'] == 'QRev':
+            mat_data = sio.loadmat(job['files'][0], struct_as_record=False, squeeze_me=True)
+            meas = Measurement(in_file=mat_data, source='QRev', proc_type='QRev', run_oursin=job['run_oursin'])
+        elif job['source'] == 'SonTek':
+            meas = Measurement(in_file=job['files'], source='SonTek', proc_type='QRev',
+                               run_oursin=job['run_oursin'])
+        else:
+            meas = Measurement(in_file=job['files'][0], source=job['source'], proc_type='QRev',
+                               run_oursin=job['run_oursin'])
+
+        return meas
+
+    @staticmethod
+    def summary_csv(meas, file_name):
+        """Writes the discharge of each transect and the mean discharge and uncertainty of the measurement to a
+        CSV file.
+
+        Parameters
+        ----------
+        meas: Measurement
+            Object of Measurement
+        file_name: str
+            Full name of CSV file
+        """
+
+        with open(file_name, 'w', newline='') as file:
+            writer = csv.writer(file)
+            writer.writerow(['Transect', 'Checked', 'Duration (s)', 'Total (m3/s)', 'Top (m3/s)', 'Middle (m3/s)',
+                             'Bottom (m3/s)', 'Left (m3/s)', 'Right (m3/s)', 'Uncertainty 95% (%)'])
+            for transect, discharge in zip(meas.transects, meas.discharge):
+                writer.writerow([transect.file_name, transect.checked, transect.date_time.transect_duration_sec,
+                                 discharge.total, discharge.top, discharge.middle, discharge.bottom,
+                                 discharge.left, discharge.right, ''])
+
+            if len(meas.checked_transect_idx) > 0:
+                q = Measurement.mean_discharges(meas)
+                total_95 = meas.uncertainty.total_95 if meas.uncertainty is not None else np.nan
+                writer.writerow(['Measurement', len(meas.checked_transect_idx), Measurement.measurement_duration(meas),
+                                 q['total_mean'], q['top_mean'], q['mid_mean'], q['bot_mean'], q['left_mean'],
+                                 q['right_mean'], total_95])
+
+
+def process_measurement(job):
+    """Processes a measurement and writes the output files. Errors are returned in the status so that a failed
+    measurement does not stop the batch. This function is used by the process pool of BatchProcess.
+
+    Parameters
+    ----------
+    job: dict
+        Dictionary with the measurement, output file names, and processing options
+
+    Returns
+    -------
+    result: dict
+        Status of the measurement with the name, source, status, processing time, and error
+    """
+
+    start = time.perf_counter()
+    result = {'name': job['name'], 'source': job['source'], 'files': job['files'], 'status': 'processed',
+              'error': ''}
+    try:
+        meas = BatchProcess.load_measurement(job)
+        if len(meas.transects) == 0:
+            raise ValueError('No transects loaded')
+
+        for output, file_name in job['output_files'].items():
+            os.makedirs(os.path.dirname(file_name), exist_ok=True)
+            if output == 'xml':
+                meas.xml_output(job['version'], file_name)
+            elif output == 'csv':
+                BatchProcess.summary_csv(meas, file_name)
+
+    except Exception:
+        result['status'] = 'failed'
+        result['error'] = traceback.format_exc().strip().splitlines()[-1]
+
+        # Remove incomplete output so the measurement is processed when the batch is resumed
+        for file_name in job['output_files'].values():
+            if os.path.exists(file_name):
+                os.remove(file_name)
+
+    result['time_s'] = time.perf_counter() - start
+
+    return result
+
+
+def main(argv=None):
+    """Command line interface for batch processing.
+
+    Parameters
+    ----------
+    argv: list
+        Command line arguments, default sys.argv
+
+    Returns
+    -------
+    code: int
+        Exit code, 1 if any measurement failed
+    """
+
+    parser = argparse.ArgumentParser(prog='python -m Classes.BatchProcess',
+                                     description='Process the measurements in a folder and its subfolders with '
+                                                 'the QRev default settings.')
+    parser.add_argument('root', help='folder containing the measurements')
+    parser.add_argument('--output', default=None,
+                        help='folder for output files, default is the folder of each measurement')
+    parser.add_argument('--outputs', nargs='+', choices=['xml', 'csv'], default=['xml', 'csv'],
+                        help='output files written for each measurement')
+    parser.add_argument('--sources', nargs='+', choices=['TRDI', 'Rowe', 'SonTek', 'QRev'],
+                        default=['TRDI', 'Rowe', 'SonTek', 'QRev'], help='types of measurements processed')
+    parser.add_argument('--workers', type=int, default=0,
+                        help='number of processes, 0 uses one process per cpu, 1 runs serially')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='process measurements that already have current output files')
+    parser.add_argument('--oursin', action='store_true', help='run the Oursin uncertainty model')
+    parser.add_argument('--version', default=None, help='QRev version written to the XML output')
+    args = parser.parse_args(argv)
+
+    batch = BatchProcess(root=args.root, output=args.output, outputs=args.outputs, sources=args.sources,
+                         n_workers=args.workers, overwrite=args.overwrite, run_oursin=args.oursin,
+                         version=args.version)
+    status = batch.run()
+
+    n_failed = sum(result['status'] == 'failed' for result in status)
+    print('%d measurements: %d processed, %d skipped, %d failed'
+          % (len(status), sum(result['status'] == 'processed' for result in status),
+             sum(result['status'] == 'skipped' for result in status), n_failed))
+
+    return 1 if n_failed > 0 else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,10 @@
 import copy
 import numpy as np
 from numpy.matlib import repmat
-from MiscLibs.common_functions import cosd, sind, cart2pol, iqr, pol2cart
+from MiscLibs.common_functions import cart2pol, iqr, pol2cart
 from MiscLibs.robust_loess import rloess
+from MiscLibs.running_statistics import run_std_trim
+from MiscLibs.coordinate_transform import hpr_matrices, ensemble_t_matrices, transform_vel
 
 
 class BoatData(object):
@@ -381,7 +383,6 @@ class BoatData(object):
         # Initialize variables
         orig_sys = 0
         new_sys = 0
-        temp_t = None
 
         if self.orig_coord_sys.strip() != new_coord_sys.strip():
             # Assign the transformation matrix and retrieve the sensor data
@@ -398,12 +399,12 @@ class BoatData(object):
                 orig_sys = 1
             elif o_coord_sys == 'Inst':
                 orig_sys = 2
-                t_matrix[:] = np.eye(t_matrix.shape[0])
+                t_matrix = np.eye(t_matrix.shape[0])
             elif o_coord_sys == 'Ship':
                 orig_sys = 3
                 p = np.zeros(h.shape)
                 r = np.zeros(h.shape)
-                t_matrix[:] = np.eye(t_matrix.shape[0])
+                t_matrix = np.eye(t_matrix.shape[0])
             elif o_coord_sys == 'Earth':
                 orig_sys = 4
 
@@ -420,189 +421,20 @@ class BoatData(object):
             # Check to ensure the new coordinate system is a higher order than the original system
             if new_sys - orig_sys > 0:
 
-                # Compute trig function for heaing, pitch and roll
-                ch = cosd(h)
-                sh = sind(h)
-                cp = cosd(p)
-                sp = sind(p)
-                cr = cosd(r)
-                sr = sind(r)
-
-                vel_changed = np.tile([np.nan], self.raw_vel_mps.shape)
-                n_ens = self.raw_vel_mps.shape[1]
-
-                for ii in range(n_ens):
-
-                    # Compute matrix for heading, pitch, and roll
-                    hpr_matrix = [[((ch[ii] * cr[ii]) + (sh[ii]*sp[ii]*sr[ii])),
-                                   (sh[ii] * cp[ii]),
-                                   ((ch[ii] * sr[ii]) - sh[ii]*sp[ii]*cr[ii])],
-                                  [(-1 * sh[ii] * cr[ii])+(ch[ii] * sp[ii] * sr[ii]),
-                                   ch[ii] * cp[ii],
-                                   (-1 * sh[ii] * sr[ii])-(ch[ii] * sp[ii] * cr[ii])],
-                                  [(-1.*cp[ii] * sr[ii]),
-                                   sp[ii],
-                                   cp[ii] * cr[ii]]]
-
-                    # Transform beam coordinates
-                    if o_coord_sys == 'Beam':
-
-                        # Determine frequency index for transformation matrix
-                        if len(t_matrix.shape) > 2:
-                            idx_freq = np.where(t_matrix_freq == self.frequency_khz[ii])
-                            t_mult = np.copy(t_matrix[idx_freq])
-                        else:
-                            t_mult = np.copy(t_matrix)
-
-                        # Get velocity data
-                        vel = np.copy(np.squeeze(self.raw_vel_mps[:, ii]))
-
-                        # Check for invalid beams
-                        idx_3_beam = np.where(np.isnan(vel))
-
-                        # 3-beam solution
-                        if len(idx_3_beam[0]) == 1:
-
-                            # Special processing for RiverRay
-                            if adcp.model == 'RiverRay':
-
-                                # Set beam pairing
-                                beam_pair_1a = 0
-                                beam_pair_1b = 1
-                                beam_pair_2a = 2
-                                beam_pair_2b = 3
-
-                                # Set speed of sound correction variables Note: Currently (2013-09-06)
-                                # WinRiver II does not use a variable correction and assumes the speed
-                                # of sound and the reference speed of sound are the same.
-                                # sos = sensors.speed_ofs_sound_mps.selected.data[ii]
-                                # sos_reference = 1536
-                                # sos_correction = np.sqrt(((2 * sos_reference) / sos) **2 -1)
-
-                                sos_correction = np.sqrt(3)
-
-                                # Reconfigure transformation matrix based on which beam is invalid
-
-                                # Beam 1 invalid
-                                if idx_3_beam[0][0] == beam_pair_1a:
-
-                                    # Double valid beam in invalid pair
-                                    t_mult[0:2, beam_pair_1b] *= 2
-
-                                    # Eliminate invalid pair from vertical velocity computations
-                                    t_mult[2, :] = [0, 0, 1/sos_correction, 1/sos_correction]
-
-                                    # Reconstruct beam velocity matrix to use only valid beams
-                                    t_mult = t_mult[0:3, [beam_pair_1b, beam_pair_2a, beam_pair_2b]]
-
-                                    # Reconstruct beam velocity matrix to use only valid beams
-                                    vel = vel[[beam_pair_1b, beam_pair_2a, beam_pair_2b]]
-
-                                    # Apply transformation matrix
-                                    temp_t = t_mult.dot(vel)
-
-                                    # Correct horizontal velocity for invalid pair with the vertical velocity
-                                    # and speed of sound correction
-                                    temp_t[0] = temp_t[0] + temp_t[2] * sos_correction
-
-                                # Beam 2 invalid
-                                if idx_3_beam[0][0] == beam_pair_1b:
-
-                                    # Double valid beam in invalid pair
-                                    t_mult[0:2, beam_pair_1a] = t_mult[0:2, beam_pair_1a] * 2
-
-                                    # Eliminate invalid pair from vertical velocity computations
-                                    t_mult[2, :] = [0, 0, 1/sos_correction, 1/sos_correction]
-
-                                    # Reconstruct transformation matrix as a 3x3 matrix
-                                    t_mult = t_mult[0:3, [beam_pair_1a, beam_pair_2a, beam_pair_2b]]
-
-                                    # Reconstruct beam velocity matrix to use only valid beams
-                                    vel = vel[[beam_pair_1a, beam_pair_2a, beam_pair_2b]]
-
-                                    # Apply transformation matrix
-                                    temp_t = t_mult.dot(vel)
-
-                                    # Correct horizontal velocity for invalid pair with the vertical
-                                    # velocity and speed of sound correction
-                                    temp_t[0] = temp_t[0] - temp_t[2] * sos_correction
-
-                                # Beam 3 invalid
-                                if idx_3_beam[0][0] == beam_pair_2a:
-
-                                    # Double valid beam in invalid pair
-                                    t_mult[0:2, beam_pair_2b] = t_mult[:2, beam_pair_2b] * 2
-
-                                    # Eliminate invalid pair from vertical velocity computations
-                                    t_mult[2, :] = [1/sos_correction, 1/sos_correction, 0, 0]
-
-                                    # Reconstruct transformation matrix as a 3x3 matrid
-                                    t_mult = t_mult[:3, [beam_pair_1a, beam_pair_1b, beam_pair_2b]]
-
-                                    # Reconstruct beam velocity matrix to use only valid beams
-                                    vel = vel[[beam_pair_1a, beam_pair_1b, beam_pair_2b]]
-
-                                    # Apply transformation matrix
-                                    temp_t = t_mult.dot(vel)
-
-                                    # Correct horizontal velocity for invalid pair with the vertical
-                                    # velocity and speed of sound correction
-                                    temp_t[1] = temp_t[1] - temp_t[2] * sos_correction
-
-                                # Beam 4 invalid
-                                if idx_3_beam[0][0] == beam_pair_2b:
-
-                                    # Double valid beam in invalid pair
-                                    t_mult[:2, beam_pair_2a] *= 2
-
-                                    # Eliminate invalid pair from vertical velocity computations
-                                    t_mult[2, :] = [1/sos_correction, 1/sos_correction, 0, 0]
+                # Compute matrix for heading, pitch, and roll for all ensembles
+                hpr = hpr_matrices(h, p, r)
 
-                                    # Reconstruct transformations matrix as a 3x3 matrix
-                                    t_mult = t_mult[:3, [beam_pair_1a, beam_pair_1b, beam_pair_2a]]
-
-                                    # Reconstruct beam velocity matrix to use only valid beams
-                                    vel = vel[[beam_pair_1a, beam_pair_1b, beam_pair_2a]]
-
-                                    # Apply transformation matrix
-                                    temp_t = t_mult.dot(vel)
-
-                                    # Correct horizontal velocity for invalid pair with the vertical
-                                    # velocity and speed of sound correction
-                                    temp_t[1] = temp_t[1] + temp_t[2] * sos_correction
-
-                            else:
-
-                                # 3 Beam solution for non-RiverRay
-                                vel_3_beam_zero = vel
-                                vel_3_beam_zero[np.isnan(vel)] = 0
-                                vel_error = np.matmul(t_mult[3, :], vel_3_beam_zero)
-                                vel[idx_3_beam] = -1 * vel_error / np.squeeze(t_mult[3, idx_3_beam])
-                                temp_t = t_mult.dot(vel)
-
-                            # Apply transformation matrix for 3 beam solutions
-                            temp_thpr = np.array(hpr_matrix).dot(temp_t[:3])
-                            temp_thpr = np.hstack([temp_thpr, np.nan])
-
-                        else:
-
-                            # Apply transformation matrix for 4 beam solutions
-                            temp_t = t_mult.dot(np.squeeze(self.raw_vel_mps[:, ii]))
-
-                            # Apply hpr_matrix
-                            temp_thpr = np.array(hpr_matrix).dot(temp_t[:3])
-                            temp_thpr = np.hstack([temp_thpr, temp_t[3]])
-
-                    else:
-
-                        # Get velocity data
-                        vel = np.copy(np.squeeze(self.raw_vel_mps[:, ii]))
-
-                        # Apply heading pitch roll for inst and ship coordinate data
-                        temp_thpr = np.array(hpr_matrix).dot(vel[:3])
-                        temp_thpr = np.hstack([temp_thpr, vel[3]])
+                # Transform beam coordinates
+                if o_coord_sys == 'Beam':
+                    # Determine transformation matrix for each ensemble
+                    t_mult = ensemble_t_matrices(t_matrix, t_matrix_freq, self.frequency_khz,
+                                                 self.raw_vel_mps.shape[1])
+                else:
+                    t_mult = None
 
-                    vel_changed[:, ii] = temp_thpr.T
+                # Apply transformation matrix, 3 beam solutions, and hpr_matrix
+                vel_changed = transform_vel(self.raw_vel_mps[:, np.newaxis, :], hpr, t_mult,
+                                            model=adcp.model)[:, 0, :]
 
                 # Assign results to object
                 self.u_mps = -1 * vel_changed[0, :]
@@ -1300,7 +1132,7 @@ class BoatData(object):
 
             # Apply a trimmed standard deviation filter multiple times
             for i in range(cycles):
-                filter_array = BoatData.run_std_trim(half_width, speed_res.T)
+                filter_array = run_std_trim(half_width, speed_res.T)
 
                 # Compute filter bounds
                 upper_limit = speed_smooth + multiplier * filter_array
@@ -1592,63 +1424,3 @@ class BoatData(object):
         vel_out[:, invalid_bool] = np.nan
 
         return vel_out
-
-    @staticmethod
-    def run_std_trim(half_width, my_data):
-        """Computes a standard deviation over +/- halfwidth of points.
-
-        The routine accepts a column vector as input. "halfWidth" number of data
-        points for computing the standard deviation are selected before and
-        after the target data point, but not including the target data point.
-        Near the ends of the series the number of points before or after are
-        reduced. nan in the data are counted as points. The selected subset of
-        points are sorted and the points with the highest and lowest values are
-        removed from the subset and the standard deviation computed on the
-        remaining points in the subset. The process occurs for each point in the
-        provided column vector. A column vector with the computed standard
-        deviation at each point is returned.
-
-        Parameters
-        ----------
-        half_width: int
-             Number of ensembles on each side of target ensemble to used
-             for computing trimmed standard deviation
-        my_data: np.array(float)
-             Data to be processed
-
-        Returns
-        -------
-        filter_array: np.array(float)
-             Vector with computed standard
-        """
-
-        # Determine number of points to process
-        n_pts = my_data.shape[0]
-        if n_pts < 20:
-            half_width = np.floor(n_pts / 2.)
-
-        filter_array = []
-        # Compute standard deviation for each point
-        for n in range(n_pts):
-
-            # Sample selection for 1st point
-            if n == 0:
-                sample = my_data[1:1 + half_width]
-
-            # Sample selection at end of data set
-            elif n + half_width > n_pts:
-                sample = np.hstack((my_data[n - half_width - 1:n - 1], my_data[n:n_pts]))
-
-            # Sample selection at beginning of data set
-            elif half_width >= n + 1:
-                sample = np.hstack((my_data[0:n], my_data[n + 1:n + half_width + 1]))
-
-            # Samples selection in body of data set
-            else:
-                sample = np.hstack((my_data[n - half_width:n], my_data[n + 1:n + half_width + 1]))
-
-            # Sort and compute trummed standard deviation
-            sample = np.sort(sample)
-            filter_array.append(np.nanstd(sample[1:sample.shape[0] - 1], ddof=1))
-
-        return np.array(filter_array)
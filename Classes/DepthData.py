@@ -1,8 +1,8 @@
 import copy
 import numpy as np
 from numpy.matlib import repmat
-from MiscLibs.common_functions import iqr
 from MiscLibs.robust_loess import rloess
+from MiscLibs.running_statistics import run_iqr
 from MiscLibs.non_uniform_savgol import non_uniform_savgol
 
 
@@ -497,7 +497,7 @@ class DepthData(object):
                     for n in range(cycles - 1):
                         
                         # Compute inner quartile range
-                        fill_array = DepthData.run_iqr(half_width, depth_res[j, :])
+                        fill_array = run_iqr(half_width, depth_res[j, :])
 
                         # Compute filter criteria and apply appropriate
                         criteria = multiplier * fill_array
@@ -643,7 +643,7 @@ class DepthData(object):
                     for n in range(cycles - 1):
 
                         # Compute inner quartile range
-                        fill_array = DepthData.run_iqr(half_width, depth_res[j, :])
+                        fill_array = run_iqr(half_width, depth_res[j, :])
 
                         # Compute filter criteria
                         criteria = multiplier * fill_array
@@ -877,55 +877,6 @@ class DepthData(object):
 
         return avg_depth
 
-    @staticmethod
-    def run_iqr(half_width, data):
-        """Computes a running Innerquartile Range
-        The routine accepts a column vector as input.  "halfWidth" number of data
-        points for computing the Innerquartile Range are selected before and
-        after the target data point, but no including the target data point.
-        Near the ends of the series the number of points before or after are reduced.
-        Nan in the data are counted as points.  The IQR is computed on the slected
-        subset of points.  The process occurs for each point in the provided column vector.
-        A column vector with the computed IQR at each point is returned.
-
-        Parameters
-        ----------
-        half_width: int
-            Number of ensembles before and after current ensemble which are used to compute the IQR
-        data: np.array(float)
-            Data for which the IQR is computed
-        """
-        npts = len(data)
-        half_width = int(half_width)
-
-        if npts < 20:
-            half_width = int(np.floor(npts / 2))
-
-        iqr_array = []
-
-        # Compute IQR for each point
-        for n in range(npts):
-
-            # Sample selection for 1st point
-            if n == 0:
-                sample = data[1:1 + half_width]
-
-            # Sample selection a end of data set
-            elif n + half_width > npts:
-                sample = np.hstack([data[n - half_width - 1:n - 1], data[n:npts]])
-
-            # Sample selection at beginning of data set
-            elif half_width >= n + 1:
-                sample = np.hstack([data[0:n], data[n + 1:n + half_width + 1]])
-
-            # Sample selection in body of data set
-            else:
-                sample = np.hstack([data[n - half_width:n], data[n + 1:n + half_width + 1]])
-
-            iqr_array.append(iqr(sample))
-
-        return np.array(iqr_array)
-
     def filter_trdi(self):
         """Filter used by TRDI to filter out multiple reflections that get digitized as depth.
         """
@@ -160,39 +160,39 @@ class ExtrapQSensitivity(object):
         q_3p_ns_opt_bot = []
 
         # Compute discharges for each transect for possible extrapolation combinations
+        combinations = [('Power', 'Power', 0.1667),
+                        ('Power', 'Power', self.pp_exp),
+                        ('Constant', 'No Slip', 0.1667),
+                        ('Constant', 'No Slip', self.ns_exp),
+                        ('3-Point', 'No Slip', 0.1667),
+                        ('3-Point', 'No Slip', self.ns_exp)]
         for transect in transects:
             if transect.checked:
-                q = QComp()
-
-                q.populate_data(data_in=transect, top_method='Power', bot_method='Power', exponent=0.1667)
-                q_pp.append(q.total)
-                q_pp_top.append(q.top)
-                q_pp_bot.append(q.bottom)
-
-                q.populate_data(data_in=transect, top_method='Power', bot_method='Power', exponent=self.pp_exp)
-                q_pp_opt.append(q.total)
-                q_pp_opt_top.append(q.top)
-                q_pp_opt_bot.append(q.bottom)
-
-                q.populate_data(data_in=transect, top_method='Constant', bot_method='No Slip', exponent=0.1667)
-                q_cns.append(q.total)
-                q_cns_top.append(q.top)
-                q_cns_bot.append(q.bottom)
-
-                q.populate_data(data_in=transect, top_method='Constant', bot_method='No Slip', exponent=self.ns_exp)
-                q_cns_opt.append(q.total)
-                q_cns_opt_top.append(q.top)
-                q_cns_opt_bot.append(q.bottom)
-
-                q.populate_data(data_in=transect, top_method='3-Point', bot_method='No Slip', exponent=0.1667)
-                q_3p_ns.append(q.total)
-                q_3p_ns_top.append(q.top)
-                q_3p_ns_bot.append(q.bottom)
-
-                q.populate_data(data_in=transect, top_method='3-Point', bot_method='No Slip', exponent=self.ns_exp)
-                q_3p_ns_opt.append(q.total)
-                q_3p_ns_opt_top.append(q.top)
-                q_3p_ns_opt_bot.append(q.bottom)
+                total, top, bot = QComp.extrap_combinations(data_in=transect, combinations=combinations)
+
+                q_pp.append(total[0])
+                q_pp_top.append(top[0])
+                q_pp_bot.append(bot[0])
+
+                q_pp_opt.append(total[1])
+                q_pp_opt_top.append(top[1])
+                q_pp_opt_bot.append(bot[1])
+
+                q_cns.append(total[2])
+                q_cns_top.append(top[2])
+                q_cns_bot.append(bot[2])
+
+                q_cns_opt.append(total[3])
+                q_cns_opt_top.append(top[3])
+                q_cns_opt_bot.append(bot[3])
+
+                q_3p_ns.append(total[4])
+                q_3p_ns_top.append(top[4])
+                q_3p_ns_bot.append(bot[4])
+
+                q_3p_ns_opt.append(total[5])
+                q_3p_ns_opt_top.append(top[5])
+                q_3p_ns_opt_bot.append(bot[5])
 
         # Compute mean discharge for each combination
         self.q_pp_mean = np.nanmean(q_pp)
@@ -324,22 +324,15 @@ class ExtrapQSensitivity(object):
             self.man_exp = extrap_fits[-1].exponent
 
             if transects is not None:
-                q_man = []
-                checked = []
-                # Compute discharge for each transect
-                for transect in transects:
-                    q = QComp()
-                    checked.append(transect.checked)
-
-                    q.populate_data(data_in=transect,
-                                    top_method=self.man_top,
-                                    bot_method=self.man_bot,
-                                    exponent=self.man_exp)
-                    q_man.append(q)
                 container = []
-                for index, item in enumerate(q_man):
-                    if checked[index]:
-                        container.append(item.total)
+                # Compute discharge for each checked transect
+                for transect in transects:
+                    if transect.checked:
+                        total, _, _ = QComp.extrap_combinations(data_in=transect,
+                                                                combinations=[(self.man_top,
+                                                                               self.man_bot,
+                                                                               self.man_exp)])
+                        container.append(total[0])
                 self.q_man_mean = np.nanmean(container)
             reference_mean = self.q_man_mean
 
@@ -384,6 +384,7 @@ class GPSData(object):
         gga_differential = np.copy(self.raw_gga_differential)
         gga_differential[valid == False] = np.nan
         n_ensembles = gga_lat_deg.shape[0]
+        ens_idx = np.arange(n_ensembles)
 
         # Apply method for computing position of ensemble
 
@@ -394,47 +395,26 @@ class GPSData(object):
 
         # Uses last valid data for each ensemble
         elif p_setting == 'End':
-            self.gga_lat_ens_deg = np.tile(np.nan, gga_lat_deg.shape[0])
-            self.gga_lon_ens_deg = np.tile(np.nan, gga_lon_deg.shape[0])
-            for n in range(n_ensembles):
-                idx = np.argwhere(~np.isnan(gga_lat_deg[n, :]))
-                if idx.size < 1:
-                    idx = 0
-                else:
-                    idx = idx[-1][0]
-                self.gga_lat_ens_deg[n] = gga_lat_deg[n, idx]
-                self.gga_lon_ens_deg[n] = gga_lon_deg[n, idx]
+            idx, selected = self.sentence_idx(np.logical_not(np.isnan(gga_lat_deg)), last=True)
+            idx[np.logical_not(selected)] = 0
+            self.gga_lat_ens_deg = gga_lat_deg[ens_idx, idx]
+            self.gga_lon_ens_deg = gga_lon_deg[ens_idx, idx]
 
         # Use first valid data for each ensemble
         elif p_setting == 'First':
-            self.gga_lat_ens_deg = np.tile(np.nan, gga_lat_deg.shape[0])
-            self.gga_lon_ens_deg = np.tile(np.nan, gga_lon_deg.shape[0])
-            for n in range(n_ensembles):
-                idx = 0
-                self.gga_lat_ens_deg[n] = gga_lat_deg[n, idx]
-                self.gga_lon_ens_deg[n] = gga_lon_deg[n, idx]
+            self.gga_lat_ens_deg = gga_lat_deg[:, 0]
+            self.gga_lon_ens_deg = gga_lon_deg[:, 0]
 
         # Use minimum delta time
         elif p_setting == 'Mindt':
-            self.gga_lat_ens_deg = np.tile(np.nan, gga_lat_deg.shape[0])
-            self.gga_lon_ens_deg = np.tile(np.nan, gga_lon_deg.shape[0])
             d_time = np.abs(gga_delta_time)
-            d_time_min = np.nanmin(d_time.T, 0).T
-            
-            use = []
-            for n in range(len(d_time_min)):
-                use.append(np.abs(d_time[n, :]) == d_time_min[n])
-                
-            use = np.array(use)
-            self.gga_lat_ens_deg = np.tile([np.nan], (len(d_time_min))) 
-            self.gga_lon_ens_deg = np.tile([np.nan], (len(d_time_min)))
-            for n in range(len(d_time_min)):
-                idx = np.where(use[n, :] == True)[0]
-                if len(idx) > 0:
-                    idx = idx[0]
-                    self.gga_lat_ens_deg[n] = gga_lat_deg[n, idx]
-                    self.gga_lon_ens_deg[n] = gga_lon_deg[n, idx]
-                    
+            d_time_min = np.nanmin(d_time, 1)
+            idx, selected = self.sentence_idx(d_time == d_time_min.reshape(-1, 1))
+            self.gga_lat_ens_deg = np.tile([np.nan], n_ensembles)
+            self.gga_lon_ens_deg = np.tile([np.nan], n_ensembles)
+            self.gga_lat_ens_deg[selected] = gga_lat_deg[ens_idx[selected], idx[selected]]
+            self.gga_lon_ens_deg[selected] = gga_lon_deg[ens_idx[selected], idx[selected]]
+
         y_utm, x_utm = self.compute_utm(self.gga_lat_ens_deg, self.gga_lon_ens_deg)
         self.utm_ens_m = (x_utm, y_utm)
 
@@ -467,65 +447,28 @@ class GPSData(object):
             self.altitude_ens_m = np.nanmean(self.raw_gga_altitude_m, 1)
             self.diff_qual_ens = np.floor(np.nanmean(self.raw_gga_differential, 1))
             
-        # Use the last valid data in an ensemble
-        elif v_setting == 'End':
-
-            for n in range(n_ensembles):
-                idx = np.where(np.isnan(gga_lat_deg[n, :]) == False)[0]
-                if len(idx) > 0:
-                    idx = idx[-1]
-                    lat[n] = gga_lat_deg[n, idx]
-                    lon[n] = gga_lon_deg[n, idx]
-                    self.gga_serial_time_ens[n] = gga_serial_time[n, idx]
-                    self.altitude_ens_m[n] = gga_altitude_m[n, idx]
-                    self.diff_qual_ens[n] = gga_differential[n, idx]
-
-                if idx <= len(self.raw_gga_hdop):
-                    self.hdop_ens[n] = gga_hdop[n, idx]
-                    
-                if idx <= len(gga_num_sats[n]):
-                    self.num_sats_ens[n] = gga_num_sats[n, idx]
-
-        # Use the first valid data in an ensemble
-        elif v_setting == 'First':
-            for n in range(n_ensembles):
-                idx = 0
-                lat[n] = gga_lat_deg[n, idx]
-                lon[n] = gga_lon_deg[n, idx]
-                self.gga_serial_time_ens[n] = gga_serial_time[n, idx]
-                self.altitude_ens_m[n] = gga_altitude_m[n, idx]
-                self.diff_qual_ens[n] = gga_differential[n, idx]
-                
-                if idx <= len(self.raw_gga_hdop):
-                    self.hdop_ens[n] = gga_hdop[n, idx]
-                    
-                if idx <= len(gga_num_sats[n]):
-                    self.num_sats_ens[n] = gga_num_sats[n, idx]
+        # Use the last valid data, the first data, or the data with the minimum delta time in an ensemble
+        elif v_setting in ('End', 'First', 'Mindt'):
+            if v_setting == 'End':
+                idx, selected = self.sentence_idx(np.logical_not(np.isnan(gga_lat_deg)), last=True)
+            elif v_setting == 'First':
+                idx = np.zeros(n_ensembles, dtype=int)
+                selected = np.ones(n_ensembles, dtype=bool)
+            else:
+                d_time = np.abs(gga_delta_time)
+                d_time_min = np.nanmin(d_time, 1)
+                idx, selected = self.sentence_idx(d_time == d_time_min.reshape(-1, 1))
+
+            rows = ens_idx[selected]
+            idx = idx[selected]
+            lat[rows] = gga_lat_deg[rows, idx]
+            lon[rows] = gga_lon_deg[rows, idx]
+            self.gga_serial_time_ens[rows] = gga_serial_time[rows, idx]
+            self.altitude_ens_m[rows] = gga_altitude_m[rows, idx]
+            self.diff_qual_ens[rows] = gga_differential[rows, idx]
+            self.hdop_ens[rows] = gga_hdop[rows, idx]
+            self.num_sats_ens[rows] = gga_num_sats[rows, idx]
 
-        # Use the minimum delta time to assign data to an ensemble
-        elif v_setting == 'Mindt':
-            d_time = np.abs(gga_delta_time)
-            d_time_min = np.nanmin(d_time, 1)
-            use = []
-            for n in range(len(d_time_min)):
-                use.append(np.abs(d_time[n, :]) == d_time_min[n])
-            use = np.array(use)  
-            for n in range(len(d_time_min)):
-                idx = np.where(use[n, :] == True)[0]
-                if len(idx) > 0:
-                    idx = idx[0]
-                    lat[n] = gga_lat_deg[n, idx]
-                    lon[n] = gga_lon_deg[n, idx]
-                    self.gga_serial_time_ens[n] = gga_serial_time[n, idx]
-                    self.altitude_ens_m[n] = gga_altitude_m[n, idx]
-                    self.diff_qual_ens[n] = gga_differential[n, idx]
-                    
-                if idx <= len(gga_hdop[n]):
-                    self.hdop_ens[n] = gga_hdop[n, idx]
-                    
-                if idx <= len(gga_num_sats[n]):
-                    self.num_sats_ens[n] = gga_num_sats[n, idx]
-                    
         # Identify valid values
         idx_values = np.where(np.isnan(x_utm) == False)[0]
         if len(idx_values) > 1:
@@ -671,6 +614,32 @@ class GPSData(object):
         
         return y_utm, x_utm
 
+    @staticmethod
+    def sentence_idx(valid, last=False):
+        """Finds the first or last valid gga sentence in each ensemble.
+
+        Parameters
+        ----------
+        valid: np.array(bool)
+            Indicates valid sentences, rows are ensembles and columns are sentences
+        last: bool
+            Indicates if the last valid sentence is found instead of the first
+
+        Returns
+        -------
+        idx: np.array(int)
+            Index of the first or last valid sentence in each ensemble, 0 or the last sentence if none are valid
+        selected: np.array(bool)
+            Indicates ensembles with a valid sentence
+        """
+
+        if last:
+            idx = valid.shape[1] - 1 - np.argmax(valid[:, ::-1], axis=1)
+        else:
+            idx = np.argmax(valid, axis=1)
+
+        return idx, np.any(valid, axis=1)
+
     @staticmethod
     def gga2_vel_trdi(lat, lon, t, idx_values):
         """Computes velocity from gga data using approach from TRDI WinRiver II.
@@ -689,30 +658,30 @@ class GPSData(object):
         
         u = np.zeros(lat.shape)
         v = np.zeros(lat.shape)
-        
-        for n in range(1, len(idx_values)):
-            lat1 = lat[idx_values[n-1]]
-            lat2 = lat[idx_values[n]]
-            lon1 = lon[idx_values[n-1]]
-            lon2 = lon[idx_values[n]]
-            t1 = t[idx_values[n-1]]
-            t2 = t[idx_values[n]]
-
-            lat_avg_rad = ((lat1 + lat2) / 2) * np.pi / 180
-            sin_lat_avg_rad = np.sin(lat_avg_rad)
-            coefficient = 6378137 * np.pi / 180
-            ellipticity = 1 / 298.257223563
-            re = coefficient * (1 + ellipticity * sin_lat_avg_rad ** 2)
-            rn = coefficient * (1 - 2 * ellipticity + 3 * ellipticity * sin_lat_avg_rad ** 2)
-            delta_x = re * (lon2 - lon1) * np.cos(lat_avg_rad)
-            delta_y = rn * (lat2 - lat1)
-            delta_time = t2 - t1
-            if delta_time > 0.0001:
-                u[idx_values[n]] = delta_x / delta_time
-                v[idx_values[n]] = delta_y / delta_time
-            else:
-                u[idx_values[n]] = np.nan
-                v[idx_values[n]] = np.nan
-            
+
+        # Each valid ensemble is compared to the previous valid ensemble
+        idx1 = idx_values[:-1]
+        idx2 = idx_values[1:]
+        lat1 = lat[idx1]
+        lat2 = lat[idx2]
+        lon1 = lon[idx1]
+        lon2 = lon[idx2]
+        t1 = t[idx1]
+        t2 = t[idx2]
+
+        lat_avg_rad = ((lat1 + lat2) / 2) * np.pi / 180
+        sin_lat_avg_rad = np.sin(lat_avg_rad)
+        coefficient = 6378137 * np.pi / 180
+        ellipticity = 1 / 298.257223563
+        re = coefficient * (1 + ellipticity * sin_lat_avg_rad ** 2)
+        rn = coefficient * (1 - 2 * ellipticity + 3 * ellipticity * sin_lat_avg_rad ** 2)
+        delta_x = re * (lon2 - lon1) * np.cos(lat_avg_rad)
+        delta_y = rn * (lat2 - lat1)
+        delta_time = t2 - t1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            valid_time = delta_time > 0.0001
+            u[idx2] = np.where(valid_time, delta_x / delta_time, np.nan)
+            v[idx2] = np.where(valid_time, delta_y / delta_time, np.nan)
+
         return u, v
 
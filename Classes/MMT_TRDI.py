@@ -58,11 +58,8 @@ class MMTtrdi(object):
         # Open the file and convert to an ordered dictionary tree
         with open(mmt_file, 'r', encoding='utf-8') as fd:
             xml_data = fd.read()
-            clean_xml_data = ''
             remove_re = re.compile(u'[\x00-\x08\x0B-\x0C\x0E-\x1F\x7F%]')
-            for line in xml_data:
-                new_line, count = remove_re.subn('', line)
-                clean_xml_data = clean_xml_data + new_line
+            clean_xml_data = remove_re.sub('', xml_data)
 
             win_river = xmltodict.parse(clean_xml_data)
         # UnicodeDecodeError
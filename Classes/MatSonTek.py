@@ -6,6 +6,9 @@ class MatSonTek(object):
      Any data in English units are converted to SI units.
     """
 
+    # Increment when the decoded data change so cached data are parsed again
+    reader_version = 1
+
     def __init__(self, fullname):
         """Initializes the object, reads the Matlab file, and converts all English units to metric.
 
@@ -9,6 +9,7 @@ from Classes.PreMeasurement import PreMeasurement
 from Classes.MovingBedTests import MovingBedTests
 from Classes.QComp import QComp
 from Classes.MatSonTek import MatSonTek
+from Classes.ParsedDataCache import ParsedDataCache
 from Classes.ComputeExtrap import ComputeExtrap
 from Classes.ExtrapQSensitivity import ExtrapQSensitivity
 from Classes.Uncertainty import Uncertainty
@@ -59,8 +60,22 @@ class Measurement(object):
         Dictionary of external temperature readings
     """
 
+    # Version of QRev written to the output files and saved measurements
+    qrev_version = 'QRev 4.23'
+
+    # Processing stages applied to each transect by apply_settings and the stages that use their results
+    stage_dependents = {'processing': ('navigation', 'bt', 'gps', 'edges'),
+                        'navigation': ('depth',),
+                        'bt': ('depth',),
+                        'gps': ('depth',),
+                        'depth': ('wt',),
+                        'wt': ('interpolation',),
+                        'interpolation': (),
+                        'edges': ()}
+
     # @profile
-    def __init__(self, in_file, source, proc_type='QRev', checked=False, run_oursin=False):
+    def __init__(self, in_file, source, proc_type='QRev', checked=False, run_oursin=False, n_workers=None,
+                 cache=None):
         """Initialize instance variables and initiate processing of measurement
         data.
 
@@ -78,9 +93,17 @@ class Measurement(object):
             TRDI data.
         run_oursin: bool
             Determines if the Oursin uncertainty model should be run
+        n_workers: int
+            Number of processes used to load the transects of TRDI and Rowe
+            data and to run the Oursin simulations. None or 1 runs serially, 0
+            uses one process per cpu.
+        cache: ParsedDataCache
+            Object of ParsedDataCache used to store the data decoded from the raw
+            data files so they are not parsed again, None if not used.
         """
 
         self.run_oursin = run_oursin
+        self.n_workers = n_workers
         self.station_name = None
         self.station_number = None
         self.transects = []
@@ -114,17 +137,17 @@ class Measurement(object):
 
         else:
             if source == 'TRDI':
-                self.load_trdi(in_file, checked=checked)
+                self.load_trdi(in_file, checked=checked, n_workers=n_workers, cache=cache)
 
             elif source == 'SonTek':
-                self.load_sontek(in_file)
+                self.load_sontek(in_file, cache=cache)
 
             elif source == 'Nortek':
-                self.load_sontek(in_file)
+                self.load_sontek(in_file, cache=cache)
 
             # Process data
             elif source == 'Rowe':
-                self.load_rowe(in_file, checked=checked)
+                self.load_rowe(in_file, checked=checked, n_workers=n_workers, cache=cache)
 
             # Process TRDI and SonTek data
             if len(self.transects) > 0:
@@ -179,7 +202,7 @@ class Measurement(object):
                 # self.oursin_orig = Oursin_orig()
                 # self.oursin_orig.compute_oursin(self)
 
-    def load_trdi(self, mmt_file, transect_type='Q', checked=False):
+    def load_trdi(self, mmt_file, transect_type='Q', checked=False, n_workers=None, cache=None):
         """Method to load TRDI data.
 
         Parameters
@@ -190,6 +213,10 @@ class Measurement(object):
             Type of data (Q: discharge, MB: moving-bed test
         checked: bool
             Determines if all files are loaded (False) or only checked (True)
+        n_workers: int
+            Number of processes used to load the transects
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
 
         # Read mmt file
@@ -203,16 +230,17 @@ class Measurement(object):
         self.processing = 'WR2'
 
         # Create transect objects for  TRDI data
-        # TODO refactor allocate_transects
         self.transects = allocate_transects(mmt=mmt,
                                             transect_type=transect_type,
-                                            checked=checked)
+                                            checked=checked,
+                                            n_workers=n_workers,
+                                            cache=cache)
 
         self.checked_transect_idx = self.checked_transects(self)
 
         # Create object for pre-measurement tests
         if isinstance(mmt.qaqc, dict) or isinstance(mmt.mbt_transects, list):
-            self.qaqc_trdi(mmt)
+            self.qaqc_trdi(mmt, n_workers=n_workers, cache=cache)
         
         # Save comments from mmt file in comments
         self.comments.append('MMT Remarks: ' + mmt.site_info['Remarks'])
@@ -332,13 +360,17 @@ class Measurement(object):
                                     selected='user',
                                     speed=speed)
 
-    def qaqc_trdi(self, mmt):
+    def qaqc_trdi(self, mmt, n_workers=None, cache=None):
         """Processes qaqc test, calibrations, and evaluations
         
         Parameters
         ----------
         mmt: MMTtrdi
             Object of MMT_TRDI
+        n_workers: int
+            Number of processes used to load the moving-bed test transects
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
 
         # ADCP Test
@@ -375,7 +407,7 @@ class Measurement(object):
         if len(mmt.mbt_transects) > 0:
             
             # Create transect objects
-            transects = allocate_transects(mmt, transect_type='MB')
+            transects = allocate_transects(mmt, transect_type='MB', n_workers=n_workers, cache=cache)
 
             # Process moving-bed tests
             if len(transects) > 0:
@@ -427,7 +459,8 @@ class Measurement(object):
         # from TransectData
         transect.depths.composite_depths(transect)
 
-    def load_rowe(self, rtt_file: str, transect_type: str = 'Q', checked: bool = False):
+    def load_rowe(self, rtt_file: str, transect_type: str = 'Q', checked: bool = False, n_workers: int = None,
+                  cache: ParsedDataCache = None):
         """Method to load Rowe data.
 
         Parameters
@@ -438,6 +471,10 @@ class Measurement(object):
             Type of data (Q: discharge, MB: moving-bed test
         checked: bool
             Determines if all files are loaded (False) or only checked (True)
+        n_workers: int
+            Number of processes used to load the transects
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
 
         # Read mmt file
@@ -453,16 +490,17 @@ class Measurement(object):
         self.processing = 'WR2'
 
         # Create transect objects for Rowe data
-        # TODO refactor allocate_transects
         self.transects = allocate_rti_transects(rtt=rtt,
                                                 transect_type=transect_type,
-                                                checked=checked)
+                                                checked=checked,
+                                                n_workers=n_workers,
+                                                cache=cache)
 
         self.checked_transect_idx = self.checked_transects(self)
 
         # Create object for pre-measurement tests
         if isinstance(rtt.qaqc, dict) or isinstance(rtt.mbt_transects, list):
-            self.qaqc_trdi(rtt)
+            self.qaqc_trdi(rtt, n_workers=n_workers, cache=cache)
 
         # Save comments from rtt file in comments
         self.comments.append('RTT Remarks: ' + rtt.site_info['Remarks'])
@@ -575,7 +613,7 @@ class Measurement(object):
                                     selected='user',
                                     speed=speed)
 
-    def load_sontek(self, fullnames):
+    def load_sontek(self, fullnames, cache=None):
         """Coordinates reading of all SonTek data files.
 
         Parameters
@@ -583,6 +621,8 @@ class Measurement(object):
         fullnames: list
             File names including path for all discharge transects converted
             to Matlab files.
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
 
         # Initialize variables
@@ -591,7 +631,10 @@ class Measurement(object):
 
         for file in fullnames:
             # Read data file
-            rsdata = MatSonTek(file)
+            if cache is None:
+                rsdata = MatSonTek(file)
+            else:
+                rsdata = cache.load(MatSonTek, file)
             pathname, file_name = os.path.split(file)
 
             # Create transect objects for each discharge transect
@@ -608,7 +651,7 @@ class Measurement(object):
             if hasattr(rsdata.SiteInfo, 'Station_Number'):
                 self.station_number = rsdata.SiteInfo.Station_Number
 
-        self.qaqc_sontek(pathname)
+        self.qaqc_sontek(pathname, cache=cache)
 
         for transect in self.transects:
             transect.change_coord_sys(new_coord_sys='Earth')
@@ -637,7 +680,7 @@ class Measurement(object):
                                                ens_interp='None',
                                                cells_interp='TRDI')
 
-    def qaqc_sontek(self, pathname):
+    def qaqc_sontek(self, pathname, cache=None):
         """Reads and stores system tests, compass calibrations,
         and moving-bed tests.
 
@@ -645,6 +688,8 @@ class Measurement(object):
         ----------
         pathname: str
             Path to discharge transect files.
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
         # Compass Evaluation
         # ce = PreMeasurement()
@@ -693,9 +738,9 @@ class Measurement(object):
                     self.system_tst.append(sys_test)
 
         # Moving-bed tests
-        self.sontek_moving_bed_tests(pathname)
+        self.sontek_moving_bed_tests(pathname, cache=cache)
 
-    def sontek_moving_bed_tests(self, pathname):
+    def sontek_moving_bed_tests(self, pathname, cache=None):
         """Locates and processes SonTek moving-bed tests.
 
         Searches the pathname for Matlab files that start with Loop or SMBA.
@@ -705,6 +750,8 @@ class Measurement(object):
         ----------
         pathname: str
             Path to discharge transect files.
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used
         """
         for file in os.listdir(pathname):
             # Find moving-bed test files.
@@ -714,13 +761,15 @@ class Measurement(object):
                     self.mb_tests.append(MovingBedTests())
                     self.mb_tests[-1].populate_data(source='SonTek',
                                                     file=os.path.join(pathname, file),
-                                                    test_type='Loop')
+                                                    test_type='Loop',
+                                                    cache=cache)
                 # Process Stationary test
                 elif file.lower().startswith('smba'):
                     self.mb_tests.append(MovingBedTests())
                     self.mb_tests[-1].populate_data(source='SonTek',
                                                     file=os.path.join(pathname, file),
-                                                    test_type='Stationary')
+                                                    test_type='Stationary',
+                                                    cache=cache)
 
     def load_qrev_mat(self, mat_data):
         """Loads and coordinates the mapping of existing QRev Matlab files
@@ -1166,7 +1215,7 @@ class Measurement(object):
                 break
         return external
 
-    def apply_settings(self, settings, force_abba=True):
+    def apply_settings(self, settings, force_abba=True, incremental=False):
         """Applies reference, filter, and interpolation settings.
         
         Parameters
@@ -1175,143 +1224,91 @@ class Measurement(object):
             Dictionary of reference, filter, and interpolation settings
         force_abba: bool
             Allows the above, below, before, after interpolation to be applied even when the data use another approach.
+        incremental: bool
+            Indicates if only the processing stages that use settings that differ from the settings currently applied
+            to each transect, and the stages that depend on them, are recomputed. Changes to the data made outside of
+            apply_settings (magvar, heading offset, draft, etc.) require incremental to be False.
         """
 
-        for transect in self.transects:
+        # Data loaded from old QRev.mat files will be set to use this new interpolation method. When reprocessing
+        # any data the interpolation method should be 'abba'
+        if force_abba:
+            settings['WTEnsInterpolation'] = 'abba'
+            settings['WTCellInterpolation'] = 'abba'
+
+        # Determine the processing stages to be applied
+        if incremental:
+            transect_stages, meas_stages = self.invalidated_stages(settings)
+        else:
+            transect_stages = [set(self.stage_dependents.keys()) for _ in self.transects]
+            meas_stages = {'extrap', 'discharge'}
+
+        for transect, stages in zip(self.transects, transect_stages):
 
             # Moving-boat ensembles
-            if 'Processing' in settings.keys():
+            if 'processing' in stages and 'Processing' in settings.keys():
                 transect.change_q_ensembles(proc_method=settings['Processing'])
                 self.processing = settings['Processing']
 
-            # Navigation reference
-            if transect.boat_vel.selected != settings['NavRef']:
-                transect.change_nav_reference(update=False, new_nav_ref=settings['NavRef'])
-                if len(self.mb_tests) > 0:
-                    self.mb_tests = MovingBedTests.auto_use_2_correct(
-                        moving_bed_tests=self.mb_tests,
-                        boat_ref=settings['NavRef'])
-
-            # Changing the nav reference applies the current setting for
-            # Composite tracks, check to see if a change is needed
-            if transect.boat_vel.composite != settings['CompTracks']:
-                transect.composite_tracks(update=False, setting=settings['CompTracks'])
-
-            # Set difference velocity BT filter
-            bt_kwargs = {}
-            if settings['BTdFilter'] == 'Manual':
-                bt_kwargs['difference'] = settings['BTdFilter']
-                bt_kwargs['difference_threshold'] = settings['BTdFilterThreshold']
-            else:
-                bt_kwargs['difference'] = settings['BTdFilter']
-
-            # Set vertical velocity BT filter
-            if settings['BTwFilter'] == 'Manual':
-                bt_kwargs['vertical'] = settings['BTwFilter']
-                bt_kwargs['vertical_threshold'] = settings['BTwFilterThreshold']
-            else:
-                bt_kwargs['vertical'] = settings['BTwFilter']
-
-            # Apply beam filter
-                bt_kwargs['beam'] = settings['BTbeamFilter']
-
-            # Apply smooth filter
-                bt_kwargs['other'] = settings['BTsmoothFilter']
-
-            # Apply BT settings
-            transect.boat_filters(update=False, **bt_kwargs)
-
-            # BT Interpolation
-            transect.boat_interpolations(update=False,
-                                         target='BT',
-                                         method=settings['BTInterpolation'])
+            if 'navigation' in stages:
+                # Navigation reference
+                if transect.boat_vel.selected != settings['NavRef']:
+                    transect.change_nav_reference(update=False, new_nav_ref=settings['NavRef'])
+                    if len(self.mb_tests) > 0:
+                        self.mb_tests = MovingBedTests.auto_use_2_correct(
+                            moving_bed_tests=self.mb_tests,
+                            boat_ref=settings['NavRef'])
+
+                # Changing the nav reference applies the current setting for
+                # Composite tracks, check to see if a change is needed
+                if transect.boat_vel.composite != settings['CompTracks']:
+                    transect.composite_tracks(update=False, setting=settings['CompTracks'])
+
+            if 'bt' in stages:
+                # Apply BT settings
+                transect.boat_filters(update=False, **Measurement.bt_filter_settings(settings))
+
+                # BT Interpolation
+                transect.boat_interpolations(update=False,
+                                             target='BT',
+                                             method=settings['BTInterpolation'])
 
             # GPS filter settings
-            if transect.gps is not None:
-                gga_kwargs = {}
+            if 'gps' in stages and transect.gps is not None:
                 if transect.boat_vel.gga_vel is not None:
-                    # GGA
-                    gga_kwargs['differential'] = settings['ggaDiffQualFilter']
-                    if settings['ggaAltitudeFilter'] == 'Manual':
-                        gga_kwargs['altitude'] = settings['ggaAltitudeFilter']
-                        gga_kwargs['altitude_threshold'] = settings['ggaAltitudeFilterChange']
-                    else:
-                        gga_kwargs['altitude'] = settings['ggaAltitudeFilter']
-
-                    # Set GGA HDOP Filter
-                    if settings['GPSHDOPFilter'] == 'Manual':
-                        gga_kwargs['hdop'] = settings['GPSHDOPFilter']
-                        gga_kwargs['hdop_max_threshold'] = settings['GPSHDOPFilterMax']
-                        gga_kwargs['hdop_change_threshold'] = settings['GPSHDOPFilterChange']
-                    else:
-                        gga_kwargs['hdop'] = settings['GPSHDOPFilter']
-
-                    gga_kwargs['other'] = settings['GPSSmoothFilter']
                     # Apply GGA filters
-                    transect.gps_filters(update=False, **gga_kwargs)
+                    transect.gps_filters(update=False, **Measurement.gga_filter_settings(settings))
 
                 if transect.boat_vel.vtg_vel is not None:
-                    vtg_kwargs = {}
-                    if settings['GPSHDOPFilter'] == 'Manual':
-                        vtg_kwargs['hdop'] = settings['GPSHDOPFilter']
-                        vtg_kwargs['hdop_max_threshold'] = settings['GPSHDOPFilterMax']
-                        vtg_kwargs['hdop_change_threshold'] = settings['GPSHDOPFilterChange']
-                        vtg_kwargs['other'] = settings['GPSSmoothFilter']
-                    else:
-                        vtg_kwargs['hdop'] = settings['GPSHDOPFilter']
-                        vtg_kwargs['other'] = settings['GPSSmoothFilter']
-
                     # Apply VTG filters
-                    transect.gps_filters(update=False, **vtg_kwargs)
+                    transect.gps_filters(update=False, **Measurement.vtg_filter_settings(settings))
 
                 transect.boat_interpolations(update=False,
                                              target='GPS',
                                              method=settings['GPSInterpolation'])
 
-            # Set depth reference
-            transect.set_depth_reference(update=False, setting=settings['depthReference'])
-
-            transect.process_depths(update=True,
-                                    filter_method=settings['depthFilterType'],
-                                    interpolation_method=settings['depthInterpolation'],
-                                    composite_setting=settings['depthComposite'],
-                                    avg_method=settings['depthAvgMethod'],
-                                    valid_method=settings['depthValidMethod'])
-
-            # Set WT difference velocity filter
-            wt_kwargs = {}
-            if settings['WTdFilter'] == 'Manual':
-                wt_kwargs['difference'] = settings['WTdFilter']
-                wt_kwargs['difference_threshold'] = settings['WTdFilterThreshold']
-            else:
-                wt_kwargs['difference'] = settings['WTdFilter']
+            if 'depth' in stages:
+                # Set depth reference
+                transect.set_depth_reference(update=False, setting=settings['depthReference'])
 
-            # Set WT vertical velocity filter
-            if settings['WTwFilter'] == 'Manual':
-                wt_kwargs['vertical'] = settings['WTwFilter']
-                wt_kwargs['vertical_threshold'] = settings['WTwFilterThreshold']
-            else:
-                wt_kwargs['vertical'] = settings['WTwFilter']
-
-            wt_kwargs['beam'] = settings['WTbeamFilter']
-            wt_kwargs['other'] = settings['WTsmoothFilter']
-            wt_kwargs['snr'] = settings['WTsnrFilter']
-            wt_kwargs['wt_depth'] = settings['WTwtDepthFilter']
-            wt_kwargs['excluded'] = settings['WTExcludedDistance']
-
-            # Data loaded from old QRev.mat files will be set to use this new interpolation method. When reprocessing
-            # any data the interpolation method should be 'abba'
-            if force_abba:
-                transect.w_vel.interpolate_cells = 'abba'
-                transect.w_vel.interpolate_ens = 'abba'
-                settings['WTEnsInterpolation'] = 'abba'
-                settings['WTCellInterpolation'] = 'abba'
+                transect.process_depths(update=True,
+                                        filter_method=settings['depthFilterType'],
+                                        interpolation_method=settings['depthInterpolation'],
+                                        composite_setting=settings['depthComposite'],
+                                        avg_method=settings['depthAvgMethod'],
+                                        valid_method=settings['depthValidMethod'])
+
+            if 'wt' in stages:
+                if force_abba:
+                    transect.w_vel.interpolate_cells = 'abba'
+                    transect.w_vel.interpolate_ens = 'abba'
 
-            transect.w_vel.apply_filter(transect=transect, **wt_kwargs)
+                transect.w_vel.apply_filter(transect=transect, **Measurement.wt_filter_settings(settings))
 
             # Edge methods
-            transect.edges.rec_edge_method = settings['edgeRecEdgeMethod']
-            transect.edges.vel_method = settings['edgeVelMethod']
+            if 'edges' in stages:
+                transect.edges.rec_edge_method = settings['edgeRecEdgeMethod']
+                transect.edges.vel_method = settings['edgeVelMethod']
 
         # Recompute extrapolations
         # NOTE: Extrapolations should be determined prior to WT
@@ -1323,7 +1320,7 @@ class Measurement(object):
         else:
             ref_transect = 0
 
-        if self.transects[ref_transect].w_vel.interpolate_cells == 'TRDI':
+        if self.transects[ref_transect].w_vel.interpolate_cells == 'TRDI' and 'extrap' in meas_stages:
             if self.extrap_fit is None:
                 self.extrap_fit = ComputeExtrap()
                 self.extrap_fit.populate_data(transects=self.transects, compute_sensitivity=False)
@@ -1342,43 +1339,391 @@ class Measurement(object):
                                       exp=settings['extrapExp'],
                                       compute_q=False)
 
-        for transect in self.transects:
+        for transect, stages in zip(self.transects, transect_stages):
 
             # Water track interpolations
-            transect.w_vel.apply_interpolation(transect=transect,
-                                               ens_interp=settings['WTEnsInterpolation'],
-                                               cells_interp=settings['WTCellInterpolation'])
+            if 'interpolation' in stages:
+                transect.w_vel.apply_interpolation(transect=transect,
+                                                   ens_interp=settings['WTEnsInterpolation'],
+                                                   cells_interp=settings['WTCellInterpolation'])
 
-        if self.extrap_fit is None:
-            self.extrap_fit = ComputeExtrap()
-            self.extrap_fit.populate_data(transects=self.transects, compute_sensitivity=False)
-            self.change_extrapolation(self.extrap_fit.fit_method, compute_q=False)
-        elif self.extrap_fit.fit_method == 'Automatic':
-            self.change_extrapolation(self.extrap_fit.fit_method, compute_q=False)
+            # Discharge components computed from the previous processed data are no longer valid
+            if len(stages) > 0:
+                transect.processed_data_changed()
+
+        if 'extrap' in meas_stages:
+            if self.extrap_fit is None:
+                self.extrap_fit = ComputeExtrap()
+                self.extrap_fit.populate_data(transects=self.transects, compute_sensitivity=False)
+                self.change_extrapolation(self.extrap_fit.fit_method, compute_q=False)
+            elif self.extrap_fit.fit_method == 'Automatic':
+                self.change_extrapolation(self.extrap_fit.fit_method, compute_q=False)
+            else:
+                if 'extrapTop' not in settings.keys():
+                    settings['extrapTop'] = self.extrap_fit.sel_fit[-1].top_method
+                    settings['extrapBot'] = self.extrap_fit.sel_fit[-1].bot_method
+                    settings['extrapExp'] = self.extrap_fit.sel_fit[-1].exponent
+
+            self.change_extrapolation(self.extrap_fit.fit_method,
+                                      top=settings['extrapTop'],
+                                      bot=settings['extrapBot'],
+                                      exp=settings['extrapExp'],
+                                      compute_q=False)
+
+        if 'discharge' in meas_stages:
+            self.extrap_fit.q_sensitivity = ExtrapQSensitivity()
+            self.extrap_fit.q_sensitivity.populate_data(transects=self.transects,
+                                                        extrap_fits=self.extrap_fit.sel_fit)
+
+            self.compute_discharge()
+
+            self.uncertainty = Uncertainty()
+            self.uncertainty.compute_uncertainty(self)
+            self.qa = QAData(self)
+            if self.run_oursin:
+                self.oursin = Oursin()
+                self.oursin.compute_oursin(self, n_workers=self.n_workers)
+
+    def invalidated_stages(self, settings):
+        """Determines the processing stages of apply_settings that must be recomputed for the settings to be applied.
+        A stage is invalidated if any of the settings it uses differs from the settings currently applied to the
+        transect. All stages that depend on an invalidated stage are also invalidated.
+
+        Parameters
+        ----------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+
+        Returns
+        -------
+        transect_stages: list
+            List of sets of the invalidated stages for each transect
+        meas_stages: set
+            Set of the invalidated measurement stages ('extrap', 'discharge')
+        """
+
+        transect_stages = []
+        for transect in self.transects:
+            current = self.stage_settings(transect=transect,
+                                          settings=Measurement.transect_settings(transect),
+                                          processing=self.processing)
+            new = self.stage_settings(transect=transect,
+                                      settings=settings,
+                                      processing=settings.get('Processing', self.processing))
+
+            stages = set()
+            changed = [stage for stage in new.keys() if not Measurement.settings_equal(new[stage], current[stage])]
+            while len(changed) > 0:
+                stage = changed.pop()
+                if stage not in stages:
+                    stages.add(stage)
+                    changed.extend(self.stage_dependents[stage])
+            transect_stages.append(stages)
+
+        meas_stages = set()
+
+        # The extrapolation uses the water data from all transects
+        if self.extrap_fit is None or any(['interpolation' in stages for stages in transect_stages]):
+            meas_stages.add('extrap')
         else:
-            if 'extrapTop' not in settings.keys():
-                settings['extrapTop'] = self.extrap_fit.sel_fit[-1].top_method
-                settings['extrapBot'] = self.extrap_fit.sel_fit[-1].bot_method
-                settings['extrapExp'] = self.extrap_fit.sel_fit[-1].exponent
+            current = (self.extrap_fit.sel_fit[-1].top_method,
+                       self.extrap_fit.sel_fit[-1].bot_method,
+                       self.extrap_fit.sel_fit[-1].exponent)
+            new = (settings.get('extrapTop', current[0]),
+                   settings.get('extrapBot', current[1]),
+                   settings.get('extrapExp', current[2]))
+            if not Measurement.settings_equal(new, current):
+                meas_stages.add('extrap')
 
-        self.change_extrapolation(self.extrap_fit.fit_method,
-                                  top=settings['extrapTop'],
-                                  bot=settings['extrapBot'],
-                                  exp=settings['extrapExp'],
-                                  compute_q=False)
+        if len(self.checked_transect_idx) > 0:
+            ref_transect = self.checked_transect_idx[0]
+        else:
+            ref_transect = 0
 
-        self.extrap_fit.q_sensitivity = ExtrapQSensitivity()
-        self.extrap_fit.q_sensitivity.populate_data(transects=self.transects,
-                                                    extrap_fits=self.extrap_fit.sel_fit)
+        # The TRDI cell interpolation uses the extrapolation
+        if 'extrap' in meas_stages and self.transects[ref_transect].w_vel.interpolate_cells == 'TRDI':
+            for stages in transect_stages:
+                stages.add('interpolation')
 
-        self.compute_discharge()
+        if 'extrap' in meas_stages or any([len(stages) > 0 for stages in transect_stages]):
+            meas_stages.add('discharge')
 
-        self.uncertainty = Uncertainty()
-        self.uncertainty.compute_uncertainty(self)
-        self.qa = QAData(self)
-        if self.run_oursin:
-            self.oursin = Oursin()
-            self.oursin.compute_oursin(self)
+        return transect_stages, meas_stages
+
+    @staticmethod
+    def stage_settings(transect, settings, processing):
+        """Collects the settings used by each processing stage of apply_settings for a transect.
+
+        Parameters
+        ----------
+        transect: TransectData
+            Object of TransectData
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+        processing: str
+            Type of processing
+
+        Returns
+        -------
+        stages: dict
+            Dictionary of the settings used by each stage
+        """
+
+        gps = None
+        if transect.gps is not None:
+            gga_settings = settings.get('gga_vel', settings)
+            vtg_settings = settings.get('vtg_vel', settings)
+            gps = [None, None]
+            if transect.boat_vel.gga_vel is not None:
+                gps[0] = (Measurement.gga_filter_settings(gga_settings), gga_settings['GPSInterpolation'])
+            if transect.boat_vel.vtg_vel is not None:
+                gps[1] = (Measurement.vtg_filter_settings(vtg_settings), vtg_settings['GPSInterpolation'])
+
+        stages = {'processing': processing,
+                  'navigation': (settings['NavRef'], settings['CompTracks']),
+                  'bt': (Measurement.bt_filter_settings(settings), settings['BTInterpolation']),
+                  'gps': gps,
+                  'depth': (settings['depthReference'],
+                            settings['depthFilterType'],
+                            settings['depthInterpolation'],
+                            settings['depthComposite'],
+                            settings['depthAvgMethod'],
+                            settings['depthValidMethod']),
+                  'wt': Measurement.wt_filter_settings(settings),
+                  'interpolation': (settings['WTEnsInterpolation'], settings['WTCellInterpolation']),
+                  'edges': (settings['edgeRecEdgeMethod'], settings['edgeVelMethod'])}
+
+        return stages
+
+    @staticmethod
+    def transect_settings(transect):
+        """Settings currently applied to a transect. The settings of the GGA and VTG boat velocities are stored in
+        separate dictionaries using the keys gga_vel and vtg_vel.
+
+        Parameters
+        ----------
+        transect: TransectData
+            Object of TransectData
+
+        Returns
+        -------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+        """
+
+        settings = {'NavRef': transect.boat_vel.selected,
+                    'CompTracks': transect.boat_vel.composite,
+                    'WTbeamFilter': transect.w_vel.beam_filter,
+                    'WTdFilter': transect.w_vel.d_filter,
+                    'WTdFilterThreshold': transect.w_vel.d_filter_threshold,
+                    'WTwFilter': transect.w_vel.w_filter,
+                    'WTwFilterThreshold': transect.w_vel.w_filter_threshold,
+                    'WTsmoothFilter': transect.w_vel.smooth_filter,
+                    'WTsnrFilter': transect.w_vel.snr_filter,
+                    'WTwtDepthFilter': transect.w_vel.wt_depth_filter,
+                    'WTEnsInterpolation': transect.w_vel.interpolate_ens,
+                    'WTCellInterpolation': transect.w_vel.interpolate_cells,
+                    'WTExcludedDistance': transect.w_vel.excluded_dist_m,
+                    'BTbeamFilter': transect.boat_vel.bt_vel.beam_filter,
+                    'BTdFilter': transect.boat_vel.bt_vel.d_filter,
+                    'BTdFilterThreshold': transect.boat_vel.bt_vel.d_filter_threshold,
+                    'BTwFilter': transect.boat_vel.bt_vel.w_filter,
+                    'BTwFilterThreshold': transect.boat_vel.bt_vel.w_filter_threshold,
+                    'BTsmoothFilter': transect.boat_vel.bt_vel.smooth_filter,
+                    'BTInterpolation': transect.boat_vel.bt_vel.interpolate,
+                    'depthAvgMethod': transect.depths.bt_depths.avg_method,
+                    'depthValidMethod': transect.depths.bt_depths.valid_data_method,
+                    'depthFilterType': transect.depths.bt_depths.filter_type,
+                    'depthReference': transect.depths.selected,
+                    'depthComposite': transect.depths.composite,
+                    'depthInterpolation': getattr(transect.depths, transect.depths.selected).interp_type,
+                    'edgeVelMethod': transect.edges.vel_method,
+                    'edgeRecEdgeMethod': transect.edges.rec_edge_method}
+
+        for gps_vel in ['gga_vel', 'vtg_vel']:
+            vel = getattr(transect.boat_vel, gps_vel)
+            if vel is not None:
+                settings[gps_vel] = {'ggaDiffQualFilter': vel.gps_diff_qual_filter,
+                                     'ggaAltitudeFilter': vel.gps_altitude_filter,
+                                     'ggaAltitudeFilterChange': vel.gps_altitude_filter_change,
+                                     'GPSHDOPFilter': vel.gps_HDOP_filter,
+                                     'GPSHDOPFilterMax': vel.gps_HDOP_filter_max,
+                                     'GPSHDOPFilterChange': vel.gps_HDOP_filter_change,
+                                     'GPSSmoothFilter': vel.smooth_filter,
+                                     'GPSInterpolation': vel.interpolate}
+
+        return settings
+
+    @staticmethod
+    def bt_filter_settings(settings):
+        """Creates the keyword arguments for TransectData.boat_filters from the settings.
+
+        Parameters
+        ----------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+
+        Returns
+        -------
+        bt_kwargs: dict
+            Dictionary of BT filter settings
+        """
+
+        # Set difference velocity BT filter
+        bt_kwargs = {}
+        if settings['BTdFilter'] == 'Manual':
+            bt_kwargs['difference'] = settings['BTdFilter']
+            bt_kwargs['difference_threshold'] = settings['BTdFilterThreshold']
+        else:
+            bt_kwargs['difference'] = settings['BTdFilter']
+
+        # Set vertical velocity BT filter
+        if settings['BTwFilter'] == 'Manual':
+            bt_kwargs['vertical'] = settings['BTwFilter']
+            bt_kwargs['vertical_threshold'] = settings['BTwFilterThreshold']
+        else:
+            bt_kwargs['vertical'] = settings['BTwFilter']
+
+            # Apply beam filter
+            bt_kwargs['beam'] = settings['BTbeamFilter']
+
+            # Apply smooth filter
+            bt_kwargs['other'] = settings['BTsmoothFilter']
+
+        return bt_kwargs
+
+    @staticmethod
+    def gga_filter_settings(settings):
+        """Creates the keyword arguments for TransectData.gps_filters for GGA data from the settings.
+
+        Parameters
+        ----------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+
+        Returns
+        -------
+        gga_kwargs: dict
+            Dictionary of GGA filter settings
+        """
+
+        gga_kwargs = {'differential': settings['ggaDiffQualFilter']}
+        if settings['ggaAltitudeFilter'] == 'Manual':
+            gga_kwargs['altitude'] = settings['ggaAltitudeFilter']
+            gga_kwargs['altitude_threshold'] = settings['ggaAltitudeFilterChange']
+        else:
+            gga_kwargs['altitude'] = settings['ggaAltitudeFilter']
+
+        # Set GGA HDOP Filter
+        if settings['GPSHDOPFilter'] == 'Manual':
+            gga_kwargs['hdop'] = settings['GPSHDOPFilter']
+            gga_kwargs['hdop_max_threshold'] = settings['GPSHDOPFilterMax']
+            gga_kwargs['hdop_change_threshold'] = settings['GPSHDOPFilterChange']
+        else:
+            gga_kwargs['hdop'] = settings['GPSHDOPFilter']
+
+        gga_kwargs['other'] = settings['GPSSmoothFilter']
+
+        return gga_kwargs
+
+    @staticmethod
+    def vtg_filter_settings(settings):
+        """Creates the keyword arguments for TransectData.gps_filters for VTG data from the settings.
+
+        Parameters
+        ----------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+
+        Returns
+        -------
+        vtg_kwargs: dict
+            Dictionary of VTG filter settings
+        """
+
+        vtg_kwargs = {}
+        if settings['GPSHDOPFilter'] == 'Manual':
+            vtg_kwargs['hdop'] = settings['GPSHDOPFilter']
+            vtg_kwargs['hdop_max_threshold'] = settings['GPSHDOPFilterMax']
+            vtg_kwargs['hdop_change_threshold'] = settings['GPSHDOPFilterChange']
+            vtg_kwargs['other'] = settings['GPSSmoothFilter']
+        else:
+            vtg_kwargs['hdop'] = settings['GPSHDOPFilter']
+            vtg_kwargs['other'] = settings['GPSSmoothFilter']
+
+        return vtg_kwargs
+
+    @staticmethod
+    def wt_filter_settings(settings):
+        """Creates the keyword arguments for WaterData.apply_filter from the settings.
+
+        Parameters
+        ----------
+        settings: dict
+            Dictionary of reference, filter, and interpolation settings
+
+        Returns
+        -------
+        wt_kwargs: dict
+            Dictionary of WT filter settings
+        """
+
+        # Set WT difference velocity filter
+        wt_kwargs = {}
+        if settings['WTdFilter'] == 'Manual':
+            wt_kwargs['difference'] = settings['WTdFilter']
+            wt_kwargs['difference_threshold'] = settings['WTdFilterThreshold']
+        else:
+            wt_kwargs['difference'] = settings['WTdFilter']
+
+        # Set WT vertical velocity filter
+        if settings['WTwFilter'] == 'Manual':
+            wt_kwargs['vertical'] = settings['WTwFilter']
+            wt_kwargs['vertical_threshold'] = settings['WTwFilterThreshold']
+        else:
+            wt_kwargs['vertical'] = settings['WTwFilter']
+
+        wt_kwargs['beam'] = settings['WTbeamFilter']
+        wt_kwargs['other'] = settings['WTsmoothFilter']
+        wt_kwargs['snr'] = settings['WTsnrFilter']
+        wt_kwargs['wt_depth'] = settings['WTwtDepthFilter']
+        wt_kwargs['excluded'] = settings['WTExcludedDistance']
+
+        return wt_kwargs
+
+    @staticmethod
+    def settings_equal(setting_1, setting_2):
+        """Compares two settings, which may be nested dictionaries, lists, or tuples. Nan values are considered
+        equal.
+
+        Parameters
+        ----------
+        setting_1: any
+            First setting
+        setting_2: any
+            Second setting
+
+        Returns
+        -------
+        equal: bool
+            Indicates if the settings are equal
+        """
+
+        if isinstance(setting_1, dict) and isinstance(setting_2, dict):
+            return setting_1.keys() == setting_2.keys() \
+                and all([Measurement.settings_equal(setting_1[key], setting_2[key]) for key in setting_1.keys()])
+
+        if isinstance(setting_1, (list, tuple)) and isinstance(setting_2, (list, tuple)):
+            return len(setting_1) == len(setting_2) \
+                and all([Measurement.settings_equal(s1, s2) for s1, s2 in zip(setting_1, setting_2)])
+
+        if isinstance(setting_1, (dict, list, tuple)) or isinstance(setting_2, (dict, list, tuple)):
+            return False
+
+        try:
+            return bool(np.array_equal(setting_1, setting_2, equal_nan=True))
+        except TypeError:
+            return bool(np.array_equal(setting_1, setting_2))
 
     def current_settings(self):
         """Saves the current settings for a measurement. Since all settings
@@ -1721,7 +2066,7 @@ class Measurement(object):
         self.uncertainty.compute_uncertainty(self)
         self.qa = QAData(self)
         self.oursin = Oursin()
-        self.oursin.compute_oursin(self)
+        self.oursin.compute_oursin(self, n_workers=self.n_workers)
 
     def compute_discharge(self):
         """Computes the discharge for all transects in the measurement.
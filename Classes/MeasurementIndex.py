@@ -0,0 +1,556 @@
+import os
+import json
+import struct
+import datetime
+import numpy as np
+from Classes.MMT_TRDI import MMTtrdi
+from Classes.RTT_Rowe import RTTrowe
+from Classes.Pd0TRDI_2 import Pd0TRDI
+from Classes.RtbRowe import RtbRowe
+
+
+class MeasurementIndex(object):
+    """Lightweight index of the measurements in a folder that is used to list measurements without loading them.
+
+    Only the mmt or rtt project file and the first and last valid ensemble of each PD0 or RTB transect file are
+    read. The index is stored as a json file in the folder and is refreshed incrementally, so only project and
+    transect files with a changed size or modification time are read again.
+
+    Attributes
+    ----------
+    folder: str
+        Folder containing the mmt or rtt project files and transect files
+    index_file: str
+        Full name of the json file used to store the index
+    projects: dict
+        Summary of each project file keyed by file name
+    raw_files: dict
+        Summary of each transect file referenced by the project files keyed by file name
+    """
+
+    # Change if the layout of the index file changes
+    index_version = 1
+
+    # Name of index file stored in each folder
+    index_name = 'QRevIndex.json'
+
+    # Manufacturer associated with each project file extension
+    project_types = {'.mmt': 'TRDI', '.rtt': 'Rowe'}
+
+    # Number of bytes initially read from the start and end of a transect file to find a valid ensemble
+    block_size = 2**16
+
+    # Maximum number of bytes read from the start or end of a transect file to find a valid ensemble
+    max_search_size = 2**22
+
+    def __init__(self, folder):
+        """Initialize index and read the stored index, if any.
+
+        Parameters
+        ----------
+        folder: str
+            Folder containing the mmt or rtt project files and transect files
+        """
+
+        self.folder = folder
+        self.index_file = os.path.join(folder, self.index_name)
+        self.projects = {}
+        self.raw_files = {}
+        self.read()
+
+    @classmethod
+    def scan(cls, root, write=True):
+        """Refreshes the index of every folder below root that contains project files.
+
+        Parameters
+        ----------
+        root: str
+            Top folder of archive
+        write: bool
+            Indicates if changed indexes are stored in their folders
+
+        Returns
+        -------
+        indexes: list
+            List of MeasurementIndex objects for each folder containing project files
+        """
+
+        indexes = []
+        for folder, _, names in os.walk(root):
+            if any([os.path.splitext(name)[1].lower() in cls.project_types for name in names]):
+                index = cls(folder)
+                index.refresh(write=write)
+                indexes.append(index)
+
+        return indexes
+
+    def read(self):
+        """Reads the stored index. An index that does not exist, cannot be read, or has a different index_version
+        is ignored.
+        """
+
+        try:
+            with open(self.index_file, 'r') as f:
+                index = json.load(f)
+            if index['index_version'] == self.index_version:
+                self.projects = index['projects']
+                self.raw_files = index['raw_files']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def write(self):
+        """Stores the index in the folder. Folders that cannot be written, such as a read only archive, are not
+        indexed on disk.
+
+        Returns
+        -------
+        :bool
+            True if the index was stored
+        """
+
+        index = {'index_version': self.index_version,
+                 'projects': self.projects,
+                 'raw_files': self.raw_files}
+
+        # Write to a temporary file first so an incomplete index is never read
+        temp_file = self.index_file + '.%d.tmp' % os.getpid()
+        try:
+            with open(temp_file, 'w') as f:
+                json.dump(index, f, indent=1)
+            os.replace(temp_file, self.index_file)
+        except OSError:
+            if os.path.isfile(temp_file):
+                os.remove(temp_file)
+            return False
+
+        return True
+
+    def refresh(self, write=True):
+        """Updates the index for project and transect files that were added, changed, or removed.
+
+        Parameters
+        ----------
+        write: bool
+            Indicates if the index is stored in the folder when it changes
+
+        Returns
+        -------
+        changed: bool
+            Indicates if the index changed
+        """
+
+        changed = False
+
+        # Project files
+        projects = {}
+        for name in sorted(os.listdir(self.folder)):
+            file_type = self.project_types.get(os.path.splitext(name)[1].lower())
+            file_stat = self.file_stat(os.path.join(self.folder, name))
+            if file_type is None or file_stat is None:
+                continue
+
+            project = self.projects.get(name)
+            if project is None or project['stat'] != file_stat:
+                project = self.project_summary(os.path.join(self.folder, name), file_type)
+                project['stat'] = file_stat
+                changed = True
+            projects[name] = project
+
+        changed = changed or projects.keys() != self.projects.keys()
+        self.projects = projects
+
+        # Transect files referenced by the project files
+        raw_files = {}
+        for project in projects.values():
+            for transect in project.get('transects', []) + project.get('mbt_transects', []):
+                for name in transect['files']:
+                    file_stat = self.file_stat(os.path.join(self.folder, name))
+                    if name in raw_files or file_stat is None:
+                        continue
+
+                    summary = self.raw_files.get(name)
+                    if summary is None or summary['stat'] != file_stat:
+                        summary = self.raw_file_summary(os.path.join(self.folder, name), project['type'])
+                        summary['stat'] = file_stat
+                        changed = True
+                    raw_files[name] = summary
+
+        changed = changed or raw_files.keys() != self.raw_files.keys()
+        self.raw_files = raw_files
+
+        if changed and write:
+            self.write()
+
+        return changed
+
+    def measurements(self):
+        """Summarizes each measurement in the folder from the index.
+
+        Returns
+        -------
+        measurements: list
+            List of dictionaries for each project file with the file name, type, project and station names,
+            number of transects, start and end time and number of ensembles of the discharge transects, serial
+            numbers, total size of files in bytes, and missing transect files
+        """
+
+        measurements = []
+        for name, project in sorted(self.projects.items()):
+            measurement = {'file': os.path.join(self.folder, name),
+                           'type': project['type'],
+                           'error': project.get('error'),
+                           'name': project.get('name', ''),
+                           'station_name': '',
+                           'station_number': '',
+                           'n_transects': 0,
+                           'n_checked': 0,
+                           'start_time': None,
+                           'end_time': None,
+                           'n_ensembles': 0,
+                           'serial_numbers': [],
+                           'size': project['stat'][0],
+                           'missing_files': []}
+            if 'site_info' in project:
+                measurement['station_name'] = str(project['site_info'].get('Name', ''))
+                measurement['station_number'] = str(project['site_info'].get('Number', ''))
+
+            transects = project.get('transects', [])
+            measurement['n_transects'] = len(transects)
+            measurement['n_checked'] = sum([transect['checked'] == 1 for transect in transects])
+
+            start_times = []
+            end_times = []
+            serial_numbers = set()
+            mbt_transects = project.get('mbt_transects', [])
+            for n, transect in enumerate(transects + mbt_transects):
+                for file_name in transect['files']:
+                    summary = self.raw_files.get(file_name)
+                    if summary is None:
+                        measurement['missing_files'].append(file_name)
+                        continue
+
+                    measurement['size'] += summary['stat'][0]
+                    if summary['serial_number'] is not None:
+                        serial_numbers.add(str(summary['serial_number']))
+
+                    # Times and ensembles are only for the discharge transects
+                    if n < len(transects):
+                        measurement['n_ensembles'] += summary['n_ensembles']
+                        if summary['start_time'] is not None:
+                            start_times.append(summary['start_time'])
+                        if summary['end_time'] is not None:
+                            end_times.append(summary['end_time'])
+
+            if len(start_times) > 0:
+                measurement['start_time'] = min(start_times)
+            if len(end_times) > 0:
+                measurement['end_time'] = max(end_times)
+            measurement['serial_numbers'] = sorted(serial_numbers)
+            measurements.append(measurement)
+
+        return measurements
+
+    @staticmethod
+    def file_stat(file_name):
+        """Size and modification time used to detect changes to a file.
+
+        Parameters
+        ----------
+        file_name: str
+            Full name of file
+
+        Returns
+        -------
+        :list
+            Size in bytes and modification time in nanoseconds, None if the file does not exist
+        """
+
+        try:
+            file_stat = os.stat(file_name)
+        except OSError:
+            return None
+        if not os.path.isfile(file_name):
+            return None
+
+        return [file_stat.st_size, file_stat.st_mtime_ns]
+
+    @staticmethod
+    def project_summary(file_name, file_type):
+        """Reads the project information from a mmt or rtt file.
+
+        Parameters
+        ----------
+        file_name: str
+            Full name of project file
+        file_type: str
+            Type of project file (TRDI, Rowe)
+
+        Returns
+        -------
+        summary: dict
+            Dictionary of project name, site information, and files of each discharge and moving-bed test
+            transect. If the file cannot be read the dictionary contains the error message.
+        """
+
+        try:
+            if file_type == 'TRDI':
+                project = MMTtrdi(file_name)
+            else:
+                project = RTTrowe()
+                project.parse_project(file_name)
+        except Exception as e:
+            return {'type': file_type, 'error': str(e)}
+
+        return {'type': file_type,
+                'name': str(project.project['Name']),
+                'site_info': project.site_info,
+                'transects': [MeasurementIndex.transect_summary(transect) for transect in project.transects],
+                'mbt_transects': [MeasurementIndex.transect_summary(transect)
+                                  for transect in project.mbt_transects]}
+
+    @staticmethod
+    def transect_summary(transect):
+        """Summarizes a transect from a project file.
+
+        Parameters
+        ----------
+        transect: MMTtransect or RTTtransect
+            Transect from project file
+
+        Returns
+        -------
+        :dict
+            Dictionary of the transect files, checked status, and moving-bed test type
+        """
+
+        return {'files': list(transect.Files),
+                'checked': int(transect.Checked),
+                'moving_bed_type': transect.moving_bed_type}
+
+    @staticmethod
+    def raw_file_summary(file_name, file_type):
+        """Summarizes a transect file from its first and last valid ensembles.
+
+        Parameters
+        ----------
+        file_name: str
+            Full name of PD0 or RTB transect file
+        file_type: str
+            Type of project file (TRDI, Rowe)
+
+        Returns
+        -------
+        summary: dict
+            Dictionary of the first and last ensemble numbers, number of ensembles, start and end times,
+            serial number, and firmware
+        """
+
+        if file_type == 'TRDI':
+            decoder = MeasurementIndex.pd0_ensemble
+        else:
+            decoder = MeasurementIndex.rtb_ensemble
+
+        first = MeasurementIndex.find_ensemble(file_name, decoder)
+        last = MeasurementIndex.find_ensemble(file_name, decoder, from_end=True)
+
+        summary = {'first_ensemble': None,
+                   'last_ensemble': None,
+                   'n_ensembles': 0,
+                   'start_time': None,
+                   'end_time': None,
+                   'serial_number': None,
+                   'firmware': None}
+
+        if first is not None and last is not None:
+            summary['first_ensemble'] = first['ensemble_number']
+            summary['last_ensemble'] = last['ensemble_number']
+            summary['n_ensembles'] = max(last['ensemble_number'] - first['ensemble_number'] + 1, 0)
+            summary['start_time'] = first['time']
+            summary['end_time'] = last['time']
+            summary['serial_number'] = first['serial_number']
+            summary['firmware'] = first['firmware']
+
+        return summary
+
+    @staticmethod
+    def find_ensemble(file_name, decoder, from_end=False):
+        """Reads a block from the start or end of a file and decodes the first or last valid ensemble in the
+        block. The block is enlarged until an ensemble is found or max_search_size is reached.
+
+        Parameters
+        ----------
+        file_name: str
+            Full name of transect file
+        decoder: function
+            Function decoding the first or last valid ensemble in a block of bytes
+        from_end: bool
+            Indicates if the last ensemble is decoded
+
+        Returns
+        -------
+        ensemble: dict
+            Dictionary of decoded ensemble information, None if no valid ensemble was found
+        """
+
+        file_size = os.path.getsize(file_name)
+        block_size = MeasurementIndex.block_size
+        with open(file_name, 'rb') as f:
+            while True:
+                block_size = min(block_size, file_size)
+                if from_end:
+                    f.seek(file_size - block_size)
+                else:
+                    f.seek(0)
+                data = f.read(block_size)
+
+                ensemble = decoder(data, from_end)
+                if ensemble is not None or block_size >= min(file_size, MeasurementIndex.max_search_size):
+                    return ensemble
+                block_size = block_size * 4
+
+    @staticmethod
+    def candidates(data, delimiter, from_end=False):
+        """Locates the possible starts of ensembles in a block of bytes.
+
+        Parameters
+        ----------
+        data: bytes
+            Block of bytes from a transect file
+        delimiter: bytes
+            Bytes at the start of each ensemble
+        from_end: bool
+            Indicates if the starts are located from the end of the block
+
+        Yields
+        ------
+        start: int
+            Position of the start of a possible ensemble
+        """
+
+        if from_end:
+            start = data.rfind(delimiter)
+            while start >= 0:
+                yield start
+                start = data.rfind(delimiter, 0, start + len(delimiter) - 1)
+        else:
+            start = data.find(delimiter)
+            while start >= 0:
+                yield start
+                start = data.find(delimiter, start + 1)
+
+    @staticmethod
+    def pd0_ensemble(data, from_end=False):
+        """Decodes the leaders of the first or last valid ensemble in a block of PD0 data. The date and time
+        are determined as in Sensor of Pd0TRDI.
+
+        Parameters
+        ----------
+        data: bytes
+            Block of bytes from a PD0 file
+        from_end: bool
+            Indicates if the last ensemble is decoded
+
+        Returns
+        -------
+        ensemble: dict
+            Dictionary of ensemble number, time, serial number, and firmware, None if no valid ensemble was found
+        """
+
+        pd0_uint8 = np.frombuffer(data, dtype=np.uint8)
+        for start in MeasurementIndex.candidates(data, b'\x7f\x7f', from_end):
+            ensemble = Pd0TRDI.index_ensemble(data, pd0_uint8, start, len(data))
+            if ensemble is not None:
+                type_offsets = ensemble[3]
+                fixed = Pd0TRDI.decode_fixed_leader(data, type_offsets[0x0000], None)
+                variable = Pd0TRDI.decode_variable_leader(data, type_offsets[0x0080], None)
+                return {'ensemble_number': variable['ensemble_number_msb'] * 65536 + variable['ensemble_number'],
+                        'time': MeasurementIndex.iso_time(variable['rtc_y2k_century'] * 100
+                                                          + variable['rtc_y2k_year'],
+                                                          variable['rtc_month'],
+                                                          variable['rtc_day'],
+                                                          variable['rtc_hour'],
+                                                          variable['rtc_minutes'],
+                                                          variable['rtc_seconds'],
+                                                          variable['rtc_hundredths']),
+                        'serial_number': fixed['serial_number'],
+                        'firmware': '%d.%02d' % (fixed['cpu_firmware_version'], fixed['cpu_firmware_revision'])}
+
+        return None
+
+    @staticmethod
+    def rtb_ensemble(data, from_end=False):
+        """Decodes the ensemble dataset of the first or last valid ensemble in a block of RTB data.
+
+        Parameters
+        ----------
+        data: bytes
+            Block of bytes from a RTB file
+        from_end: bool
+            Indicates if the last ensemble is decoded
+
+        Returns
+        -------
+        ensemble: dict
+            Dictionary of ensemble number, time, serial number, and firmware, None if no valid ensemble was found
+        """
+
+        raw = memoryview(data)
+        for start in MeasurementIndex.candidates(data, RtbRowe.DELIMITER, from_end):
+            ens_end = RtbRowe.verify_ens_location(raw, start)
+            if ens_end == 0:
+                continue
+
+            # Locate the ensemble dataset
+            pointer = start + RtbRowe.HEADER_SIZE
+            for _ in range(RtbRowe.MAX_DATASETS):
+                if pointer + RtbRowe.get_base_data_size(8) > ens_end - RtbRowe.CHECKSUM_SIZE:
+                    break
+                ds_type, num_elements, element_multiplier, image, name_len = struct.unpack_from('<5i', data, pointer)
+                name = data[pointer + RtbRowe.BYTES_IN_INT32 * 5:pointer + RtbRowe.BYTES_IN_INT32 * 5 + 8]
+                data_set_size = RtbRowe.get_data_set_size(ds_type, name_len, num_elements, element_multiplier)
+
+                if b'E000008' in name:
+                    values_start = pointer + RtbRowe.get_base_data_size(name_len)
+                    values = struct.unpack_from('<13i32s4B', data, values_start)
+                    return {'ensemble_number': values[0],
+                            'time': MeasurementIndex.iso_time(*values[6:13]),
+                            'serial_number': values[13].decode('utf-8', 'ignore').strip('\x00 '),
+                            'firmware': '%d.%d.%d' % (values[16], values[15], values[14])}
+
+                if data_set_size <= 0:
+                    break
+                pointer = pointer + data_set_size
+
+        return None
+
+    @staticmethod
+    def iso_time(year, month, day, hour, minute, second, hundredths):
+        """Converts an ensemble date and time to a string in ISO format.
+
+        Parameters
+        ----------
+        year: int
+            Year including century
+        month: int
+            Month
+        day: int
+            Day
+        hour: int
+            Hour
+        minute: int
+            Minute
+        second: int
+            Second
+        hundredths: int
+            Hundredths of a second
+
+        Returns
+        -------
+        :str
+            Date and time in ISO format, None if the date or time is not valid
+        """
+
+        try:
+            return datetime.datetime(year, month, day, hour, minute, second, hundredths * 10000).isoformat()
+        except ValueError:
+            return None
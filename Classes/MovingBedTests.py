@@ -1,4 +1,3 @@
-import copy
 import numpy as np
 from Classes.TransectData import adjusted_ensemble_duration
 from Classes.TransectData import TransectData
@@ -76,7 +75,13 @@ class MovingBedTests(object):
         Moving-bed speed using BT and GPS
     gps_flow_spd_mps: float
         Corrected flow speed using BT and GPS
+    results_cache: dict
+        Heading dependent results keyed by heading source, magvar, and heading offset
     """
+
+    # Results that depend on the heading and are restored from results_cache
+    heading_results = ('bt_mb_dir', 'flow_dir', 'gps_dist_us_m', 'gps_mb_dir', 'gps_mb_spd_mps',
+                       'gps_flow_spd_mps', 'gps_percent_mb')
     
     def __init__(self):
         """Initialize class and instance variables."""
@@ -113,8 +118,9 @@ class MovingBedTests(object):
         self.gps_mb_dir = np.nan
         self.gps_mb_spd_mps = np.nan
         self.gps_flow_spd_mps = np.nan
+        self.results_cache = {}
         
-    def populate_data(self, source, file=None, test_type=None):
+    def populate_data(self, source, file=None, test_type=None, cache=None):
         """Process and store moving-bed test data.
 
         Parameters
@@ -125,12 +131,14 @@ class MovingBedTests(object):
             Object of TransectData for TRDI and str of filename for SonTek
         test_type: str
             Type of moving-bed test (Loop or Stationary)
+        cache: ParsedDataCache
+            Object of ParsedDataCache used for SonTek data, None if not used
         """
 
         if source == 'TRDI':
             self.mb_trdi(file, test_type)
         else:
-            self.mb_sontek(file, test_type)
+            self.mb_sontek(file, test_type, cache=cache)
 
         self.process_mb_test(source)
 
@@ -155,6 +163,9 @@ class MovingBedTests(object):
         else:
             raise ValueError('Invalid moving-bed test identifier specified.')
 
+        # Results for previous headings are no longer valid
+        self.results_cache = {self.heading_state(): self.current_results()}
+
     @staticmethod
     def qrev_mat_in(meas_struct):
         """Processes the Matlab data structure to obtain a list of TransectData objects containing transect
@@ -306,7 +317,7 @@ class MovingBedTests(object):
         self.user_valid = True
         self.type = test_type
 
-    def mb_sontek(self, file_name, test_type):
+    def mb_sontek(self, file_name, test_type, cache=None):
         """Function to create object properties for SonTek moving-bed tests
 
         Parameters
@@ -314,11 +325,16 @@ class MovingBedTests(object):
         file_name: str
             Name of moving-bed test data file
         test_type: str
-            Type of moving-bed test."""
+            Type of moving-bed test.
+        cache: ParsedDataCache
+            Object of ParsedDataCache, None if not used"""
         self.type = test_type
 
         # Read Matlab file for moving-bed test
-        rsdata = MatSonTek(file_name)
+        if cache is None:
+            rsdata = MatSonTek(file_name)
+        else:
+            rsdata = cache.load(MatSonTek, file_name)
 
         # Create transect objects for each discharge transect
         self.transect = TransectData()
@@ -338,7 +354,9 @@ class MovingBedTests(object):
         # Assign data from transect to local variables
         self.transect.boat_interpolations(update=False, target='BT', method='Linear')
         self.transect.boat_interpolations(update=False, target='GPS', method='Linear')
-        trans_data = copy.deepcopy(self.transect)
+
+        # The transect is not changed, indexing with in_transect_idx creates copies of the arrays that are used
+        trans_data = self.transect
         in_transect_idx = trans_data.in_transect_idx
         n_ensembles = len(in_transect_idx)
         bt_valid = trans_data.boat_vel.bt_vel.valid_data[0, in_transect_idx]
@@ -593,8 +611,9 @@ class MovingBedTests(object):
         """Processed the stationary moving-bed tests.
         """
 
-        # Assign data from transect to local variables
-        trans_data = copy.deepcopy(self.transect)
+        # Assign data from transect to local variables. The transect is not changed, indexing with
+        # in_transect_idx creates copies of the arrays that are modified.
+        trans_data = self.transect
         in_transect_idx = trans_data.in_transect_idx
         bt_valid = trans_data.boat_vel.bt_vel.valid_data[0, in_transect_idx]
 
@@ -785,12 +804,19 @@ class MovingBedTests(object):
         """
 
         if self.transect.sensors.heading_deg.selected == 'internal':
-            magvar_change = magvar - old_magvar
-            self.bt_mb_dir = self.bt_mb_dir + magvar_change
-            self.flow_dir = self.flow_dir + magvar_change
+            selected, _, h_offset = self.heading_state()
+            self.results_cache.setdefault((selected, old_magvar, h_offset), self.current_results())
 
-            # Recompute moving-bed tests with GPS and set results using existing reference
-            self.compute_mb_gps()
+            if not self.restore_results():
+                magvar_change = magvar - old_magvar
+                self.bt_mb_dir = self.bt_mb_dir + magvar_change
+                self.flow_dir = self.flow_dir + magvar_change
+
+                # Recompute moving-bed tests with GPS
+                self.compute_mb_gps()
+                self.results_cache[self.heading_state()] = self.current_results()
+
+            # Set results using existing reference
             self.change_ref(self.ref)
 
     def h_offset_change(self, h_offset, old_h_offset):
@@ -805,14 +831,64 @@ class MovingBedTests(object):
         """
 
         if self.transect.sensors.heading_deg.selected == 'external':
-            h_offset_change = h_offset - old_h_offset
-            self.bt_mb_dir = self.bt_mb_dir + h_offset_change
-            self.flow_dir = self.flow_dir + h_offset_change
+            selected, magvar, _ = self.heading_state()
+            self.results_cache.setdefault((selected, magvar, old_h_offset), self.current_results())
 
-            # Recompute moving-bed tests with GPS and set results using existing reference
-            self.compute_mb_gps()
+            if not self.restore_results():
+                h_offset_change = h_offset - old_h_offset
+                self.bt_mb_dir = self.bt_mb_dir + h_offset_change
+                self.flow_dir = self.flow_dir + h_offset_change
+
+                # Recompute moving-bed tests with GPS
+                self.compute_mb_gps()
+                self.results_cache[self.heading_state()] = self.current_results()
+
+            # Set results using existing reference
             self.change_ref(self.ref)
 
+    def heading_state(self):
+        """Identifies the heading used to compute the heading dependent results.
+
+        Returns
+        -------
+        state: tuple
+            Heading source, magvar of the internal compass, and heading offset of the external compass
+        """
+
+        heading = self.transect.sensors.heading_deg
+        magvar = heading.internal.mag_var_deg if heading.internal is not None else None
+        h_offset = heading.external.align_correction_deg if heading.external is not None else None
+
+        return heading.selected, magvar, h_offset
+
+    def current_results(self):
+        """Collects the heading dependent results.
+
+        Returns
+        -------
+        results: dict
+            Dictionary of heading dependent results
+        """
+
+        return {name: getattr(self, name) for name in self.heading_results}
+
+    def restore_results(self):
+        """Restores the heading dependent results previously computed for the current heading.
+
+        Returns
+        -------
+        restored: bool
+            Indicates if results were available for the current heading
+        """
+
+        results = self.results_cache.get(self.heading_state())
+        if results is None:
+            return False
+
+        for name, value in results.items():
+            setattr(self, name, value)
+        return True
+
     def change_ref(self, ref):
         """Change moving-bed test fixed reference.
 
@@ -1,7 +1,9 @@
-import pandas as pd
+import os
 import copy
+from concurrent.futures import ProcessPoolExecutor
 from Classes.BoatStructure import *
 from Classes.QComp import QComp
+from Classes.SimulationTable import SimulationTable
 from scipy.stats import t
 # from profilehooks import profile
 from MiscLibs.common_functions import cosd, sind
@@ -91,41 +93,41 @@ class Oursin(object):
        List that contains the user specified uncertainty (68%) due to right discharge extrapolation for each transect
     cov_68: float
        Computed uncertainty (68%) due to coefficient of variation
-    sim_original: DataFrame
+    sim_original: SimulationTable
         Discharges (total, and subareas) computed for the processed discharge
-    sim_extrap_pp_16: DataFrame
+    sim_extrap_pp_16: SimulationTable
         Discharges (total, and subareas) computed using power fit with 1/6th exponent
-    sim_extrap_pp_min: DataFrame
+    sim_extrap_pp_min: SimulationTable
         Discharges (total, and subareas) computed using power fit with minimum exponent
-    sim_extrap_pp_max: DataFrame
+    sim_extrap_pp_max: SimulationTable
         Discharges (total, and subareas) computed using power fit with maximum exponent
-    sim_extrap_cns_16: DataFrame
+    sim_extrap_cns_16: SimulationTable
         Discharges (total, and subareas) computed using constant no slip with 1/6th exponent
-    sim_extrap_cns_min: DataFrame
+    sim_extrap_cns_min: SimulationTable
         Discharges (total, and subareas) computed using constant no slip with minimum exponent
-    sim_extrap_cns_max: DataFrame
+    sim_extrap_cns_max: SimulationTable
         Discharges (total, and subareas) computed using constant no slip with maximum exponent
-    sim_extrap_3pns_16: DataFrame
+    sim_extrap_3pns_16: SimulationTable
         Discharges (total, and subareas) computed using 3pt no slip with 1/6the exponent
-    sim_extrap_3pns_opt: DataFrame
+    sim_extrap_3pns_opt: SimulationTable
         Discharges (total, and subareas) computed using 3pt no slip with optimized exponent
-    sim_edge_min: DataFrame
+    sim_edge_min: SimulationTable
         Discharges (total, and subareas) computed using minimum edge q
-    sim_edge_max: DataFrame
+    sim_edge_max: SimulationTable
         Discharges (total, and subareas) computed using maximum edge q
-    sim_draft_min: DataFrame
+    sim_draft_min: SimulationTable
         Discharges (total, and subareas) computed using minimum draft
-    sim_draft_max: DataFrame
+    sim_draft_max: SimulationTable
         Discharges (total, and subareas) computed using maximum draft
-    sim_cells_trdi: DataFrame
+    sim_cells_trdi: SimulationTable
         Discharges (total, and subareas) computed using TRDI method for invalid cells
-    sim_cells_above: DataFrame
+    sim_cells_above: SimulationTable
         Discharges (total, and subareas) computed using cells above for invalid cells
-    sim_cells_below: DataFrame
+    sim_cells_below: SimulationTable
         Discharges (total, and subareas) computed using cells below for invalid cells
-    sim_cells_before: DataFrame
+    sim_cells_before: SimulationTable
         Discharges (total, and subareas) computed for using cells before for invalid cells
-    sim_cells_after: DataFrame
+    sim_cells_after: SimulationTable
         Discharges (total, and subareas) computed for using cells before for invalid cells
     nb_transects: float
         Number of transects used
@@ -239,6 +241,33 @@ class Oursin(object):
         u_ens, u_meas, u_top, u_bot, u_left, u_right, u_boat, u_depth, u_water, and total
     """
 
+    # Discharge components computed by each simulation
+    simulation_columns = {'sim_original': ['q_total', 'q_top', 'q_bot', 'q_left', 'q_right', 'q_middle'],
+                          'sim_extrap_pp_16': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_pp_opt': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_pp_min': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_pp_max': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_cns_16': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_cns_opt': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_cns_min': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_cns_max': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_3pns_16': ['q_total', 'q_top', 'q_bot'],
+                          'sim_extrap_3pns_opt': ['q_total', 'q_top', 'q_bot'],
+                          'sim_edge_min': ['q_total', 'q_left', 'q_right'],
+                          'sim_edge_max': ['q_total', 'q_left', 'q_right'],
+                          'sim_draft_min': ['q_total', 'q_top', 'q_left', 'q_right'],
+                          'sim_draft_max': ['q_total', 'q_top', 'q_left', 'q_right'],
+                          'sim_cells_trdi': ['q_total', 'q_middle'],
+                          'sim_cells_above': ['q_total', 'q_middle'],
+                          'sim_cells_below': ['q_total', 'q_middle'],
+                          'sim_cells_before': ['q_total', 'q_middle'],
+                          'sim_cells_after': ['q_total', 'q_middle'],
+                          'sim_shallow': ['q_total', 'q_middle'],
+                          'sim_depth_hold': ['q_total', 'q_middle'],
+                          'sim_depth_next': ['q_total', 'q_middle'],
+                          'sim_boat_hold': ['q_total', 'q_middle'],
+                          'sim_boat_next': ['q_total', 'q_middle']}
+
     def __init__(self):
         """Initialize class and instance variables."""
 
@@ -331,32 +360,13 @@ class Oursin(object):
         self.nb_transects = None
         self.checked_idx = []
 
-        # --- Store results of all simulations in DataFrame
-        self.sim_original = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot', 'q_left', 'q_right', 'q_middle'])
-        self.sim_extrap_pp_16 = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_pp_opt = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_pp_min = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_pp_max = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_cns_16 = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_cns_opt = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_cns_min = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_cns_max = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_3pns_16 = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_extrap_3pns_opt = pd.DataFrame(columns=['q_total', 'q_top', 'q_bot'])
-        self.sim_edge_min = pd.DataFrame(columns=['q_total', 'q_left', 'q_right'])
-        self.sim_edge_max = pd.DataFrame(columns=['q_total', 'q_left', 'q_right'])
-        self.sim_draft_min = pd.DataFrame(columns=['q_total', 'q_top', 'q_left', 'q_right'])
-        self.sim_draft_max = pd.DataFrame(columns=['q_total', 'q_top', 'q_left', 'q_right'])
-        self.sim_cells_trdi = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_cells_above = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_cells_below = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_cells_before = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_cells_after = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_shallow = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_depth_hold = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_depth_next = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_boat_hold = pd.DataFrame(columns=['q_total', 'q_middle'])
-        self.sim_boat_next = pd.DataFrame(columns=['q_total', 'q_middle'])
+        # --- Store results of all simulations
+        for name, columns in self.simulation_columns.items():
+            setattr(self, name, SimulationTable(columns))
+
+        # pandas is only imported for the reporting tables so the processes running the simulations do not load it
+        import pandas as pd
+
         self.u_contribution_meas = pd.DataFrame(columns=['boat', 'water', 'depth', 'dzi'])
         self.u = pd.DataFrame(columns=['u_syst', 'u_compass', 'u_movbed', 'u_ens', 'u_meas', 'u_top', 'u_bot',
                                        'u_left', 'u_right', 'u_boat', 'u_depth', 'u_water', 'u_cov', 'total',
@@ -395,7 +405,7 @@ class Oursin(object):
                                                               'u_depth', 'u_water', 'total', 'total_95'])
 
     # @profile
-    def compute_oursin(self, meas):
+    def compute_oursin(self, meas, n_workers=None):
         """Computes the uncertainty for the components of the discharge measurement
         using measurement data or user provided values.
 
@@ -403,6 +413,9 @@ class Oursin(object):
         ----------
         meas: Measurement
             Object of class Measurement
+        n_workers: int
+            Number of processes used to run the simulations of the transects. None or 1 runs the simulations
+            serially, 0 uses one process per cpu.
         """
 
         # Initialize lists
@@ -433,7 +446,7 @@ class Oursin(object):
         self.uncertainty_number_ensembles(meas)
 
         # 3. Run all the simulations to compute possible discharges
-        self.run_simulations(meas)
+        self.run_simulations(meas, n_workers=n_workers)
 
         # 4. Compute uncertainty terms based on simulations and assuming a rectangular law
         self.uncertainty_top_discharge()
@@ -532,6 +545,8 @@ class Oursin(object):
             u_ens, u_meas, u_top, u_bot, u_left, u_right, u_boat, u_depth, u_water, and total
         """
 
+        import pandas as pd
+
         # Create a Dataframe with all computed uncertainty for each checked transect
         u = pd.DataFrame(columns=['u_syst', 'u_compass', 'u_movbed', 'u_ens', 'u_meas', 'u_top', 'u_bot',
                                   'u_left', 'u_right', 'u_boat', 'u_depth', 'u_water', 'u_cov'])
@@ -638,19 +653,26 @@ class Oursin(object):
 
         self.nb_transects = len(self.checked_idx)
 
-    def run_simulations(self, meas):
+    def run_simulations(self, meas, n_workers=None):
         """Compute discharges (top, bot, right, left, total, middle)  based on possible scenarios
 
         Parameters
         ----------
         meas: Measurement
             Object of class Measurement
+        n_workers: int
+            Number of processes used to run the simulations of the transects. None or 1 runs the simulations
+            serially, 0 uses one process per cpu.
         """
 
         # If list have not be saved recompute q_sensitivity
         if not hasattr(meas.extrap_fit.q_sensitivity, 'q_pp_list'):
             meas.extrap_fit.q_sensitivity.populate_data(meas.transects, meas.extrap_fit.sel_fit)
 
+        # Preallocate results of the simulations for the checked transects
+        for name, columns in self.simulation_columns.items():
+            setattr(self, name, SimulationTable(columns, self.nb_transects))
+
         # Simulation original
         self.sim_orig(meas)
 
@@ -660,7 +682,7 @@ class Oursin(object):
         self.sim_extrap_pp_16['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_list
 
         # Simulations power / power optimized
-        self.sim_pp_min_max_opt(meas=meas)
+        exp_pp = self.sim_pp_min_max_opt(meas=meas)
 
         # Simulation cns default 1/6
         self.sim_extrap_cns_16['q_total'] = meas.extrap_fit.q_sensitivity.q_cns_list
@@ -668,7 +690,7 @@ class Oursin(object):
         self.sim_extrap_cns_16['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_cns_list
 
         # Simulation cns optimized
-        self.sim_cns_min_max_opt(meas=meas)
+        exp_ns = self.sim_cns_min_max_opt(meas=meas)
 
         # Simulation 3pt no slip default 1/6
         self.sim_extrap_3pns_16['q_total'] = meas.extrap_fit.q_sensitivity.q_3p_ns_list
@@ -680,24 +702,13 @@ class Oursin(object):
         self.sim_extrap_3pns_opt['q_top'] = meas.extrap_fit.q_sensitivity.q_top_3p_ns_opt_list
         self.sim_extrap_3pns_opt['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_3p_ns_opt_list
 
-        # Simulations edge min and max
-        self.sim_edge_min_max(meas=meas)
-
-        # Simulation draft min and max
-        self.sim_draft_max_min(meas=meas)
-
-        # Simulation of invalid cells and ensembles
-        self.sim_invalid_cells(meas=meas)
+        # Simulations of each transect: extrapolation min and max, edge min and max, draft min and max,
+        # invalid cells and ensembles, invalid boat velocity, and invalid depths
+        self.sim_transects(meas=meas, exp_pp=exp_pp, exp_ns=exp_ns, n_workers=n_workers)
 
         # Simulation of shallow no cells
         self.sim_shallow_ens(meas=meas)
 
-        # Simulation of invalid boat velocity
-        self.sim_invalid_boat_velocity(meas=meas)
-
-        # Simulation of invalid depths
-        self.sim_invalid_depth(meas=meas)
-
     def uncertainty_measured_discharge(self, meas):
         """Compute the uncertainty related to the measured area.
 
@@ -707,7 +718,7 @@ class Oursin(object):
             Object of class Measurement
         """
 
-        self.u_contribution_meas = pd.DataFrame(columns=['boat', 'water', 'depths', 'dzi'])
+        u_contribution_meas = []
 
         # Set uncertainty of cell size
         if self.user_advanced_settings['dzi_prct_user'] is not None:
@@ -769,10 +780,11 @@ class Oursin(object):
             u_contrib_dzi = (np.nan_to_num(q_2_ens * ((1 / n_cell_ens) * (u_dzi ** 2))).sum()
                              / q_2_tran) / u_2_prct_meas
 
-            self.u_contribution_meas.loc[len(self.u_contribution_meas)] = [u_contrib_boat,
-                                                                           u_contrib_water,
-                                                                           u_contrib_depth,
-                                                                           u_contrib_dzi]
+            u_contribution_meas.append([u_contrib_boat, u_contrib_water, u_contrib_depth, u_contrib_dzi])
+
+        import pandas as pd
+
+        self.u_contribution_meas = pd.DataFrame(u_contribution_meas, columns=['boat', 'water', 'depths', 'dzi'])
 
         # Apply user specified uncertainty
         if self.user_specified_u['u_meas_mean_user'] is not None:
@@ -949,7 +961,7 @@ class Oursin(object):
         """Computes the uncertianty of the left edge discharge using simulations and the rectangular law.
         """
 
-        self.u_left_list = Oursin.apply_u_rect(list_sims=[self.sim_original['q_left'],
+        self.u_left_list = Oursin.apply_u_rect(list_sims=[self.sim_original,
                                                           self.sim_edge_min,
                                                           self.sim_edge_max,
                                                           self.sim_draft_min,
@@ -966,7 +978,7 @@ class Oursin(object):
         """Computes the uncertainty of the right edge discharge using simulations and the rectangular law.
         """
 
-        self.u_right_list = Oursin.apply_u_rect(list_sims=[self.sim_original['q_right'],
+        self.u_right_list = Oursin.apply_u_rect(list_sims=[self.sim_original,
                                                            self.sim_edge_min,
                                                            self.sim_edge_max,
                                                            self.sim_draft_min,
@@ -1069,31 +1081,35 @@ class Oursin(object):
         # self.u_cov_68_user_value = self.cov_68
 
     def sim_orig(self, meas):
-        """Stores original measurement results in a data frame
+        """Stores original measurement results
 
         Parameters
         ----------
         meas: MeasurementData
             Object of MeasurementData
         """
-        transect_q = dict()
-        for trans_id in self.checked_idx:
-            transect_q['q_total'] = meas.discharge[trans_id].total
-            transect_q['q_top'] = meas.discharge[trans_id].top
-            transect_q['q_bot'] = meas.discharge[trans_id].bottom
-            transect_q['q_right'] = meas.discharge[trans_id].right
-            transect_q['q_left'] = meas.discharge[trans_id].left
-            transect_q['q_middle'] = meas.discharge[trans_id].middle
-            self.sim_original = self.sim_original.append(transect_q, ignore_index=True, sort=False)
+
+        for row, trans_id in enumerate(self.checked_idx):
+            self.sim_original.set_row(row, [meas.discharge[trans_id].total,
+                                            meas.discharge[trans_id].top,
+                                            meas.discharge[trans_id].bottom,
+                                            meas.discharge[trans_id].left,
+                                            meas.discharge[trans_id].right,
+                                            meas.discharge[trans_id].middle])
 
     def sim_cns_min_max_opt(self, meas):
-        """Computes simulations resulting in the the min and max discharges for a constant no slip extrapolation
-        fit.
+        """Stores the discharges for the optimized constant no slip extrapolation fit and determines the min and max
+        no slip exponents. The discharges for the min and max exponents are computed by transect_simulations.
 
         Parameters
         ----------
         meas: MeasurementData
             Object of MeasurementData
+
+        Returns
+        -------
+        exp_ns: list
+            Min and max no slip exponents, None if the simulations are not required
         """
 
         # Compute min-max no slip exponent
@@ -1117,34 +1133,23 @@ class Oursin(object):
             self.sim_extrap_cns_max['q_total'] = meas.extrap_fit.q_sensitivity.q_cns_opt_list
             self.sim_extrap_cns_max['q_top'] = meas.extrap_fit.q_sensitivity.q_top_cns_opt_list
             self.sim_extrap_cns_max['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_cns_opt_list
+            return None
         else:
-            # Compute q for min and max values
-            q = QComp()
-            self.sim_extrap_cns_min = pd.DataFrame(columns=self.sim_extrap_cns_min.columns)
-            self.sim_extrap_cns_max = pd.DataFrame(columns=self.sim_extrap_cns_max.columns)
-
-            for trans_id in self.checked_idx:
-                # Compute min values
-                q.populate_data(data_in=meas.transects[trans_id],
-                                top_method='Constant',
-                                bot_method='No Slip',
-                                exponent=self.exp_ns_min)
-                self.sim_extrap_cns_min.loc[len(self.sim_extrap_cns_min)] = [q.total, q.top, q.bottom]
-                # Compute max values
-                q.populate_data(data_in=meas.transects[trans_id],
-                                top_method='Constant',
-                                bot_method='No Slip',
-                                exponent=self.exp_ns_max)
-                self.sim_extrap_cns_max.loc[len(self.sim_extrap_cns_max)] = [q.total, q.top, q.bottom]
+            return [self.exp_ns_min, self.exp_ns_max]
 
     def sim_pp_min_max_opt(self, meas):
-        """Computes simulations resulting in the the min and max discharges for a power power extrapolation
-        fit.
+        """Stores the discharges for the optimized power power extrapolation fit and determines the min and max
+        power exponents. The discharges for the min and max exponents are computed by transect_simulations.
 
         Parameters
         ----------
         meas: MeasurementData
             Object of MeasurementData
+
+        Returns
+        -------
+        exp_pp: list
+            Min and max power exponents, None if the simulations are not required
         """
 
         # A power fit is not applicable to bi-directional flow
@@ -1153,193 +1158,272 @@ class Oursin(object):
             self.sim_extrap_pp_min = self.sim_original[['q_total', 'q_top', 'q_bot']]
             self.sim_extrap_pp_max = self.sim_original[['q_total', 'q_top', 'q_bot']]
             self.sim_extrap_pp_opt = self.sim_original[['q_total', 'q_top', 'q_bot']]
+            return None
 
+        # Compute min-max power exponent
+        skip_pp_min_max, self.exp_pp_max, self.exp_pp_min = \
+            self.compute_pp_max_min(meas=meas,
+                                    exp_95ic_min=self.exp_95ic_min,
+                                    exp_95ic_max=self.exp_95ic_max,
+                                    pp_exp=self.pp_exp,
+                                    exp_pp_min_user=self.user_advanced_settings['exp_pp_min_user'],
+                                    exp_pp_max_user=self.user_advanced_settings['exp_pp_max_user'])
+
+        # Optimized
+        self.sim_extrap_pp_opt['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
+        self.sim_extrap_pp_opt['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
+        self.sim_extrap_pp_opt['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
+
+        # Max min
+        if skip_pp_min_max:
+            self.sim_extrap_pp_min['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
+            self.sim_extrap_pp_min['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
+            self.sim_extrap_pp_min['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
+            self.sim_extrap_pp_max['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
+            self.sim_extrap_pp_max['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
+            self.sim_extrap_pp_max['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
+            return None
         else:
-            # Compute min-max power exponent
-            skip_pp_min_max, self.exp_pp_max, self.exp_pp_min = \
-                self.compute_pp_max_min(meas=meas,
-                                        exp_95ic_min=self.exp_95ic_min,
-                                        exp_95ic_max=self.exp_95ic_max,
-                                        pp_exp=self.pp_exp,
-                                        exp_pp_min_user=self.user_advanced_settings['exp_pp_min_user'],
-                                        exp_pp_max_user=self.user_advanced_settings['exp_pp_max_user'])
-
-            # Optimized
-            self.sim_extrap_pp_opt['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
-            self.sim_extrap_pp_opt['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
-            self.sim_extrap_pp_opt['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
-
-            # Max min
-            if skip_pp_min_max:
-                self.sim_extrap_pp_min['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
-                self.sim_extrap_pp_min['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
-                self.sim_extrap_pp_min['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
-                self.sim_extrap_pp_max['q_total'] = meas.extrap_fit.q_sensitivity.q_pp_opt_list
-                self.sim_extrap_pp_max['q_top'] = meas.extrap_fit.q_sensitivity.q_top_pp_opt_list
-                self.sim_extrap_pp_max['q_bot'] = meas.extrap_fit.q_sensitivity.q_bot_pp_opt_list
+            return [self.exp_pp_min, self.exp_pp_max]
+
+    def sim_transects(self, meas, exp_pp, exp_ns, n_workers=None):
+        """Runs the simulations that recompute the discharge of each checked transect and stores the results in
+        the order of the checked transects.
+
+        Parameters
+        ----------
+        meas: MeasurementData
+            Object of MeasurementData
+        exp_pp: list
+            Min and max power exponents, None if not simulated
+        exp_ns: list
+            Min and max no slip exponents, None if not simulated
+        n_workers: int
+            Number of processes. None or 1 runs the simulations serially, 0 uses one process per cpu.
+        """
+
+        # Only the moving-bed tests used for correction affect the discharge
+        mb_tests = [test for test in meas.mb_tests if test.use_2_correct]
+        settings = {'exp_pp': exp_pp,
+                    'exp_ns': exp_ns,
+                    'user_advanced_settings': self.user_advanced_settings,
+                    'default_advanced_settings': self.default_advanced_settings}
+
+        args = [(meas.transects[trans_id], meas.discharge[trans_id], mb_tests, settings)
+                for trans_id in self.checked_idx]
+        results = run_transect_simulations(args, n_workers=n_workers)
+
+        # Store results
+        for name in results[0] if len(results) > 0 else []:
+            if name.startswith('sim_'):
+                for row, result in enumerate(results):
+                    getattr(self, name).set_row(row, result[name])
             else:
-                q = QComp()
-                self.sim_extrap_pp_min = pd.DataFrame(columns=self.sim_extrap_pp_min.columns)
-                self.sim_extrap_pp_max = pd.DataFrame(columns=self.sim_extrap_pp_max.columns)
-
-                for trans_id in self.checked_idx:
-                    q.populate_data(data_in=meas.transects[trans_id],
-                                    top_method='Power',
-                                    bot_method='Power',
-                                    exponent=self.exp_pp_min)
-                    self.sim_extrap_pp_min.loc[len(self.sim_extrap_pp_min)] = [q.total, q.top, q.bottom]
-
-                    q.populate_data(data_in=meas.transects[trans_id],
-                                    top_method='Power',
-                                    bot_method='Power',
-                                    exponent=self.exp_pp_max)
-                    self.sim_extrap_pp_max.loc[len(self.sim_extrap_pp_max)] = [q.total, q.top, q.bottom]
-
-    def sim_edge_min_max(self, meas):
+                setattr(self, name, [result[name] for result in results])
+
+    @staticmethod
+    def transect_simulations(transect, discharge, mb_tests, settings):
+        """Computes the simulations that recompute the discharge of a transect. The simulations of each transect
+        are independent so they can be run in separate processes.
+
+        Parameters
+        ----------
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+        settings: dict
+            Dictionary of min and max extrapolation exponents (exp_pp, exp_ns) and advanced settings
+            (user_advanced_settings, default_advanced_settings)
+
+        Returns
+        -------
+        results: dict
+            Dictionary of the results of each simulation using the name of the Oursin attribute
+        """
+
+        results = dict()
+
+        if settings['exp_pp'] is not None:
+            results['sim_extrap_pp_min'], results['sim_extrap_pp_max'] = \
+                Oursin.sim_extrap_min_max(transect, 'Power', 'Power', settings['exp_pp'])
+
+        if settings['exp_ns'] is not None:
+            results['sim_extrap_cns_min'], results['sim_extrap_cns_max'] = \
+                Oursin.sim_extrap_min_max(transect, 'Constant', 'No Slip', settings['exp_ns'])
+
+        results.update(Oursin.sim_edge_min_max(transect, discharge, mb_tests,
+                                               user_settings=settings['user_advanced_settings'],
+                                               default_settings=settings['default_advanced_settings']))
+        results.update(Oursin.sim_draft_max_min(transect, discharge, mb_tests,
+                                                draft_error_user=settings['user_advanced_settings']
+                                                ['draft_error_user']))
+        results.update(Oursin.sim_invalid_cells(transect, discharge, mb_tests))
+        results.update(Oursin.sim_invalid_boat_velocity(transect, discharge, mb_tests))
+        results.update(Oursin.sim_invalid_depth(transect, discharge, mb_tests))
+
+        return results
+
+    @staticmethod
+    def sim_extrap_min_max(transect, top_method, bot_method, exponents):
+        """Computes simulations for the min and max extrapolation exponents.
+
+        Parameters
+        ----------
+        transect: TransectData
+            Object of TransectData
+        top_method: str
+            Top extrapolation method
+        bot_method: str
+            Bottom extrapolation method
+        exponents: list
+            Min and max exponents
+
+        Returns
+        -------
+        sim: list
+            Total, top, and bottom discharges for each exponent
+        """
+
+        total, top, bottom = QComp.extrap_combinations(data_in=transect,
+                                                       combinations=[(top_method, bot_method, exponent)
+                                                                     for exponent in exponents])
+        sim = [[total[n], top[n], bottom[n]] for n in range(len(exponents))]
+
+        return sim
+
+    @staticmethod
+    def sim_edge_min_max(transect, discharge, mb_tests, user_settings, default_settings):
         """Computes simulations for the maximum and minimum edge discharges.
 
         Parameters
         ----------
-        meas: MeasurementData
-            Object of measurement data
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+        user_settings: dict
+            Dictionary of user specified advanced settings
+        default_settings: dict
+            Dictionary of default values for advanced settings
+
+        Returns
+        -------
+        results: dict
+            Simulated discharges and edge distances
         """
 
-        # Clear variables
-        self.d_right_error_min = []
-        self.d_left_error_min = []
-        self.d_right_error_max = []
-        self.d_left_error_max = []
-        self.sim_edge_min = pd.DataFrame(columns=self.sim_edge_min.columns)
-        self.sim_edge_max = pd.DataFrame(columns=self.sim_edge_max.columns)
+        # Compute max and min edge distances
+        max_left_dist, max_right_dist, min_left_dist, min_right_dist = \
+            Oursin.compute_edge_dist_max_min(transect=transect,
+                                             user_settings=user_settings,
+                                             default_settings=default_settings)
+        results = {'d_right_error_min': min_right_dist,
+                   'd_left_error_min': min_left_dist,
+                   'd_right_error_max': max_right_dist,
+                   'd_left_error_max': max_left_dist}
+
+        # Compute the edge discharges for the minimum (triangular) and maximum (rectangular) edges. Only the edges
+        # change so the discharge of the remainder of the transect, including any moving-bed correction, is reused.
+        edge_types = ['Triangular', 'Rectangular']
+        left = QComp.edge_discharge_candidates('left', transect, distances=[min_left_dist, max_left_dist],
+                                               edge_types=edge_types)
+        right = QComp.edge_discharge_candidates('right', transect, distances=[min_right_dist, max_right_dist],
+                                                edge_types=edge_types)
+        if discharge.correction_factor is None or discharge.correction_factor == 1:
+            total = left + right + discharge.middle + discharge.bottom + discharge.top
+        else:
+            total = left + right + (discharge.middle + discharge.bottom + discharge.top) * discharge.correction_factor
 
-        # Create measurement copy to allow changes without affecting original
-        meas_temp = copy.deepcopy(meas)
+        results['sim_edge_min'] = [total[0], left[0], right[0]]
+        results['sim_edge_max'] = [total[1], left[1], right[1]]
 
-        # Process each checked transect
-        for trans_id in self.checked_idx:
-            # Compute max and min edge distances
-            max_left_dist, max_right_dist, min_left_dist, min_right_dist = \
-                self.compute_edge_dist_max_min(transect=meas.transects[trans_id],
-                                               user_settings=self.user_advanced_settings,
-                                               default_settings=self.default_advanced_settings)
-
-            # Compute edge minimum
-            self.d_right_error_min.append(min_right_dist)
-            self.d_left_error_min.append(min_left_dist)
-            meas_temp.transects[trans_id].edges.left.distance_m = min_left_dist
-            meas_temp.transects[trans_id].edges.right.distance_m = min_right_dist
-            meas_temp.transects[trans_id].edges.left.type = 'Triangular'
-            meas_temp.transects[trans_id].edges.right.type = 'Triangular'
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_edge_min.loc[len(self.sim_edge_min)] = [meas_temp.discharge[trans_id].total,
-                                                             meas_temp.discharge[trans_id].left,
-                                                             meas_temp.discharge[trans_id].right]
-
-            # Compute edge maximum
-            self.d_right_error_max.append(max_right_dist)
-            self.d_left_error_max.append(max_left_dist)
-            meas_temp.transects[trans_id].edges.left.distance_m = max_left_dist
-            meas_temp.transects[trans_id].edges.right.distance_m = max_right_dist
-            meas_temp.transects[trans_id].edges.left.type = 'Rectangular'
-            meas_temp.transects[trans_id].edges.right.type = 'Rectangular'
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_edge_max.loc[len(self.sim_edge_max)] = [meas_temp.discharge[trans_id].total,
-                                                             meas_temp.discharge[trans_id].left,
-                                                             meas_temp.discharge[trans_id].right]
-
-    def sim_draft_max_min(self, meas):
+        return results
+
+    @staticmethod
+    def sim_draft_max_min(transect, discharge, mb_tests, draft_error_user=None):
         """Compute the simulations for the max and min draft errror.
 
         Parameters
         ----------
-        meas: MeasurementData
-            Object of MeasurementData
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+        draft_error_user: float
+            User specified draft error in m
+
+        Returns
+        -------
+        results: dict
+            Simulated discharges and draft error
         """
 
-        # Reset variables
-        self.draft_error_list = []
-        self.sim_draft_min = pd.DataFrame(columns=self.sim_draft_min.columns)
-        self.sim_draft_max = pd.DataFrame(columns=self.sim_draft_max.columns)
+        # Create transect copy to allow changes to the depths without affecting original
+        transect_sim = transect.scenario(['depths.vb_depths', 'depths.bt_depths'])
+        q = copy.copy(discharge)
 
-        # Create copy of meas to avoid changing original
-        meas_temp = copy.deepcopy(meas)
+        # Compute max and min draft
+        draft_max, draft_min, draft_error = \
+            Oursin.compute_draft_max_min(transect=transect, draft_error_user=draft_error_user)
+        results = {'draft_error_list': draft_error}
 
-        for trans_id in self.checked_idx:
-            # Compute max and min draft
-            draft_max, draft_min, draft_error = \
-                self.compute_draft_max_min(transect=meas.transects[trans_id],
-                                           draft_error_user=self.user_advanced_settings['draft_error_user'])
-            self.draft_error_list.append(draft_error)
-
-            # Compute discharge for draft min
-            meas_temp.transects[trans_id].change_draft(draft_min)
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_draft_min.loc[len(self.sim_draft_min)] = [meas_temp.discharge[trans_id].total,
-                                                               meas_temp.discharge[trans_id].top,
-                                                               meas_temp.discharge[trans_id].left,
-                                                               meas_temp.discharge[trans_id].right]
-            # Compute discharge for draft max
-            meas_temp.transects[trans_id].change_draft(draft_max)
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_draft_max.loc[len(self.sim_draft_max)] = [meas_temp.discharge[trans_id].total,
-                                                               meas_temp.discharge[trans_id].top,
-                                                               meas_temp.discharge[trans_id].left,
-                                                               meas_temp.discharge[trans_id].right]
-
-    def sim_invalid_cells(self, meas):
+        # Compute discharge for draft min
+        transect_sim.change_draft(draft_min)
+        q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+        results['sim_draft_min'] = [q.total, q.top, q.left, q.right]
+
+        # Compute discharge for draft max
+        transect_sim.change_draft(draft_max)
+        q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+        results['sim_draft_max'] = [q.total, q.top, q.left, q.right]
+
+        return results
+
+    @staticmethod
+    def sim_invalid_cells(transect, discharge, mb_tests):
         """Computes simulations using different methods to interpolate for invalid cells and ensembles.
 
         Parameters
         ----------
-        meas: MeasurementData
-            Object of MeasurementData
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+
+        Returns
+        -------
+        results: dict
+            Simulated discharges
         """
 
-        # Reset data frames
-        self.sim_cells_trdi = pd.DataFrame(columns=self.sim_cells_trdi.columns)
-        self.sim_cells_above = pd.DataFrame(columns=self.sim_cells_above.columns)
-        self.sim_cells_below = pd.DataFrame(columns=self.sim_cells_below.columns)
-        self.sim_cells_before = pd.DataFrame(columns=self.sim_cells_before.columns)
-        self.sim_cells_after = pd.DataFrame(columns=self.sim_cells_after.columns)
+        # Create transect copy to allow changes to the processed water velocities without affecting original
+        transect_sim = transect.scenario(['w_vel.u_processed_mps', 'w_vel.v_processed_mps'])
+        q = copy.copy(discharge)
+        results = dict()
 
-        # Simulations for invalid cells and ensembles
-        meas_temp = copy.deepcopy(meas)
-        for trans_id in self.checked_idx:
-            # TRDI method
-            meas_temp.transects[trans_id].w_vel.interpolate_cells_trdi(meas_temp.transects[trans_id])
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_cells_trdi.loc[len(self.sim_cells_trdi)] = [meas_temp.discharge[trans_id].total,
-                                                                 meas_temp.discharge[trans_id].middle]
-
-            # Above only
-            meas_temp.transects[trans_id].w_vel.interpolate_abba(meas_temp.transects[trans_id], search_loc=['above'])
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_cells_above.loc[len(self.sim_cells_above)] = [meas_temp.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
-            # Below only
-            meas_temp.transects[trans_id].w_vel.interpolate_abba(meas_temp.transects[trans_id], search_loc=['below'])
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_cells_below.loc[len(self.sim_cells_below)] = [meas_temp.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
-            # Before only
-            meas_temp.transects[trans_id].w_vel.interpolate_abba(meas_temp.transects[trans_id], search_loc=['before'])
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_cells_before.loc[len(self.sim_cells_before)] = [meas_temp.discharge[trans_id].total,
-                                                                     meas_temp.discharge[trans_id].middle]
-            # After only
-            meas_temp.transects[trans_id].w_vel.interpolate_abba(meas_temp.transects[trans_id], search_loc=['after'])
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_cells_after.loc[len(self.sim_cells_after)] = [meas_temp.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
+        # TRDI method
+        transect_sim.w_vel.interpolate_cells_trdi(transect_sim)
+        transect_sim.processed_data_changed()
+        q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+        results['sim_cells_trdi'] = [q.total, q.middle]
+
+        # Above, below, before, and after only
+        for search_loc in ['above', 'below', 'before', 'after']:
+            transect_sim.w_vel.interpolate_abba(transect_sim, search_loc=[search_loc])
+            transect_sim.processed_data_changed()
+            q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+            results['sim_cells_' + search_loc] = [q.total, q.middle]
+
+        return results
 
     def sim_shallow_ens(self, meas):
         """Computes simulations assuming no interpolation of discharge for ensembles where depths are too shallow
@@ -1351,84 +1435,99 @@ class Oursin(object):
             Object of MeasurementData
         """
 
-        # Reset data frame
-        self.sim_shallow = pd.DataFrame(columns=self.sim_shallow.columns)
-
-        for trans_id in self.checked_idx:
+        for row, trans_id in enumerate(self.checked_idx):
             shallow_estimate = np.nansum(meas.discharge[trans_id].middle_ens) \
                                - np.nansum(np.nansum(meas.discharge[trans_id].middle_cells))
             if np.abs(shallow_estimate) > 0:
-                self.sim_shallow.loc[len(self.sim_shallow)] = [meas.discharge[trans_id].total - shallow_estimate,
-                                                               meas.discharge[trans_id].middle - shallow_estimate]
+                self.sim_shallow.set_row(row, [meas.discharge[trans_id].total - shallow_estimate,
+                                               meas.discharge[trans_id].middle - shallow_estimate])
             else:
-                self.sim_shallow.loc[len(self.sim_shallow)] = [meas.discharge[trans_id].total,
-                                                               meas.discharge[trans_id].middle]
+                self.sim_shallow.set_row(row, [meas.discharge[trans_id].total,
+                                               meas.discharge[trans_id].middle])
 
-    def sim_invalid_depth(self, meas):
+    @staticmethod
+    def sim_invalid_depth(transect, discharge, mb_tests):
         """Computes simulations using different methods to interpolate for invalid depths.
 
         Parameters
         ----------
-        meas: MeasurementData
-           Object of MeasurementData
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+
+        Returns
+        -------
+        results: dict
+            Simulated discharges
         """
 
-        # Reset dataframes
-        self.sim_depth_hold = pd.DataFrame(columns=self.sim_depth_hold.columns)
-        self.sim_depth_next = pd.DataFrame(columns=self.sim_depth_next.columns)
+        # Create transect copy to allow changes to the processed depths without affecting original
+        selected = transect.depths.selected
+        transect_sim = transect.scenario(['depths.' + selected + '.depth_processed_m'])
+        q = copy.copy(discharge)
+        depths = getattr(transect_sim.depths, selected)
+        results = dict()
 
-        # Simulations for invalid depths
-        meas_temp = copy.deepcopy(meas)
-        for trans_id in self.checked_idx:
-            depths = getattr(meas_temp.transects[trans_id].depths, meas_temp.transects[trans_id].depths.selected)
-            # Hold last
-            depths.interpolate_hold_last()
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_depth_hold.loc[len(self.sim_depth_hold)] = [meas_temp.discharge[trans_id].total,
-                                                                 meas_temp.discharge[trans_id].middle]
-            # Fill with next
-            depths.interpolate_next()
-            meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                        moving_bed_data=meas_temp.mb_tests)
-            self.sim_depth_next.loc[len(self.sim_depth_next)] = [meas_temp.discharge[trans_id].total,
-                                                                 meas_temp.discharge[trans_id].middle]
+        # Hold last
+        depths.interpolate_hold_last()
+        transect_sim.processed_data_changed()
+        q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+        results['sim_depth_hold'] = [q.total, q.middle]
+
+        # Fill with next
+        depths.interpolate_next()
+        transect_sim.processed_data_changed()
+        q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+        results['sim_depth_next'] = [q.total, q.middle]
+
+        return results
 
-    def sim_invalid_boat_velocity(self, meas):
+    @staticmethod
+    def sim_invalid_boat_velocity(transect, discharge, mb_tests):
         """Computes simulations using different methods to interpolate for invalid boat velocity.
 
         Parameters
         ----------
-        meas: MeasurementData
-           Object of MeasurementData
+        transect: TransectData
+            Object of TransectData
+        discharge: QComp
+            Object of QComp with the discharge of the transect
+        mb_tests: list
+            List of MovingBedTests objects used to correct the discharge
+
+        Returns
+        -------
+        results: dict
+            Simulated discharges
         """
 
-        # Reset dataframes
-        self.sim_boat_hold = pd.DataFrame(columns=self.sim_boat_hold.columns)
-        self.sim_boat_next = pd.DataFrame(columns=self.sim_boat_next.columns)
+        # Create transect copy to allow changes to the processed boat velocities without affecting original
+        selected = transect.boat_vel.selected
+        transect_sim = transect.scenario(['boat_vel.' + selected])
+        q = copy.copy(discharge)
+        results = dict()
 
-        # Simulations for invalid boat velocity
-        meas_temp = copy.deepcopy(meas)
-        for trans_id in self.checked_idx:
+        boat_data = getattr(transect_sim.boat_vel, selected)
+        if boat_data is not None:
             # Hold last
-            boat_data = getattr(meas_temp.transects[trans_id].boat_vel, meas_temp.transects[trans_id].boat_vel.selected)
-            if boat_data is not None:
-                boat_data.interpolate_hold_last()
-                meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                            moving_bed_data=meas_temp.mb_tests)
-                self.sim_boat_hold.loc[len(self.sim_boat_hold)] = [meas_temp.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
-                # Fill with next
-                boat_data.interpolate_next()
-                meas_temp.discharge[trans_id].populate_data(data_in=meas_temp.transects[trans_id],
-                                                            moving_bed_data=meas_temp.mb_tests)
-                self.sim_boat_next.loc[len(self.sim_boat_next)] = [meas_temp.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
-            else:
-                self.sim_boat_next.loc[len(self.sim_boat_next)] = [meas.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
-                self.sim_boat_hold.loc[len(self.sim_boat_hold)] = [meas.discharge[trans_id].total,
-                                                                   meas_temp.discharge[trans_id].middle]
+            boat_data.interpolate_hold_last()
+            transect_sim.processed_data_changed()
+            q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+            results['sim_boat_hold'] = [q.total, q.middle]
+
+            # Fill with next
+            boat_data.interpolate_next()
+            transect_sim.processed_data_changed()
+            q.populate_data(data_in=transect_sim, moving_bed_data=mb_tests)
+            results['sim_boat_next'] = [q.total, q.middle]
+        else:
+            results['sim_boat_hold'] = [discharge.total, discharge.middle]
+            results['sim_boat_next'] = [discharge.total, discharge.middle]
+
+        return results
 
     @staticmethod
     def compute_draft_max_min(transect, draft_error_user=None):
@@ -1744,21 +1843,50 @@ class Oursin(object):
         Parameters
         ----------
         list_sims: list
-            List of simulation data frames to be used in the computation
+            List of simulation tables to be used in the computation
         col_name: str
-            Name of column in the data frames to be used in the computation
+            Name of column in the simulation tables to be used in the computation
 
         Returns
         -------
-        u_rect: float
-            Result of rectangular law
+        u_rect: np.array(float)
+            Result of rectangular law for each transect
         """
 
-        # Combine data frames
-        vertical_stack = pd.concat(list_sims, axis=0, sort=True)
+        # Combine simulations, simulations that do not compute the column are nan and are ignored
+        vertical_stack = np.vstack([sim[col_name] for sim in list_sims])
 
         # Apply rectangular law
-        u_rect = (vertical_stack.groupby(vertical_stack.index)[col_name].max()
-                  - vertical_stack.groupby(vertical_stack.index)[col_name].min()) / (2 * (3 ** 0.5))
+        u_rect = (np.fmax.reduce(vertical_stack, axis=0)
+                  - np.fmin.reduce(vertical_stack, axis=0)) / (2 * (3 ** 0.5))
 
         return u_rect
+
+
+def run_transect_simulations(args, n_workers=None):
+    """Applies Oursin.transect_simulations to each set of arguments either serially or using a pool of processes.
+    The order of the transects is preserved.
+
+    Parameters
+    ----------
+    args: list
+        List of tuples with the arguments for each transect
+    n_workers: int
+        Number of processes. None or 1 runs the simulations serially, 0 uses one process per cpu.
+
+    Returns
+    -------
+    results: list
+        List of dictionaries with the results of the simulations for each transect
+    """
+
+    if n_workers == 0:
+        n_workers = os.cpu_count()
+
+    if n_workers is None or n_workers <= 1 or len(args) <= 1:
+        results = [Oursin.transect_simulations(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(args))) as executor:
+            results = list(executor.map(Oursin.transect_simulations, *zip(*args)))
+
+    return results
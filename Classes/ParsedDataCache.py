@@ -0,0 +1,240 @@
+import os
+import pickle
+import hashlib
+import tempfile
+import numpy as np
+
+
+class ParsedDataCache(object):
+    """Optional on disk cache of the data decoded from raw data files by Pd0TRDI, RtbRowe, and MatSonTek.
+
+    The decoded reader object is stored in a .npz file. The numpy arrays of the reader are stored uncompressed as
+    separate members of the .npz file and the remaining structure of the object is stored as a pickle that references
+    those arrays. Each cache file is keyed by the full path, size, modification time, and content hash of the raw
+    data file, the reader class and its reader_version, and any arguments passed to the reader, so a change to any of
+    these causes the file to be parsed again. The cache is limited in size by deleting the least recently used files.
+
+    Note
+    ----
+    Cache files contain pickled data and should only be loaded from a folder controlled by the user.
+
+    Attributes
+    ----------
+    cache_dir: str
+        Folder used to store the cache files.
+    max_size: float
+        Maximum size of the cache in bytes.
+    """
+
+    # Change if the layout of the cache files changes
+    cache_version = 1
+
+    def __init__(self, cache_dir=None, max_size_mb=2048):
+        """Initialize cache.
+
+        Parameters
+        ----------
+        cache_dir: str
+            Folder used to store the cache files, if None a folder in the temporary directory is used.
+        max_size_mb: float
+            Maximum size of the cache in megabytes.
+        """
+
+        if cache_dir is None:
+            cache_dir = os.path.join(tempfile.gettempdir(), 'QRevCache')
+        self.cache_dir = cache_dir
+        self.max_size = max_size_mb * 2**20
+
+    def load(self, reader, file_name, **kwargs):
+        """Returns the reader object for the file from the cache or, if it is not cached, reads the file with the
+        reader and stores the result in the cache.
+
+        Parameters
+        ----------
+        reader: class
+            Reader class (Pd0TRDI, RtbRowe, MatSonTek)
+        file_name: str
+            Full name of raw data file
+        kwargs: dict
+            Additional keyword arguments passed to the reader
+
+        Returns
+        -------
+        data: object
+            Object of reader
+        """
+
+        cache_file = self.cache_file(reader, file_name, kwargs)
+        data = self.read(cache_file)
+        if data is None:
+            data = reader(file_name, **kwargs)
+            try:
+                self.write(data, cache_file)
+                self.evict()
+            except OSError:
+                # The cache is optional so a cache folder that cannot be written does not prevent loading the file
+                pass
+        return data
+
+    def cache_file(self, reader, file_name, kwargs=None):
+        """Determines the name of the cache file for a raw data file.
+
+        Parameters
+        ----------
+        reader: class
+            Reader class
+        file_name: str
+            Full name of raw data file
+        kwargs: dict
+            Additional keyword arguments passed to the reader
+
+        Returns
+        -------
+        cache_file: str
+            Full name of cache file
+        """
+
+        if kwargs is None:
+            kwargs = {}
+
+        file_stat = os.stat(file_name)
+        key = hashlib.sha1()
+        key.update(repr((os.path.abspath(file_name),
+                         file_stat.st_size,
+                         file_stat.st_mtime_ns,
+                         reader.__module__,
+                         reader.__name__,
+                         getattr(reader, 'reader_version', 0),
+                         self.cache_version,
+                         sorted(kwargs.items()))).encode())
+        key.update(self.file_hash(file_name))
+
+        return os.path.join(self.cache_dir, key.hexdigest() + '.npz')
+
+    @staticmethod
+    def file_hash(file_name, block_size=2**20):
+        """Computes the hash of the contents of a file.
+
+        Parameters
+        ----------
+        file_name: str
+            Full name of file
+        block_size: int
+            Number of bytes read at a time
+
+        Returns
+        -------
+        digest: bytes
+            Hash of file contents
+        """
+
+        file_hash = hashlib.sha1()
+        with open(file_name, 'rb') as f:
+            block = f.read(block_size)
+            while block:
+                file_hash.update(block)
+                block = f.read(block_size)
+        return file_hash.digest()
+
+    @staticmethod
+    def read(cache_file):
+        """Reads a reader object from a cache file.
+
+        Parameters
+        ----------
+        cache_file: str
+            Full name of cache file
+
+        Returns
+        -------
+        data: object
+            Object of reader, None if the cache file does not exist or cannot be read
+        """
+
+        if not os.path.isfile(cache_file):
+            return None
+
+        try:
+            with np.load(cache_file) as npz:
+                buffers = [npz['buffer_%d' % n] for n in range(int(npz['n_buffers']))]
+                data = pickle.loads(npz['structure'].tobytes(), buffers=buffers)
+
+            # Mark the file as recently used
+            os.utime(cache_file)
+        except (OSError, ValueError, KeyError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+            return None
+
+        return data
+
+    def write(self, data, cache_file):
+        """Writes a reader object to a cache file.
+
+        Parameters
+        ----------
+        data: object
+            Object of reader
+        cache_file: str
+            Full name of cache file
+
+        Raises
+        ------
+        OSError
+            If the cache folder or file cannot be written
+        """
+
+        buffers = []
+        structure = pickle.dumps(data, protocol=5, buffer_callback=buffers.append)
+        arrays = {'buffer_%d' % n: np.frombuffer(buffer.raw(), dtype=np.uint8) for n, buffer in enumerate(buffers)}
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # Write to a temporary file first so an incomplete file is never read
+        temp_file = cache_file + '.%d.tmp' % os.getpid()
+        try:
+            with open(temp_file, 'wb') as f:
+                np.savez(f, structure=np.frombuffer(structure, dtype=np.uint8), n_buffers=len(buffers), **arrays)
+            os.replace(temp_file, cache_file)
+        except OSError:
+            # Remove the incomplete temporary file
+            try:
+                os.remove(temp_file)
+            except OSError:
+                pass
+            raise
+
+    def evict(self, max_size=None):
+        """Deletes the least recently used cache files until the size of the cache is less than max_size.
+
+        Parameters
+        ----------
+        max_size: float
+            Maximum size of the cache in bytes, if None the max_size of the cache is used.
+        """
+
+        if max_size is None:
+            max_size = self.max_size
+
+        cache_files = []
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith('.npz'):
+                    try:
+                        file_stat = os.stat(os.path.join(self.cache_dir, name))
+                        cache_files.append((file_stat.st_mtime, file_stat.st_size, name))
+                    except OSError:
+                        pass
+
+        total_size = sum([cache_file[1] for cache_file in cache_files])
+        for _, size, name in sorted(cache_files):
+            if total_size <= max_size:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except OSError:
+                pass
+            total_size -= size
+
+    def clear(self):
+        """Deletes all cache files."""
+
+        self.evict(max_size=0)
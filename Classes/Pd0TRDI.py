@@ -1,5 +1,6 @@
 import os
 import re
+import mmap
 import numpy as np
 import struct
 from MiscLibs.common_functions import pol2cart, valid_number, nans
@@ -35,14 +36,98 @@ class Pd0TRDI(object):
     Nmea: Nmea
         Object of Nmea to hold Nmea data
     """
-    
-    def __init__(self, file_name):
+
+    # Increment when the decoded data change so cached data are parsed again
+    reader_version = 1
+
+    # Structured dtypes describing the fixed size data types, offsets are from the start of the leader id
+    fixed_leader_dtype = np.dtype({
+        'names': ['firm_ver', 'firm_rev', 'sys_cfg_ls', 'sys_cfg_ms', 'sim_flag', 'n_beams', 'wn', 'wp', 'ws_cm',
+                  'wf_cm', 'wm', 'wc', 'code_reps', 'wg_per', 'we_mmps', 'tp', 'ex', 'ea', 'eb', 'ez',
+                  'sensor_avail', 'dist_bin1_cm', 'xmit_pulse_cm', 'ref_lay_str_cell', 'ref_lay_end_cell', 'wa',
+                  'cx', 'lag_cm', 'cpu_ser_no', 'wb', 'cq'],
+        'formats': ['u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', '<u2', '<u2', '<u2', 'u1', 'u1', 'u1', 'u1', '<u2',
+                    ('u1', 3), 'u1', '<i2', '<u2', 'u1', 'u1', '<u2', '<u2', 'u1', 'u1', 'u1', 'u1', '<u2', 'u1',
+                    'u1', 'u1'],
+        'offsets': [2, 3, 4, 5, 6, 8, 9, 10, 12, 14, 16, 17, 18, 19, 20, 22, 25, 26, 28, 30, 31, 32, 34, 36, 37,
+                    38, 39, 40, 42, 43, 44],
+        'itemsize': 45})
+
+    variable_leader_dtype = np.dtype({
+        'names': ['num', 'date_not_y2k', 'time', 'num_fact', 'bit_test', 'sos_mps', 'xdcr_depth_dm', 'heading',
+                  'pitch', 'roll', 'salinity_ppt', 'temperature', 'mpt_msc', 'heading_std_dev_deg', 'pitch_std',
+                  'roll_std', 'xmit_current', 'xmit_voltage', 'ambient_temp', 'pressure_pos', 'pressure_neg',
+                  'attitude_temp', 'attitude', 'contam_sensor', 'error_status_word', 'pressure_pascal',
+                  'pressure_var_pascal', 'date_y2k', 'time_y2k', 'lag_near_bottom'],
+        'formats': ['<u2', ('u1', 3), ('u1', 4), 'u1', '<u2', '<u2', '<u2', '<u2', '<i2', '<i2', '<u2', '<i2',
+                    ('u1', 3), 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', 'u1', ('u1', 4), '<u4',
+                    '<u4', ('u1', 4), ('u1', 4), 'u1'],
+        'offsets': [2, 4, 7, 11, 12, 14, 16, 18, 20, 22, 24, 26, 28, 31, 32, 33, 34, 35, 36, 37, 38, 39, 40, 41,
+                    42, 48, 52, 57, 61, 65],
+        'itemsize': 66})
+
+    bottom_track_dtype = np.dtype({
+        'names': ['bp', 'long1', 'bc', 'ba', 'bg', 'bm', 'be_mmps', 'lat', 'depth', 'vel', 'corr', 'eval_amp',
+                  'pergd', 'alt', 'long2', 'ext_depth_cm', 'gga_vel_e_mps', 'gga_vel_n_mps', 'vtg_vel_e_mps',
+                  'vtg_vel_n_mps', 'gsa_v_dop', 'gsa_p_dop', 'gga_n_stats', 'gsa_sat_4_5', 'gga_diff',
+                  'gga_hdop', 'gsa_sat_0_3', 'bx_dm', 'rssi', 'wj', 'range_msb'],
+        'formats': ['<u2', '<u2', 'u1', 'u1', 'u1', 'u1', '<u2', '<i4', ('<u2', 4), ('<i2', 4), ('u1', 4),
+                    ('u1', 4), ('u1', 4), '<u2', '<u2', '<i2', '<i2', '<i2', '<i2', '<i2', 'u1', 'u1', 'u1',
+                    ('u1', 2), 'u1', 'u1', ('u1', 4), '<u2', ('u1', 4), 'u1', 'u1'],
+        'offsets': [2, 4, 6, 7, 8, 9, 10, 12, 16, 24, 32, 36, 40, 44, 46, 48, 50, 52, 54, 56, 58, 59, 60, 62, 64,
+                    65, 66, 70, 72, 76, 77],
+        'itemsize': 78})
+
+    surface_leader_dtype = np.dtype({'names': ['no_cells', 'cell_size_cm', 'dist_bin1_cm'],
+                                     'formats': ['u1', '<u2', '<u2'],
+                                     'offsets': [2, 3, 5],
+                                     'itemsize': 7})
+
+    auto_mode_beam_dtype = np.dtype({
+        'names': ['mode', 'depth_cm', 'ping_count', 'ping_type', 'cell_count', 'cell_size_cm', 'cell_mid_cm',
+                  'code_repeat', 'trans_length_cm', 'lag_length_cm', 'transmit_bw', 'receive_bw',
+                  'ping_interval_ms'],
+        'formats': ['u1', '<u2', 'u1', 'u1', '<u2', '<u2', '<u2', 'u1', '<u2', '<u2', 'u1', 'u1', '<u2'],
+        'offsets': [0, 1, 3, 4, 5, 7, 9, 11, 12, 14, 16, 17, 18],
+        'itemsize': 20})
+
+    auto_mode_dtype = np.dtype({'names': ['beam_count', 'beam', 'reserved'],
+                                'formats': ['u1', (auto_mode_beam_dtype, 4), 'u1'],
+                                'offsets': [2, 3, 83],
+                                'itemsize': 84})
+
+    vertical_beam_dtype = np.dtype({'names': ['eval_amp', 'rssi_amp', 'range_mm', 'status'],
+                                    'formats': ['u1', 'u1', '<u4', 'u1'],
+                                    'offsets': [2, 3, 4, 8],
+                                    'itemsize': 9})
+
+    transformation_matrix_dtype = np.dtype({'names': ['matrix'],
+                                            'formats': [('<i2', (4, 4))],
+                                            'offsets': [2],
+                                            'itemsize': 34})
+
+    nmea_leader_dtype = np.dtype({'names': ['specific_id', 'msg_size', 'delta_time'],
+                                  'formats': ['<i2', '<i2', '<f8'],
+                                  'offsets': [2, 4, 6],
+                                  'itemsize': 14})
+
+    # Leader ids decoded by the reader
+    known_leader_ids = (0x0000, 0x0080, 0x0100, 0x0200, 0x0300, 0x0400, 0x0600, 0x2022, 0x2100, 0x2101, 0x2102,
+                        0x2103, 0x0010, 0x0110, 0x0210, 0x0310, 0x0410, 0x0510, 0x4401, 0x4100, 0x3200)
+
+    # Binary string of each possible byte value
+    bits = np.array(["{0:08b}".format(x) for x in range(256)])
+
+    def __init__(self, file_name, engine='mmap'):
         """Constructor initializing instance variables.
 
         Parameters
         ----------
         file_name: str
             Full name including path of pd0 file to be read
+        engine: str
+            Reader used to decode the file, 'mmap' for the memory mapped vectorized reader (pd0_read_mmap)
+            or 'file' for the original file based reader (pd0_read)
         """
         
         self.file_name = file_name
@@ -57,8 +142,11 @@ class Pd0TRDI(object):
         self.Surface = None
         self.AutoMode = None
         self.Nmea = None
-        
-        self.pd0_read(file_name)
+
+        if engine == 'mmap':
+            self.pd0_read_mmap(file_name)
+        else:
+            self.pd0_read(file_name)
         
     def create_objects(self, n_ensembles, n_types, n_bins, max_surface_bins, n_velocities, wr2=False):
         """Create objects for instance variables.
@@ -1120,7 +1208,7 @@ class Pd0TRDI(object):
 
                             dummy = np.fromfile(f, np.uint8, count=int((self.Surface.no_cells[i_ens]*4)))
                             dummy = np.reshape(dummy, [int(self.Surface.no_cells[i_ens]), n_velocities])
-                            self.Surface.pergd[:n_velocities, :self.Surface.no_cells[i_ens], i_ens] = dummy.T
+                            self.Surface.pergd[:n_velocities, :int(self.Surface.no_cells[i_ens]), i_ens] = dummy.T
 
                             # Check if more data types need to be read and position the pointer
                             self.end_reading(f, file_loc, i_data_types, i_ens, bytes_per_ens)
@@ -1278,80 +1366,635 @@ class Pd0TRDI(object):
                         if end_file_check < end_file:
                             end_file_check = f.tell()
 
-                    # Screen for bad data, and do the unit conversions
-                    self.Wt.vel_mps[self.Wt.vel_mps == -32768] = np.nan
-                    self.Wt.vel_mps = self.Wt.vel_mps / 1000
-                    self.Wt.corr[self.Wt.corr == -32768] = np.nan
-                    self.Wt.rssi[self.Wt.rssi == -32768] = np.nan
-                    self.Wt.pergd[self.Wt.pergd == -32768] = np.nan
-
-                    # Remove bad data, convert units
-                    self.Bt.depth_m[self.Bt.depth_m == -32768] = np.nan
-                    self.Bt.depth_m = self.Bt.depth_m / 100
-                    self.Bt.vel_mps[self.Bt.vel_mps == -32768] = np.nan
-                    self.Bt.vel_mps = self.Bt.vel_mps / 1000
-                    self.Bt.corr[self.Bt.corr == -32768] = np.nan
-                    self.Bt.eval_amp[self.Bt.eval_amp == -32768] = np.nan
-                    self.Bt.pergd[self.Bt.pergd == -32768] = np.nan
-
-                    # Correct Bt.depth_m for RiverRay data
-                    if not np.isnan(rr_bt_depth_correction).any():
-                        rr_bt_depth_correction[rr_bt_depth_correction == (-32768 * 2e16) / 100] = np.nan
-                        self.Bt.depth_m += rr_bt_depth_correction
-
-                    # Remove bad data from Surface structure (RR), convert where needed
-                    self.Surface.vel_mps[self.Surface.vel_mps == -32768] = np.nan
-                    self.Surface.vel_mps = self.Surface.vel_mps / 1000
-                    self.Surface.corr[self.Surface.corr == -32768] = np.nan
-                    self.Surface.rssi[self.Surface.rssi == -32768] = np.nan
-                    self.Surface.pergd[self.Surface.pergd == -32768] = np.nan
-
-                    # If requested compute WR2 compatible GPS-based boat velocities
-                    if wr2:
-
-                        # If vtg data are available compute north and east components
-                        if self.Gps2.vtg_header[0, 0] == '$':
-
-                            # Find minimum of absolute value of delta time from raw data
-                            vtg_delta_time = np.abs(self.Gps2.vtg_delta_time)
-                            vtg_min = np.nanmin(vtg_delta_time, 1)
-
-                            # Compute the velocity components in m/s
-                            for i in range(len(vtg_delta_time)):
-                                idx = np.where(vtg_delta_time == vtg_min)[0][0]
-                                self.Gps2.vtg_velE_mps[i], self.Gps2.vtg_velN_mps[i] = \
-                                    pol2cart((90 - self.Gps2.course_true[i, idx])*np.pi/180,
-                                             self.Gps2.speed_kph[i, idx] * 0.2777778)
-
-                        if self.Gps2.gga_header[0, 0] == '$':
-
-                            # Initialize constants
-                            e_radius = 6378137
-                            coeff = e_radius * np.pi / 180
-                            ellip = 1 / 298.257223563
-
-                            # Find minimum of absolute value of delta time from raw data
-                            gga_delta_time = np.abs(self.Gps2.gga_delta_time)
-                            gga_min = np.nanmin(gga_delta_time, axis=1)
-
-                            # Process gga data
-                            for i in range(len(gga_delta_time)):
-                                idx = np.where(gga_delta_time[i:] == gga_min)
-                                if idx > 0:
-                                    lat_avg_rad = (self.Gps2.lat_deg[i, idx[i]]
-                                                   + self.Gps2.lat_deg[i - 1, idx[i - 1]]) / 2
-                                    sin_lat_avg_rad = np.sin(np.deg2rad(lat_avg_rad))
-                                    r_e = coeff * (1 + ellip * sin_lat_avg_rad * sin_lat_avg_rad)
-                                    rn = coeff * (1 - 2 * ellip + 3 * ellip * sin_lat_avg_rad * sin_lat_avg_rad)
-                                    dx = r_e * (self.Gps2.lon_deg[i, idx[i]] -
-                                                self.Gps2.lon_deg(i-1, idx[i-1])) * np.cos(np.deg2rad(lat_avg_rad))
-                                    dy = rn * (self.Gps2.lat_deg[i, idx[i]] - self.Gps2.lat_deg[i - 1, idx[i - 1]])
-                                    dt = self.Gps2.utc[i, idx[i]] - self.Gps2.utc[i-1, idx[i-1]]
-                                    self.Gps2.gga_velE_mps[i] = dx / dt
-                                    self.Gps2.gga_velN_mps[i] = dy / dt
-                                else:
-                                    self.Gps2.gga_velE_mps[i] = np.nan
-                                    self.Gps2.gga_velN_mps[i] = np.nan
+                    # Screen for bad data, convert units, and compute WR2 boat velocities
+                    self.screen_and_convert(rr_bt_depth_correction, wr2)
+
+    def screen_and_convert(self, rr_bt_depth_correction, wr2):
+        """Screens for bad data, converts units, and applies the RiverRay depth correction.
+
+        Parameters
+        ----------
+        rr_bt_depth_correction: np.array(float)
+            Depth correction computed from the most significant byte of the bottom track range
+        wr2: bool
+            Determines if WR2 processing should be applied to GPS data
+        """
+
+        # Screen for bad data, and do the unit conversions
+        self.Wt.vel_mps[self.Wt.vel_mps == -32768] = np.nan
+        self.Wt.vel_mps = self.Wt.vel_mps / 1000
+        self.Wt.corr[self.Wt.corr == -32768] = np.nan
+        self.Wt.rssi[self.Wt.rssi == -32768] = np.nan
+        self.Wt.pergd[self.Wt.pergd == -32768] = np.nan
+
+        # Remove bad data, convert units
+        self.Bt.depth_m[self.Bt.depth_m == -32768] = np.nan
+        self.Bt.depth_m = self.Bt.depth_m / 100
+        self.Bt.vel_mps[self.Bt.vel_mps == -32768] = np.nan
+        self.Bt.vel_mps = self.Bt.vel_mps / 1000
+        self.Bt.corr[self.Bt.corr == -32768] = np.nan
+        self.Bt.eval_amp[self.Bt.eval_amp == -32768] = np.nan
+        self.Bt.pergd[self.Bt.pergd == -32768] = np.nan
+
+        # Correct Bt.depth_m for RiverRay data
+        if not np.isnan(rr_bt_depth_correction).any():
+            rr_bt_depth_correction[rr_bt_depth_correction == (-32768 * 2e16) / 100] = np.nan
+            self.Bt.depth_m += rr_bt_depth_correction
+
+        # Remove bad data from Surface structure (RR), convert where needed
+        self.Surface.vel_mps[self.Surface.vel_mps == -32768] = np.nan
+        self.Surface.vel_mps = self.Surface.vel_mps / 1000
+        self.Surface.corr[self.Surface.corr == -32768] = np.nan
+        self.Surface.rssi[self.Surface.rssi == -32768] = np.nan
+        self.Surface.pergd[self.Surface.pergd == -32768] = np.nan
+
+        # If requested compute WR2 compatible GPS-based boat velocities
+        if wr2:
+
+            # If vtg data are available compute north and east components
+            if self.Gps2.vtg_header[0, 0] == '$':
+
+                # Find minimum of absolute value of delta time from raw data
+                vtg_delta_time = np.abs(self.Gps2.vtg_delta_time)
+                vtg_min = np.nanmin(vtg_delta_time, 1)
+
+                # Compute the velocity components in m/s
+                for i in range(len(vtg_delta_time)):
+                    idx = np.where(vtg_delta_time == vtg_min)[0][0]
+                    self.Gps2.vtg_velE_mps[i], self.Gps2.vtg_velN_mps[i] = \
+                        pol2cart((90 - self.Gps2.course_true[i, idx])*np.pi/180,
+                                 self.Gps2.speed_kph[i, idx] * 0.2777778)
+
+            if self.Gps2.gga_header[0, 0] == '$':
+
+                # Initialize constants
+                e_radius = 6378137
+                coeff = e_radius * np.pi / 180
+                ellip = 1 / 298.257223563
+
+                # Find minimum of absolute value of delta time from raw data
+                gga_delta_time = np.abs(self.Gps2.gga_delta_time)
+                gga_min = np.nanmin(gga_delta_time, axis=1)
+
+                # Process gga data
+                for i in range(len(gga_delta_time)):
+                    idx = np.where(gga_delta_time[i:] == gga_min)
+                    if idx > 0:
+                        lat_avg_rad = (self.Gps2.lat_deg[i, idx[i]]
+                                       + self.Gps2.lat_deg[i - 1, idx[i - 1]]) / 2
+                        sin_lat_avg_rad = np.sin(np.deg2rad(lat_avg_rad))
+                        r_e = coeff * (1 + ellip * sin_lat_avg_rad * sin_lat_avg_rad)
+                        rn = coeff * (1 - 2 * ellip + 3 * ellip * sin_lat_avg_rad * sin_lat_avg_rad)
+                        dx = r_e * (self.Gps2.lon_deg[i, idx[i]] -
+                                    self.Gps2.lon_deg(i-1, idx[i-1])) * np.cos(np.deg2rad(lat_avg_rad))
+                        dy = rn * (self.Gps2.lat_deg[i, idx[i]] - self.Gps2.lat_deg[i - 1, idx[i - 1]])
+                        dt = self.Gps2.utc[i, idx[i]] - self.Gps2.utc[i-1, idx[i-1]]
+                        self.Gps2.gga_velE_mps[i] = dx / dt
+                        self.Gps2.gga_velN_mps[i] = dy / dt
+                    else:
+                        self.Gps2.gga_velE_mps[i] = np.nan
+                        self.Gps2.gga_velN_mps[i] = np.nan
+
+    def pd0_read_mmap(self, fullname, wr2=False):
+        """Reads the binary pd0 file using a memory map and vectorized decoding. The file is scanned once
+        for ensemble headers, checksums are validated in bulk, and the fixed size data types are gathered
+        for all ensembles at once using structured dtypes. The resulting object layout is the same as
+        pd0_read.
+
+        Parameters
+        ----------
+        fullname: str
+            Full file name including path
+        wr2: bool
+            Determines if WR2 processing should be applied to GPS data
+        """
+
+        # Assign default values
+        n_velocities = 4
+        max_surface_bins = 5
+
+        # Check to ensure file exists
+        if os.path.exists(fullname) and os.path.getsize(fullname) > 0:
+            with open(fullname, 'rb') as f:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            try:
+                raw = np.frombuffer(mm, dtype=np.uint8)
+                self.decode_mmap(raw, n_velocities, max_surface_bins, wr2)
+                del raw
+            finally:
+                mm.close()
+
+    def decode_mmap(self, raw, n_velocities, max_surface_bins, wr2):
+        """Decodes all ensembles in the memory mapped pd0 data.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        n_velocities: int
+            Number of velocities
+        max_surface_bins: int
+            Maximum number of surface cells
+        wr2: bool
+            Determines if WR2 processing should be applied to GPS data
+        """
+
+        # Locate valid ensembles and the data types in each
+        starts, n_bytes = Pd0TRDI.find_ensembles(raw)
+        if starts.shape[0] == 0:
+            return
+        n_types, offsets, leader_ids = Pd0TRDI.find_data_types(raw, starts, n_bytes)
+
+        # Use the variable leader ensemble number to assign each ensemble to an index, gaps in the
+        # ensemble numbers are left as missing ensembles and repeated numbers overwrite the previous ensemble
+        vl_rows, vl_pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x0080)
+        if vl_rows.shape[0] == 0:
+            return
+        starts, n_bytes = starts[vl_rows], n_bytes[vl_rows]
+        n_types, offsets, leader_ids = n_types[vl_rows], offsets[vl_rows], leader_ids[vl_rows]
+        vl = Pd0TRDI.gather_records(raw, vl_pos, Pd0TRDI.variable_leader_dtype)
+        ens_diff = np.diff(vl['num'].astype(np.int64))
+        ens_idx = np.concatenate(([0], np.cumsum(np.where(ens_diff >= 1, ens_diff, 0))))
+        n_ensembles = int(ens_idx[-1]) + 1
+
+        # Number of bins is taken from the first ensemble, arrays are expanded if more bins are found
+        fl_rows, fl_pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x0000)
+        fl = Pd0TRDI.gather_records(raw, fl_pos, Pd0TRDI.fixed_leader_dtype)
+        n_bins = int(fl['wn'][0]) if fl.shape[0] > 0 else 0
+        self.create_objects(n_ensembles=n_ensembles,
+                            n_types=int(np.max(n_types)),
+                            n_bins=n_bins,
+                            max_surface_bins=max_surface_bins,
+                            n_velocities=n_velocities)
+
+        # Header
+        self.Hdr.bytes_per_ens[ens_idx] = n_bytes
+        self.Hdr.n_data_types[ens_idx] = n_types
+        self.Hdr.data_offsets[ens_idx, :] = np.where(offsets < 0, np.nan, offsets)
+        known_ids = np.array(list(Pd0TRDI.known_leader_ids))
+        unknown = np.logical_and(leader_ids >= 0, np.isin(leader_ids, known_ids, invert=True))
+        for row, col in zip(*np.nonzero(unknown)):
+            self.Hdr.invalid[ens_idx[row]] = hex(leader_ids[row, col])
+        self.Inst.res_RDI = int(raw[starts[-1] + n_bytes[-1] - 2]) + (int(raw[starts[-1] + n_bytes[-1] - 1]) << 8)
+
+        # Ensemble numbers for missing ensembles are filled sequentially except for the last missing ensemble
+        # of each gap, which pd0_read leaves empty
+        self.Sensor.num[:] = vl['num'][0] + np.arange(n_ensembles)
+        self.Sensor.num[ens_idx[1:][np.diff(ens_idx) > 1] - 1] = np.nan
+
+        # Fixed and variable leaders
+        self.populate_fixed_leader(ens_idx[fl_rows], fl)
+        self.populate_variable_leader(ens_idx, vl)
+
+        # Water track data
+        wn = self.Cfg.wn[ens_idx]
+        max_bins = int(np.nanmax(wn)) if np.any(np.isfinite(wn)) else 0
+        if max_bins > n_bins:
+            # Added bins are zero filled to be consistent with pd0_read
+            pad = np.zeros([n_velocities, max_bins - n_bins, n_ensembles])
+            self.Wt.vel_mps = np.hstack([self.Wt.vel_mps, pad])
+            self.Wt.corr = np.hstack([self.Wt.corr, pad])
+            self.Wt.rssi = np.hstack([self.Wt.rssi, pad])
+            self.Wt.pergd = np.hstack([self.Wt.pergd, pad])
+        for leader_id, attribute, dtype in ((0x0100, 'vel_mps', '<i2'),
+                                            (0x0200, 'corr', 'u1'),
+                                            (0x0300, 'rssi', 'u1'),
+                                            (0x0400, 'pergd', 'u1')):
+            rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, leader_id)
+            Pd0TRDI.populate_cells(raw, pos + 2, wn[rows], ens_idx[rows], getattr(self.Wt, attribute),
+                                   n_velocities, dtype)
+
+        # Bottom track data
+        rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x0600)
+        rr_bt_depth_correction = np.tile(np.nan, (n_velocities, n_ensembles))
+        if rows.shape[0] > 0:
+            bt = Pd0TRDI.gather_records(raw, pos, Pd0TRDI.bottom_track_dtype)
+            self.populate_bottom_track(ens_idx[rows], bt)
+            rr_bt_depth_correction[:, ens_idx[rows]] = bt['range_msb'] * 2e16 / 100
+
+        # Surface cells
+        rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x0010)
+        if rows.shape[0] > 0:
+            surface = Pd0TRDI.gather_records(raw, pos, Pd0TRDI.surface_leader_dtype)
+            self.Surface.no_cells[ens_idx[rows]] = surface['no_cells']
+            self.Surface.cell_size_cm[ens_idx[rows]] = surface['cell_size_cm']
+            self.Surface.dist_bin1_cm[ens_idx[rows]] = surface['dist_bin1_cm']
+        no_cells = self.Surface.no_cells[ens_idx]
+        for leader_id, attribute, dtype in ((0x0110, 'vel_mps', '<i2'),
+                                            (0x0210, 'corr', 'u1'),
+                                            (0x0310, 'rssi', 'u1'),
+                                            (0x0410, 'pergd', 'u1')):
+            rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, leader_id)
+            Pd0TRDI.populate_cells(raw, pos + 2, no_cells[rows], ens_idx[rows],
+                                   getattr(self.Surface, attribute), n_velocities, dtype)
+
+        # Automatic mode configuration
+        rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x4401)
+        if rows.shape[0] > 0:
+            auto = Pd0TRDI.gather_records(raw, pos, Pd0TRDI.auto_mode_dtype)
+            self.AutoMode.beam_count[ens_idx[rows]] = auto['beam_count']
+            self.AutoMode.Reserved[ens_idx[rows]] = auto['reserved']
+            for n, beam in enumerate([self.AutoMode.Beam1, self.AutoMode.Beam2,
+                                      self.AutoMode.Beam3, self.AutoMode.Beam4]):
+                beam_data = auto['beam'][:, n]
+                for name in Pd0TRDI.auto_mode_beam_dtype.names:
+                    getattr(beam, name)[ens_idx[rows]] = beam_data[name]
+
+        # Vertical beam
+        rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x4100)
+        if rows.shape[0] > 0:
+            vb = Pd0TRDI.gather_records(raw, pos, Pd0TRDI.vertical_beam_dtype)
+            self.Sensor.vert_beam_eval_amp[ens_idx[rows]] = vb['eval_amp']
+            self.Sensor.vert_beam_RSSI_amp[ens_idx[rows]] = vb['rssi_amp']
+            self.Sensor.vert_beam_range_m[ens_idx[rows]] = vb['range_mm'] / 1000
+            self.Sensor.vert_beam_status[ens_idx[rows]] = vb['status'] & 3
+            Pd0TRDI.fill_list(self.Sensor.vert_beam_gain, ens_idx[rows],
+                              np.where(vb['status'] & 4, 'H', 'L'))
+
+        # Transformation matrix, the last one in the file is used
+        rows, pos = Pd0TRDI.data_type_positions(starts, offsets, leader_ids, 0x3200)
+        if rows.shape[0] > 0:
+            t_matrix = Pd0TRDI.gather_records(raw, pos[-1:], Pd0TRDI.transformation_matrix_dtype)
+            self.Inst.t_matrix = t_matrix['matrix'][0] * .0001
+
+        # Variable length NMEA data types are decoded individually
+        self.decode_nmea_mmap(raw, starts, n_bytes, n_types, offsets, leader_ids, ens_idx, n_ensembles)
+
+        self.screen_and_convert(rr_bt_depth_correction, wr2)
+
+    @staticmethod
+    def find_ensembles(raw):
+        """Finds the start of every valid ensemble in the pd0 data with a single scan for the 0x7F7F header
+        and a bulk validation of the checksums.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+
+        Returns
+        -------
+        starts: np.array(int)
+            Byte location of the start of each valid ensemble
+        n_bytes: np.array(int)
+            Number of bytes in each ensemble excluding the checksum
+        """
+
+        file_size = raw.shape[0]
+        empty = np.array([], dtype=np.int64)
+        if file_size < 8:
+            return empty, empty
+
+        # Candidate headers
+        starts = np.flatnonzero(np.logical_and(raw[:-1] == 0x7f, raw[1:] == 0x7f))
+        starts = starts[starts + 6 <= file_size]
+        n_bytes = raw[starts + 2].astype(np.int64) + (raw[starts + 3].astype(np.int64) << 8)
+        valid = np.logical_and(n_bytes > 6, starts + n_bytes + 2 <= file_size)
+        starts, n_bytes = starts[valid], n_bytes[valid]
+
+        # Checksums from a running sum, the uint16 overflow is the modulo required by the checksum
+        running_sum = np.zeros(file_size + 1, dtype=np.uint16)
+        np.cumsum(raw, dtype=np.uint16, out=running_sum[1:])
+        ends = starts + n_bytes
+        check_sum = raw[ends].astype(np.uint16) + (raw[ends + 1].astype(np.uint16) << 8)
+        valid = (running_sum[ends] - running_sum[starts]) == check_sum
+        del running_sum
+        starts, n_bytes = starts[valid], n_bytes[valid]
+
+        # Remove headers found within the data of a valid ensemble
+        keep = np.zeros(starts.shape[0], dtype=bool)
+        next_start = 0
+        for n in range(starts.shape[0]):
+            if starts[n] >= next_start:
+                keep[n] = True
+                next_start = starts[n] + n_bytes[n] + 2
+
+        return starts[keep], n_bytes[keep]
+
+    @staticmethod
+    def find_data_types(raw, starts, n_bytes):
+        """Decodes the number of data types, the data type offsets, and the leader id of each data type for
+        all ensembles.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        starts: np.array(int)
+            Byte location of the start of each ensemble
+        n_bytes: np.array(int)
+            Number of bytes in each ensemble
+
+        Returns
+        -------
+        n_types: np.array(int)
+            Number of data types in each ensemble
+        offsets: np.array(int)
+            Offset of each data type from the start of the ensemble, -1 if not used
+        leader_ids: np.array(int)
+            Leader id of each data type, -1 if not used
+        """
+
+        n_types = raw[starts + 5].astype(np.int64)
+        type_idx = np.arange(np.max(n_types))
+        used = np.logical_and(type_idx < n_types[:, np.newaxis],
+                              6 + 2 * type_idx + 2 <= n_bytes[:, np.newaxis])
+        loc = np.where(used, starts[:, np.newaxis] + 6 + 2 * type_idx, 0)
+        offsets = raw[loc].astype(np.int64) + (raw[loc + 1].astype(np.int64) << 8)
+        used = np.logical_and(used, offsets + 2 <= n_bytes[:, np.newaxis])
+        offsets[np.logical_not(used)] = -1
+        loc = np.where(used, starts[:, np.newaxis] + offsets, 0)
+        leader_ids = raw[loc].astype(np.int64) + (raw[loc + 1].astype(np.int64) << 8)
+        leader_ids[np.logical_not(used)] = -1
+
+        return n_types, offsets, leader_ids
+
+    @staticmethod
+    def data_type_positions(starts, offsets, leader_ids, leader_id):
+        """Finds the ensembles containing a data type and the byte location of that data type.
+
+        Parameters
+        ----------
+        starts: np.array(int)
+            Byte location of the start of each ensemble
+        offsets: np.array(int)
+            Offset of each data type from the start of the ensemble
+        leader_ids: np.array(int)
+            Leader id of each data type
+        leader_id: int
+            Leader id of the data type to find
+
+        Returns
+        -------
+        rows: np.array(int)
+            Index of ensembles containing the data type
+        pos: np.array(int)
+            Byte location of the first occurrence of the data type in each ensemble
+        """
+
+        match = leader_ids == leader_id
+        rows = np.flatnonzero(np.any(match, axis=1))
+        cols = np.argmax(match[rows], axis=1)
+        return rows, starts[rows] + offsets[rows, cols]
+
+    @staticmethod
+    def gather_records(raw, pos, dtype):
+        """Gathers fixed size records from all ensembles into a structured array.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        pos: np.array(int)
+            Byte location of each record
+        dtype: np.dtype
+            Structured dtype describing the record
+
+        Returns
+        -------
+        records: np.array
+            Array of records
+        """
+
+        idx = np.minimum(pos[:, np.newaxis] + np.arange(dtype.itemsize), raw.shape[0] - 1)
+        return np.ascontiguousarray(raw[idx]).view(dtype)[:, 0]
+
+    @staticmethod
+    def populate_cells(raw, pos, n_cells, ens_idx, data_out, n_velocities, dtype):
+        """Gathers per cell per beam data into a 3D array. Ensembles are grouped by the number of cells so
+        that each group can be decoded at once.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        pos: np.array(int)
+            Byte location of the first cell in each ensemble
+        n_cells: np.array(float)
+            Number of cells in each ensemble
+        ens_idx: np.array(int)
+            Ensemble index for each ensemble
+        data_out: np.array(float)
+            Array (beam, cell, ensemble) to be populated
+        n_velocities: int
+            Number of velocities
+        dtype: str
+            Data type of each value
+        """
+
+        valid = np.logical_and(np.isfinite(n_cells), n_cells > 0)
+        for cells in np.unique(n_cells[valid]).astype(int):
+            group = np.logical_and(valid, n_cells == cells)
+            cells_dtype = np.dtype([('data', dtype, (cells, n_velocities))])
+            data = Pd0TRDI.gather_records(raw, pos[group], cells_dtype)['data']
+            data_out[:n_velocities, :cells, ens_idx[group]] = data.transpose(2, 1, 0)
+
+    @staticmethod
+    def fill_list(list_out, ens_idx, values):
+        """Assigns values to a list by ensemble index.
+
+        Parameters
+        ----------
+        list_out: list
+            List to be populated
+        ens_idx: np.array(int)
+            Ensemble index for each value
+        values: np.array
+            Values to be assigned
+        """
+
+        for idx, value in zip(ens_idx.tolist(), values.tolist()):
+            list_out[idx] = value
+
+    def populate_fixed_leader(self, ens_idx, fl):
+        """Populates instrument and configuration data from the fixed leader of all ensembles.
+
+        Parameters
+        ----------
+        ens_idx: np.array(int)
+            Ensemble index for each fixed leader
+        fl: np.array
+            Array of fixed leader records
+        """
+
+        if ens_idx.shape[0] == 0:
+            return
+
+        # Instrument characteristics
+        self.Inst.firm_ver[ens_idx] = fl['firm_ver'] + fl['firm_rev'] / 100
+        ls = fl['sys_cfg_ls']
+        self.Inst.freq[ens_idx] = np.array([75, 150, 300, 600, 1200, 2400, np.nan, np.nan])[ls & 7]
+        Pd0TRDI.fill_list(self.Inst.pat, ens_idx, np.where(ls & 8, 'Convex', 'Concave'))
+        self.Inst.sensor_CFG[ens_idx] = ((ls >> 5) & 1) + 1
+        Pd0TRDI.fill_list(self.Inst.xducer, ens_idx, np.where(ls & 64, 'Attached', 'Not Attached'))
+        Pd0TRDI.fill_list(self.Sensor.orient, ens_idx, np.where(ls & 128, 'Up', 'Down'))
+        ms = fl['sys_cfg_ms']
+        self.Inst.beam_ang[ens_idx] = np.array([15, 20, 30, np.nan])[ms & 3]
+        beams = ms >> 4
+        self.Inst.beams[ens_idx] = np.select([beams == 4, beams == 5, beams == 15], [4, 5, 5], np.nan)
+        demod_idx = ens_idx[beams != 4]
+        beams = beams[beams != 4]
+        self.Inst.demod[demod_idx] = np.select([beams == 5, beams == 15], [1, 2], np.nan)
+        Pd0TRDI.fill_list(self.Inst.data_type, ens_idx, np.where(fl['sim_flag'] == 0, 'Real', 'Simu'))
+
+        # Configuration
+        for name in ('n_beams', 'wn', 'wp', 'ws_cm', 'wf_cm', 'wm', 'wc', 'code_reps', 'wg_per', 'we_mmps',
+                     'dist_bin1_cm', 'xmit_pulse_cm', 'ref_lay_str_cell', 'ref_lay_end_cell', 'wa', 'cx',
+                     'lag_cm', 'wb', 'cq'):
+            getattr(self.Cfg, name)[ens_idx] = fl[name]
+        self.Cfg.cpu_ser_no[ens_idx, :] = fl['cpu_ser_no'][:, np.newaxis]
+        self.Cfg.tp_sec[ens_idx] = fl['tp'][:, 0] * 60 + fl['tp'][:, 1] + fl['tp'][:, 2] * 0.01
+        self.Cfg.ea_deg[ens_idx] = fl['ea'] * 0.01
+        self.Cfg.eb_deg[ens_idx] = fl['eb'] * 0.01
+
+        ex = fl['ex']
+        Pd0TRDI.fill_list(self.Cfg.ex, ens_idx, Pd0TRDI.bits[ex])
+        Pd0TRDI.fill_list(self.Cfg.coord_sys, ens_idx, np.array(['Beam', 'Inst', 'Ship', 'Earth'])[(ex >> 3) & 3])
+        # Consistent with pd0_read these settings are stored for the last ensemble only
+        self.Cfg.use_pr = 'Yes' if ex[-1] & 4 else 'No'
+        self.Cfg.use_3beam = 'Yes' if ex[-1] & 2 else 'No'
+        self.Cfg.map_bins = 'Yes' if ex[-1] & 1 else 'No'
+
+        ez = fl['ez']
+        Pd0TRDI.fill_list(self.Cfg.ez, ens_idx, Pd0TRDI.bits[ez])
+        Pd0TRDI.fill_list(self.Cfg.sos_src, ens_idx,
+                          np.array(['Manual EC', 'Calculated', 'N/a', 'SVSS Sensor'])[ez >> 6])
+        Pd0TRDI.fill_list(self.Cfg.head_src, ens_idx, np.where(ez & 16, 'Int. Sensor', 'N/a'))
+        Pd0TRDI.fill_list(self.Cfg.pitch_src, ens_idx, np.where(ez & 8, 'Int. Sensor', 'N/a'))
+        Pd0TRDI.fill_list(self.Cfg.roll_src, ens_idx, np.where(ez & 4, 'Int. Sensor', 'N/a'))
+        Pd0TRDI.fill_list(self.Cfg.xdcr_dep_srs, ens_idx, np.where(ez & 2, 'Int. Sensor', 'N/a'))
+        Pd0TRDI.fill_list(self.Cfg.temp_src, ens_idx, np.where(ez & 1, 'Int. Sensor', 'N/a'))
+        Pd0TRDI.fill_list(self.Cfg.sensor_avail, ens_idx, Pd0TRDI.bits[fl['sensor_avail']])
+
+    def populate_variable_leader(self, ens_idx, vl):
+        """Populates sensor data from the variable leader of all ensembles.
+
+        Parameters
+        ----------
+        ens_idx: np.array(int)
+            Ensemble index for each variable leader
+        vl: np.array
+            Array of variable leader records
+        """
+
+        for name in ('num', 'num_fact', 'bit_test', 'sos_mps', 'xdcr_depth_dm', 'salinity_ppt',
+                     'heading_std_dev_deg', 'xmit_current', 'xmit_voltage', 'ambient_temp', 'pressure_pos',
+                     'pressure_neg', 'attitude_temp', 'attitude', 'contam_sensor', 'pressure_pascal',
+                     'pressure_var_pascal', 'date_not_y2k', 'time', 'mpt_msc', 'date_y2k', 'time_y2k'):
+            getattr(self.Sensor, name)[ens_idx] = vl[name]
+        self.Sensor.num_tot[ens_idx] = vl['num'] + vl['num_fact'].astype(float) * 65535
+        self.Sensor.heading_deg[ens_idx] = vl['heading'] / 100.
+        self.Sensor.pitch_deg[ens_idx] = vl['pitch'] / 100.
+        self.Sensor.roll_deg[ens_idx] = vl['roll'] / 100.
+        self.Sensor.temperature_deg_c[ens_idx] = vl['temperature'] / 100.
+        self.Sensor.pitch_std_dev_deg[ens_idx] = vl['pitch_std'] / 10.
+        self.Sensor.roll_std_dev_deg[ens_idx] = vl['roll_std'] / 10.
+        Pd0TRDI.fill_list(self.Sensor.error_status_word, ens_idx,
+                          Pd0TRDI.bits[vl['error_status_word']])
+        self.Sensor.date[ens_idx, :] = vl['date_not_y2k']
+        self.Sensor.date[ens_idx, 0] = vl['date_y2k'][:, 0].astype(float) * 100 + vl['date_y2k'][:, 1]
+        self.Cfg.lag_near_bottom[ens_idx] = vl['lag_near_bottom']
+
+    def populate_bottom_track(self, ens_idx, bt):
+        """Populates bottom track, bottom track configuration, and WinRiver GPS data for all ensembles.
+
+        Parameters
+        ----------
+        ens_idx: np.array(int)
+            Ensemble index for each bottom track record
+        bt: np.array
+            Array of bottom track records
+        """
+
+        for name in ('bp', 'bc', 'ba', 'bg', 'bm', 'be_mmps', 'bx_dm', 'wj'):
+            getattr(self.Cfg, name)[ens_idx] = bt[name]
+        self.Bt.depth_m[0:4, ens_idx] = bt['depth'].T
+        self.Bt.vel_mps[0:4, ens_idx] = bt['vel'].T
+        self.Bt.corr[0:4, ens_idx] = bt['corr'].T
+        self.Bt.eval_amp[0:4, ens_idx] = bt['eval_amp'].T
+        self.Bt.pergd[0:4, ens_idx] = bt['pergd'].T
+        self.Bt.rssi[0:4, ens_idx] = bt['rssi'].T
+        self.Bt.ext_depth_cm[ens_idx] = bt['ext_depth_cm']
+
+        # WinRiver 10.06 format GPS data
+        self.Gps.lat_deg[ens_idx] = (bt['lat'] / 2**31) * 180
+        self.Gps.alt_m[ens_idx] = (bt['alt'].astype(np.int64) - 32768) / 10
+        long_deg = ((bt['long1'] + bt['long2'].astype(np.int64) * 2**16) / 2**31) * 180
+        self.Gps.long_deg[ens_idx] = np.where(long_deg > 180, long_deg - 360, long_deg)
+        for name in ('gga_vel_e_mps', 'gga_vel_n_mps', 'vtg_vel_e_mps', 'vtg_vel_n_mps'):
+            getattr(self.Gps, name)[ens_idx] = np.where(bt[name] != -32768, bt[name] * -1 / 1000, np.nan)
+        for name in ('gsa_v_dop', 'gsa_p_dop', 'gga_n_stats'):
+            nonzero = bt[name] != 0
+            getattr(self.Gps, name)[ens_idx[nonzero]] = bt[name][nonzero]
+        nonzero = bt['gga_hdop'] != 0
+        self.Gps.gga_hdop[ens_idx[nonzero]] = bt['gga_hdop'][nonzero] / 10
+        self.Gps.gga_diff[ens_idx] = bt['gga_diff']
+        self.Gps.gsa_sat[ens_idx, 0:4] = bt['gsa_sat_0_3']
+        self.Gps.gsa_sat[ens_idx, 4:6] = bt['gsa_sat_4_5']
+
+    def decode_nmea_mmap(self, raw, starts, n_bytes, n_types, offsets, leader_ids, ens_idx, n_ensembles):
+        """Decodes the variable length NMEA data types, 0x2022 and the raw NMEA sentences 0x2100 - 0x2103.
+        Only the ensembles containing these data types are visited.
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        starts: np.array(int)
+            Byte location of the start of each ensemble
+        n_bytes: np.array(int)
+            Number of bytes in each ensemble
+        n_types: np.array(int)
+            Number of data types in each ensemble
+        offsets: np.array(int)
+            Offset of each data type from the start of the ensemble
+        leader_ids: np.array(int)
+            Leader id of each data type
+        ens_idx: np.array(int)
+            Ensemble index for each ensemble
+        n_ensembles: int
+            Number of ensembles
+        """
+
+        # Raw NMEA sentences
+        for leader_id, attribute in ((0x2100, 'dbt'), (0x2101, 'gga'), (0x2102, 'vtg'), (0x2103, 'gsa')):
+            for row, col in zip(*np.nonzero(leader_ids == leader_id)):
+                start = starts[row] + offsets[row, col] + 4
+                if col + 1 < n_types[row] and offsets[row, col + 1] >= 0:
+                    end = starts[row] + offsets[row, col + 1]
+                else:
+                    end = starts[row] + n_bytes[row] - 2
+                getattr(self.Nmea, attribute)[ens_idx[row]] = raw[start:end].tobytes().decode('latin-1')
+
+        # General NMEA structure
+        rows, cols = np.nonzero(leader_ids == 0x2022)
+        if rows.shape[0] == 0:
+            return
+        pos = starts[rows] + offsets[rows, cols]
+        leader = Pd0TRDI.gather_records(raw, pos, Pd0TRDI.nmea_leader_dtype)
+
+        # Expand arrays for the maximum number of each sentence type in an ensemble
+        for ids, expand, delta_time in (((100, 104, 204), self.Gps2.gga_expand, 'gga_delta_time'),
+                                        ((101, 105, 205), self.Gps2.vtg_expand, 'vtg_delta_time'),
+                                        ((102, 106, 206), self.Gps2.dbt_expand, 'dbt_delta_time'),
+                                        ((103, 107, 207), self.Gps2.hdt_expand, 'hdt_delta_time')):
+            sentence_rows = rows[np.isin(leader['specific_id'], ids)]
+            if sentence_rows.shape[0] > 0:
+                max_count = np.max(np.bincount(sentence_rows))
+                while getattr(self.Gps2, delta_time).shape[1] < max_count:
+                    expand(n_ensembles)
+
+        counts = {}
+        for row, loc, specific_id, msg_size, delta_time in zip(rows.tolist(), pos.tolist(),
+                                                               leader['specific_id'].tolist(),
+                                                               leader['msg_size'].tolist(),
+                                                               leader['delta_time'].tolist()):
+            group = (specific_id % 100) % 4
+            if specific_id not in (100, 101, 102, 103, 104, 105, 106, 107, 204, 205, 206, 207):
+                continue
+            j = counts.get((row, group), -1) + 1
+            counts[(row, group)] = j
+            self.Gps2.decode_sentence(raw, loc + 14, specific_id, msg_size, delta_time, ens_idx[row], j)
 
     @staticmethod
     def number_of_ensembles(f, f_size):
@@ -2153,6 +2796,159 @@ class Gps2(object):
         self.vtg_velE_mps = nans(n_ensembles)
         self.vtg_velN_mps = nans(n_ensembles)
 
+    def decode_sentence(self, raw, loc, specific_id, msg_size, delta_time, i_ens, j):
+        """Decodes a single NMEA data structure from the general NMEA data type (0x2022).
+
+        Parameters
+        ----------
+        raw: np.array(np.uint8)
+            Contents of pd0 file
+        loc: int
+            Byte location of the data following the NMEA leader
+        specific_id: int
+            Specific id of NMEA data structure
+        msg_size: int
+            Size of message
+        delta_time: float
+            Time between ping and NMEA data
+        i_ens: int
+            Ensemble index
+        j: int
+            Index of the sentence of this type within the ensemble
+        """
+
+        # Binary GGA
+        if specific_id == 100 or specific_id == 104:
+            header_size = 10 if specific_id == 100 else 7
+            values = struct.unpack_from('<%ds10sdcdcBBffcfcfh' % header_size, raw, loc)
+            self.gga_delta_time[i_ens, j] = delta_time
+            self.gga_header[i_ens][j] = values[0].decode('latin-1')
+            try:
+                self.utc[i_ens, j] = float(re.findall(r'^\d+\.\d+|\d+', values[1].decode('latin-1'))[0])
+            except (ValueError, IndexError):
+                self.utc[i_ens, j] = np.nan
+            self.lat_deg[i_ens, j] = values[2]
+            self.lat_ref[i_ens][j] = values[3].decode('latin-1')
+            self.lon_deg[i_ens, j] = values[4]
+            self.lon_ref[i_ens][j] = values[5].decode('latin-1')
+            self.corr_qual[i_ens, j] = values[6]
+            self.num_sats[i_ens, j] = values[7]
+            self.hdop[i_ens, j] = values[8]
+            self.alt[i_ens, j] = values[9]
+            self.alt_unit[i_ens][j] = values[10].decode('latin-1')
+            self.geoid[i_ens, j] = values[11]
+            self.geoid_unit[i_ens][j] = values[12].decode('latin-1')
+            self.d_gps_age[i_ens, j] = values[13]
+            self.ref_stat_id[i_ens, j] = values[14]
+
+        # Binary VTG
+        elif specific_id == 101 or specific_id == 105:
+            header_size = 10 if specific_id == 101 else 7
+            values = struct.unpack_from('<%dsfcfcfcfcc' % header_size, raw, loc)
+            self.vtg_delta_time[i_ens, j] = delta_time
+            self.vtg_header[i_ens][j] = values[0].decode('latin-1')
+            self.course_true[i_ens, j] = values[1]
+            self.true_indicator[i_ens][j] = values[2].decode('latin-1')
+            self.course_mag[i_ens, j] = values[3]
+            self.mag_indicator[i_ens][j] = values[4].decode('latin-1')
+            self.speed_knots[i_ens, j] = values[5]
+            self.knots_indicator[i_ens][j] = values[6].decode('latin-1')
+            self.speed_kph[i_ens, j] = values[7]
+            self.kph_indicator[i_ens][j] = values[8].decode('latin-1')
+            self.mode_indicator[i_ens][j] = values[9].decode('latin-1')
+
+        # Binary depth sounder
+        elif specific_id == 102 or specific_id == 106:
+            header_size = 10 if specific_id == 102 else 7
+            values = struct.unpack_from('<%dsfcfcfc' % header_size, raw, loc)
+            self.dbt_delta_time[i_ens, j] = delta_time
+            self.dbt_header[i_ens][j] = values[0].decode('latin-1')
+            self.depth_ft[i_ens, j] = values[1]
+            self.ft_indicator[i_ens][j] = values[2].decode('latin-1')
+            self.depth_m[i_ens, j] = values[3]
+            self.m_indicator[i_ens][j] = values[4].decode('latin-1')
+            self.depth_fath[i_ens, j] = values[5]
+            self.fath_indicator[i_ens][j] = values[6].decode('latin-1')
+
+        # Binary external heading
+        elif specific_id == 103 or specific_id == 107:
+            header_size = 10 if specific_id == 103 else 7
+            values = struct.unpack_from('<%dsdc' % header_size, raw, loc)
+            self.hdt_delta_time[i_ens, j] = delta_time
+            self.hdt_header[i_ens][j] = values[0].decode('latin-1')
+            self.heading_deg[i_ens, j] = values[1]
+            self.h_true_indicator[i_ens][j] = values[2].decode('latin-1')
+
+        # NMEA sentences stored as text
+        else:
+            temp = raw[loc:loc + msg_size].tobytes().decode('latin-1')
+            temp_array = np.array(temp.split(','))
+            temp_array[temp_array == '999.9'] = ''
+
+            try:
+                # GGA
+                if specific_id == 204:
+                    self.gga_sentence[i_ens][j] = temp
+                    self.gga_delta_time[i_ens, j] = delta_time
+                    self.gga_header[i_ens][j] = temp_array[0]
+                    self.utc[i_ens, j] = float(temp_array[1])
+                    lat_str = temp_array[2]
+                    self.lat_deg[i_ens, j] = float(lat_str[0:2]) + float(lat_str[2:]) / 60
+                    self.lat_ref[i_ens][j] = temp_array[3]
+                    lon_num = float(temp_array[4])
+                    lon_deg = np.floor(lon_num / 100)
+                    self.lon_deg[i_ens, j] = lon_deg + (((lon_num / 100.) - lon_deg) * 100.) / 60.
+                    self.lon_ref[i_ens][j] = temp_array[5]
+                    self.corr_qual[i_ens, j] = float(temp_array[6])
+                    self.num_sats[i_ens, j] = float(temp_array[7])
+                    self.hdop[i_ens, j] = float(temp_array[8])
+                    self.alt[i_ens, j] = float(temp_array[9])
+                    self.alt_unit[i_ens][j] = temp_array[10]
+                    self.geoid[i_ens, j] = temp_array[11]
+                    self.geoid_unit[i_ens][j] = temp_array[12]
+                    self.d_gps_age[i_ens, j] = float(temp_array[13])
+                    idx_star = temp_array[14].find('*')
+                    self.ref_stat_id[i_ens, j] = float(temp_array[15][:idx_star])
+
+                # VTG
+                elif specific_id == 205:
+                    self.vtg_sentence[i_ens][j] = temp
+                    self.vtg_delta_time[i_ens, j] = delta_time
+                    self.vtg_header[i_ens][j] = temp_array[0]
+                    self.course_true[i_ens, j] = valid_number(temp_array[1])
+                    self.true_indicator[i_ens][j] = temp_array[2]
+                    self.course_mag[i_ens, j] = valid_number(temp_array[3])
+                    self.mag_indicator[i_ens][j] = temp_array[4]
+                    self.speed_knots[i_ens, j] = valid_number(temp_array[5])
+                    self.knots_indicator[i_ens][j] = temp_array[6]
+                    self.speed_kph[i_ens, j] = valid_number(temp_array[7])
+                    self.kph_indicator[i_ens][j] = temp_array[8]
+                    idx_star = temp_array[9].find('*')
+                    self.mode_indicator[i_ens][j] = temp_array[9][:idx_star]
+
+                # Depth sounder
+                elif specific_id == 206:
+                    self.dbt_delta_time[i_ens, j] = delta_time
+                    self.dbt_header[i_ens][j] = temp_array[0]
+                    self.depth_ft[i_ens, j] = float(temp_array[1])
+                    self.ft_indicator[i_ens][j] = temp_array[2]
+                    self.depth_m[i_ens, j] = float(temp_array[3])
+                    self.m_indicator[i_ens][j] = temp_array[4]
+                    self.depth_fath[i_ens, j] = float(temp_array[5])
+                    idx_star = temp.find('*')
+                    self.fath_indicator[i_ens][j] = temp_array[6][:idx_star]
+
+                # External heading
+                elif specific_id == 207:
+                    self.hdt_delta_time[i_ens, j] = delta_time
+                    self.hdt_header[i_ens][j] = temp_array[0]
+                    self.heading_deg[i_ens, j] = float(temp_array[1])
+                    idx_star = temp.find('*')
+                    self.h_true_indicator[i_ens][j] = temp_array[2][:idx_star]
+
+            except (ValueError, EOFError, IndexError):
+                pass
+
     def gga_expand(self, n_ensembles):
         self.gga_delta_time = np.concatenate(
             (self.gga_delta_time, np.tile(np.nan, (1, n_ensembles)).T), axis=1)
@@ -615,6 +615,8 @@ class Python2Matlab(object):
         if len(meas.mb_tests) > 0:
             for test in meas_mat.mb_tests:
                 test.transect = Python2Matlab.reconfigure_transect(test.transect)
+                # Cached results are not saved
+                del test.results_cache
 
         # Adjust 1-D array to be row based
         for fit in meas_mat.extrap_fit.sel_fit:
@@ -706,4 +708,8 @@ class Python2Matlab(object):
         transect.date_time.start_serial_time = (transect.date_time.start_serial_time / seconds_day) \
                                                + time_correction
         transect.date_time.end_serial_time = (transect.date_time.end_serial_time / seconds_day) + time_correction
+
+        # Cached discharge components and their version are not saved
+        del transect.discharge_cache
+        del transect.data_version
         return transect
\ No newline at end of file
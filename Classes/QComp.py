@@ -83,58 +83,24 @@ class QComp(object):
             Extrapolation exponent
         """
 
-        # Use bottom track interpolation settings to determine the appropriate algorithms to apply
-        if data_in.boat_vel.bt_vel.interpolate == 'None':
-            processing = 'WR2'
-        elif data_in.boat_vel.bt_vel.interpolate == 'Linear':
-            processing = 'QRev'
-        else:
-            processing = 'RSL'
+        # Get the cross product, duration of each ensemble, and the components independent of the extrapolation
+        components = QComp.transect_components(data_in)
+        x_prod = components['x_prod']
+        delta_t = components['delta_t']
 
-        # Compute cross product
-        x_prod = QComp.cross_product(data_in)
-        
-        # Get index of ensembles in moving-boat portion of transect
-        in_transect_idx = data_in.in_transect_idx
-        
-        if processing == 'WR2':
-            # TRDI uses expanded delta time to handle invalid ensembles which can be caused by invalid BT
-            # WT, or depth.  QRev by default handles this invalid data through linear interpolation of the
-            # invalid data through linear interpolation of the invalid data type.  This if statement and
-            # associated code is required to maintain compatibility with WinRiver II discharge computations.
-            
-            # Determine valid ensembles
-            valid_ens = np.any(np.isnan(x_prod) == False) 
-            valid_ens = valid_ens[in_transect_idx]
-            
-            # Compute the ensemble duration using TRDI approach of expanding delta time to compensate
-            # for invalid ensembles
-            n_ens = len(valid_ens)
-            ens_dur = data_in.date_time.ens_duration_sec[in_transect_idx]
-            delta_t = np.tile([np.nan], n_ens)
-            cum_dur = 0
-            idx = 1
-            for j in range(idx, n_ens):
-                cum_dur = np.nansum(np.hstack([cum_dur, ens_dur[j]]))
-                if valid_ens[j]:
-                    delta_t[j] = cum_dur
-                    cum_dur = 0
-                    
-        else:
-            # For non-WR2 processing use actual ensemble duration
-            delta_t = data_in.date_time.ens_duration_sec[in_transect_idx]
-            
         # Compute measured or middle discharge
-        self.middle_cells = QComp.discharge_middle_cells(x_prod, data_in, delta_t)
+        self.middle_cells = np.copy(components['middle_cells'])
         self.middle_ens = np.nansum(self.middle_cells, 0)
         self.middle = np.nansum(self.middle_ens)
         
         # Compute the top discharge
-        self.top_ens = QComp.extrapolate_top(x_prod, data_in, delta_t, top_method, exponent)
+        self.top_ens = QComp.extrapolate_top(x_prod, data_in, delta_t, top_method, exponent,
+                                             extrap_data=components['top'])
         self.top = np.nansum(self.top_ens)
         
         # Compute the bottom discharge
-        self.bottom_ens = QComp.extrapolate_bot(x_prod, data_in, delta_t, bot_method, exponent)
+        self.bottom_ens = QComp.extrapolate_bot(x_prod, data_in, delta_t, bot_method, exponent,
+                                                extrap_data=components['bot'])
         self.bottom = np.nansum(self.bottom_ens)
         
         # Compute interpolated cell and ensemble discharge from computed
@@ -144,19 +110,10 @@ class QComp(object):
         self.int_cells, self.int_ens = QComp.discharge_interpolated(self.top_ens, self.middle_cells,
                                                                     self.bottom_ens, data_in)
         
-        # Compute right edge discharge
-        if data_in.edges.right.type != 'User Q':
-            self.right, self.right_idx = QComp.discharge_edge('right', data_in, top_method, bot_method, exponent)
-        else:
-            self.right = data_in.edges.right.user_discharge_cms
-            self.right_idx = []
-
-        # Compute left edge discharge
-        if data_in.edges.left.type != 'User Q':
-            self.left, self.left_idx = QComp.discharge_edge('left', data_in, top_method, bot_method, exponent)
-        else:
-            self.left = data_in.edges.left.user_discharge_cms
-            self.left_idx = []
+        # Compute right and left edge discharges
+        edges = QComp.discharge_edges(data_in, top_method, bot_method, exponent)
+        self.right, self.right_idx = edges['right']
+        self.left, self.left_idx = edges['left']
             
         # Compute moving-bed correction, if applicable.  Two checks are used to account for the
         # way the meas object is created.
@@ -196,6 +153,188 @@ class QComp(object):
         else:
             self.total = self.left + self.right + (self.middle + self.bottom + self.top) * self.correction_factor
 
+    @staticmethod
+    def transect_components(data_in):
+        """Gets the cross product and the discharge components of a transect that are independent of the
+        extrapolation methods and the edges. The components are stored in the discharge_cache of the transect and
+        reused until the processed data, start edge, navigation reference, or depth reference of the transect change.
+
+        Parameters
+        ----------
+        data_in: TransectData
+            Object of TransectData
+
+        Returns
+        -------
+        components: dict
+            key: tuple
+                Data version, start edge, navigation reference, and depth reference used to compute the components
+            x_prod: np.array(float)
+                Cross product computed from the cross product method
+            delta_t: np.array(float)
+                Duration of each ensemble
+            middle_cells: np.array(float)
+                Measured middle discharge by cell
+            top: tuple
+                Variables for the top extrapolation from top_extrap_data
+            bot: tuple
+                Variables for the bottom extrapolation from bot_extrap_data
+            distance_m: np.array(float)
+                Boat track distance for the ensembles in the moving-boat portion of the transect, computed when
+                first needed by interpolate_no_cells
+        """
+
+        key = (data_in.data_version, data_in.start_edge, data_in.boat_vel.selected, data_in.depths.selected)
+        components = data_in.discharge_cache
+        if components is not None and components['key'] == key:
+            return components
+
+        x_prod = QComp.cross_product(data_in)
+        delta_t = QComp.ensemble_delta_t(data_in, x_prod)
+        components = {'key': key,
+                      'x_prod': x_prod,
+                      'delta_t': delta_t,
+                      'middle_cells': QComp.discharge_middle_cells(x_prod, data_in, delta_t),
+                      'top': QComp.top_extrap_data(x_prod, data_in),
+                      'bot': QComp.bot_extrap_data(x_prod, data_in),
+                      'distance_m': None}
+
+        # A new dictionary is stored so copies of the transect sharing the previous components are not affected
+        data_in.discharge_cache = components
+
+        return components
+
+    @staticmethod
+    def ensemble_delta_t(data_in, x_prod):
+        """Computes the duration of each ensemble in the moving-boat portion of the transect.
+        The TRDI method using expanded delta time is applied if the processing method is WR2.
+
+        Parameters
+        ----------
+        data_in: TransectData
+            Object of TransectData
+        x_prod: np.array(float)
+            Cross product computed from the cross product method
+
+        Returns
+        -------
+        delta_t: np.array(float)
+            Duration of each ensemble
+        """
+
+        # Get index of ensembles in moving-boat portion of transect
+        in_transect_idx = data_in.in_transect_idx
+
+        # Use bottom track interpolation settings to determine the appropriate algorithms to apply
+        if data_in.boat_vel.bt_vel.interpolate == 'None':
+            # TRDI uses expanded delta time to handle invalid ensembles which can be caused by invalid BT
+            # WT, or depth.  QRev by default handles this invalid data through linear interpolation of the
+            # invalid data through linear interpolation of the invalid data type.  This if statement and
+            # associated code is required to maintain compatibility with WinRiver II discharge computations.
+            
+            # Determine valid ensembles
+            valid_ens = np.any(np.isnan(x_prod) == False) 
+            valid_ens = valid_ens[in_transect_idx]
+            
+            # Compute the ensemble duration using TRDI approach of expanding delta time to compensate
+            # for invalid ensembles
+            n_ens = len(valid_ens)
+            ens_dur = data_in.date_time.ens_duration_sec[in_transect_idx]
+            delta_t = np.tile([np.nan], n_ens)
+            cum_dur = 0
+            idx = 1
+            for j in range(idx, n_ens):
+                cum_dur = np.nansum(np.hstack([cum_dur, ens_dur[j]]))
+                if valid_ens[j]:
+                    delta_t[j] = cum_dur
+                    cum_dur = 0
+
+        else:
+            # For non-WR2 processing use actual ensemble duration
+            delta_t = data_in.date_time.ens_duration_sec[in_transect_idx]
+
+        return delta_t
+
+    @staticmethod
+    def extrap_combinations(data_in, combinations):
+        """Computes the discharge of a transect for several combinations of top method, bottom method, and
+        exponent. The cross product, measured discharge, and the extrapolation variables, which are independent of
+        the extrapolation method, are obtained from transect_components and the top and bottom discharges are
+        computed once for each unique method and exponent. Edge discharges are only recomputed for each combination
+        if the edge velocity method uses the extrapolation. Moving-bed corrections are not applied.
+
+        Parameters
+        ----------
+        data_in: TransectData
+            Object of TransectData
+        combinations: list
+            List of tuples of top method, bottom method, and exponent
+
+        Returns
+        -------
+        total: np.array(float)
+            Total discharge for each combination
+        top: np.array(float)
+            Top discharge for each combination
+        bottom: np.array(float)
+            Bottom discharge for each combination
+        """
+
+        # Get the duration of each ensemble, measured discharge, and variables for the top and bottom extrapolation
+        components = QComp.transect_components(data_in)
+        delta_t = components['delta_t']
+        middle_ens = np.nansum(components['middle_cells'], 0)
+        idx_top, idx_top3, top_rng, top_component, top_cell_size, top_cell_depth, depth_ens, top_z = \
+            components['top']
+        idx_bot, bot_rng, bot_component, bot_cell_size, bot_cell_depth, depth_ens, bot_z = components['bot']
+
+        # Edge discharges do not depend on the extrapolation unless the edge velocity is computed from the profile
+        edges = None
+        edges_extrap = data_in.edges.vel_method == 'VectorProf'
+
+        total = np.tile(np.nan, len(combinations))
+        top = np.tile(np.nan, len(combinations))
+        bottom = np.tile(np.nan, len(combinations))
+        top_ens_computed = {}
+        bot_ens_computed = {}
+        q = QComp()
+        for n, (top_method, bot_method, exponent) in enumerate(combinations):
+
+            # Compute the top discharge, the constant and 3-point methods do not use the exponent
+            top_key = (top_method, exponent if top_method == 'Power' else None)
+            if top_key not in top_ens_computed:
+                top_ens_computed[top_key] = QComp.discharge_top(top_method, exponent, idx_top, idx_top3, top_rng,
+                                                                top_component, top_cell_size, top_cell_depth,
+                                                                depth_ens, delta_t, top_z)
+            q.top_ens = top_ens_computed[top_key]
+            q.top = np.nansum(q.top_ens)
+
+            # Compute the bottom discharge
+            bot_key = (bot_method, exponent)
+            if bot_key not in bot_ens_computed:
+                bot_ens_computed[bot_key] = QComp.discharge_bot(bot_method, exponent, idx_bot, bot_rng,
+                                                                bot_component, bot_cell_size, bot_cell_depth,
+                                                                depth_ens, delta_t, bot_z)
+            q.bottom_ens = bot_ens_computed[bot_key]
+            q.bottom = np.nansum(q.bottom_ens)
+
+            # Compute interpolated ensemble discharge from computed measured discharge
+            q.middle_ens = np.copy(middle_ens)
+            q.interpolate_no_cells(data_in)
+            q.middle = np.nansum(q.middle_ens)
+
+            # Compute edge discharges
+            if edges is None or edges_extrap:
+                edges = QComp.discharge_edges(data_in, top_method, bot_method, exponent)
+            q.right = edges['right'][0]
+            q.left = edges['left'][0]
+
+            total[n] = q.left + q.right + q.middle + q.bottom + q.top
+            top[n] = q.top
+            bottom[n] = q.bottom
+
+        return total, top, bottom
+
     @staticmethod
     def qrev_mat_in(meas_struct):
         """Processes the Matlab data structure to obtain a list of QComp objects containing the discharge data from the
@@ -290,12 +429,16 @@ class QComp(object):
                 unit_q_depth = (q_ensemble / depth_selected.depth_processed_m[transect_data.in_transect_idx]) \
                     / transect_data.date_time.ens_duration_sec[transect_data.in_transect_idx]
 
-                # Compute boat track
-                boat_track = BoatStructure.compute_boat_track(transect_data, transect_data.boat_vel.selected)
+                # Compute boat track, which is independent of the extrapolation and edges
+                components = QComp.transect_components(transect_data)
+                if components['distance_m'] is None:
+                    boat_track = BoatStructure.compute_boat_track(transect_data, transect_data.boat_vel.selected)
+                    components['distance_m'] = boat_track['distance_m'][transect_data.in_transect_idx]
+                distance = components['distance_m']
 
                 # Create strict monotonic vector for 1-D interpolation
                 q_mono = unit_q_depth
-                x_mono = boat_track['distance_m'][transect_data.in_transect_idx]
+                x_mono = np.copy(distance)
 
                 # Identify duplicate values, and replace with an average
                 dups = self.group_consecutives(x_mono)
@@ -312,8 +455,7 @@ class QComp(object):
 
                 # Interpolate unit q
                 if np.any(valid):
-                    unit_q_int = np.interp(boat_track['distance_m'][transect_data.in_transect_idx], x_mono[valid],
-                                           q_mono[valid], left=np.nan, right=np.nan)
+                    unit_q_int = np.interp(distance, x_mono[valid], q_mono[valid], left=np.nan, right=np.nan)
                 else:
                     unit_q_int = 0
 
@@ -433,7 +575,7 @@ class QComp(object):
         return q_mid_cells
 
     @staticmethod
-    def extrapolate_top(xprod, transect, delta_t, top_method=None, exponent=None):
+    def extrapolate_top(xprod, transect, delta_t, top_method=None, exponent=None, extrap_data=None):
         """Computes the extrapolated top discharge.
 
         Parameters
@@ -448,6 +590,8 @@ class QComp(object):
             Specifies method to use for top extrapolation
         exponent: float
             Exponent to use for power extrapolation
+        extrap_data: tuple
+            Variables from top_extrap_data for xprod, computed if not provided
 
         Returns
         -------
@@ -459,6 +603,49 @@ class QComp(object):
             top_method = transect.extrap.top_method
             exponent = transect.extrap.exponent
 
+        # Compute top variables
+        if extrap_data is None:
+            extrap_data = QComp.top_extrap_data(xprod, transect)
+        idx_top, idx_top3, top_rng, component, cell_size, cell_depth, depth_ens, z = extrap_data
+
+        # Compute top discharge
+        q_top = QComp.discharge_top(top_method, exponent, idx_top, idx_top3, top_rng,
+                                    component, cell_size, cell_depth,
+                                    depth_ens, delta_t, z)
+
+        return q_top
+
+    @staticmethod
+    def top_extrap_data(xprod, transect):
+        """Computes the variables used for the top extrapolation, which are independent of the extrapolation method.
+
+        Parameters
+        ----------
+        xprod: np.array(float)
+            Cross product computed from the cross product method
+        transect: TransectData
+            Object of TransectData
+
+        Returns
+        -------
+        idx_top: np.array(int)
+            Index to the topmost valid depth cell in each ensemble
+        idx_top3: np.array(int)
+            Index to the top 3 valid depth cells in each ensemble
+        top_rng: np.array(float)
+            Range from the water surface to the top of the topmost cell
+        component: np.array(float)
+            Cross product in the moving-boat portion of the transect
+        cell_size: np.array(float)
+            Size of valid cells
+        cell_depth: np.array(float)
+            Depth of valid cells
+        depth_ens: np.array(float)
+            Depth of each ensemble
+        z: np.array(float)
+            Distance from the bottom to each valid cell
+        """
+
         # Get index for ensembles in moving-boat portion of transect
         in_transect_idx = transect.in_transect_idx
 
@@ -483,12 +670,7 @@ class QComp(object):
         cell_size[valid_data == False] = np.nan
         cell_depth[valid_data == False] = np.nan
 
-        # Compute top discharge
-        q_top = QComp.discharge_top(top_method, exponent, idx_top, idx_top3, top_rng,
-                                    xprod[:, in_transect_idx], cell_size, cell_depth,
-                                    depth_ens, delta_t, z)
-
-        return q_top
+        return idx_top, idx_top3, top_rng, xprod[:, in_transect_idx], cell_size, cell_depth, depth_ens, z
 
     @staticmethod
     def discharge_top(top_method, exponent, idx_top, idx_top_3, top_rng, component, cell_size, cell_depth,
@@ -540,9 +722,8 @@ class QComp(object):
         elif top_method == 'Constant':
             n_ensembles = len(delta_t)
             top_value = np.tile([np.nan], n_ensembles)
-            for j in range(n_ensembles):
-                if idx_top[j] >= 0:
-                    top_value[j] = delta_t[j] * component[idx_top[j], j] * top_rng[j]
+            ens = np.where(idx_top >= 0)[0]
+            top_value[ens] = delta_t[ens] * component[idx_top[ens], ens] * top_rng[ens]
 
         # Top 3-point extrapolation
         elif top_method == '3-Point':
@@ -554,23 +735,25 @@ class QComp(object):
             # Preallocate qtop vector
             top_value = np.tile([np.nan], n_ensembles)
 
-            for j in range(n_ensembles):
-
-                if (n_bins[j] < 6) and (n_bins[j] > 0) and (idx_top[j] >= 0):
-                    top_value[j] = delta_t[j] * component[idx_top[j], j] * top_rng[j]
-
-                # If 6 or more bins use 3-pt at top
-                if n_bins[j] > 5:
-                    sumd = np.nansum(cell_depth[idx_top_3[0:3, j], j])
-                    sumd2 = np.nansum(cell_depth[idx_top_3[0:3, j], j]**2)
-                    sumq = np.nansum(component[idx_top_3[0:3, j], j])
-                    sumqd = np.nansum(component[idx_top_3[0:3, j], j] * cell_depth[idx_top_3[0:3, j], j])
-                    delta = 3 * sumd2 - sumd**2
-                    a = (3 * sumqd - sumq * sumd) / delta
-                    b = (sumq * sumd2 - sumqd * sumd) / delta
-                    # Compute discharge for 3-pt fit
-                    qo = (a * top_rng[j]**2) / 2 + b * top_rng[j]
-                    top_value[j] = delta_t[j] * qo
+            # If less than 6 bins use constant at top
+            ens = np.where(np.logical_and(np.logical_and(n_bins < 6, n_bins > 0), idx_top >= 0))[0]
+            top_value[ens] = delta_t[ens] * component[idx_top[ens], ens] * top_rng[ens]
+
+            # If 6 or more bins use 3-pt at top
+            ens = np.where(n_bins > 5)[0]
+            if len(ens) > 0:
+                depth_3 = cell_depth[idx_top_3[0:3, ens], ens]
+                component_3 = component[idx_top_3[0:3, ens], ens]
+                sumd = np.nansum(depth_3, 0)
+                sumd2 = np.nansum(depth_3**2, 0)
+                sumq = np.nansum(component_3, 0)
+                sumqd = np.nansum(component_3 * depth_3, 0)
+                delta = 3 * sumd2 - sumd**2
+                a = (3 * sumqd - sumq * sumd) / delta
+                b = (sumq * sumd2 - sumqd * sumd) / delta
+                # Compute discharge for 3-pt fit
+                qo = (a * top_rng[ens]**2) / 2 + b * top_rng[ens]
+                top_value[ens] = delta_t[ens] * qo
 
         return top_value
 
@@ -597,37 +780,33 @@ class QComp(object):
         """
 
         # Get data from transect object
-        valid_data1 = np.copy(transect.w_vel.valid_data[0, :, :])
-        valid_data2 = np.isnan(xprod) == False
-        valid_data = valid_data1 * valid_data2
         trans_select = getattr(transect.depths, transect.depths.selected)
         cell_size = trans_select.depth_cell_size_m
         cell_depth = trans_select.depth_cell_depth_m
 
-        # Preallocate variables
-        n_ensembles = valid_data.shape[1]
-        idx_top = np.tile(-1, valid_data.shape[1]).astype(int)
+        # Identify valid cells and the number of valid cells above and including each cell
+        valid_data = np.isnan(xprod) == False
+        n_valid = np.cumsum(valid_data, 0)
+        ens = np.arange(valid_data.shape[1])
+
+        # Identify topmost valid cell, the first cell is used if there are no valid cells
+        idx_top = np.argmax(valid_data, 0)
+
+        # Identify topmost 3 valid cells in ensembles with at least 3 valid cells
         idx_top_3 = np.tile(-1, (3, valid_data.shape[1])).astype(int)
-        top_rng = np.tile([np.nan], n_ensembles)
+        ens_3 = n_valid[-1, :] > 2
+        for n in range(3):
+            idx_top_3[n, ens_3] = np.argmax(np.logical_and(valid_data, n_valid == n + 1), 0)[ens_3]
 
-        # Loop through ensembles
-        for n in range(n_ensembles):
-            # Identify topmost 1 and 3 valid cells
-            idx_temp = np.where(np.isnan(xprod[:, n]) == False)[0]
-            if len(idx_temp) > 0:
-                idx_top[n] = idx_temp[0]
-                if len(idx_temp) > 2:
-                    idx_top_3[:, n] = idx_temp[0:3]
-                # Compute top range
-                top_rng[n] = cell_depth[idx_top[n], n] - 0.5 * cell_size[idx_top[n], n]
-            else:
-                top_rng[n] = 0
-                idx_top[n] = 0
+        # Compute top range
+        top_rng = np.tile([0.], valid_data.shape[1])
+        ens_valid = n_valid[-1, :] > 0
+        top_rng[ens_valid] = cell_depth[idx_top, ens][ens_valid] - 0.5 * cell_size[idx_top, ens][ens_valid]
 
         return idx_top, idx_top_3, top_rng
 
     @staticmethod
-    def extrapolate_bot(xprod, transect, delta_t, bot_method=None, exponent=None):
+    def extrapolate_bot(xprod, transect, delta_t, bot_method=None, exponent=None, extrap_data=None):
         """Computes the extrapolated bottom discharge
 
         Parameters
@@ -642,6 +821,8 @@ class QComp(object):
             Bottom extrapolation method
         exponent: float
             Bottom extrapolation exponent
+        extrap_data: tuple
+            Variables from bot_extrap_data for xprod, computed if not provided
 
         Returns
         -------
@@ -654,6 +835,47 @@ class QComp(object):
             bot_method = transect.extrap.bot_method
             exponent = transect.extrap.exponent
 
+        # Compute bottom variables
+        if extrap_data is None:
+            extrap_data = QComp.bot_extrap_data(xprod, transect)
+        idx_bot, bot_rng, component, cell_size, cell_depth, depth_ens, z = extrap_data
+
+        # Compute bottom discharge
+        q_bot = QComp.discharge_bot(bot_method, exponent, idx_bot, bot_rng, component,
+                                    cell_size, cell_depth, depth_ens, delta_t, z)
+
+        return q_bot
+
+    @staticmethod
+    def bot_extrap_data(xprod, transect):
+        """Computes the variables used for the bottom extrapolation, which are independent of the extrapolation
+        method.
+
+        Parameters
+        ----------
+        xprod: np.array(float)
+            Cross product of the water and boat velocities
+        transect: TransectData
+            Object of TransectData
+
+        Returns
+        -------
+        idx_bot: np.array(int)
+            Index to the bottom most valid depth cell in each ensemble
+        bot_rng: np.array(float)
+            Range from the streambed to the bottom of the bottom most cell
+        xprod: np.array(float)
+            Cross product in the moving-boat portion of the transect
+        cell_size: np.array(float)
+            Size of valid cells
+        cell_depth: np.array(float)
+            Depth of valid cells
+        depth_ens: np.array(float)
+            Depth of each ensemble
+        z: np.array(float)
+            Distance from the bottom to each valid cell
+        """
+
         # Get index for ensembles in moving-boat portion of transect
         in_transect_idx = transect.in_transect_idx
         xprod = xprod[:, in_transect_idx]
@@ -674,11 +896,8 @@ class QComp(object):
         z[z < 0] = np.nan
         cell_size[valid_data == False] = np.nan
         cell_depth[valid_data == False] = np.nan
-        # Compute bottom discharge
-        q_bot = QComp.discharge_bot(bot_method, exponent, idx_bot, bot_rng, xprod,
-                                    cell_size, cell_depth, depth_ens, delta_t, z)
 
-        return q_bot
+        return idx_bot, bot_rng, xprod, cell_size, cell_depth, depth_ens, z
 
     @staticmethod
     def discharge_bot(bot_method, exponent, idx_bot, bot_rng, component,
@@ -731,9 +950,8 @@ class QComp(object):
             depth_ok = (cell_depth > np.tile(cutoff_depth, (cell_depth.shape[0], 1)))
             component_ok = np.isnan(component) == False
             use_ns = depth_ok * component_ok
-            for j in range(len(delta_t)):
-                if idx_bot[j] >= 0:
-                    use_ns[idx_bot[j], j] = 1
+            ens = np.where(idx_bot >= 0)[0]
+            use_ns[idx_bot[ens], ens] = 1
 
             # Create cross product and z arrays for the data to be used in
             # no slip computations
@@ -772,9 +990,7 @@ class QComp(object):
 
         # Identify valid data
         in_transect_idx = transect.in_transect_idx
-        valid_data1 = np.copy(transect.w_vel.valid_data[0, :, in_transect_idx].T)
-        valid_data2 = np.isnan(x_prod) == False
-        valid_data = valid_data1 * valid_data2
+        valid_data = np.logical_not(np.isnan(x_prod))
 
         # Assign transect properties to local variables
         trans_selected = getattr(transect.depths, transect.depths.selected)
@@ -782,21 +998,14 @@ class QComp(object):
         cell_depth = trans_selected.depth_cell_depth_m[:, in_transect_idx]
         depth_ens = trans_selected.depth_processed_m[in_transect_idx]
 
-        # Preallocate variables
-        n_ensembles = valid_data.shape[1]
+        # Identify bottom most valid cell
+        ens = np.where(np.any(valid_data, 0))[0]
         idx_bot = np.tile(-1, (valid_data.shape[1])).astype(int)
-        bot_rng = np.tile([np.nan], n_ensembles)
+        idx_bot[ens] = valid_data.shape[0] - 1 - np.argmax(valid_data[::-1, ens], 0)
 
-        for n in range(n_ensembles):
-            # Identifying bottom most valid cell
-            idx_temp = np.where(np.logical_not(np.isnan(x_prod[:, n])))[0]
-            if len(idx_temp) > 0:
-                idx_temp = idx_temp[-1]
-                idx_bot[n] = idx_temp
-                # Compute bottom range
-                bot_rng[n] = depth_ens[n] - cell_depth[idx_bot[n], n] - 0.5 * cell_size[idx_bot[n], n]
-            else:
-                bot_rng[n] = 0
+        # Compute bottom range
+        bot_rng = np.tile([0.], valid_data.shape[1])
+        bot_rng[ens] = depth_ens[ens] - cell_depth[idx_bot[ens], ens] - 0.5 * cell_size[idx_bot[ens], ens]
 
         return idx_bot, bot_rng
 
@@ -825,34 +1034,181 @@ class QComp(object):
             List of valid edge ensembles
         """
 
+        # Compute the edge ensembles, depth, and velocity and the discharge for the current edge settings
+        edge = QComp.edge_data([edge_loc], transect, top_method, bot_method, exponent)[edge_loc]
+        edge_q = QComp.edge_discharge_candidates(edge_loc, transect, edge=edge)[0]
+
+        return edge_q, edge['idx']
+
+    @staticmethod
+    def discharge_edges(transect, top_method=None, bot_method=None, exponent=None):
+        """Computes the discharge of the right and left edges. The edge ensembles, depths, and velocities of both
+        edges are computed in one pass by edge_data. Edges of type User Q use the user supplied discharge.
+
+        Parameters
+        ----------
+        transect: TransectData
+            Object of TransectData
+        top_method: str
+            Top extrapolation method
+        bot_method: str
+            Bottom extrapolation method
+        exponent: float
+            Exponent
+
+        Returns
+        -------
+        edges: dict
+            Tuple of the edge discharge and the list of edge ensembles for the right and left edges
+        """
+
+        edges = {}
+        edge_locs = []
+        for edge_loc in ['right', 'left']:
+            edge_select = getattr(transect.edges, edge_loc)
+            if edge_select.type == 'User Q':
+                edges[edge_loc] = (edge_select.user_discharge_cms, [])
+            else:
+                edge_locs.append(edge_loc)
+
+        if len(edge_locs) > 0:
+            data = QComp.edge_data(edge_locs, transect, top_method, bot_method, exponent)
+            for edge_loc in edge_locs:
+                edge_q = QComp.edge_discharge_candidates(edge_loc, transect, edge=data[edge_loc])[0]
+                edges[edge_loc] = (edge_q, data[edge_loc]['idx'])
+
+        return edges
+
+    @staticmethod
+    def edge_data(edge_locs, transect, top_method=None, bot_method=None, exponent=None):
+        """Computes the ensembles, average depth, and velocity of the specified edges. The valid ensembles, boat
+        track, and ensemble mean velocities used by the TRDI method are computed once for all edges.
+
+        Parameters
+        ----------
+        edge_locs: list
+            Edge locations (left, right)
+        transect: TransectData
+            Object of TransectData
+        top_method: str
+            Top extrapolation method
+        bot_method: str
+            Bottom extrapolation method
+        exponent: float
+            Exponent
+
+        Returns
+        -------
+        edges: dict
+            Dictionary for each edge location with the following keys
+            idx: np.array
+                Indices of ensembles used to compute edge discharge
+            depth_avg: float
+                Average depth of the edge ensembles
+            vel_mag: float
+                Magnitude of edge velocity
+            vel_sign: int
+                Sign of edge velocity (discharge)
+        """
+
         # Determine what ensembles to use for edge computation.
         # The method of determining varies by manufacturer
-        edge_idx = QComp.edge_ensembles(edge_loc, transect)
+        valid_ens = None
+        if transect.adcp.manufacturer == 'TRDI':
+            valid_ens = QComp.valid_edge_ens(transect)
+        edges_idx = [QComp.edge_ensembles(edge_loc, transect, valid_ens) for edge_loc in edge_locs]
 
         # Average depth for the edge ensembles
         trans_select = getattr(transect.depths, transect.depths.selected)
-        depth = trans_select.depth_processed_m[edge_idx]
-        depth_avg = np.nanmean(depth)
-
-        # Edge distance
-        edge_selected = getattr(transect.edges, edge_loc)
-        edge_dist = edge_selected.distance_m
+        depth_avg = [np.nanmean(trans_select.depth_processed_m[edge_idx]) for edge_idx in edges_idx]
 
         # Compute edge velocity and sign
-        edge_vel_sign, edge_vel_mag = QComp.edge_velocity(edge_idx, transect, top_method, bot_method, exponent)
+        vel_mag = np.tile(0., len(edge_locs))
+        vel_sign = np.tile(1., len(edge_locs))
+        with_data = [n for n, edge_idx in enumerate(edges_idx) if len(edge_idx) > 0]
+        if transect.edges.vel_method == 'MeasMag':
+            if len(with_data) > 0:
+                vel_mag[with_data], vel_sign[with_data] = \
+                    QComp.edge_velocities_trdi([edges_idx[n] for n in with_data], transect)
+        else:
+            for n in with_data:
+                vel_sign[n], vel_mag[n] = QComp.edge_velocity(edges_idx[n], transect, top_method, bot_method,
+                                                              exponent)
 
-        # Compute edge coefficient
-        coef = QComp.edge_coef(edge_loc, transect)
+        edges = {}
+        for n, edge_loc in enumerate(edge_locs):
+            edges[edge_loc] = {'idx': edges_idx[n],
+                               'depth_avg': depth_avg[n],
+                               'vel_mag': vel_mag[n],
+                               'vel_sign': vel_sign[n]}
 
-        # Compute edge discharge
-        edge_q = coef * depth_avg * edge_vel_mag * edge_dist * edge_vel_sign
-        if np.isnan(edge_q):
-            edge_q = 0
+        return edges
 
-        return edge_q, edge_idx
+    @staticmethod
+    def edge_discharge_candidates(edge_loc, transect, distances=None, edge_types=None, coefs=None, edge=None,
+                                  top_method=None, bot_method=None, exponent=None):
+        """Computes the discharge of an edge for one or more candidate distances, edge types, or custom
+        coefficients. The edge ensembles, depth, and velocity are computed once and the discharge of all candidates
+        is computed with array operations. Candidates not specified use the current edge settings.
+
+        Parameters
+        ----------
+        edge_loc: str
+            Edge location (left or right)
+        transect: TransectData
+            Object of TransectData
+        distances: np.array(float)
+            Candidate distances to shore, in m
+        edge_types: np.array(str)
+            Candidate edge types (Triangular, Rectangular, Custom, User Q)
+        coefs: np.array(float)
+            Candidate custom coefficients, used for the Custom edge type
+        edge: dict
+            Edge ensembles, depth, and velocity from edge_data, computed if not provided
+        top_method: str
+            Top extrapolation method
+        bot_method: str
+            Bottom extrapolation method
+        exponent: float
+            Exponent
+
+        Returns
+        -------
+        edge_q: np.array(float)
+            Edge discharge for each candidate
+        """
+
+        edge_select = getattr(transect.edges, edge_loc)
+        if distances is None:
+            distances = edge_select.distance_m
+        if edge_types is None:
+            edge_types = edge_select.type
+        if coefs is None:
+            coefs = edge_select.cust_coef
+        distances, edge_types, coefs = np.broadcast_arrays(np.array(distances, dtype=float).reshape(-1),
+                                                           np.array(edge_types, dtype=object).reshape(-1),
+                                                           np.array(coefs, dtype=float).reshape(-1))
+
+        # User supplied edge discharge
+        edge_q = np.tile(np.nan, distances.shape)
+        user_q = edge_types == 'User Q'
+        edge_q[user_q] = edge_select.user_discharge_cms
+
+        # Compute edge discharge
+        computed = np.logical_not(user_q)
+        if np.any(computed):
+            if edge is None:
+                edge = QComp.edge_data([edge_loc], transect, top_method, bot_method, exponent)[edge_loc]
+            coef = QComp.edge_coefs(edge_types[computed], distances[computed], edge['depth_avg'],
+                                    transect.edges.rec_edge_method, coefs[computed])
+            q = coef * edge['depth_avg'] * edge['vel_mag'] * distances[computed] * edge['vel_sign']
+            q[np.isnan(q)] = 0
+            edge_q[computed] = q
+
+        return edge_q
 
     @staticmethod
-    def edge_ensembles(edge_loc, transect):
+    def edge_ensembles(edge_loc, transect, valid_ens=None):
         """This function computes the starting and ending ensemble numbers for an edge.
 
          This method uses either the method used by TRDI which used the specified number of valid ensembles or SonTek
@@ -864,6 +1220,8 @@ class QComp(object):
             Edge location (left or right)
         transect: TransectData
             Object of TransectData
+        valid_ens: np.array(bool)
+            Valid ensembles from valid_edge_ens for the TRDI method, computed if not provided
 
         Returns
         -------
@@ -880,7 +1238,8 @@ class QComp(object):
             # Determine the indices of the edge ensembles which contain
             # the specified number of valid ensembles
             # noinspection PyTypeChecker
-            valid_ens = QComp.valid_edge_ens(transect)
+            if valid_ens is None:
+                valid_ens = QComp.valid_edge_ens(transect)
             if num_edge_ens > len(valid_ens):
                 num_edge_ens = len(valid_ens)
             if edge_loc.lower() == transect.start_edge.lower():
@@ -974,18 +1333,46 @@ class QComp(object):
             Sign of edge velocity (discharge)
         """
 
-        # Assign water velocity to local variables
-        x_vel = transect.w_vel.u_processed_mps[:, edge_idx]
-        y_vel = transect.w_vel.v_processed_mps[:, edge_idx]
+        edge_vel_mag, edge_vel_sign = QComp.edge_velocities_trdi([edge_idx], transect)
+
+        return edge_vel_mag[0], edge_vel_sign[0]
+
+    @staticmethod
+    def edge_velocities_trdi(edges_idx, transect):
+        """Computes edge velocity magnitude and sign using TRDI's method for several edges. The mean velocity of
+        each ensemble is computed once for the ensembles of all edges.
+
+        Parameters
+        ----------
+        edges_idx: list
+            List of indices of ensembles used to compute the discharge of each edge
+        transect: TransectData
+            Object of TransectData
+
+        Returns
+        -------
+        edge_vel_mag: np.array(float)
+            Magnitude of edge velocity for each edge
+        edge_vel_sign: np.array(float)
+            Sign of edge velocity (discharge) for each edge
+        """
+
+        # Assign water velocity of the ensembles of all edges to local variables
+        idx = np.hstack(edges_idx).astype(int)
+        x_vel = transect.w_vel.u_processed_mps[:, idx]
+        y_vel = transect.w_vel.v_processed_mps[:, idx]
 
         # Use only valid data
-        valid = np.copy(transect.w_vel.valid_data[0, :, edge_idx].T)
+        valid = transect.w_vel.valid_data[0][:, idx]
         x_vel[np.logical_not(valid)] = np.nan
         y_vel[np.logical_not(valid)] = np.nan
 
-        # Compute the mean velocity components
-        x_vel_avg = np.nanmean(np.nanmean(x_vel, 0))
-        y_vel_avg = np.nanmean(np.nanmean(y_vel, 0))
+        # Compute the mean velocity components of each ensemble and each edge
+        x_vel_ens = np.nanmean(x_vel, 0)
+        y_vel_ens = np.nanmean(y_vel, 0)
+        bounds = np.cumsum([0] + [len(edge_idx) for edge_idx in edges_idx])
+        x_vel_avg = np.array([np.nanmean(x_vel_ens[bounds[n]:bounds[n + 1]]) for n in range(len(edges_idx))])
+        y_vel_avg = np.array([np.nanmean(y_vel_ens[bounds[n]:bounds[n + 1]]) for n in range(len(edges_idx))])
 
         # Compute magnitude and direction
         edge_dir, edge_vel_mag = cart2pol(x_vel_avg, y_vel_avg)
@@ -1008,9 +1395,10 @@ class QComp(object):
             b_vel_x = np.tile([np.nan], transect.boat_vel.bt_vel.u_processed_mps.shape)
             b_vel_y = np.tile([np.nan], transect.boat_vel.bt_vel.v_processed_mps.shape)
 
-        track_x = np.nancumsum(b_vel_x[in_transect_idx] * ens_delta_time[in_transect_idx])
-        track_y = np.nancumsum(b_vel_y[in_transect_idx] * ens_delta_time[in_transect_idx])
-        boat_dir, boat_mag = cart2pol(track_x[-1], track_y[-1])
+        # Only the end of the boat track is needed
+        track_x = np.nansum(b_vel_x[in_transect_idx] * ens_delta_time[in_transect_idx])
+        track_y = np.nansum(b_vel_y[in_transect_idx] * ens_delta_time[in_transect_idx])
+        boat_dir, boat_mag = cart2pol(track_x, track_y)
         unit_track_x, unit_track_y = pol2cart(boat_dir, 1)
         unit_x_prod = (unit_water_x * unit_track_y - unit_water_y * unit_track_x) * dir_sign
         edge_vel_sign = np.sign(unit_x_prod)
@@ -1426,40 +1814,65 @@ class QComp(object):
 
         # Process appropriate edge type
         edge_select = getattr(transect.edges, edge_loc)
-        if edge_select.type == 'Triangular':
-            coef = 0.3535
-
-        elif edge_select.type == 'Rectangular':
-            # Rectangular edge coefficient depends on the rec_edge_method.
-            # 'Fixed' is compatible with the method used by TRDI.
-            # 'Variable is compatible with the method used by SonTek
+        if edge_select.type in ['Triangular', 'Rectangular', 'Custom']:
+            depth_edge = np.nan
+            if edge_select.type == 'Rectangular' and transect.edges.rec_edge_method != 'Fixed':
+                # Compute the mean depth for edge
+                edge_idx = QComp.edge_ensembles(edge_loc, transect)
+                trans_select = getattr(transect.depths, transect.depths.selected)
+                depth_edge = np.nanmean(trans_select.depth_processed_m[edge_idx])
 
-            if transect.edges.rec_edge_method == 'Fixed':
-                # Fixed Method
-                coef = 0.91
+            coef = QComp.edge_coefs(np.array([edge_select.type]), np.array([edge_select.distance_m], dtype=float),
+                                    depth_edge, transect.edges.rec_edge_method,
+                                    np.array([edge_select.cust_coef], dtype=float))[0]
+        else:
+            coef = []
 
-            else:
-                # Variable method
-                # Get edge distance
-                dist = edge_select.dist_m
+        return coef
 
-                # Get edge ensembles to use
-                edge_idx = QComp.edge_ensembles(edge_loc, transect)
+    @staticmethod
+    def edge_coefs(edge_types, distances, depth_edge, rec_edge_method, cust_coefs):
+        """Computes the edge coefficients for arrays of edge types and distances.
 
-                # Compute the mean depth for edge
-                trans_select = getattr(transect.depths, transect.depths.selected)
-                depth_edge = np.nanmean(trans_select.depth_processed_m[edge_idx])
+        Parameters
+        ----------
+        edge_types: np.array(str)
+            Edge type for each coefficient (Triangular, Rectangular, Custom)
+        distances: np.array(float)
+            Distance to shore for each coefficient, in m
+        depth_edge: float
+            Mean depth of the edge ensembles, in m
+        rec_edge_method: str
+            Method for rectangular edges (Fixed, Variable)
+        cust_coefs: np.array(float)
+            Custom coefficient for each coefficient
 
-                # Compute coefficient using equation 34 from Principle of River Discharge Measurement, SonTek, 2003
-                coef = (1 - ((0.35 / 4) * (depth_edge / dist) * (1 - np.exp(-4 * (dist / depth_edge))))) / \
-                    (1 - 0.35 * np.exp(-4 * (dist / depth_edge)))
+        Returns
+        -------
+        coef: np.array(float)
+            Edge coefficient for accounting for velocity distribution and edge shape
+        """
 
-        elif edge_select.type == 'Custom':
-            # Custom user supplied coefficient
-            coef = edge_select.cust_coef
+        coef = np.tile(np.nan, distances.shape)
+        coef[edge_types == 'Triangular'] = 0.3535
 
+        # Rectangular edge coefficient depends on the rec_edge_method.
+        # 'Fixed' is compatible with the method used by TRDI.
+        # 'Variable is compatible with the method used by SonTek
+        rectangular = edge_types == 'Rectangular'
+        if rec_edge_method == 'Fixed':
+            # Fixed Method
+            coef[rectangular] = 0.91
         else:
-            coef = []
+            # Variable method
+            # Compute coefficient using equation 34 from Principle of River Discharge Measurement, SonTek, 2003
+            dist = distances[rectangular]
+            coef[rectangular] = (1 - ((0.35 / 4) * (depth_edge / dist) * (1 - np.exp(-4 * (dist / depth_edge))))) / \
+                (1 - 0.35 * np.exp(-4 * (dist / depth_edge)))
+
+        # Custom user supplied coefficient
+        custom = edge_types == 'Custom'
+        coef[custom] = cust_coefs[custom]
 
         return coef
 
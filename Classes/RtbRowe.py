@@ -5,6 +5,7 @@ import numpy as np
 import struct
 import binascii
 import math
+import mmap
 
 
 class RtbRowe(object):
@@ -27,83 +28,194 @@ class RtbRowe(object):
     BAD_VEL = 88.888                    # RTB Bad Velocity
     PD0_BAD_VEL = -32768                # PD0 Bad Velocity
     PD0_BAD_AMP = 255                   # PD0 Bad Amplitude
+    DELIMITER = b'\x80' * 16          # RTB ensemble delimiter
+    PD0_BEAM_ORDER = [2, 3, 1, 0]       # RTB beam for each PD0 beam
 
-    def __init__(self, file_path: str, use_pd0_format: bool = False):
+    # Increment when the decoded data change so cached data are parsed again
+    reader_version = 1
+
+    # Groups of data that can be selected with the fields argument and the objects populated by each group.
+    # The ensemble, ancillary, system setup, and bottom track datasets also populate Inst, Cfg, and Sensor
+    # and are always decoded for those objects.
+    field_groups = {'wt': ('Wt',),
+                    'bt': ('Bt',),
+                    'rt': ('Rt',),
+                    'gps': ('Nmea', 'Gps', 'Gps2'),
+                    'gage': ('Gage',),
+                    'river_bt': ('River_BT',)}
+
+    # Names of the objects that are always decoded, accepted in fields
+    leader_fields = ('inst', 'cfg', 'sensor')
+
+    # Named selections of field groups, 'summary' adds the bottom track to the objects that are always decoded and
+    # 'discharge' selects the data used by TransectData
+    field_profiles = {'summary': ('bt',),
+                      'discharge': ('wt', 'bt', 'gps')}
+
+    def __init__(self, file_path: str, use_pd0_format: bool = False, fields=None):
         """
         Constructor initializing instance variables.
         Set the use_pd0_format value if you want the values stored as a PD0 file.
         PD0 uses different scales for its values compared to RTB.
+        Set fields to decode only some of the data when the file is read.  The objects
+        of the field groups that are not decoded are decoded on first access.
 
         :param file_path: Full Path of RTB file to be read
         :param use_pd0_format: Determine if the data should be decoded as RTB or PD0 scales.
+        :param fields: Name of a field profile or set of field groups to decode.  None decodes all the data.
         """
 
         # File path
         self.file_name = file_path
         self.use_pd0_format = use_pd0_format
 
+        # Location of each ensemble in the file
+        self.ens_locations = []
+
+        # Field groups that are decoded on first access
+        self.pending_fields = set()
+        fields = self.select_fields(fields)
+
         # Count the number of ensembles in the file to initialize the np.array
         self.num_ens, self.num_beams, self.num_bins = self.get_file_info(file_path=file_path)
 
         # List of all the ensemble data decoded
-        # Instrument Specific data
-        self.Inst = Inst(num_ens=self.num_ens)
+        self.create_objects(fields=fields)
+
+        # Keep track of ensemble index
+        # This is used only for 3 or 4 beam ensembles
+        # Vertical beams are merged with 3 or 4 beam ensemble
+        self.ens_index = 0
+
+        # Read in the given file path
+        self.rtb_read(file_path=file_path, use_pd0_format=self.use_pd0_format, fields=fields)
+
+        # The objects of the field groups not decoded are created and decoded on first access
+        self.pending_fields = set(self.field_groups).difference(fields)
+
+    def __getattr__(self, name):
+        """
+        Decode the field group of an object that was not decoded when the file was read.
+        :param name: Name of attribute.
+        :return Object of the field group.
+        """
+        for group in self.__dict__.get('pending_fields', ()):
+            if name in self.field_groups[group]:
+                try:
+                    if not os.path.isfile(self.file_name):
+                        raise FileNotFoundError('File not found: ' + self.file_name)
+                    self.decode_fields([group])
+                    return self.__dict__[name]
+                except (OSError, KeyError) as e:
+                    # Remove any objects created before the failure so they are not used with missing data
+                    for obj_name in self.field_groups[group]:
+                        self.__dict__.pop(obj_name, None)
+                    raise AttributeError("'%s' could not be decoded from the '%s' fields of %s"
+                                         % (name, group, self.file_name)) from e
+
+        raise AttributeError("'%s' object has no attribute '%s'" % (type(self).__name__, name))
+
+    @classmethod
+    def select_fields(cls, fields):
+        """
+        Determine the field groups to decode.
+        :param fields: Name of a field profile or set of field groups.  None selects all the field groups.
+        :return Set of field groups to decode.
+        """
+        if fields is None:
+            return set(cls.field_groups)
+        if isinstance(fields, str):
+            if fields not in cls.field_profiles:
+                raise ValueError('Unknown field profile: ' + fields)
+            fields = cls.field_profiles[fields]
+
+        fields = set(fields)
+        unknown = fields.difference(cls.field_groups, cls.leader_fields)
+        if len(unknown) > 0:
+            raise ValueError('Unknown fields: ' + ', '.join(sorted(unknown)))
+
+        return fields.intersection(cls.field_groups)
+
+    def decode_fields(self, fields):
+        """
+        Read the file again to decode field groups that were not decoded when the file was read.
+        :param fields: List of field groups to decode.
+        """
+        fields = self.pending_fields.intersection(fields)
+        if len(fields) > 0:
+            self.create_objects(fields=fields, leaders=False)
+
+            # Decode the field groups without decoding Inst, Cfg and Sensor again
+            self.ens_index = 0
+            self.rtb_read(file_path=self.file_name, use_pd0_format=self.use_pd0_format, fields=fields, leaders=False)
+            self.pending_fields = self.pending_fields.difference(fields)
+
+    def create_objects(self, fields=None, leaders: bool = True):
+        """
+        Create the objects to hold the decoded data.
+        :param fields: Set of field groups for which objects are created.  None creates objects for all field groups.
+        :param leaders: Create the Inst, Cfg and Sensor objects and the objects that are not decoded.
+        """
+        if fields is None:
+            fields = self.field_groups.keys()
+
+        if leaders:
+            # Instrument Specific data
+            self.Inst = Inst(num_ens=self.num_ens)
+
+            # ADCP Configuration values
+            self.Cfg = Cfg(num_ens=self.num_ens,
+                           pd0_format=self.use_pd0_format)
 
-        # ADCP Configuration values
-        self.Cfg = Cfg(num_ens=self.num_ens,
-                       pd0_format=use_pd0_format)
+            # ADCP Sensors like temp and compass
+            self.Sensor = Sensor(num_ens=self.num_ens,
+                                 pd0_format=self.use_pd0_format)
 
-        # ADCP Sensors like temp and compass
-        self.Sensor = Sensor(num_ens=self.num_ens,
-                             pd0_format=use_pd0_format)
+            # Surface velocity data
+            self.Surface = Surface(num_ens=self.num_ens,
+                                   num_beams=self.num_beams,
+                                   max_surface_bins=0)          # TODO: NOT USED RIGHT NOW
+            self.AutoMode = []
 
         # Water velocity data and quality
-        self.Wt = Wt(pd0_format=use_pd0_format,
-                     num_ens=self.num_ens,
-                     num_beams=self.num_beams,
-                     num_bins=self.num_bins)
+        if 'wt' in fields:
+            self.Wt = Wt(pd0_format=self.use_pd0_format,
+                         num_ens=self.num_ens,
+                         num_beams=self.num_beams,
+                         num_bins=self.num_bins)
 
         # Range Tracking Data
-        self.Rt = RT(num_ens=self.num_ens,
-                     num_beams=self.num_beams,
-                     pd0_format=use_pd0_format)
+        if 'rt' in fields:
+            self.Rt = RT(num_ens=self.num_ens,
+                         num_beams=self.num_beams,
+                         pd0_format=self.use_pd0_format)
 
         # Bottom Track Data
-        self.Bt = BT(num_ens=self.num_ens,
-                     num_beams=self.num_beams,
-                     pd0_format=use_pd0_format)
+        if 'bt' in fields:
+            self.Bt = BT(num_ens=self.num_ens,
+                         num_beams=self.num_beams,
+                         pd0_format=self.use_pd0_format)
 
         # NMEA data
-        self.Nmea = Nmea(num_ens=self.num_ens,
-                         pd0_format=use_pd0_format)
+        if 'gps' in fields:
+            self.Nmea = Nmea(num_ens=self.num_ens,
+                             pd0_format=self.use_pd0_format)
 
-        # Water Gage Data
-        self.Gage = Gage(num_ens=self.num_ens,
-                         pd0_format=use_pd0_format)
-
-        self.Gps = Gps(num_ens=self.num_ens)
+            self.Gps = Gps(num_ens=self.num_ens)
 
-        self.Gps2 = Gps2(num_ens=self.num_ens,
-                         wr2=False)
+            self.Gps2 = Gps2(num_ens=self.num_ens,
+                             wr2=False)
 
-        # Surface velocity data
-        self.Surface = Surface(num_ens=self.num_ens,
-                               num_beams=self.num_beams,
-                               max_surface_bins=0)          # TODO: NOT USED RIGHT NOW
-        self.AutoMode = []
+        # Water Gage Data
+        if 'gage' in fields:
+            self.Gage = Gage(num_ens=self.num_ens,
+                             pd0_format=self.use_pd0_format)
 
         # River Bottom Track data
-        self.River_BT = RiverBT(num_ens=self.num_ens,
-                                num_subsystems=10,          # TODO: NOT SET CORRECTLY, NEED TO READ IN IN CHECK
-                                pd0_format=use_pd0_format)
-
-        # Keep track of ensemble index
-        # This is used only for 3 or 4 beam ensembles
-        # Vertical beams are merged with 3 or 4 beam ensemble
-        self.ens_index = 0
-
-        # Read in the given file path
-        self.rtb_read(file_path=file_path, use_pd0_format=self.use_pd0_format)
+        if 'river_bt' in fields:
+            self.River_BT = RiverBT(num_ens=self.num_ens,
+                                    num_subsystems=10,          # TODO: NOT SET CORRECTLY, NEED TO READ IN IN CHECK
+                                    pd0_format=self.use_pd0_format)
 
     @staticmethod
     def count_ensembles(file_path: str):
@@ -143,80 +255,107 @@ class RtbRowe(object):
         This only counts 3 or 4 beam ensembles.  Vertical beams
         will be merged with 4 beam ensembles.
 
+        The file is memory mapped and indexed in a single pass.  The location
+        of every ensemble that passes the checksum is stored in ens_locations
+        so rtb_read can decode the ensembles without searching or verifying
+        the data again.
+
         :param file_path File path to inspect.
         :return NumEnsembles, NumBeams, NumBins
         """
-        # RTB ensemble delimiter
-        DELIMITER = b'\x80' * 16
-
-        # Block size to read in data
-        BLOCK_SIZE = 4096
-
-        # Create a buffer
-        buff = bytes()
-
         # Keep count of the number of ensembles found
         ens_count = 0
         num_beams = 0
         num_bins = 0
 
-        # Search for the number of ensembles by looking for the delimiter
-        # Check to ensure file exists
-        if os.path.exists(file_path):
+        # Location of each valid ensemble in the file
+        self.ens_locations = []
+
+        # Check to ensure file exists and is not empty
+        if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
             with open(file_path, "rb") as f:
-                data = f.read(BLOCK_SIZE)  # Read in data
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as raw:
+                        self.ens_locations = RtbRowe.find_ensembles(mm, raw)
 
-                # Verify data was found
-                while data:
-                    # Accumulate the buffer
-                    buff += data
+                        for start, end in self.ens_locations:
+                            # Get the ensemble info
+                            with raw[start:end] as ens_bytes:
+                                bin_count, beams_count = self.get_ens_info(ens_bytes)
 
-                    # Check for the delimiter
-                    if DELIMITER in buff:
-                        # If delimiter found, split at the delimiter to get the remaining buffer data
-                        chunks = buff.split(DELIMITER)
-
-                        # Put the remaining data back in the buffer
-                        buff = chunks.pop()
-
-                        # Take out the ens data
-                        for chunk in chunks:
-                            # Process the binary ensemble data
-                            # Verify the ENS data is good
-                            # This will check that all the data is there and the checksum is good
-                            if self.verify_ens_data(DELIMITER + chunk):
-                                # Get the ensemble info
-                                bin_count, beams_count = self.get_ens_info(DELIMITER + chunk)
-
-                                # Verify we have 3 or 4 beam data ensemble
-                                # Vertical beam is not counted and is merged with 4 beam ensembles
-                                if beams_count > 2:
-                                    ens_count += 1
-
-                                    # Set the largest beam and bin number
-                                    num_beams = max(beams_count, num_beams)
-                                    num_bins = max(bin_count, num_bins)
+                            # Verify we have 3 or 4 beam data ensemble
+                            # Vertical beam is not counted and is merged with 4 beam ensembles
+                            if beams_count > 2:
+                                ens_count += 1
 
-                    # Read the next batch of data
-                    data = f.read(BLOCK_SIZE)
+                                # Set the largest beam and bin number
+                                num_beams = max(beams_count, num_beams)
+                                num_bins = max(bin_count, num_bins)
+
+        return ens_count, num_beams, num_bins
+
+    @staticmethod
+    def find_ensembles(mm, raw):
+        """
+        Find the location of all the ensembles in the file that pass the checksum.
+        The delimiter is located with find and the checksum is computed on
+        a memoryview of the payload so the file data is not copied.
 
-            # Process whatever is remaining in the buffer
-            # Verify the ENS data is good
-            # This will check that all the data is there and the checksum is good
-            if self.verify_ens_data(DELIMITER + buff):
-                # Get the ensemble info
-                bin_count, beams_count = self.get_ens_info(DELIMITER + buff)
+        :param mm: Memory mapped file data.
+        :param raw: Memoryview of the file data.
+        :return List of the (start, end) byte location of each valid ensemble.
+        """
+        ens_locations = []
 
-                # Verify we have 3 or 4 beam data ensemble
-                # Vertical beam is not counted and is merged with 4 beam ensembles
-                if beams_count > 2:
-                    ens_count += 1
+        loc = mm.find(RtbRowe.DELIMITER)
+        while loc >= 0:
+            ens_end = RtbRowe.verify_ens_location(raw, loc)
 
-                    # Set the largest beam and bin number
-                    num_beams = max(beams_count, num_beams)
-                    num_bins = max(bin_count, num_bins)
+            if ens_end > 0:
+                ens_locations.append((loc, ens_end))
 
-        return ens_count, num_beams, num_bins
+                # Search for the next ensemble after the checksum
+                loc = mm.find(RtbRowe.DELIMITER, ens_end)
+            else:
+                loc = mm.find(RtbRowe.DELIMITER, loc + 1)
+
+        return ens_locations
+
+    @staticmethod
+    def verify_ens_location(raw, ens_start: int):
+        """
+        Verify the ensemble starting at the given location is complete and
+        the checksum is correct.
+        :param raw: Memoryview of the file data.
+        :param ens_start: Start location of the ensemble delimiter.
+        :return End location of the ensemble, or 0 if the ensemble is not valid.
+        """
+        # Verify at least the header is available
+        if len(raw) < ens_start + RtbRowe.HEADER_SIZE + RtbRowe.CHECKSUM_SIZE:
+            logging.warning("Incomplete ensemble.")
+            return 0
+
+        # Check ensemble size
+        payload_size = struct.unpack_from("I", raw, ens_start + 24)[0]
+        checksum_loc = ens_start + RtbRowe.HEADER_SIZE + payload_size
+
+        # Ensure the entire ensemble is in the file
+        if len(raw) < checksum_loc + RtbRowe.CHECKSUM_SIZE:
+            logging.warning("Incomplete ensemble.")
+            return 0
+
+        # Calculate Checksum
+        # Use only the payload for the checksum
+        checksum = struct.unpack_from("I", raw, checksum_loc)[0]
+        with raw[ens_start + RtbRowe.HEADER_SIZE:checksum_loc] as payload:
+            calc_checksum = binascii.crc_hqx(payload, 0)
+
+        # Verify checksum
+        if checksum != calc_checksum:
+            logging.warning("Ensemble fails checksum. {:#04x} {:#04x}".format(checksum, calc_checksum))
+            return 0
+
+        return checksum_loc + RtbRowe.CHECKSUM_SIZE
 
     def get_ens_info(self, ens_bytes: list):
         """
@@ -257,70 +396,27 @@ class RtbRowe(object):
 
         return num_elements, element_multiplier
 
-    def rtb_read(self, file_path: str, wr2: bool = False, use_pd0_format: bool = False):
+    def rtb_read(self, file_path: str, wr2: bool = False, use_pd0_format: bool = False, fields=None,
+                 leaders: bool = True):
         """
         Reads the binary RTB file and assigns values to object instance variables.
+        The ensembles located by get_file_info are decoded from the memory mapped file.
         :param file_path: Full file path
         :param wr2: Determines if WR2 processing should be applied to GPS data
         :param use_pd0_format: Determine if data should be RTB or PD0 format.  Convert values to PD0 values.
+        :param fields: Set of field groups to decode.  None decodes all the field groups.
+        :param leaders: Decode the Inst, Cfg and Sensor data.
         """
 
-        # RTB ensemble delimiter
-        DELIMITER = b'\x80' * 16
-
-        # Block size to read in data
-        BLOCK_SIZE = 4096
-
-        # Get the total file size to keep track of total bytes read and show progress
-        file_size = os.path.getsize(file_path)
-        bytes_read = 0
-
-        # Create a buffer
-        buff = bytes()
-
-        # Assign default values
-        n_velocities = 4
-        max_surface_bins = 5
-
-        # Check to ensure file exists
-        if os.path.exists(file_path):
-            file_info = os.path.getsize(file_path)
-
+        # Check to ensure file exists and ensembles were found
+        if os.path.exists(file_path) and len(self.ens_locations) > 0:
             with open(file_path, "rb") as f:
-                data = f.read(BLOCK_SIZE)  # Read in data
-
-                # Keep track of bytes read
-                #bytes_read += BLOCK_SIZE
-                #self.file_progress(bytes_read, file_size, fullname)
-
-                # Verify data was found
-                while data:
-                    # Accumulate the buffer
-                    buff += data
-
-                    # Check for the delimiter
-                    if DELIMITER in buff:
-                        # If delimiter found, split at the delimiter to get the remaining buffer data
-                        chunks = buff.split(DELIMITER)
-
-                        # Put the remaining data back in the buffer
-                        buff = chunks.pop()
-
-                        # Take out the ens data
-                        for chunk in chunks:
-                            # Process the binary ensemble data
-                            self.decode_ens(DELIMITER + chunk, use_pd0_format=use_pd0_format)
-
-                    # Read the next batch of data
-                    data = f.read(BLOCK_SIZE)
-
-                    # Keep track of bytes read
-                    bytes_read += BLOCK_SIZE
-                    # self.file_progress(bytes_read, file_size, ens_file_path)
-                    #self.file_progress(BLOCK_SIZE, file_size, fullname)
-
-            # Process whatever is remaining in the buffer
-            self.decode_ens(DELIMITER + buff, use_pd0_format=use_pd0_format)
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    for start, end in self.ens_locations:
+                        # Decode the ensemble, the checksum was verified when the file was indexed
+                        logging.debug("Decoding binary data to ensemble: " + str(end - start))
+                        self.decode_data_sets(mm[start:end], use_pd0_format=use_pd0_format, fields=fields,
+                                              leaders=leaders)
 
         #self.Gps2.corr_qual = np.array(self.Gps2.corr_qual)
         #self.Gps2.lat_deg = np.array(self.Gps2.lat_deg)
@@ -396,18 +492,25 @@ class RtbRowe(object):
 
         return False
 
-    def decode_data_sets(self, ens_bytes: list, use_pd0_format: bool = False):
+    def decode_data_sets(self, ens_bytes: list, use_pd0_format: bool = False, fields=None, leaders: bool = True):
         """
         Decode the datasets to an ensemble.
         Use verify_ens_data if you are using this
         as a static method to verify the data is correct.
+        Datasets are only decoded for the objects of the selected field groups.  Vertical beam
+        ensembles are detected even if the water track data are not decoded.
         :param ens_bytes: Ensemble binary data.  Decode the dataset.
         :param use_pd0_format: Flag to decode and convert data to PD0 format.
+        :param fields: Set of field groups to decode.  None decodes all the field groups.
+        :param leaders: Decode the Inst, Cfg and Sensor data.
         :return: Return the decoded ensemble.
         """
         packetPointer = self.HEADER_SIZE
         ens_len = len(ens_bytes)
 
+        if fields is None:
+            fields = self.field_groups.keys()
+
         # Flag if BT data found
         bt_data_found = False
         bt_adcp3_data_found = False
@@ -442,7 +545,7 @@ class RtbRowe(object):
                 if element_multiplier == 1:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_vel(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                        ens_index=self.ens_index,
                                        num_elements=num_elements,
@@ -456,7 +559,7 @@ class RtbRowe(object):
                 if element_multiplier == 1:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_instr_vel(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                              ens_index=self.ens_index,
                                              num_elements=num_elements,
@@ -470,7 +573,7 @@ class RtbRowe(object):
                 if element_multiplier == 1:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_earth_vel(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                              ens_index=self.ens_index,
                                              num_elements=num_elements,
@@ -485,7 +588,7 @@ class RtbRowe(object):
                 if element_multiplier == 1:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_rssi(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                         ens_index=self.ens_index,
                                         num_elements=num_elements,
@@ -505,7 +608,7 @@ class RtbRowe(object):
                 if element_multiplier < 2:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_corr(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                         ens_index=self.ens_index,
                                         num_elements=num_elements,
@@ -526,7 +629,7 @@ class RtbRowe(object):
                 if element_multiplier < 2:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_pgb(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                        ens_index=self.ens_index,
                                        num_elements=num_elements,
@@ -547,7 +650,7 @@ class RtbRowe(object):
                 if element_multiplier < 2:
                     is_vert_ens = True
                     # Do nothing else for vertical beam
-                else:
+                elif 'wt' in fields:
                     self.Wt.decode_pg_earth(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                             ens_index=self.ens_index,
                                             num_elements=num_elements,
@@ -562,7 +665,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and leaders:
                     self.Cfg.decode_ensemble_data(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                                   ens_index=self.ens_index,
                                                   name_len=name_len)
@@ -582,7 +685,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and leaders:
 
                     # Configuration data
                     self.Cfg.decode_ancillary_data(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
@@ -612,12 +715,13 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and 'bt' in fields:
                     # Populate Bottom Track data
                     self.Bt.decode(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                    ens_index=self.ens_index,
                                    name_len=name_len)
 
+                if not is_vert_ens and leaders:
                     # Populate Config data
                     self.Cfg.decode_bottom_track_data(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                                       ens_index=self.ens_index,
@@ -642,7 +746,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and 'gps' in fields:
                     self.Nmea.decode(ens_bytes=ens_bytes[packetPointer:packetPointer+data_set_size],
                                      ens_index=self.ens_index,
                                      name_len=name_len)
@@ -664,7 +768,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and leaders:
                     # Configuration data
                     # Check if the Cfg is already created from other dataset
                     self.Cfg.decode_systemsetup_data(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
@@ -689,11 +793,11 @@ class RtbRowe(object):
                 if is_vert_ens:
                     # Vertical beam data
                     # Add the vertical beam data to the previous ensemble
-                    if self.ens_index-1 >= 0:
+                    if self.ens_index-1 >= 0 and leaders:
                         self.Sensor.decode_vert_rt(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                                    ens_index=self.ens_index-1,
                                                    name_len=name_len)
-                else:
+                elif 'rt' in fields:
                     self.Rt.decode(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                    ens_index=self.ens_index,
                                    name_len=name_len)
@@ -703,7 +807,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and 'gage' in fields:
                     self.Gage.decode_data(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                           name_len=name_len)
 
@@ -712,7 +816,7 @@ class RtbRowe(object):
                 # This should have already been flagged if the data is vertical
                 # from the velocity, amplitude or correlation data
                 # If it is vertical beam data, do not add the data
-                if not is_vert_ens:
+                if not is_vert_ens and 'river_bt' in fields:
                     self.River_BT.decode_data(ens_bytes=ens_bytes[packetPointer:packetPointer + data_set_size],
                                               ens_index=self.ens_index,
                                               name_len=name_len)
@@ -835,6 +939,62 @@ class RtbRowe(object):
             logging.debug("Error creating a float from bytes. " + str(e))
             return 0.0
 
+    @staticmethod
+    def get_floats(start: int, num_values: int, ens: list):
+        """
+        Convert the bytes given into an array of floats.
+        Values missing from the end of the buffer are set to 0.0.
+        :param start: Start location.
+        :param num_values: Number of floats.
+        :param ens: Buffer containing the bytearray data.
+        :return: Array of the floats in the buffer.
+        """
+        values = np.zeros(num_values)
+        num_found = min(num_values, max(len(ens) - start, 0) // RtbRowe.BYTES_IN_FLOAT)
+        if num_found > 0:
+            values[:num_found] = np.frombuffer(ens, dtype='<f4', count=num_found, offset=start)
+        return values
+
+    @staticmethod
+    def get_int32s(start: int, num_values: int, ens_bytes: list):
+        """
+        Convert the bytes given into an array of Int32.
+        Values missing from the end of the buffer are set to 0.
+        :param start: Start location in the ens_bytes.
+        :param num_values: Number of Int32.
+        :param ens_bytes: Buffer containing the bytearray data.
+        :return: Array of the Int32 in the buffer.
+        """
+        values = np.zeros(num_values, dtype=int)
+        num_found = min(num_values, max(len(ens_bytes) - start, 0) // RtbRowe.BYTES_IN_INT32)
+        if num_found > 0:
+            values[:num_found] = np.frombuffer(ens_bytes, dtype='<i4', count=num_found, offset=start)
+        return values
+
+    @staticmethod
+    def is_bad_velocity_array(vel: np.ndarray):
+        """
+        Check if the velocities given are good or bad.
+        Vectorized version of is_bad_velocity.
+        :param vel: Array of velocities to check.
+        :return: Boolean array, True if Bad Velocity.
+        """
+        return (vel >= RtbRowe.BAD_VEL) | \
+               (np.abs(vel - RtbRowe.BAD_VEL) <= 1e-06 * np.maximum(np.abs(vel), RtbRowe.BAD_VEL))
+
+    @staticmethod
+    def pd0_beam_order(data: np.ndarray):
+        """
+        Rearrange the rows of the data to match the PD0 beam order.
+        RTB BEAM 0,1,2,3 = PD0 BEAM 3,2,0,1
+        Vertical beam data is not changed.
+        :param data: Data array [beam][bin]
+        :return: Data array in PD0 beam order.
+        """
+        if data.shape[0] == 4:
+            return data[RtbRowe.PD0_BEAM_ORDER, :]
+        return data
+
     @staticmethod
     def nans(num_ens: int, dtype=float):
         """
@@ -901,49 +1061,20 @@ class Wt:
         # Determine where to start in the ensemble data
         packet_pointer = RtbRowe.get_base_data_size(name_len)
 
-        # Initialize the array
-        if not self.pd0_format:
-            vel = np.empty(shape=[element_multiplier, num_elements])
-        else:
-            vel = np.empty(shape=[element_multiplier, num_elements])
-
-        # Create a 2D list of velocities
+        # Create a 2D array of velocities
         # [beam][bin]
-        for beam in range(element_multiplier):
-            for bin_num in range(num_elements):
-                # Determine if RTB or PD0 data format
-                if not self.pd0_format:
-                    # Use the original value
-                    vel[beam][bin_num] = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes)
-                else:
-                    # Get the velocity data
-                    pd0_vel = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes)
+        vel = RtbRowe.get_floats(packet_pointer, element_multiplier * num_elements, ens_bytes)
+        vel = vel.reshape([element_multiplier, num_elements])
 
-                    # Check for bad velocity and convert
-                    if RtbRowe.is_bad_velocity(pd0_vel):
-                        #pd0_vel = RtbRowe.PD0_BAD_VEL
-                        # QRev wants bad values set to NaN
-                        pd0_vel = np.nan
-                    #else:
-                        # Convert from m/s to mm/s
-                        #pd0_vel = round(pd0_vel * 1000.0)
-                        # QRev expects m/s
-                        #pd0_vel = round(pd0_vel)
-
-                    # Set the velocity based on the beam reassignment
-                    if element_multiplier == 1:             # Vertical Beam
-                        vel[0][bin_num] = pd0_vel
-                    elif beam == 0:                         # RTB 0 - PD0 3
-                        vel[3][bin_num] = pd0_vel
-                    elif beam == 1:                         # RTB 1 - PD0 2
-                        vel[2][bin_num] = pd0_vel
-                    elif beam == 2:                         # RTB 2 - PD0 0
-                        vel[0][bin_num] = pd0_vel
-                    elif beam == 3:                         # RTB 3 - PD0 1
-                        vel[1][bin_num] = pd0_vel
+        # Determine if RTB or PD0 data format
+        if self.pd0_format:
+            # Check for bad velocity and convert
+            # QRev wants bad values set to NaN
+            # QRev expects m/s
+            vel[RtbRowe.is_bad_velocity_array(vel)] = np.nan
 
-                # Move the pointer
-                packet_pointer += RtbRowe.BYTES_IN_FLOAT
+            # Set the velocity based on the beam reassignment
+            vel = RtbRowe.pd0_beam_order(vel)
 
         # Reshape the data from [beam, bin] to [bin, beam]
         vel = np.reshape(vel, [num_elements, element_multiplier])
@@ -970,37 +1101,18 @@ class Wt:
         # Determine where to start in the ensemble data
         packet_pointer = RtbRowe.get_base_data_size(name_len)
 
-        # Initialize the array
-        if not self.pd0_format:
-            amp = np.empty(shape=[element_multiplier, num_elements], dtype=np.float)
-        else:
-            amp = np.empty(shape=[element_multiplier, num_elements], dtype=np.int)
-
-        # Create a 2D list of velocities
+        # Create a 2D array of amplitudes
         # [beam][bin]
-        for beam in range(element_multiplier):
-            for bin_num in range(num_elements):
-                # Determine if RTB or PD0 data format
-                if not self.pd0_format:
-                    amp[beam][bin_num] = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes)
-                else:
-                    # Get the dB and convert to counts
-                    pd0_amp = round(RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes) * 2.0)
-
-                    # Beam Reassignment
-                    if element_multiplier == 1:                 # Vertical Beam
-                        amp[beam][bin_num] = pd0_amp
-                    elif beam == 0:                               # RTB 0 - PD0 3
-                        amp[3][bin_num] = pd0_amp
-                    elif beam == 1:                             # RTB 1 - PD0 2
-                        amp[2][bin_num] = pd0_amp
-                    elif beam == 2:                             # RTB 2 - PD0 0
-                        amp[0][bin_num] = pd0_amp
-                    elif beam == 3:                             # RTB 3 - PD0 1
-                        amp[1][bin_num] = pd0_amp
+        amp = RtbRowe.get_floats(packet_pointer, element_multiplier * num_elements, ens_bytes)
+        amp = amp.reshape([element_multiplier, num_elements])
 
-                # Move the pointer
-                packet_pointer += RtbRowe.BYTES_IN_FLOAT
+        # Determine if RTB or PD0 data format
+        if self.pd0_format:
+            # Get the dB and convert to counts
+            amp = np.round(amp * 2.0).astype(int)
+
+            # Beam Reassignment
+            amp = RtbRowe.pd0_beam_order(amp)
 
         # Reshape the data from [beam, bin] to [bin, beam]
         amp = np.reshape(amp, [num_elements, element_multiplier])
@@ -1034,52 +1146,29 @@ class Wt:
         # Determine where to start in the ensemble data
         packet_pointer = RtbRowe.get_base_data_size(name_len)
 
-        # Initialize the array
-        if not self.pd0_format:
-            corr = np.empty(shape=[element_multiplier, num_elements], dtype=np.float)
-        else:
-            corr = np.empty(shape=[element_multiplier, num_elements], dtype=np.int)
-
-        # Create a 2D list of velocities
+        # Create a 2D array of correlations
         # [beam][bin]
-        for beam in range(element_multiplier):
-            for bin_num in range(num_elements):
-                # Determine if RTB or PD0 data format
-                if not self.pd0_format:
-                    corr[beam][bin_num] = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes)
-                else:
-                    # Verify a number of code repeats is given
-                    if num_repeats and not np.isnan(num_repeats):
-                        # Verify a good value for num_repeats
-                        if num_repeats == 0:
-                            num_repeats = 1
-
-                        # Calculate code repeats used
-                        repeats = (num_repeats - 1.0) / num_repeats
-                        if repeats == 0.0:
-                            repeats = 1.0
-
-                        # Get the correlation percentage and convert to counts
-                        pd0_corr = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes) * 128.0
-                        pd0_corr = round(pd0_corr / repeats)
-                    else:
-                        # If no repeats given, use this calculation
-                        pd0_corr = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes) * 255.0
-
-                    # Beam Reassignment
-                    if element_multiplier == 1:                 # Vertical Beam
-                        corr[beam][bin_num] = RtbRowe.get_float(packet_pointer, RtbRowe.BYTES_IN_FLOAT, ens_bytes) * 255.0
-                    elif beam == 0:                               # RTB 0 - PD0 3
-                        corr[3][bin_num] = pd0_corr
-                    elif beam == 1:                             # RTB 1 - PD0 2
-                        corr[2][bin_num] = pd0_corr
-                    elif beam == 2:                             # RTB 2 - PD0 0
-                        corr[0][bin_num] = pd0_corr
-                    elif beam == 3:                             # RTB 3 - PD0 1
-                        corr[1][bin_num] = pd0_corr
+        corr = RtbRowe.get_floats(packet_pointer, element_multiplier * num_elements, ens_bytes)
+        corr = corr.reshape([element_multiplier, num_elements])
 
-                # Move the pointer
-                packet_pointer += RtbRowe.BYTES_IN_FLOAT
+        # Determine if RTB or PD0 data format
+        if self.pd0_format:
+            # Verify a number of code repeats is given
+            # Vertical beam always uses the percentage scale
+            if num_repeats and not np.isnan(num_repeats) and element_multiplier != 1:
+                # Calculate code repeats used
+                repeats = (num_repeats - 1.0) / num_repeats
+                if repeats == 0.0:
+                    repeats = 1.0
+
+                # Get the correlation percentage and convert to counts
+                corr = np.round((corr * 128.0) / repeats).astype(int)
+            else:
+                # If no repeats given, use this calculation
+                corr = (corr * 255.0).astype(int)
+
+            # Beam Reassignment
+            corr = RtbRowe.pd0_beam_order(corr)
 
         # Reshape the data from [beam, bin] to [bin, beam]
         corr = np.reshape(corr, [num_elements, element_multiplier])
@@ -1108,41 +1197,22 @@ class Wt:
         # Determine where to start in the ensemble data
         packet_pointer = RtbRowe.get_base_data_size(name_len)
 
-        # Initialize the array
-        if not self.pd0_format:
-            pings = np.empty(shape=[element_multiplier, num_elements], dtype=np.int)
-        else:
-            pings = np.empty(shape=[element_multiplier, num_elements], dtype=np.int)
-
-        # Create a 2D list
+        # Create a 2D array of good pings
         # [beam][bin]
-        for beam in range(element_multiplier):
-            for bin_num in range(num_elements):
-                # Determine if RTB or PD0 data format
-                if not self.pd0_format:
-                    pings[beam][bin_num] = RtbRowe.get_int32(packet_pointer, RtbRowe.BYTES_IN_INT32, ens_bytes)
-                else:
-                    # Verify a good value for pings_per_ens
-                    if pings_per_ens == 0:
-                        pings_per_ens = 1
+        pings = RtbRowe.get_int32s(packet_pointer, element_multiplier * num_elements, ens_bytes)
+        pings = pings.reshape([element_multiplier, num_elements])
+
+        # Determine if RTB or PD0 data format
+        if self.pd0_format:
+            # Verify a good value for pings_per_ens
+            if pings_per_ens == 0:
+                pings_per_ens = 1
 
-                    # Get the Good Beam number of good pings and convert to percentage
-                    pd0_gb = round((RtbRowe.get_int32(packet_pointer, RtbRowe.BYTES_IN_INT32, ens_bytes) * 100) / pings_per_ens)
-
-                    # Beam Reassignment
-                    if element_multiplier == 1:                 # Vertical Beam
-                        pings[beam][bin_num] = pd0_gb
-                    elif beam == 0:                               # RTB 0 - PD0 3
-                        pings[3][bin_num] = pd0_gb
-                    elif beam == 1:                             # RTB 1 - PD0 2
-                        pings[2][bin_num] = pd0_gb
-                    elif beam == 2:                             # RTB 2 - PD0 0
-                        pings[0][bin_num] = pd0_gb
-                    elif beam == 3:                             # RTB 3 - PD0 1
-                        pings[1][bin_num] = pd0_gb
+            # Get the Good Beam number of good pings and convert to percentage
+            pings = np.round((pings * 100) / pings_per_ens).astype(int)
 
-                # Move the pointer
-                packet_pointer += RtbRowe.BYTES_IN_INT32
+            # Beam Reassignment
+            pings = RtbRowe.pd0_beam_order(pings)
 
         # Reshape the data from [beam, bin] to [bin, beam]
         pings = np.reshape(pings, [num_elements, element_multiplier])
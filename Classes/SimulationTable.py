@@ -0,0 +1,99 @@
+import numpy as np
+
+
+class SimulationTable(object):
+    """Class used to store the discharges computed by an Oursin simulation for each checked transect. The discharges
+    are stored in an array preallocated with a row for each transect and a column for each discharge component.
+    Components not computed by the simulation are nan.
+
+    Attributes
+    ----------
+    columns: list
+        Names of the discharge components computed by the simulation
+    data: np.array(float)
+        Discharges for each transect (n_transects, 6) in the order of all_columns
+    """
+
+    # Discharge components: total, top, bottom, left, right, and middle
+    all_columns = ['q_total', 'q_top', 'q_bot', 'q_left', 'q_right', 'q_middle']
+
+    def __init__(self, columns, n_transects=0):
+        """Initialize SimulationTable.
+
+        Parameters
+        ----------
+        columns: list
+            Names of the discharge components computed by the simulation
+        n_transects: int
+            Number of transects
+        """
+
+        self.columns = list(columns)
+        self.data = np.tile(np.nan, (n_transects, len(self.all_columns)))
+
+    def __len__(self):
+        """Number of transects."""
+
+        return self.data.shape[0]
+
+    def __getitem__(self, key):
+        """Returns the discharges of a component for all transects or a table with the specified components.
+
+        Parameters
+        ----------
+        key: str, list
+            Name of a component or list of names of components
+
+        Returns
+        -------
+        data: np.array(float), SimulationTable
+            Discharges of the component for each transect or table with the components
+        """
+
+        if isinstance(key, str):
+            return self.data[:, self.all_columns.index(key)]
+
+        table = SimulationTable(key, len(self))
+        idx = [self.all_columns.index(column) for column in key]
+        table.data[:, idx] = self.data[:, idx]
+        return table
+
+    def __setitem__(self, key, values):
+        """Sets the discharges of a component for all transects.
+
+        Parameters
+        ----------
+        key: str
+            Name of component
+        values: list, np.array(float)
+            Discharges for each transect
+        """
+
+        self.data[:, self.all_columns.index(key)] = values
+
+    def set_row(self, row, values):
+        """Sets the discharges computed by the simulation for a transect.
+
+        Parameters
+        ----------
+        row: int
+            Index of the transect in the table
+        values: list
+            Discharges in the order of columns
+        """
+
+        self.data[row, [self.all_columns.index(column) for column in self.columns]] = values
+
+    def to_dataframe(self):
+        """Converts the discharges computed by the simulation to a pandas DataFrame for reporting.
+
+        Returns
+        -------
+        df: DataFrame
+            Discharges with a row for each transect and a column for each component computed by the simulation
+        """
+
+        import pandas as pd
+
+        return pd.DataFrame(self.data[:, [self.all_columns.index(column) for column in self.columns]],
+                            columns=self.columns)
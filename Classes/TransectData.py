@@ -1,5 +1,7 @@
 import os
+import copy
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from datetime import timezone
 from scipy import signal, fftpack
@@ -7,6 +9,7 @@ from scipy import signal, fftpack
 from Classes.Pd0TRDI_2 import Pd0TRDI
 from Classes.RtbRowe import RtbRowe
 from Classes.RTT_Rowe import RTTrowe
+from Classes.ParsedDataCache import ParsedDataCache
 from Classes.DepthStructure import DepthStructure
 from Classes.WaterData import WaterData
 from Classes.BoatStructure import BoatStructure
@@ -18,7 +21,6 @@ from Classes.SensorData import SensorData
 from Classes.HeadingData import HeadingData
 from Classes.DateTime import DateTime
 from Classes.InstrumentData import InstrumentData
-from Classes.MultiThread import MultiThread
 from Classes.CoordError import CoordError
 from MiscLibs.common_functions import nandiff, cosd, arctand, tand, nans, cart2pol, rad2azdeg
 
@@ -56,6 +58,10 @@ class TransectData(object):
         Setting for if transect was checked for use in mmt file assumed checked for SonTek
     in_transect_idx: np.array(int)
         Index of ensemble data associated with the moving-boat portion of the transect
+    data_version: int
+        Counter incremented each time the processed water, boat, or depth data are changed
+    discharge_cache: dict
+        Discharge components computed by QComp for the current data_version
     """
 
     def __init__(self):
@@ -73,6 +79,8 @@ class TransectData(object):
         self.date_time = None  # object of DateTime
         self.checked = None  # transect was checked for use in mmt file assumed checked for SonTek
         self.in_transect_idx = None  # index of ensemble data associated with the moving-boat portion of the transect
+        self.data_version = 0  # incremented each time the processed water, boat, or depth data are changed
+        self.discharge_cache = None  # discharge components computed by QComp for the current data_version
 
     def trdi(self, mmt_transect, pd0_data, mmt):
         """Create object, lists, and instance variables for TRDI data.
@@ -1314,11 +1322,11 @@ class TransectData(object):
         num_ens = rsdata.WaterTrack.Velocity.shape[2]
 
         # Compute cell sizes and depths
-        cell_size = rsdata.System.Cell_Size.reshape(1, num_ens)
-        cell_size_all = np.tile(cell_size, (max_cells, 1))
-        top_of_cells = rsdata.System.Cell_Start.reshape(1, num_ens)
-        cell_depth = ((np.tile(np.arange(1, max_cells+1, 1).reshape(max_cells, 1), (1, num_ens)) - 0.5)
-                      * cell_size_all) + np.tile(top_of_cells, (max_cells, 1))
+        cell_size = rsdata.System.Cell_Size.reshape(num_ens)
+        top_of_cells = rsdata.System.Cell_Start.reshape(num_ens)
+        cell_size_all, cell_depth = TransectData.cell_geometry(max_cells=max_cells,
+                                                               reg_cell_size=cell_size,
+                                                               dist_cell_1_m=top_of_cells + 0.5 * cell_size)
 
         # Prepare bottom track depth variable
         depth = rsdata.BottomTrack.BT_Beam_Depth.T
@@ -1795,9 +1803,6 @@ class TransectData(object):
     @staticmethod
     def compute_cell_data(pd0):
         
-        # Number of ensembles
-        num_ens = np.array(pd0.Wt.vel_mps).shape[-1]
-
         # Retrieve and compute cell information
         reg_cell_size = pd0.Cfg.ws_cm / 100
         reg_cell_size[reg_cell_size == 0] = np.nan
@@ -1814,34 +1819,15 @@ class TransectData(object):
         
         # Compute maximum number of cells
         max_cells = int(max_surf_cells + num_reg_cells)
-        
+
         # Combine cell size and cell range from transducer for both
         # surface and regular cells
-        cell_depth = np.tile(np.nan, (max_cells, num_ens))
-        cell_size_all = np.tile(np.nan, (max_cells, num_ens))
-        for i in range(num_ens):
-            # Determine number of cells to be treated as regular cells
-            if np.nanmax(no_surf_cells) > 0:
-                
-                num_reg_cells = max_cells - no_surf_cells[i]
-            else:
-                num_reg_cells = max_cells
-
-            # Compute cell depth
-            if no_surf_cells[i] > 1e-5:
-                cell_depth[:int(no_surf_cells[i]), i] = surf_cell_dist[i] + \
-                                                        np.arange(0, (no_surf_cells[i]-1) * surf_cell_size[i]+0.001,
-                                                                  surf_cell_size[i])
-                cell_depth[int(no_surf_cells[i]):, i] = cell_depth[int(no_surf_cells[i]-1), i] \
-                    + (.5 * surf_cell_size[i] + 0.5 * reg_cell_size[i]) \
-                    + np.arange(0, (num_reg_cells-1) * reg_cell_size[i]+0.001, reg_cell_size[i])
-                cell_size_all[0:int(no_surf_cells[i]), i] = np.repeat(surf_cell_size[i], int(no_surf_cells[i]))
-                cell_size_all[int(no_surf_cells[i]):, i] = np.repeat(reg_cell_size[i], int(num_reg_cells))
-            else:
-                cell_depth[:int(num_reg_cells), i] = dist_cell_1_m[i] + \
-                                                     np.linspace(0, int(num_reg_cells) - 1,
-                                                                 int(num_reg_cells)) * reg_cell_size[i]
-                cell_size_all[:, i] = np.repeat(reg_cell_size[i], num_reg_cells)
+        cell_size_all, cell_depth = TransectData.cell_geometry(max_cells=max_cells,
+                                                               reg_cell_size=reg_cell_size,
+                                                               dist_cell_1_m=dist_cell_1_m,
+                                                               no_surf_cells=no_surf_cells,
+                                                               surf_cell_size=surf_cell_size,
+                                                               surf_cell_dist=surf_cell_dist)
 
         # Firmware is used to ID RiverRay data with variable modes and lags
         firmware = str(pd0.Inst.firm_ver[0])
@@ -1859,6 +1845,58 @@ class TransectData(object):
             
         return cell_size_all, cell_depth, sl_cutoff_per, sl_lag_effect_m
 
+    @staticmethod
+    def cell_geometry(max_cells, reg_cell_size, dist_cell_1_m, no_surf_cells=None, surf_cell_size=None,
+                      surf_cell_dist=None):
+        """Computes the size and range from the transducer of every cell in every ensemble. Ensembles with
+        surface cells (RiverRay and RiverPro) have the surface cells followed by regular cells.
+
+        Parameters
+        ----------
+        max_cells: int
+            Number of cells in each ensemble
+        reg_cell_size: np.array(float)
+            Size of regular cells for each ensemble, in m
+        dist_cell_1_m: np.array(float)
+            Range to the center of the first regular cell for each ensemble, in m
+        no_surf_cells: np.array(float)
+            Number of surface cells for each ensemble, None if there are no surface cells
+        surf_cell_size: np.array(float)
+            Size of surface cells for each ensemble, in m
+        surf_cell_dist: np.array(float)
+            Range to the center of the first surface cell for each ensemble, in m
+
+        Returns
+        -------
+        cell_size_all: np.array(float)
+            Size of each cell, in m
+        cell_depth: np.array(float)
+            Range from the transducer to the center of each cell, in m
+        """
+
+        cell_idx = np.arange(max_cells).reshape(-1, 1)
+
+        # Regular cells starting at the first cell
+        cell_depth = dist_cell_1_m + cell_idx * reg_cell_size
+        cell_size_all = np.tile(reg_cell_size, (max_cells, 1))
+
+        if no_surf_cells is not None and np.nanmax(no_surf_cells) > 0:
+            surface = no_surf_cells > 1e-5
+            n_surf = no_surf_cells[surface].astype(int)
+            surf_size = surf_cell_size[surface]
+            reg_size = reg_cell_size[surface]
+            is_surf_cell = cell_idx < n_surf
+
+            # Surface cells followed by regular cells starting half a cell of each size below the last surface cell
+            surf_depth = surf_cell_dist[surface] + cell_idx * surf_size
+            last_surf_depth = surf_cell_dist[surface] + (n_surf - 1) * surf_size
+            below_depth = last_surf_depth + (.5 * surf_size + 0.5 * reg_size) + (cell_idx - n_surf) * reg_size
+
+            cell_depth[:, surface] = np.where(is_surf_cell, surf_depth, below_depth)
+            cell_size_all[:, surface] = np.where(is_surf_cell, surf_size, reg_size)
+
+        return cell_size_all, cell_depth
+
     def change_q_ensembles(self, proc_method):
         """Sets in_transect_idx to all ensembles, except in the case of SonTek data
         where RSL processing is applied.
@@ -1878,6 +1916,8 @@ class TransectData(object):
                 self.in_transect_idx = np.arange(self.edges.left.num_ens_2_avg, num_ens-self.edges.right.num_ens_2_avg)
         else:
             self.in_transect_idx = np.arange(0, self.boat_vel.bt_vel.u_processed_mps.shape[0])
+
+        self.processed_data_changed()
         
     def change_coord_sys(self, new_coord_sys):
         """Changes the coordinate system of the water and boat data.
@@ -1892,6 +1932,7 @@ class TransectData(object):
         """
         self.w_vel.change_coord_sys(new_coord_sys, self.sensors, self.adcp)
         self.boat_vel.change_coord_sys(new_coord_sys, self.sensors, self.adcp)
+        self.processed_data_changed()
         
     def change_nav_reference(self, update, new_nav_ref):
         """Method to set the navigation reference for the water data.
@@ -1905,6 +1946,7 @@ class TransectData(object):
         """
         
         self.boat_vel.change_nav_reference(reference=new_nav_ref, transect=self)
+        self.processed_data_changed()
         
         if update:
             self.update_water()
@@ -1931,6 +1973,8 @@ class TransectData(object):
             self.w_vel.change_heading(self.boat_vel, magvar_change)
         else:
             self.sensors.heading_deg.internal.set_mag_var(magvar, 'internal')
+
+        self.processed_data_changed()
         
         # self.update_water()
         
@@ -1990,6 +2034,16 @@ class TransectData(object):
 
         self.w_vel.apply_filter(transect=self)
         self.w_vel.apply_interpolation(transect=self)
+        self.processed_data_changed()
+
+    def processed_data_changed(self):
+        """Records a change in the processed water, boat, or depth data. The data version is incremented and the
+        discharge components computed from the previous data are discarded. Methods that change the processed data
+        in place without using the methods of this class must call this method.
+        """
+
+        self.data_version += 1
+        self.discharge_cache = None
 
     @staticmethod
     def side_lobe_cutoff(depths, draft, cell_depth, sl_lag_effect, slc_type='Percent', value=None):
@@ -2087,6 +2141,7 @@ class TransectData(object):
         else:
             # Process transect usin new setting
             self.boat_vel.composite_tracks(transect=self, setting=setting)
+        self.processed_data_changed()
             
         # Update water data to reflect changes in boatvel
         if update:
@@ -2116,6 +2171,7 @@ class TransectData(object):
         
         # Apply filter to transect
         self.boat_vel.bt_vel.apply_filter(self, **kwargs)
+        self.processed_data_changed()
         
         if self.boat_vel.selected == 'bt_vel' and update:
             self.update_water()
@@ -2148,6 +2204,7 @@ class TransectData(object):
             self.boat_vel.gga_vel.apply_gps_filter(self, **kwargs)
         if self.boat_vel.vtg_vel is not None:
             self.boat_vel.vtg_vel.apply_gps_filter(self, **kwargs)
+        self.processed_data_changed()
             
         if (self.boat_vel.selected == 'VTG' or self.boat_vel.selected == 'GGA') and update == True:
             self.update_water()
@@ -2164,6 +2221,7 @@ class TransectData(object):
         """
         
         self.depths.selected = setting
+        self.processed_data_changed()
 
         if update:
             self.process_depths(update)
@@ -2225,6 +2283,7 @@ class TransectData(object):
         self.depths.depth_interpolation(transect=self, method=interpolation_method)
         self.depths.composite_depths(transect=self, setting=composite_setting)
         self.w_vel.adjust_side_lobe(transect=self)
+        self.processed_data_changed()
         
         if update:
             self.update_water()
@@ -2242,6 +2301,37 @@ class TransectData(object):
             self.depths.vb_depths.change_draft(draft_in)
         if self.depths.bt_depths is not None:
             self.depths.bt_depths.change_draft(draft_in)
+        self.processed_data_changed()
+
+    def scenario(self, changed):
+        """Creates a copy of the transect for a simulation. The copy shares all data with the transect except the
+        objects and arrays changed by the simulation, so the raw data are not duplicated.
+
+        Parameters
+        ----------
+        changed: list
+            List of attributes changed by the simulation using dot notation (e.g. 'w_vel.u_processed_mps'). The
+            objects along the path are shallow copied and the attribute is copied.
+
+        Returns
+        -------
+        transect: TransectData
+            Copy of transect
+        """
+
+        transect = copy.copy(self)
+        copies = {}
+        for name in changed:
+            parent = transect
+            path = ''
+            for attribute in name.split('.'):
+                path = path + '.' + attribute
+                if path not in copies:
+                    copies[path] = copy.copy(getattr(parent, attribute))
+                    setattr(parent, attribute, copies[path])
+                parent = copies[path]
+
+        return transect
 
     def change_sos(self, parameter=None, salinity=None, temperature=None, selected=None, speed=None):
         """Coordinates changing the speed of sounc.
@@ -2387,6 +2477,7 @@ class TransectData(object):
             self.boat_vel.bt_vel.sos_correction(ratio=ratio)
         # Correct depths
         self.depths.sos_correction(ratio=ratio)
+        self.processed_data_changed()
 
     @staticmethod
     def raw_valid_data(transect):
@@ -2596,16 +2687,13 @@ class TransectData(object):
         return gps_bt
 
 # ========================================================================
-# Begin multithread function included in module but not TransectData class
-# Currently this is coded only for TRDI data
+# Begin transect loading functions included in module but not TransectData class
 # ========================================================================
 
 
-# DSM changed 1/23/2018 def allocate_transects(source, mmt, kargs)
-# TODO This needs a complete rewrite from what Greg did. However it works with no multi-threading for now
-def allocate_transects(mmt, transect_type='Q', checked=False):
-    """Method to load transect data. Changed from Matlab approach by Greg to allow possibility
-    of multi-thread approach.
+def allocate_transects(mmt, transect_type='Q', checked=False, n_workers=None, cache=None):
+    """Method to load transect data. Each transect file is read and processed
+    independently so the files can be distributed over a pool of processes.
 
     Parameters
     ----------
@@ -2615,263 +2703,220 @@ def allocate_transects(mmt, transect_type='Q', checked=False):
         Type of transect (Q: discharge or MB: moving-bed test)
     checked: bool
         Determines if all files are loaded (False) or only checked files (True)
+    n_workers: int
+        Number of processes used to load the transects. None or 1 loads the
+        transects serially, 0 uses one process per cpu.
+    cache: ParsedDataCache
+        Object of ParsedDataCache used to store the decoded raw data, None if not used
+
+    Returns
+    -------
+    processed_transects: list
+        List of TransectData objects in the order of the transects in the mmt file
     """
 
-    # DEBUG, set threaded to false to get manual serial commands
-    multi_threaded = False
+    if transect_type == 'MB':
+        mmt_transects = mmt.mbt_transects
+    else:
+        mmt_transects = mmt.transects
 
-    file_names = []
-    file_idx = []
+    valid_files, valid_indices = valid_transect_files(path=mmt.path,
+                                                      transects=mmt_transects,
+                                                      transect_type=transect_type,
+                                                      checked=checked)
 
-    # Setup processing for discharge or moving-bed transects
-    if transect_type == 'Q':
-        # Identify discharge transect files to load
-        if checked:
-            for idx, transect in enumerate(mmt.transects):
-                if transect.Checked == 1:
-                    file_names.append(transect.Files[0])
-                    file_idx.append(idx)
-            # file_names = [transect.Files[0] for transect in mmt.transects if transect.Checked == 1]
-        else:
-            file_names = [transect.Files[0] for transect in mmt.transects]
-            file_idx = list(range(0, len(file_names)))
-    elif transect_type == 'MB':
-        file_names = [transect.Files[0] for transect in mmt.mbt_transects]
-        file_idx = list(range(0, len(file_names)))
+    args = [(mmt, mmt_transects[valid_indices[k]], valid_files[k], cache) for k in range(len(valid_files))]
 
-    # Determine if any files are missing
-    valid_files = []
-    valid_indices = []
-    for index, name in enumerate(file_names):
-        fullname = os.path.join(mmt.path, name)
-        if os.path.exists(fullname):
-            valid_files.append(fullname)
-            valid_indices.append(file_idx[index])
+    return load_transects(function=load_trdi_transect, args=args, n_workers=n_workers)
 
-    # Multi-thread for Pd0 files
-    # -------------------------
-    # Seems like this section belongs in Pd0TRDI.py
-    # Initialize thread variables
-    pd0_data = []
-    pd0_threads = []
-    thread_id = 0
-
-    # DSM 1/24/2018 could this be moved to Pd0TRDI.py as a method
-    def add_pd0(file_name):
-        pd0_data.append(Pd0TRDI(file_name))
-        
-    if multi_threaded:
-        # TODO this belongs in the pd0 class
-        for file in valid_files:
-            pd0_thread = MultiThread(thread_id=thread_id, function=add_pd0, args={'file_name': file})
-            thread_id += 1
-            pd0_thread.start()
-            pd0_threads.append(pd0_thread)
+
+def allocate_rti_transects(rtt: RTTrowe, transect_type: str = 'Q', checked: bool = False, n_workers: int = None,
+                           cache: ParsedDataCache = None):
+    """Method to load Rowe transect data. Each transect file is read and processed
+    independently so the files can be distributed over a pool of processes.
+
+    Parameters
+    ----------
+    rtt: RTT Rowe
+        Object of RTT Rowe
+    transect_type: str
+        Type of transect (Q: discharge or MB: moving-bed test)
+    checked: bool
+        Determines if all files are loaded (False) or only checked files (True)
+    n_workers: int
+        Number of processes used to load the transects. None or 1 loads the
+        transects serially, 0 uses one process per cpu.
+    cache: ParsedDataCache
+        Object of ParsedDataCache used to store the decoded raw data, None if not used
+
+    Returns
+    -------
+    processed_transects: list
+        List of TransectData objects in the order of the transects in the rtt file
+    """
+
+    if transect_type == 'MB':
+        rtt_transects = rtt.mbt_transects
     else:
-        for file in valid_files:
-            pd0_data.append(Pd0TRDI(file))
-
-    for thrd in pd0_threads:
-        thrd.join()
-
-    # Multi-thread for transect data
-
-    # Initialize thread variables
-    processed_transects = []
-    transect_threads = []
-    thread_id = 0
-
-    # DSM 1/24/2018 couldn't this be added to the TransectData class
-    def add_transect(transect_data, mmt_transect, mt_pd0_data, mt_mmt):
-        transect_data.trdi(mmt=mt_mmt,
-                           mmt_transect=mmt_transect,
-                           pd0_data=mt_pd0_data)
-        processed_transects.append(transect_data)
-
-    # Process each transect
-    for k in range(len(pd0_data)):
-        transect = TransectData()
-        if pd0_data[k].Wt is not None:
-            if transect_type == 'MB':
-                # Process moving-bed transect
-                if multi_threaded:
-                    t_thread = MultiThread(thread_id=thread_id,
-                                           function=add_transect,
-                                           args={'transect': transect,
-                                                 'mmt_transect': mmt.mbt_transects[valid_indices[k]],
-                                                 'mt_pd0_data': pd0_data[k],
-                                                 'mt_mmt': mmt})
-                    t_thread.start()
-                    transect_threads.append(t_thread)
+        rtt_transects = rtt.transects
 
-                else:
-                    transect = TransectData()
-                    add_transect(transect_data=transect,
-                                 mmt_transect=mmt.mbt_transects[valid_indices[k]],
-                                 mt_pd0_data=pd0_data[k],
-                                 mt_mmt=mmt)
+    valid_files, valid_indices = valid_transect_files(path=rtt.path,
+                                                      transects=rtt_transects,
+                                                      transect_type=transect_type,
+                                                      checked=checked)
 
-            else:
-                # Process discharge transects
-                if multi_threaded:
-                    t_thread = MultiThread(thread_id=thread_id,
-                                           function=add_transect,
-                                           args={'transect': transect,
-                                                 'mmt_transect': mmt.transects[valid_indices[k]],
-                                                 'mt_pd0_data': pd0_data[k],
-                                                 'mt_mmt': mmt})
-                    t_thread.start()
-                    transect_threads.append(t_thread)
+    args = [(rtt, rtt_transects[valid_indices[k]], valid_files[k], cache) for k in range(len(valid_files))]
 
-                else:
-                    add_transect(transect_data=transect,
-                                 mmt_transect=mmt.transects[valid_indices[k]],
-                                 mt_pd0_data=pd0_data[k],
-                                 mt_mmt=mmt)
-
-    if multi_threaded:
-        for x in transect_threads:
-            x.join()
-                
-    return processed_transects
+    return load_transects(function=load_rowe_transect, args=args, n_workers=n_workers)
 
 
-def allocate_rti_transects(rtt: RTTrowe, transect_type: str = 'Q', checked: bool = False):
-    """Method to load transect data. Changed from Matlab approach by Greg to allow possibility
-    of multi-thread approach.
+def valid_transect_files(path, transects, transect_type='Q', checked=False):
+    """Identifies the transect files to load and removes any missing files.
 
     Parameters
     ----------
-    rtt: RTT Rowe
-        Object of RTT Rowe
+    path: str
+        Path to the transect files
+    transects: list
+        List of transect objects from the mmt or rtt file
     transect_type: str
         Type of transect (Q: discharge or MB: moving-bed test)
     checked: bool
         Determines if all files are loaded (False) or only checked files (True)
-    """
 
-    # DEBUG, set threaded to false to get manual serial commands
-    multi_threaded = False
+    Returns
+    -------
+    valid_files: list
+        Full names of the files that exist
+    valid_indices: list
+        Index of the transect associated with each valid file
+    """
 
     file_names = []
     file_idx = []
 
-    # Setup processing for discharge or moving-bed transects
-    if transect_type == 'Q':
-        # Identify discharge transect files to load
-        if checked:
-            for idx, transect in enumerate(rtt.transects):
-                if transect.Checked == 1:
-                    file_names.append(transect.Files[0])
-                    file_idx.append(idx)
-            # file_names = [transect.Files[0] for transect in mmt.transects if transect.Checked == 1]
-        else:
-            file_names = [transect.Files[0] for transect in rtt.transects]
-            file_idx = list(range(0, len(file_names)))
-    elif transect_type == 'MB':
-        file_names = [transect.Files[0] for transect in rtt.mbt_transects]
-        file_idx = list(range(0, len(file_names)))
+    # Only discharge transects can be limited to the checked transects
+    for idx, transect in enumerate(transects):
+        if transect_type == 'MB' or not checked or transect.Checked == 1:
+            file_names.append(transect.Files[0])
+            file_idx.append(idx)
 
     # Determine if any files are missing
     valid_files = []
     valid_indices = []
     for index, name in enumerate(file_names):
-        fullname = os.path.join(rtt.path, name)
+        fullname = os.path.join(path, name)
         if os.path.exists(fullname):
             valid_files.append(fullname)
             valid_indices.append(file_idx[index])
 
-    # Multi-thread for RTB files
-    # -------------------------
-    # Seems like this section belongs in RtbRowe.py
-    # Initialize thread variables
-    rtb_data = []
-    rtb_threads = []
-    thread_id = 0
-
-    # DSM 1/24/2018 could this be moved to Pd0TRDI.py as a method
-    # Accumulate the ensemble transect files
-    # Cecode the data, then add it to the list
-    def add_rtb(file_name):
-        rtb_data.append(RtbRowe(file_name, use_pd0_format=True))
-
-    if multi_threaded:
-        # TODO this belongs in the RTB class
-        for file in valid_files:
-            rtb_thread = MultiThread(thread_id=thread_id, function=add_rtb, args={'file_name': file})
-            thread_id += 1
-            rtb_threads.start()
-            rtb_threads.append(rtb_thread)
-    else:
-        for file in valid_files:
-            rtb_data.append(RtbRowe(file, use_pd0_format=True))
-
-    # Wait for all the threads to complete
-    for thrd in rtb_threads:
-        thrd.join()
-
-    # Multi-thread for transect data
-
-    # Initialize thread variables
-    processed_transects = []
-    transect_threads = []
-    thread_id = 0
-
-    # DSM 1/24/2018 couldn't this be added to the TransectData class
-    def add_transect(transect_data, rtt_transect, mt_rtb_data, mt_rtt):
-        transect_data.rowe(rtt=mt_rtt,                          # RTT Project
-                           rtt_transect=rtt_transect,           # RTT Transect Configs
-                           rowe_data=mt_rtb_data)               # RTB Ensemble data
-        processed_transects.append(transect_data)
-
-    # Process each transect
-    for k in range(len(rtb_data)):
-        transect = TransectData()
-        if rtb_data[k].Wt is not None:
-            if transect_type == 'MB':
-                # Process moving-bed transect
-                if multi_threaded:
-                    t_thread = MultiThread(thread_id=thread_id,
-                                           function=add_transect,
-                                           args={'transect': transect,
-                                                 'rtt_transect': rtt.mbt_transects[valid_indices[k]],
-                                                 'mt_rtb_data': rtb_data[k],
-                                                 'mt_rtt': rtt})
-                    t_thread.start()
-                    transect_threads.append(t_thread)
+    return valid_files, valid_indices
 
-                else:
-                    transect = TransectData()
-                    add_transect(transect_data=transect,
-                                 rtt_transect=rtt.mbt_transects[valid_indices[k]],
-                                 mt_rtt_data=rtb_data[k],
-                                 mt_rtt=rtt)
 
-            else:
-                # Process discharge transects
-                if multi_threaded:
-                    t_thread = MultiThread(thread_id=thread_id,
-                                           function=add_transect,
-                                           args={'transect': transect,
-                                                 'rtt_transect': rtt.transects[valid_indices[k]],
-                                                 'mt_rtb_data': rtb_data[k],
-                                                 'mt_rtt': rtt})
-                    t_thread.start()
-                    transect_threads.append(t_thread)
+def load_transects(function, args, n_workers=None):
+    """Applies the load function to each set of arguments either serially or
+    using a pool of processes. The order of the transects is preserved.
 
-                else:
-                    add_transect(transect_data=transect,
-                                 rtt_transect=rtt.transects[valid_indices[k]],
-                                 mt_rtb_data=rtb_data[k],
-                                 mt_rtt=rtt)
+    Parameters
+    ----------
+    function: function
+        Module level function that loads and processes a single transect
+    args: list
+        List of tuples with the arguments for each transect
+    n_workers: int
+        Number of processes. None or 1 loads the transects serially, 0 uses
+        one process per cpu.
+
+    Returns
+    -------
+    processed_transects: list
+        List of TransectData objects, transects with no water track data are omitted
+    """
+
+    if n_workers == 0:
+        n_workers = os.cpu_count()
+
+    if n_workers is None or n_workers <= 1 or len(args) <= 1:
+        transects = [function(*arg) for arg in args]
+    else:
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(args))) as executor:
+            transects = list(executor.map(function, *zip(*args)))
 
-    if multi_threaded:
-        for x in transect_threads:
-            x.join()
+    processed_transects = [transect for transect in transects if transect is not None]
 
     return processed_transects
 
 
+def load_trdi_transect(mmt, mmt_transect, file_name, cache=None):
+    """Reads a pd0 file and processes it into a transect. This function is
+    defined at the module level so that it can be used by a process pool.
+
+    Parameters
+    ----------
+    mmt: MMT_TRDI
+        Object of MMT_TRDI
+    mmt_transect: MMT_TRDI.Transect
+        Transect object from the mmt file
+    file_name: str
+        Full name of the pd0 file
+    cache: ParsedDataCache
+        Object of ParsedDataCache used to store the decoded raw data, None if not used
+
+    Returns
+    -------
+    transect: TransectData
+        Object of TransectData, None if the file has no water track data
+    """
+
+    if cache is None:
+        pd0_data = Pd0TRDI(file_name, fields='discharge')
+    else:
+        pd0_data = cache.load(Pd0TRDI, file_name, fields='discharge')
+    if pd0_data.Wt is None:
+        return None
+
+    transect = TransectData()
+    transect.trdi(mmt=mmt,
+                  mmt_transect=mmt_transect,
+                  pd0_data=pd0_data)
+    return transect
+
+
+def load_rowe_transect(rtt, rtt_transect, file_name, cache=None):
+    """Reads a rtb file and processes it into a transect. This function is
+    defined at the module level so that it can be used by a process pool.
+
+    Parameters
+    ----------
+    rtt: RTTrowe
+        Object of RTTrowe
+    rtt_transect: RTTrowe.Transect
+        Transect object from the rtt file
+    file_name: str
+        Full name of the rtb file
+    cache: ParsedDataCache
+        Object of ParsedDataCache used to store the decoded raw data, None if not used
+
+    Returns
+    -------
+    transect: TransectData
+        Object of TransectData, None if the file has no water track data
+    """
+
+    if cache is None:
+        rtb_data = RtbRowe(file_name, use_pd0_format=True, fields='discharge')
+    else:
+        rtb_data = cache.load(RtbRowe, file_name, use_pd0_format=True, fields='discharge')
+    if rtb_data.Wt is None:
+        return None
+
+    transect = TransectData()
+    transect.rowe(rtt=rtt,                          # RTT Project
+                  rtt_transect=rtt_transect,        # RTT Transect Configs
+                  rowe_data=rtb_data)               # RTB Ensemble data
+    return transect
+
+
 def adjusted_ensemble_duration(transect, trans_type=None):
     """Applies the TRDI method of expanding the ensemble time when data are invalid.
 
@@ -5,7 +5,9 @@ from scipy import interpolate
 from Classes.BoatData import BoatData
 from MiscLibs.common_functions import cart2pol, pol2cart, iqr
 from MiscLibs.robust_loess import rloess
+from MiscLibs.running_statistics import run_std_trim
 from MiscLibs.abba_2d_interpolation import abba_idw_interpolation
+from MiscLibs.coordinate_transform import hpr_matrices, ensemble_t_matrices, transform_vel
 
 
 class WaterData(object):
@@ -528,88 +530,24 @@ class WaterData(object):
             # Check to ensure the new coordinate system is a higher order than the original system
             if new_sys - orig_sys > 0:
                 
-                # Compute trig function for heaing, pitch and roll
-                ch = np.cos(np.deg2rad(h))
-                sh = np.sin(np.deg2rad(h))
-                cp = np.cos(np.deg2rad(p))
-                sp = np.sin(np.deg2rad(p))
-                cr = np.cos(np.deg2rad(r))
-                sr = np.sin(np.deg2rad(r))
-
-                n_ens = self.raw_vel_mps.shape[2]
-                
-                for ii in range(n_ens):
-                    
-                    # Compute matrix for heading, pitch, and roll
-                    hpr_matrix = np.array([[((ch[ii] * cr[ii]) + (sh[ii]*sp[ii] * sr[ii])),
-                                            (sh[ii] * cp[ii]),
-                                            ((ch[ii] * sr[ii]) - sh[ii]*sp[ii] * cr[ii])],
-                                           [(-1 * sh[ii] * cr[ii]) + (ch[ii] * sp[ii] * sr[ii]),
-                                            ch[ii] * cp[ii],
-                                            (-1 * sh[ii] * sr[ii])-(ch[ii] * sp[ii] * cr[ii])],
-                                           [(-1.*cp[ii] * sr[ii]),
-                                            sp[ii],
-                                            cp[ii] * cr[ii]]])
-                    
-                    # Transform beam coordinates
-                    if o_coord_sys == 'Beam':
-                        
-                        # Determine frequency index for transformation
-                        if len(t_matrix.shape) > 2:
-                            idx_freq = np.where(t_matrix_freq == self.frequency[ii])
-                            t_mult = np.copy(t_matrix[:, :, idx_freq])
-                        else:
-                            t_mult = np.copy(t_matrix)
-                            
-                        # Get velocity data
-                        vel_beams = np.copy(self.raw_vel_mps[:, :, ii])
-                        
-                        # Apply transformation matrix for 4 beam solutions
-                        temp_t = t_mult.dot(vel_beams)
-                        
-                        # Apply hpr_matrix
-                        temp_thpr = hpr_matrix.dot(temp_t[:3])
-                        temp_thpr = np.vstack([temp_thpr, temp_t[3]])
-                        
-                        # Check for invalid beams
-                        invalid_idx = np.isnan(vel_beams)
-                        
-                        # Identify rows requiring 3 beam solutions
-                        n_invalid_col = np.sum(invalid_idx, axis=0)
-                        col_idx = np.where(n_invalid_col == 1)[0]
-                        
-                        # Compute 3 beam solution, if necessary
-                        if len(col_idx) > 0:
-                            for i3 in range(len(col_idx)):
-                                
-                                # Id invalid beam
-                                vel_3_beam = vel_beams[:, col_idx[i3]]
-                                idx_3_beam = np.where(np.isnan(vel_3_beam))[0]
-                        
-                                # 3 beam solution for non-RiverRay
-                                vel_3_beam_zero = vel_3_beam
-                                vel_3_beam_zero[np.isnan(vel_3_beam)] = 0
-                                vel_error = t_mult[3, :].dot(vel_3_beam_zero)
-                                vel_3_beam[idx_3_beam] = -1 * vel_error / t_mult[3, idx_3_beam]
-                                temp_t = t_mult.dot(vel_3_beam)
-                                
-                                # Apply transformation matrix for 3
-                                # beam solutions
-                                temp_thpr[0:3, col_idx[i3]] = hpr_matrix.dot(temp_t[:3])
-                                temp_thpr[3, col_idx[i3]] = np.nan
-                            
-                    else:
-                        # Get velocity data
-                        vel_raw = np.copy(np.squeeze(self.raw_vel_mps[:, :, ii]))
-                        temp_thpr = np.array(hpr_matrix).dot(vel_raw[:3, :])
-                        temp_thpr = np.vstack([temp_thpr, vel_raw[3, :]])
-                        
-                    # Update object
-                    temp_thpr = temp_thpr.T
-                    self.u_mps[:, ii] = temp_thpr[:, 0]
-                    self.v_mps[:, ii] = temp_thpr[:, 1]
-                    self.w_mps[:, ii] = temp_thpr[:, 2]
-                    self.d_mps[:, ii] = temp_thpr[:, 3]
+                # Compute matrix for heading, pitch, and roll for all ensembles
+                hpr = hpr_matrices(h, p, r)
+
+                # Transform beam coordinates
+                if o_coord_sys == 'Beam':
+                    # Determine transformation matrix for each ensemble
+                    t_mult = ensemble_t_matrices(t_matrix, t_matrix_freq, self.frequency, self.raw_vel_mps.shape[2])
+                else:
+                    t_mult = None
+
+                # Apply transformation matrix, 3 beam solutions, and hpr_matrix
+                vel_changed = transform_vel(self.raw_vel_mps, hpr, t_mult)
+
+                # Update object
+                self.u_mps = vel_changed[0]
+                self.v_mps = vel_changed[1]
+                self.w_mps = vel_changed[2]
+                self.d_mps = vel_changed[3]
 
                 # Because of padded arrays with zeros and RR has a variable number of bins,
                 # the raw data may be padded with zeros.  The next 4 statements changes
@@ -1311,7 +1249,7 @@ class WaterData(object):
             
             # Apply a trimmed standard deviation filter multiple times
             for i in range(cycles):
-                fill_array = BoatData.run_std_trim(half_width, speed_res.T)
+                fill_array = run_std_trim(half_width, speed_res.T)
                 
                 # Compute filter bounds
                 upper_limit = speed_smooth + multiplier * fill_array
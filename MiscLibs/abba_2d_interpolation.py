@@ -15,6 +15,11 @@ or a normalized location. To use a normalized location set normalize to True.
 For efficiency the data_list can contain multiple types of data that lie on the same x-y locations.
 This allows multiple interpolations without having to recompute neighbors and distances.
 
+The neighbors of all targets are found together. The nearest valid cells above and below are found from the
+cumulative maximum and minimum of the valid row indices in each ensemble. The ensembles before and after are searched
+one ensemble at a time for all targets that have not yet found a valid ensemble or encountered the streambed. The
+neighbors are stored as arrays with the index of the target of each neighbor, ordered by target.
+
 Example
 -------
 
@@ -58,8 +63,11 @@ def find_neighbors(valid_data, cells_above_sl, y_cell_centers, y_cell_size, y_de
 
     Returns
     -------
-    neighbors: list
-        List of dictionaries providing the indices of the above, below, before, and after valid cells.
+    targets: tuple
+        Row and column indices of the invalid cells
+    neighbors: dict
+        Dictionary of arrays of the target index (target), row (row), and column (ens) of each neighbor. The neighbors
+        of each target are ordered above, below, before, and after.
     """
 
     # Compute cell extents
@@ -74,221 +82,221 @@ def find_neighbors(valid_data, cells_above_sl, y_cell_centers, y_cell_size, y_de
     # ID cells above side lobe with invalid data
     valid_data_float = valid_data.astype(float)
     valid_data_float[np.logical_not(cells_above_sl)] = np.nan
-    invalid_cell_index = np.where(valid_data_float == 0)
+    targets = np.where(valid_data_float == 0)
+    target_idx = np.arange(len(targets[0]))
 
-    # Initialize output list
+    # Neighbors of all targets, each as a tuple of target index, row, and column arrays
     neighbors = []
 
-    # Process each index
-    for cell, ens in zip(invalid_cell_index[0], invalid_cell_index[1]):
-        points = []
-        target = (cell, ens)
-
-        if 'above' in search_loc:
-            # Identify indices of cells above and below target
-            above = find_above(target, valid_data)
-            if above is not None:
-                points.append(above)
-
-        if 'below' in search_loc:
-            below = find_below(target, valid_data)
-            if below is not None:
-                points.append(below)
-
-        # Find all cells in ensembles before or after the target ensemble that overlap the target cell
-        # This is a change implemented on 2/27/2020 - dsm
-        y_match = np.logical_and(y_top[target] <= y_bottom, y_bottom[target] >= y_top)
-        y_match = np.logical_and(y_match, valid_data)
-
-        if 'before' in search_loc:
-            # Identify indices of cells before and after target
-            before = find_before(target, y_match, y_depth, y_bottom_actual)
-            if before:
-                points = points + before
-
-        if 'after' in search_loc:
-            after = find_after(target, y_match, y_depth, y_bottom_actual)
-            if after:
-                points = points + after
-
-        neighbors.append({'target': target, 'neighbors': points})
+    if 'above' in search_loc:
+        # Identify indices of cells above and below target
+        above = find_above(valid_data)[targets]
+        has_above = above >= 0
+        neighbors.append((target_idx[has_above], above[has_above], targets[1][has_above]))
+
+    if 'below' in search_loc:
+        below = find_below(valid_data)[targets]
+        has_below = below >= 0
+        neighbors.append((target_idx[has_below], below[has_below], targets[1][has_below]))
+
+    # Find all cells in ensembles before or after the target ensemble that overlap the target cell
+    # This is a change implemented on 2/27/2020 - dsm
+    if 'before' in search_loc:
+        # Identify indices of cells before and after target
+        neighbors.append(find_before(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual))
+
+    if 'after' in search_loc:
+        neighbors.append(find_after(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual))
+
+    # Order neighbors by target, preserving the order above, below, before, after for each target
+    if len(neighbors) > 0:
+        neighbor_target, neighbor_row, neighbor_ens = [np.concatenate(values) for values in zip(*neighbors)]
+    else:
+        neighbor_target, neighbor_row, neighbor_ens = [np.array([], dtype=int) for _ in range(3)]
+    order = np.argsort(neighbor_target, kind='stable')
 
-    return neighbors
+    return targets, {'target': neighbor_target[order], 'row': neighbor_row[order], 'ens': neighbor_ens[order]}
 
 
-def find_above(target, valid_data):
-    """ Finds the nearest valid cell above the target.
+def find_above(valid_data):
+    """ Finds the nearest valid cell above each cell.
 
     Parameters
     ----------
-    target: tuple
-        Indices of target cell
     valid_data: np.array(logical)
 
     Returns
     -------
-    above_idx: tuple
-        Indices of valid cell immediately above target
+    above_idx: np.array(int)
+        Row index of the valid cell immediately above each cell, -1 if there is no valid cell above
     """
 
-    # Initialize cell counter
-    above_idx = target[0] - 1
+    # Row index of the last valid cell at or above each cell
+    rows = np.arange(valid_data.shape[0])[:, np.newaxis]
+    last_valid = np.maximum.accumulate(np.where(valid_data, rows, -1), axis=0)
 
-    # Find nearest valid cell above target
-    while above_idx >= 0 and not valid_data[above_idx, target[1]]:
-        above_idx = above_idx - 1
-    if above_idx >= 0:
-        above_idx = (above_idx, target[1])
-    else:
-        above_idx = None
+    # Shift down one row to exclude the cell itself
+    above_idx = np.full(valid_data.shape, -1)
+    above_idx[1:, :] = last_valid[:-1, :]
 
     return above_idx
 
 
-def find_below(target, valid_data):
-    """ Finds the nearest valid cell below the target.
+def find_below(valid_data):
+    """ Finds the nearest valid cell below each cell.
 
     Parameters
     ----------
-    target: tuple
-        Indices of target cell
     valid_data: np.array(logical)
 
     Returns
     -------
-    below_idx: tuple
-        Indices of valid cell immediately below target
+    below_idx: np.array(int)
+        Row index of the valid cell immediately below each cell, -1 if there is no valid cell below
     """
 
-    # Initialize cell counter
-    below_idx = target[0] + 1
-
-    # Determine cell row index limit
-    n_cells = len(valid_data[:, target[1]])-1
+    # Row index of the first valid cell at or below each cell
+    n_cells = valid_data.shape[0]
+    rows = np.arange(n_cells)[:, np.newaxis]
+    next_valid = np.flipud(np.minimum.accumulate(np.flipud(np.where(valid_data, rows, n_cells)), axis=0))
 
-    # Find nearest valid cell below target
-    while below_idx <= n_cells and not valid_data[below_idx, target[1]]:
-        below_idx = below_idx + 1
-    if below_idx <= n_cells:
-        below_idx = (below_idx, target[1])
-    else:
-        below_idx = None
+    # Shift up one row to exclude the cell itself
+    below_idx = np.full(valid_data.shape, -1)
+    below_idx[:-1, :] = np.where(next_valid[1:, :] < n_cells, next_valid[1:, :], -1)
 
     return below_idx
 
 
-def find_before(target, y_match, y_depth, y_bottom):
-    """ Finds the nearest ensemble before the target that has valid cells within the vertical range of the target
+def find_before(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual):
+    """ Finds the nearest ensemble before each target that has valid cells within the vertical range of the target
 
     Parameters
     ----------
-    target: tuple
-        Indices of target cell
-    y_match: np.array(logical)
-        2-D array of all cells that are within the vertical range of the target cell
+    targets: tuple
+        Row and column indices of target cells
+    valid_data: np.array(logical)
+        Logical array indicating whether each cell is valid (true) or invalid (false)
+    y_top: np.array(float)
+        Top of each cell used to determine the vertical range
+    y_bottom: np.array(float)
+        Bottom of each cell used to determine the vertical range
     y_depth: np.array(float)
         1-D array containing values that will be used to normalize the data and specifying the lower boundary for
         identifying neighbors
-    y_bottom: np.array(float)
+    y_bottom_actual: np.array(float)
         Bottom depth of each cell
 
     Returns
     -------
-    before_idx: list
-        List of tuples of indices of all cells in the nearest ensemble before that target that are within
-        the vertical range of the target cell
+    before_idx: tuple
+        Arrays of the target index, row, and column of all cells in the nearest ensemble before each target that
+        are within the vertical range of the target cell
     """
 
-    # Initialize ensemble counter
-    before_ens = target[1] - 1
+    return find_ensemble(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual, step=-1)
 
-    # Loop until an ensemble is found that has valid data within the vertical range of the target while honoring
-    # the bathymetry. If the streambed is encountered while searching for a previously valid ensemble then
-    # it is determined that there is no available valid data before the target that can be used.
-    found = False
 
-    while (before_ens >= 0) and not found:
-        if y_bottom[target] < y_depth[before_ens] and np.any(y_match[:, before_ens]):
-            found = True
-        elif y_bottom[target] > y_depth[before_ens]:
-            before_ens = -999
-            found = True
-        else:
-            before_ens = before_ens - 1
+def find_after(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual):
+    """ Finds the nearest ensemble after each target that has valid cells within the vertical range of the target
 
-    # Find and store the indices all cells from the identified ensemble
-    # that are within the vertical range of the target
-    if before_ens >= 0:
-        rows = np.where(y_match[:, before_ens])[0]
-        before_idx = []
-        for row in rows:
-            before_idx.append((row, before_ens))
-    else:
-        before_idx = []
+    Parameters
+    ----------
+    targets: tuple
+        Row and column indices of target cells
+    valid_data: np.array(logical)
+        Logical array indicating whether each cell is valid (true) or invalid (false)
+    y_top: np.array(float)
+        Top of each cell used to determine the vertical range
+    y_bottom: np.array(float)
+        Bottom of each cell used to determine the vertical range
+    y_depth: np.array(float)
+        1-D array containing values that will be used to normalize the data and specifying the lower boundary for
+        identifying neighbors
+    y_bottom_actual: np.array(float)
+        Bottom depth of each cell
 
-    return before_idx
+    Returns
+    -------
+    after_idx: tuple
+        Arrays of the target index, row, and column of all cells in the nearest ensemble after each target that
+        are within the vertical range of the target cell
+    """
 
+    return find_ensemble(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual, step=1)
 
-def find_after(target, y_match, y_depth, y_bottom):
-    """ Finds the nearest ensemble after the target that has valid cells within the vertical range of the target
+
+def find_ensemble(targets, valid_data, y_top, y_bottom, y_depth, y_bottom_actual, step):
+    """ Searches the ensembles before (step = -1) or after (step = 1) all targets for the nearest ensemble that has
+    valid cells within the vertical range of each target while honoring the bathymetry. If the streambed is
+    encountered while searching then it is determined that there is no available valid data in that direction.
 
     Parameters
     ----------
-    target: tuple
-        Indices of target cell
-    y_match: np.array(logical)
-        2-D array of all cells that are within the vertical range of the target cell
-    y_depth: np.array(float)
-        1-D array containing values that will be used to normalize the data and specifying the lower boundary for
-        identifying neighbors
+    targets: tuple
+        Row and column indices of target cells
+    valid_data: np.array(logical)
+        Logical array indicating whether each cell is valid (true) or invalid (false)
+    y_top: np.array(float)
+        Top of each cell used to determine the vertical range
     y_bottom: np.array(float)
+        Bottom of each cell used to determine the vertical range
+    y_depth: np.array(float)
+        1-D array of streambed depth for each ensemble
+    y_bottom_actual: np.array(float)
         Bottom depth of each cell
+    step: int
+        Direction of search
+
     Returns
     -------
-    after_idx: list
-        List of tuples of indices of all cells in the nearest ensemble after that target that are within
+    neighbors: tuple
+        Arrays of the target index, row, and column of all cells in the identified ensembles that are within
         the vertical range of the target cell
     """
 
-    # Initialize ensemble counter
-    after_ens = target[1] + 1
+    n_ens = valid_data.shape[1]
+    target_top = y_top[targets]
+    target_bottom = y_bottom[targets]
+    target_bottom_actual = y_bottom_actual[targets]
+
+    found_ens = np.full(len(targets[0]), -1)
+    search_ens = targets[1] + step
+    searching = np.where(np.logical_and(search_ens >= 0, search_ens < n_ens))[0]
+
+    # Step all targets that are still searching one ensemble at a time
+    while len(searching) > 0:
+        ens = search_ens[searching]
+        y_match = np.logical_and(target_top[searching] <= y_bottom[:, ens], target_bottom[searching] >= y_top[:, ens])
+        y_match = np.logical_and(y_match, valid_data[:, ens])
 
-    # Loop until an ensemble is found that has valid data within the vertical range of the target while honoring
-    # the bathymetry. If the streambed is encountered while searching for a next valid ensemble then
-    # it is determined that there is no available valid data after the target that can be used.
-    found = False
+        found = np.logical_and(target_bottom_actual[searching] < y_depth[ens], np.any(y_match, axis=0))
+        streambed = np.logical_and(np.logical_not(found), target_bottom_actual[searching] > y_depth[ens])
+        found_ens[searching[found]] = ens[found]
 
-    while (after_ens <= y_match.shape[1] - 1) and not found:
-        if (y_bottom[target] < y_depth[after_ens]) and np.any(y_match[:, after_ens]):
-            found = True
-        elif y_bottom[target] > y_depth[after_ens]:
-            after_ens = -999
-            found = True
-        else:
-            after_ens = after_ens + 1
+        search_ens[searching] = ens + step
+        searching = searching[np.logical_not(np.logical_or(found, streambed))]
+        searching = searching[np.logical_and(search_ens[searching] >= 0, search_ens[searching] < n_ens)]
 
-    # Find and store the indices all cells from the identified ensemble
+    # Find and store the indices all cells from the identified ensembles
     # that are within the vertical range of the target
-    if (after_ens <= y_match.shape[1]-1) and (after_ens > 0):
-        rows = np.where(y_match[:, after_ens])[0]
-        after_idx = []
-        for row in rows:
-            after_idx.append((row, after_ens))
-    else:
-        after_idx = []
+    target_idx = np.where(found_ens >= 0)[0]
+    ens = found_ens[target_idx]
+    y_match = np.logical_and(target_top[target_idx] <= y_bottom[:, ens], target_bottom[target_idx] >= y_top[:, ens])
+    y_match = np.logical_and(y_match, valid_data[:, ens])
+    match_target, match_row = np.where(y_match.T)
 
-    return after_idx
+    return target_idx[match_target], match_row, ens[match_target]
 
 
-def compute_distances(target, neighbors, x, y):
-    """ Computes distances between the target and neighbors.
+def compute_distances(targets, neighbors, x, y):
+    """ Computes distances between the targets and neighbors.
 
     Parameters
     ----------
-    target: tuple
-        Indices of target cell
-    neighbors: list
-        List of indices of target's neighboring cells
+    targets: tuple
+        Row and column indices of target cells
+    neighbors: dict
+        Dictionary of arrays of the target index, row, and column of each neighbor
     x: np.array(float)
         1-D array of distances between ensembles
     y: np.array(float)
@@ -296,54 +304,57 @@ def compute_distances(target, neighbors, x, y):
 
     Returns
     -------
-    distances: list
-        List of distances from target to each neighbor
+    distances: np.array(float)
+        Distance from target to each neighbor
     """
 
     # Intialize target location
-    target_y = y[target]
-    target_x = x[target[1]]
+    target_y = y[targets][neighbors['target']]
+    target_x = x[targets[1]][neighbors['target']]
 
-    # Compute distance from target cell to each neighbor
-    distances = []
-    for neighbor in neighbors:
-        distances.append(np.sqrt((y[neighbor] - target_y) ** 2 + (x[neighbor[1]] - target_x) ** 2))
+    # Compute distance from target cell to each neighbor, float_power is used so the result is rounded the same as
+    # the power of a single value
+    distances = np.sqrt(np.float_power(y[neighbors['row'], neighbors['ens']] - target_y, 2)
+                        + np.float_power(x[neighbors['ens']] - target_x, 2))
 
     return distances
 
 
-def idw_interpolation(data, neighbor_indices, distances):
-    """ Interpolate value using neighbors and inverse distance weighting.
+def idw_interpolation(data, targets, neighbors, distances):
+    """ Interpolate values for all targets using neighbors and inverse distance weighting.
 
     Parameters
     ----------
     data: np.array(float)
         2-D array containing data to interpolate
-    neighbor_indices: list
-        List of tuples defining the indices of the target's neighbors
-    distances: list
-        List of distances from target to each neighbor
+    targets: tuple
+        Row and column indices of target cells
+    neighbors: dict
+        Dictionary of arrays of the target index, row, and column of each neighbor
+    distances: np.array(float)
+        Distance from target to each neighbor
 
     Returns
     -------
-    interpolated_value: float
-        Value of target cell interpolated from neighbors
+    interpolated_values: np.array(float)
+        Values of target cells interpolated from neighbors
     """
 
-    # Compute weighted sum or neighbor values
-    sum_of_weights = 0
-    weighted_sum = 0
-    for n, index in enumerate(neighbor_indices):
-        sum_of_weights = sum_of_weights + (1/distances[n])
-        weighted_sum = weighted_sum + data[index] * (1/distances[n])
+    # Compute weighted sum or neighbor values, the sums for each target are accumulated in neighbor order
+    n_targets = len(targets[0])
+    with np.errstate(divide='ignore'):
+        weights = 1 / distances
+    sum_of_weights = np.bincount(neighbors['target'], weights=weights, minlength=n_targets)
+    weighted_sum = np.bincount(neighbors['target'],
+                               weights=data[neighbors['row'], neighbors['ens']] * weights,
+                               minlength=n_targets)
 
     # Compute interpolated value
-    if sum_of_weights > 0:
-        interpolated_value = weighted_sum / sum_of_weights
-    else:
-        interpolated_value = np.nan
+    interpolated_values = np.tile(np.nan, n_targets)
+    valid = sum_of_weights > 0
+    interpolated_values[valid] = weighted_sum[valid] / sum_of_weights[valid]
 
-    return interpolated_value
+    return interpolated_values
 
 
 def abba_idw_interpolation(data_list, valid_data, cells_above_sl, y_centers, y_cell_size, y_depth,
@@ -383,27 +394,26 @@ def abba_idw_interpolation(data_list, valid_data, cells_above_sl, y_centers, y_c
     valid_cells = np.logical_and(cells_above_sl, valid_data)
     if not np.all(valid_cells):
         # Find neighbors associated with each target
-        interpolation_points = find_neighbors(valid_data=valid_data,
-                                              cells_above_sl=cells_above_sl,
-                                              y_cell_centers=y_centers,
-                                              y_cell_size=y_cell_size,
-                                              y_depth=y_depth,
-                                              search_loc=search_loc,
-                                              normalize=normalize)
-
-        # Process each target
-        for point in interpolation_points:
-            # Compute distance from target to neighbors
-            distances = compute_distances(target=point['target'],
-                                          neighbors=point['neighbors'],
-                                          x=x_shiptrack,
-                                          y=y_centers)
-
-            # Interpolate target for each data set in data_list
-            for n, data in enumerate(data_list):
-                interpolated_value = idw_interpolation(data=data,
-                                                       neighbor_indices=point['neighbors'],
-                                                       distances=distances)
-                interpolated_data[n].append([point['target'], interpolated_value])
+        targets, neighbors = find_neighbors(valid_data=valid_data,
+                                            cells_above_sl=cells_above_sl,
+                                            y_cell_centers=y_centers,
+                                            y_cell_size=y_cell_size,
+                                            y_depth=y_depth,
+                                            search_loc=search_loc,
+                                            normalize=normalize)
+
+        # Compute distance from targets to neighbors
+        distances = compute_distances(targets=targets,
+                                      neighbors=neighbors,
+                                      x=x_shiptrack,
+                                      y=y_centers)
+
+        # Interpolate targets for each data set in data_list
+        for n, data in enumerate(data_list):
+            interpolated_values = idw_interpolation(data=data,
+                                                    targets=targets,
+                                                    neighbors=neighbors,
+                                                    distances=distances)
+            interpolated_data[n] = [[target, value] for target, value in zip(zip(*targets), interpolated_values)]
 
     return interpolated_data
@@ -0,0 +1,194 @@
+"""coordinate_transform
+This module transforms ADCP velocities from beam, instrument, or ship coordinates to a higher order coordinate
+system for all ensembles at once. The heading, pitch, and roll matrices for all ensembles are computed as a
+(n_ens, 3, 3) stack and the transformation and heading, pitch, and roll matrices are applied using einsum. Three-beam
+solutions are computed only for the cells with one invalid beam. The module is used by both WaterData and BoatData.
+Velocities are arrays of (4, n_cells, n_ens); boat velocities (4, n_ens) are passed as (4, 1, n_ens).
+
+Example
+-------
+
+from MiscLibs.coordinate_transform import hpr_matrices, ensemble_t_matrices, transform_vel
+
+hpr = hpr_matrices(heading, pitch, roll)
+t_mult = ensemble_t_matrices(t_matrix, t_matrix_freq, frequency, n_ens)
+vel_earth = transform_vel(vel_beam, hpr, t_mult)
+"""
+import numpy as np
+from MiscLibs.common_functions import cosd, sind
+
+
+def hpr_matrices(heading, pitch, roll):
+    """Computes the heading, pitch, and roll matrix for each ensemble.
+
+    Parameters
+    ----------
+    heading: np.array(float)
+        Heading for each ensemble, in degrees
+    pitch: np.array(float)
+        Pitch for each ensemble, in degrees
+    roll: np.array(float)
+        Roll for each ensemble, in degrees
+
+    Returns
+    -------
+    hpr: np.array(float)
+        Heading, pitch, and roll matrices (n_ens, 3, 3)
+    """
+
+    ch = cosd(np.asarray(heading, dtype=float))
+    sh = sind(np.asarray(heading, dtype=float))
+    cp = cosd(np.asarray(pitch, dtype=float))
+    sp = sind(np.asarray(pitch, dtype=float))
+    cr = cosd(np.asarray(roll, dtype=float))
+    sr = sind(np.asarray(roll, dtype=float))
+
+    hpr = np.array([[(ch * cr) + (sh * sp * sr), sh * cp, (ch * sr) - sh * sp * cr],
+                    [(-1 * sh * cr) + (ch * sp * sr), ch * cp, (-1 * sh * sr) - (ch * sp * cr)],
+                    [-1. * cp * sr, sp, cp * cr]])
+
+    return np.moveaxis(hpr, -1, 0)
+
+
+def ensemble_t_matrices(t_matrix, t_matrix_freq, frequency, n_ens):
+    """Selects the transformation matrix for each ensemble. ADCPs with multiple frequencies (M9, S5) have a
+    transformation matrix for each frequency (4, 4, n_freq) and the matrix for the frequency of each ensemble is
+    used.
+
+    Parameters
+    ----------
+    t_matrix: np.array(float)
+        Transformation matrix (4, 4) or (4, 4, n_freq)
+    t_matrix_freq: np.array(float)
+        Frequency of each transformation matrix
+    frequency: np.array(float)
+        Frequency of each ensemble, only used for multiple frequencies
+    n_ens: int
+        Number of ensembles
+
+    Returns
+    -------
+    t_mult: np.array(float)
+        Transformation matrix for each ensemble (n_ens, 4, 4), nan if no matrix matches the ensemble frequency
+    """
+
+    t_matrix = np.asarray(t_matrix, dtype=float)
+
+    if t_matrix.ndim > 2:
+        frequency = np.asarray(frequency).reshape(-1)
+        match = frequency[:, np.newaxis] == np.asarray(t_matrix_freq).reshape(1, -1)
+        t_mult = np.moveaxis(t_matrix[:, :, np.argmax(match, axis=1)], -1, 0)
+        t_mult[np.logical_not(np.any(match, axis=1))] = np.nan
+    else:
+        t_mult = np.broadcast_to(t_matrix, (n_ens, 4, 4))
+
+    return t_mult
+
+
+def transform_vel(vel, hpr, t_mult=None, model=None):
+    """Transforms velocities to earth coordinates (ship coordinates if heading is zero and instrument coordinates if
+    heading, pitch, and roll are zero).
+
+    Parameters
+    ----------
+    vel: np.array(float)
+        Velocities (4, n_cells, n_ens)
+    hpr: np.array(float)
+        Heading, pitch, and roll matrices (n_ens, 3, 3)
+    t_mult: np.array(float)
+        Transformation matrix for each ensemble (n_ens, 4, 4), None if the velocities are not in beam coordinates
+    model: str
+        ADCP model, the RiverRay uses a different 3-beam solution
+
+    Returns
+    -------
+    vel_out: np.array(float)
+        Transformed velocities (4, n_cells, n_ens), error velocity is nan for 3-beam solutions
+    """
+
+    vel_out = np.tile(np.nan, vel.shape)
+
+    # Instrument or ship coordinates only require heading, pitch, and roll
+    if t_mult is None:
+        vel_out[:3] = np.einsum('eij,jce->ice', hpr, vel[:3])
+        vel_out[3] = vel[3]
+        return vel_out
+
+    # Apply transformation matrix for 4 beam solutions, cells with invalid beams are nan
+    temp_t = np.einsum('eij,jce->ice', t_mult, vel)
+    vel_out[:3] = np.einsum('eij,jce->ice', hpr, temp_t[:3])
+    vel_out[3] = temp_t[3]
+
+    # Identify cells requiring 3 beam solutions
+    invalid = np.isnan(vel)
+    cell_idx, ens_idx = np.where(np.sum(invalid, axis=0) == 1)
+
+    if len(cell_idx) > 0:
+        vel_3_beam = vel[:, cell_idx, ens_idx]
+        beam_idx = np.argmax(invalid[:, cell_idx, ens_idx], axis=0)
+        vel_3_beam[beam_idx, np.arange(len(cell_idx))] = 0
+        t_3_beam = t_mult[ens_idx]
+
+        if model == 'RiverRay':
+            temp_t = river_ray_3_beam(vel_3_beam, t_3_beam, beam_idx)
+        else:
+            # 3 beam solution for non-RiverRay
+            vel_error = np.einsum('nj,jn->n', t_3_beam[:, 3, :], vel_3_beam)
+            vel_3_beam[beam_idx, np.arange(len(cell_idx))] = \
+                -1 * vel_error / t_3_beam[np.arange(len(cell_idx)), 3, beam_idx]
+            temp_t = np.einsum('nij,jn->in', t_3_beam, vel_3_beam)
+
+        # Apply heading, pitch, and roll for 3 beam solutions
+        vel_out[:3, cell_idx, ens_idx] = np.einsum('nij,jn->in', hpr[ens_idx], temp_t[:3])
+        vel_out[3, cell_idx, ens_idx] = np.nan
+
+    return vel_out
+
+
+def river_ray_3_beam(vel_3_beam, t_3_beam, beam_idx):
+    """Computes the 3-beam solution for the RiverRay. The valid beam in the pair with the invalid beam is doubled,
+    the invalid pair is eliminated from the vertical velocity, and the horizontal velocity of the invalid pair is
+    corrected with the vertical velocity and speed of sound correction.
+
+    Parameters
+    ----------
+    vel_3_beam: np.array(float)
+        Beam velocities with the invalid beam set to zero (4, n)
+    t_3_beam: np.array(float)
+        Transformation matrix for each velocity (n, 4, 4)
+    beam_idx: np.array(int)
+        Index of the invalid beam for each velocity
+
+    Returns
+    -------
+    temp_t: np.array(float)
+        Velocities in instrument coordinates, only the first 3 components are valid (4, n)
+    """
+
+    # Set speed of sound correction variables Note: Currently (2013-09-06)
+    # WinRiver II does not use a variable correction and assumes the speed
+    # of sound and the reference speed of sound are the same.
+    sos_correction = np.sqrt(3)
+
+    n = np.arange(len(beam_idx))
+    t_3_beam = np.copy(t_3_beam)
+
+    # Double valid beam in invalid pair (beam pairs are 1-2 and 3-4)
+    pair_idx = np.array([1, 0, 3, 2])[beam_idx]
+    t_3_beam[n, 0, pair_idx] *= 2
+    t_3_beam[n, 1, pair_idx] *= 2
+
+    # Eliminate invalid pair from vertical velocity computations
+    pair_1 = beam_idx < 2
+    t_3_beam[pair_1, 2, :] = [0, 0, 1 / sos_correction, 1 / sos_correction]
+    t_3_beam[np.logical_not(pair_1), 2, :] = [1 / sos_correction, 1 / sos_correction, 0, 0]
+
+    # Apply transformation matrix
+    temp_t = np.einsum('nij,jn->in', t_3_beam, vel_3_beam)
+
+    # Correct horizontal velocity for invalid pair with the vertical velocity and speed of sound correction
+    sign = np.array([1, -1, -1, 1])[beam_idx]
+    component = np.where(pair_1, 0, 1)
+    temp_t[component, n] = temp_t[component, n] + sign * temp_t[2] * sos_correction
+
+    return temp_t
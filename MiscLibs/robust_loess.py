@@ -3,6 +3,9 @@ This module computes a robust loess smooth using a quadratic model as defined by
 W.S.Cleveland, (1979) "Robust Locally Weighted Regression and Smoothing Scatterplots",
 Journal of the American Statistical Association, Vol 74, No. 368, pp. 829-836.
 Both x and y values are required and are assumed to be 1D arrays (n,).
+The neighbors of all points are found with a sliding window over the sorted x values and the local weighted
+quadratic regressions for all points are solved together as stacked normal equations. The neighbors found for the
+non-robust fit are reused in each robust cycle.
 
 Example
 -------
@@ -17,6 +20,9 @@ import numpy as np
 eps = np.finfo('float').eps
 seps = np.sqrt(eps)
 
+# Largest condition number of the normal equations solved together in compute_loess_batch
+max_cond = 1e4
+
 
 def nearest_neighbors(num_neighbors, idx, x, valid_x):
     """Find the nearest k neighbors to x[i] that are not nan.
@@ -172,6 +178,146 @@ def compute_loess(x, y, neighbors_idx, idx, r_weights=None):
     return smoothed_values[0]
 
 
+def neighbor_windows(x, valid_x, num_neighbors, targets):
+    """Find the nearest k neighbors that are not nan for each target. The x values must be sorted. The k nearest
+    neighbors of a target are k consecutive valid points, so only the windows of k valid points next to the target
+    are checked. Points as close as the farthest of the k neighbors are also neighbors, as in nearest_neighbors.
+
+    Parameters
+    ----------
+    x: np.array
+        1D array of the independent variable, sorted
+    valid_x: bool
+        Boolean array indicating valid x data.
+    num_neighbors: int
+        Number of neighbors to find
+    targets: np.array(int)
+        Indices for the target x values
+
+    Returns
+    -------
+    neighbors_idx: np.array(int)
+        Indices for neighbors in x array for each target (n_targets, max number of neighbors)
+    neighbors_valid: np.array(bool)
+        Indicates which columns of neighbors_idx are neighbors of each target
+    """
+
+    valid_idx = np.where(valid_x)[0]
+    n_valid = len(valid_idx)
+    n_targets = len(targets)
+
+    # If there are k points or fewer, then they are all neighbors
+    if n_valid <= num_neighbors:
+        neighbors_idx = np.tile(valid_idx, (n_targets, 1))
+        neighbors_valid = np.ones(neighbors_idx.shape, dtype=bool)
+        return neighbors_idx, neighbors_valid
+
+    x_valid = x[valid_idx]
+    x_targets = x[targets]
+    rows = np.arange(n_targets)
+
+    # Distance to the farthest point of each window of k valid points that could contain the k closest points
+    position = np.searchsorted(x_valid, x_targets)
+    first = np.clip(position[:, np.newaxis] + np.arange(-num_neighbors, 1), 0, n_valid - num_neighbors)
+    distance_window = np.maximum(np.abs(x_valid[first] - x_targets[:, np.newaxis]),
+                                 np.abs(x_valid[first + num_neighbors - 1] - x_targets[:, np.newaxis]))
+
+    # The window with the closest farthest point contains the k closest points
+    closest = np.argmin(distance_window, axis=1)
+    lower = first[rows, closest]
+    upper = lower + num_neighbors - 1
+    distance_neighbors = distance_window[rows, closest]
+
+    # Add all points that are as close as the k closest points
+    extend = lower > 0
+    while np.any(extend):
+        extend[extend] = np.abs(x_valid[lower[extend] - 1] - x_targets[extend]) <= distance_neighbors[extend]
+        lower[extend] -= 1
+        extend = np.logical_and(extend, lower > 0)
+    extend = upper < n_valid - 1
+    while np.any(extend):
+        extend[extend] = np.abs(x_valid[upper[extend] + 1] - x_targets[extend]) <= distance_neighbors[extend]
+        upper[extend] += 1
+        extend = np.logical_and(extend, upper < n_valid - 1)
+
+    # Store the neighbors of each target in a row
+    window = lower[:, np.newaxis] + np.arange(np.max(upper - lower) + 1)
+    neighbors_valid = window <= upper[:, np.newaxis]
+    neighbors_idx = valid_idx[np.minimum(window, n_valid - 1)]
+
+    return neighbors_idx, neighbors_valid
+
+
+def compute_loess_batch(x, y, targets, neighbors_idx, neighbors_valid, r_weights=None):
+    """Computes the loess smooth for all targets by solving the normal equations of the weighted quadratic
+    regressions together. Targets with 3 or fewer distinct weighted neighbors or poorly conditioned normal equations
+    are computed with compute_loess.
+
+    Parameters
+    ----------
+    x: np.array(float)
+        1D array of independent variable
+    y: np.array(float)
+        1D array of dependent variable
+    targets: np.array(int)
+        Indices of x defining targets
+    neighbors_idx: np.array(int)
+        Indices of x defining neighbors of each target (n_targets, max number of neighbors)
+    neighbors_valid: np.array(bool)
+        Indicates which columns of neighbors_idx are neighbors of each target
+    r_weights: np.array(float)
+        1D array of robust weights
+
+    Returns
+    -------
+    smoothed_values: np.array(float)
+        Computed smoothed value for each target
+    """
+
+    # Center around current point
+    distances = np.where(neighbors_valid, x[neighbors_idx] - x[targets][:, np.newaxis], 0)
+    distances_abs = np.abs(distances)
+    neighbors_y = np.where(neighbors_valid, y[neighbors_idx], 0)
+
+    # Tri-cubic weights
+    max_distance = np.max(distances_abs, axis=1)[:, np.newaxis]
+    max_distance[max_distance <= 0] = 1
+    distances_abs = distances_abs / max_distance
+    weights = (1 - distances_abs ** 3) ** 1.5
+
+    # If all weights are 0, skip weighting
+    weights[np.all(np.logical_or(weights < seps, np.logical_not(neighbors_valid)), axis=1), :] = 1
+    weights[np.logical_not(neighbors_valid)] = 0
+
+    if r_weights is not None:
+        weights = weights * r_weights[neighbors_idx]
+
+    # Scaling the distances improves the conditioning and does not change the fitted value at the target
+    distances = distances / max_distance
+    x_matrix = np.stack((np.ones(distances.shape), distances, distances * distances), axis=2)
+    weights_sq = weights * weights
+    a_matrix = np.einsum('nk,nki,nkj->nij', weights_sq, x_matrix, x_matrix)
+    b_vector = np.einsum('nk,nki->ni', weights_sq * neighbors_y, x_matrix)
+
+    # The quadratic is only determined by the normal equations if more than 3 distinct x values have weight. With
+    # 3 or fewer the fit interpolates or is singular, so the fitted value is very sensitive to rounding.
+    weighted_x = np.sort(np.where(weights > 0, x[neighbors_idx], np.nan), axis=1)
+    n_distinct = np.sum(np.isfinite(weighted_x), axis=1) - np.sum(np.diff(weighted_x, axis=1) == 0, axis=1)
+    well_conditioned = n_distinct > 3
+    well_conditioned[well_conditioned] = np.linalg.cond(a_matrix[well_conditioned]) < max_cond
+
+    smoothed_values = np.tile(np.nan, len(targets))
+    if np.any(well_conditioned):
+        smoothed_values[well_conditioned] = np.linalg.solve(a_matrix[well_conditioned],
+                                                            b_vector[well_conditioned][:, :, np.newaxis])[:, 0, 0]
+
+    # Use least squares for nearly degenerate, poorly conditioned, or singular regressions
+    for n in np.where(np.logical_not(well_conditioned))[0]:
+        smoothed_values[n] = compute_loess(x, y, neighbors_idx[n, neighbors_valid[n]], targets[n], r_weights)
+
+    return smoothed_values
+
+
 def rloess(x, y, span):
     """This function computes a robust loess smooth using a quadratic model as defined by
     W.S.Cleveland, (1979) "Robust Locally Weighted Regression and Smoothing Scatterplots",
@@ -191,67 +337,50 @@ def rloess(x, y, span):
     # Number of cycles of the robust fit
     cycles = 5
 
-    n_points = len(y)
     smoothed_values = np.copy(y)
 
     if span > 1:
 
-        diff_x = np.diff(x)
-
-        # Assumes non-uniform x
         y_nan = np.isnan(y)
-        any_nans = np.any(y_nan[:])
-        the_diffs = np.concatenate((np.array([1]), diff_x, np.array([1])), axis=0)
+        if np.all(y_nan):
+            raise ValueError('No valid data to smooth')
 
-        # Pre-allocate space for lower and upper indices for each fit
-        lower_bound = np.zeros(n_points).astype(int)
-        upper_bound = np.zeros(n_points).astype(int)
+        # Sort x so neighbors are adjacent, points with the same x have the same fit
+        order = np.argsort(x, kind='stable')
+        x_sorted = x[order]
+        y_sorted = y[order]
+        targets = np.where(np.concatenate((np.array([True]), np.diff(x_sorted) != 0)))[0]
+        same_x = np.cumsum(np.concatenate((np.array([True]), np.diff(x_sorted) != 0))) - 1
 
         # Compute the non-robust smooth
-        for n in range(n_points):
-
-            # if x[i] and x[i-1] are equal just use previous fit
-            if the_diffs[n] == 0:
-
-                smoothed_values[n] = smoothed_values[n-1]
-                lower_bound[n] = lower_bound[n-1].astype(int)
-                upper_bound[n] = upper_bound[n-1].astype(int)
-
-            else:
-
-                # Find nearest neighbors
-                neighbors_idx = nearest_neighbors(span, n, x, np.logical_not(y_nan))
-                # Store neighbors for robust loop
-                lower_bound[n] = np.min(neighbors_idx).astype(int)
-                upper_bound[n] = np.max(neighbors_idx).astype(int)
-
-                if len(neighbors_idx) < 1:
-                    smoothed_values[n] = np.nan
-                else:
-                    smoothed_values[n] = compute_loess(x, y, neighbors_idx, n)
+        neighbors_idx, neighbors_valid = neighbor_windows(x_sorted, np.logical_not(y_nan[order]), span, targets)
+        smoothed_targets = compute_loess_batch(x_sorted, y_sorted, targets, neighbors_idx, neighbors_valid)
+        smoothed_values[order] = smoothed_targets[same_x]
         # Non-robust fit complete
 
         # Compute residual and apply robust fit
         max_absy_eps = np.max(np.abs(y)) * eps
+        robust = np.logical_not(np.isnan(smoothed_targets))
         for cycle in range(cycles - 1):
-            residuals = y - smoothed_values
+            residuals = y_sorted - smoothed_values[order]
 
             # Compute robust weights
             r_weights = robust_weights(residuals, max_absy_eps)
 
-            # Find new value for each point
-            for n in range(n_points):
-                if n > 0 and x[n] == x[n-1]:
-                    smoothed_values[n] = smoothed_values[n-1]
-                else:
-                    if not np.isnan(smoothed_values[n]):
-                        neighbors_idx = np.array(list(range(lower_bound[n], upper_bound[n] + 1)))
+            # Reuse the neighbors from the non-robust fit unless they include points with zero weight
+            zero_weight = np.any(np.logical_and(neighbors_valid, r_weights[neighbors_idx] <= 0), axis=1)
+            reuse = np.logical_and(robust, np.logical_not(zero_weight))
+            new = np.logical_and(robust, zero_weight)
 
-                        if any_nans:
-                            neighbors_idx = neighbors_idx[np.logical_not(y_nan[neighbors_idx])]
+            if np.any(reuse):
+                smoothed_targets[reuse] = compute_loess_batch(x_sorted, y_sorted, targets[reuse],
+                                                              neighbors_idx[reuse], neighbors_valid[reuse],
+                                                              r_weights)
+            if np.any(new):
+                new_idx, new_valid = neighbor_windows(x_sorted, r_weights > 0, span, targets[new])
+                smoothed_targets[new] = compute_loess_batch(x_sorted, y_sorted, targets[new],
+                                                            new_idx, new_valid, r_weights)
 
-                        if np.any(r_weights[neighbors_idx] <= 0):
-                            neighbors_idx = nearest_neighbors(span, n, x, (r_weights > 0))
+            smoothed_values[order] = smoothed_targets[same_x]
 
-                        smoothed_values[n] = compute_loess(x, y, neighbors_idx, n, r_weights)
     return smoothed_values
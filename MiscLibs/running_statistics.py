@@ -0,0 +1,169 @@
+"""running_statistics
+This module computes running statistics for all points of a 1D array (n,) in one call. The samples for each point
+are the half_width points before and after the point, not including the point. Near the ends of the series the
+number of points before or after are reduced and nan in the data are counted as points. The samples in the body of
+the data are views created with sliding_window_view and only the samples near the ends are indexed individually.
+The samples are stored in a 2D array (n, 2 * half_width) padded with nan.
+
+Example
+-------
+
+from MiscLibs.running_statistics import run_std_trim, run_iqr
+
+filter_array = run_std_trim(half_width, data)
+iqr_array = run_iqr(half_width, data)
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+def running_samples(half_width, data):
+    """Selects the samples before and after each point.
+
+    Parameters
+    ----------
+    half_width: int
+        Number of points before and after each point used for the sample
+    data: np.array(float)
+        1D array of data
+
+    Returns
+    -------
+    samples: np.array(float)
+        Samples for each point (n, max number of samples), padded with nan
+    n_samples: np.array(int)
+        Number of samples for each point, including nan in the data
+    """
+
+    data = np.asarray(data, dtype=float)
+    n_pts = data.shape[0]
+    n = np.arange(n_pts)
+
+    # Sample selection in body of data set
+    before_start = n - half_width
+    before_end = np.copy(n)
+    after_start = n + 1
+    after_end = n + half_width + 1
+
+    # Sample selection for 1st point
+    before_start[0:1] = 0
+    before_end[0:1] = 0
+
+    # Sample selection at end of data set
+    end = np.logical_and(n > 0, n + half_width > n_pts)
+    before_start[end] = n[end] - half_width - 1
+    before_end[end] = n[end] - 1
+    after_start[end] = n[end]
+    after_end[end] = n_pts
+
+    # Sample selection at beginning of data set
+    beginning = np.logical_and(np.logical_and(n > 0, np.logical_not(end)), half_width >= n + 1)
+    before_start[beginning] = 0
+
+    # Apply the indexing rules of slices
+    before_start, before_end, after_start, after_end = \
+        [np.clip(np.where(idx < 0, idx + n_pts, idx), 0, n_pts)
+         for idx in (before_start, before_end, after_start, after_end)]
+    n_before = np.maximum(before_end - before_start, 0)
+    n_samples = n_before + np.maximum(after_end - after_start, 0)
+
+    samples = np.tile(np.nan, (n_pts, max(np.max(n_samples, initial=0), 2 * half_width, 1)))
+
+    # Samples in body of data set are the sliding windows without the center point
+    body = np.zeros(n_pts, dtype=bool)
+    if n_pts > 2 * half_width:
+        body[max(half_width, 1):n_pts - half_width] = True
+        windows = sliding_window_view(data, 2 * half_width + 1)[max(half_width, 1) - half_width:]
+        samples[body, :half_width] = windows[:, :half_width]
+        samples[body, half_width:2 * half_width] = windows[:, half_width + 1:]
+
+    # Samples at the ends of data set
+    edge = np.where(np.logical_not(body))[0]
+    if len(edge) > 0:
+        column = np.arange(samples.shape[1])
+        idx = np.where(column < n_before[edge, np.newaxis],
+                       before_start[edge, np.newaxis] + column,
+                       after_start[edge, np.newaxis] + column - n_before[edge, np.newaxis])
+        valid = column < n_samples[edge, np.newaxis]
+        samples[edge] = np.where(valid, data[np.clip(idx, 0, max(n_pts - 1, 0))], np.nan)
+
+    return samples, n_samples
+
+
+def run_std_trim(half_width, data):
+    """Computes a standard deviation over +/- half_width of points. The samples for each point are sorted and
+    the points with the highest and lowest values are removed and the standard deviation computed on the
+    remaining points. Because nan are sorted to the end, a nan in the sample is removed instead of the highest value.
+
+    Parameters
+    ----------
+    half_width: int
+         Number of points on each side of target point used for computing trimmed standard deviation
+    data: np.array(float)
+         1D array of data to be processed
+
+    Returns
+    -------
+    filter_array: np.array(float)
+         Trimmed standard deviation for each point
+    """
+
+    n_pts = data.shape[0]
+    half_width = int(half_width)
+    if n_pts < 20:
+        half_width = int(np.floor(n_pts / 2.))
+
+    samples, n_samples = running_samples(half_width, data)
+
+    # Sort and remove the first and last point of each sample
+    samples = np.sort(samples, axis=1)
+    column = np.arange(samples.shape[1])
+    trimmed = np.logical_and(column >= 1, column < n_samples[:, np.newaxis] - 1)
+    samples[np.logical_not(trimmed)] = np.nan
+
+    return np.nanstd(samples, axis=1, ddof=1)
+
+
+def run_iqr(half_width, data):
+    """Computes a running inner quartile range over +/- half_width of points. The quartiles are computed
+    consistent with Matlab, as in common_functions.iqr, and nan in the samples are ignored.
+
+    Parameters
+    ----------
+    half_width: int
+        Number of points before and after each point which are used to compute the IQR
+    data: np.array(float)
+        1D array of data for which the IQR is computed
+
+    Returns
+    -------
+    iqr_array: np.array(float)
+        Inner quartile range for each point
+    """
+
+    n_pts = len(data)
+    half_width = int(half_width)
+    if n_pts < 20:
+        half_width = int(np.floor(n_pts / 2))
+
+    samples, _ = running_samples(half_width, data)
+
+    # Sort valid data to the beginning of each sample
+    samples = np.sort(samples, axis=1)
+    n_valid = np.sum(np.logical_not(np.isnan(samples)), axis=1)
+
+    # Quantiles using plotting positions (alphap=0.5, betap=0.5) of scipy.stats.mstats.mquantiles
+    rows = np.arange(n_pts)
+    quartiles = []
+    for p in (0.25, 0.75):
+        aleph = n_valid * p + 0.5
+        k = np.floor(np.clip(aleph, 1, np.maximum(n_valid - 1, 1))).astype(int)
+        gamma = np.clip(aleph - k, 0, 1)
+        quartiles.append((1. - gamma) * samples[rows, k - 1]
+                         + gamma * samples[rows, np.minimum(k, samples.shape[1] - 1)])
+
+    iqr_array = quartiles[1] - quartiles[0]
+    iqr_array[n_valid == 1] = 0
+    iqr_array[n_valid == 0] = np.nan
+
+    return iqr_array
@@ -1,5 +1,6 @@
 import numpy as np
 from PyQt5 import QtCore
+from UI.LevelOfDetail import LevelOfDetail
 
 
 class BeamDepths(object):
@@ -42,6 +43,8 @@ class BeamDepths(object):
         Index to data cursor connection
     annot: Annotation
         Annotation for data cursor
+    lod: LevelOfDetail
+        Object of LevelOfDetail used to plot the beam depths at the screen resolution
     """
 
     def __init__(self, canvas):
@@ -71,6 +74,7 @@ class BeamDepths(object):
         self.ds = None
         self.hover_connection = None
         self.annot = None
+        self.lod = None
 
     def create(self, transect, units, cb_beam1=None, cb_beam2=None, cb_beam3=None, cb_beam4=None,
                cb_vert=None, cb_ds=None):
@@ -136,9 +140,11 @@ class BeamDepths(object):
             beam_depths = transect.depths.bt_depths.depth_beams_m
 
             # Plot beams
+            self.lod = LevelOfDetail(self.fig.ax)
             self.beam1 = self.fig.ax.plot(x * units['L'],
                                           beam_depths[0, :] * units['L'],
                                           'r-')
+            self.lod.add_line(self.beam1[0])
             self.beam1.append(self.fig.ax.plot(x[invalid_beams[0, :]] * units['L'],
                                                beam_depths[0, invalid_beams[0, :]] * units['L'],
                                                'r', linestyle='',
@@ -147,6 +153,7 @@ class BeamDepths(object):
             self.beam2 = self.fig.ax.plot(x * units['L'],
                                           beam_depths[1, :] * units['L'],
                                           color='#005500')
+            self.lod.add_line(self.beam2[0])
             self.beam2.append(self.fig.ax.plot(x[invalid_beams[1, :]] * units['L'],
                                                beam_depths[1, invalid_beams[1, :]] * units['L'],
                                                color='#005500',
@@ -156,6 +163,7 @@ class BeamDepths(object):
             self.beam3 = self.fig.ax.plot(x * units['L'],
                                           beam_depths[2, :] * units['L'],
                                           'b-')
+            self.lod.add_line(self.beam3[0])
             self.beam3.append(self.fig.ax.plot(x[invalid_beams[2, :]] * units['L'],
                                                beam_depths[2, invalid_beams[2, :]] * units['L'],
                                                'b',
@@ -166,6 +174,7 @@ class BeamDepths(object):
                                           beam_depths[3, :] * units['L'],
                                           color='#aa5500',
                                           linestyle='-')
+            self.lod.add_line(self.beam4[0])
             self.beam4.append(self.fig.ax.plot(x[invalid_beams[3, :]] * units['L'],
                                                beam_depths[3, invalid_beams[3, :]] * units['L'],
                                                color='#aa5500',
@@ -211,6 +220,7 @@ class BeamDepths(object):
                                            beam_depths * units['L'],
                                            color='#aa00ff',
                                            linestyle='-')
+                self.lod.add_line(self.vb[0])
                 self.vb.append(self.fig.ax.plot(x[invalid_beams] * units['L'],
                                                 beam_depths[invalid_beams] * units['L'],
                                                 color='#aa00ff',
@@ -233,6 +243,7 @@ class BeamDepths(object):
                 self.ds = self.fig.ax.plot(x * units['L'],
                                            beam_depths * units['L'],
                                            color='#00aaff')
+                self.lod.add_line(self.ds[0])
                 self.ds.append(self.fig.ax.plot(x[invalid_beams] * units['L'],
                                                 beam_depths[invalid_beams] * units['L'],
                                                 color='#00aaff',
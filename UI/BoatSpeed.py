@@ -1,5 +1,6 @@
 import numpy as np
 from PyQt5 import QtCore
+from UI.LevelOfDetail import LevelOfDetail
 
 class BoatSpeed(object):
     """Class to generate boat speed time series plot. If checkboxes for the boat speed reference
@@ -31,6 +32,8 @@ class BoatSpeed(object):
         Index to data cursor connection
     annot: Annotation
         Annotation object for data cursor
+    lod: LevelOfDetail
+        Object of LevelOfDetail used to plot the boat speeds at the screen resolution
     """
 
     def __init__(self, canvas):
@@ -55,6 +58,7 @@ class BoatSpeed(object):
         self.vtg = None
         self.hover_connection = None
         self.annot = None
+        self.lod = None
 
     def create(self, transect, units,
                cb=False, cb_bt=None, cb_gga=None, cb_vtg=None):
@@ -91,6 +95,7 @@ class BoatSpeed(object):
 
         # Configure axis
         self.fig.ax = self.fig.add_subplot(1, 1, 1)
+        self.lod = LevelOfDetail(self.fig.ax)
 
         # Set margins and padding for figure
         self.fig.subplots_adjust(left=0.08, bottom=0.2, right=0.98, top=0.98, wspace=0.1, hspace=0)
@@ -110,6 +115,7 @@ class BoatSpeed(object):
         # Plot bottom track boat speed
         speed = np.sqrt(transect.boat_vel.bt_vel.u_processed_mps ** 2 + transect.boat_vel.bt_vel.v_processed_mps ** 2)
         self.bt = self.fig.ax.plot(ensembles, speed * units['V'], 'r-')
+        self.lod.add_line(self.bt[0])
 
         # Plot invalid data points using a symbol to represent what caused the data to be invalid
         invalid_bt = np.logical_not(transect.boat_vel.bt_vel.valid_data)
@@ -143,6 +149,7 @@ class BoatSpeed(object):
             speed = np.sqrt(
                 transect.boat_vel.vtg_vel.u_processed_mps ** 2 + transect.boat_vel.vtg_vel.v_processed_mps ** 2)
             self.vtg = self.fig.ax.plot(ensembles, speed * units['V'], 'g-')
+            self.lod.add_line(self.vtg[0])
 
             # Plot invalid data points using a symbol to represent what caused the data to be invalid
             invalid_gps = np.logical_not(transect.boat_vel.vtg_vel.valid_data)
@@ -171,6 +178,7 @@ class BoatSpeed(object):
             speed = np.sqrt(
                 transect.boat_vel.gga_vel.u_processed_mps ** 2 + transect.boat_vel.gga_vel.v_processed_mps ** 2)
             self.gga = self.fig.ax.plot(ensembles, speed * units['V'], 'b-')
+            self.lod.add_line(self.gga[0])
 
             # Plot invalid data points using a symbol to represent what caused the data to be invalid
             invalid_gps = np.logical_not(transect.boat_vel.gga_vel.valid_data)
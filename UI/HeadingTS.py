@@ -1,5 +1,6 @@
 import numpy as np
 from PyQt5 import QtCore
+from UI.LevelOfDetail import LevelOfDetail
 
 
 class HeadingTS(object):
@@ -23,6 +24,8 @@ class HeadingTS(object):
         Annotation object for heading
     annot2: Annotation
         Annotation object for percent change in magnetic field
+    lod: list
+        Objects of LevelOfDetail used to plot the time series of each axes at the screen resolution
     """
 
     def __init__(self, canvas):
@@ -44,6 +47,7 @@ class HeadingTS(object):
         self.hover_connection = None
         self.annot = None
         self.annot2 = None
+        self.lod = []
 
     def create(self, meas, checked, tbl, cb_internal, cb_external, cb_merror):
         """Creates heading time series graph.
@@ -70,6 +74,7 @@ class HeadingTS(object):
 
         # Configure axis
         self.fig.axh = self.fig.add_subplot(1, 1, 1)
+        self.lod = [LevelOfDetail(self.fig.axh)]
 
         # Set margins and padding for figure
         self.fig.subplots_adjust(left=0.1, bottom=0.15, right=0.95, top=0.98, wspace=0.1, hspace=0)
@@ -83,6 +88,7 @@ class HeadingTS(object):
         if cb_merror.isChecked():
             # Plot magnetic field change
             self.fig.axm = self.fig.axh.twinx()
+            self.lod.append(LevelOfDetail(self.fig.axm))
             self.fig.axm.set_ylabel(self.canvas.tr('Magnetic Change (%)'))
             self.fig.axm.yaxis.label.set_fontsize(10)
             self.fig.axm.tick_params(axis='both', direction='in', bottom=True, top=True, left=True, right=True)
@@ -100,6 +106,7 @@ class HeadingTS(object):
                         heading = np.flip(heading)
                     ensembles = range(1, len(heading) + 1)
                     self.internal.append(self.fig.axh.plot(ensembles, heading, 'r-')[0])
+                    self.lod[0].add_line(self.internal[-1])
                 else:
                     self.internal = None
 
@@ -110,6 +117,7 @@ class HeadingTS(object):
                         heading = np.flip(heading)
                     ensembles = range(1, len(heading) + 1)
                     self.external.append(self.fig.axh.plot(ensembles, heading, 'b-')[0])
+                    self.lod[0].add_line(self.external[-1])
                 else:
                     self.external = None
 
@@ -120,6 +128,7 @@ class HeadingTS(object):
                         mag_chng = np.flip(mag_chng)
                     ensembles = range(1, len(mag_chng) + 1)
                     self.merror.append(self.fig.axm.plot(ensembles, mag_chng, 'k-')[0])
+                    self.lod[1].add_line(self.merror[-1])
                     self.merror.append(self.fig.axm.plot([ensembles[0], ensembles[-1]], [2, 2], 'k--')[0])
                 else:
                     self.merror = None
@@ -0,0 +1,347 @@
+import numpy as np
+
+
+class LevelOfDetail(object):
+    """Class to limit the data plotted in an axes to what can be resolved on the screen. Lines are decimated
+    keeping the minimum and maximum of each block of points and color contour meshes are aggregated into blocks of
+    ensembles. The data are decimated again for the current view when the axis limits change, so zooming in shows
+    the full detail. The full data are kept so data cursors can report the values of the original points.
+
+    Attributes
+    ----------
+    ax: Axes
+        Axes containing the plotted data
+    lines: list
+        Dictionary for each registered line with the line, full data, and index of the plotted points
+    mesh: dict
+        Dictionary with the plotted QuadMesh, full mesh data, and plot options
+    points_per_pixel: int
+        Number of points per pixel of axes width above which the data are decimated
+    margin: float
+        Fraction of the points in view added on each side when the data in view are plotted without decimation
+    """
+
+    def __init__(self, ax, points_per_pixel=4):
+        """Initialize object and connect to the changes in the axis limits.
+
+        Parameters
+        ----------
+        ax: Axes
+            Axes containing the plotted data
+        points_per_pixel: int
+            Number of points per pixel of axes width above which the data are decimated
+        """
+
+        self.ax = ax
+        self.lines = []
+        self.mesh = None
+        self.points_per_pixel = points_per_pixel
+        self.margin = 0.25
+
+        # The callback registry keeps weak references so the graph must keep a reference to this object
+        self.ax.callbacks.connect('xlim_changed', self.lim_changed)
+        self.ax.callbacks.connect('ylim_changed', self.lim_changed)
+
+    def add_line(self, line, xy=False):
+        """Registers a line plotted with the full data and decimates it for the current view.
+
+        Parameters
+        ----------
+        line: Line2D
+            Line plotted with the full data
+        xy: bool
+            Indicates if both coordinates vary along the line (ship track) instead of a time series
+        """
+
+        item = {'line': line,
+                'x': np.asarray(line.get_xdata(orig=True), dtype=float),
+                'y': np.asarray(line.get_ydata(orig=True), dtype=float),
+                'xy': xy,
+                'idx': None,
+                'view': None}
+        self.lines.append(item)
+        self.update_line(item)
+
+    def add_mesh(self, x_plt, y_plt, c_plt, **kwargs):
+        """Plots a color contour mesh aggregated for the current view. The mesh has two columns for each
+        ensemble as created by WTContour.contour_mesh.
+
+        Parameters
+        ----------
+        x_plt: np.array
+            Data in meshgrid format used for the contour x variable
+        y_plt: np.array
+            Data in meshgrid format used for the contour y variable
+        c_plt: np.array
+            Data in meshgrid format used to determine colors in plot, values less than -900 are invalid
+        kwargs: dict
+            Options for pcolormesh
+
+        Returns
+        -------
+        quad_mesh: QuadMesh
+            Plotted mesh
+        """
+
+        # The axis limits are not set until the mesh is plotted so the mesh is first aggregated for all ensembles
+        self.mesh = {'quad_mesh': None, 'x': x_plt, 'y': y_plt, 'c': c_plt, 'kwargs': kwargs, 'view': None}
+        self.update_mesh(x_lim=(np.min(x_plt), np.max(x_plt)))
+
+        return self.mesh['quad_mesh']
+
+    def full_index(self, line, ind):
+        """Converts the index of a plotted point to the index of the point in the full data.
+
+        Parameters
+        ----------
+        line: Line2D
+            Plotted line
+        ind: int
+            Index of the point in the plotted data
+
+        Returns
+        -------
+        idx: int
+            Index of the point in the full data
+        """
+
+        for item in self.lines:
+            if item['line'] is line and item['idx'] is not None:
+                return item['idx'][ind]
+        return ind
+
+    def lim_changed(self, ax):
+        """Decimates the data for the new axis limits.
+
+        Parameters
+        ----------
+        ax: Axes
+            Axes with changed limits
+        """
+
+        for item in self.lines:
+            self.update_line(item)
+        if self.mesh is not None:
+            self.update_mesh()
+
+    def n_pixels(self):
+        """Width of the axes in pixels."""
+
+        return max(int(self.ax.bbox.width), 1)
+
+    def visible_range(self, visible):
+        """Determines the range of points to plot from the points in the current view. The points next to the
+        view are included so lines continue to the edge of the axes.
+
+        Parameters
+        ----------
+        visible: np.array(bool)
+            Indicates points in the current view
+
+        Returns
+        -------
+        start: int
+            Index of first point
+        stop: int
+            Index after the last point
+        """
+
+        visible_idx = np.flatnonzero(visible)
+        if len(visible_idx) == 0:
+            return 0, len(visible)
+        return max(visible_idx[0] - 1, 0), min(visible_idx[-1] + 2, len(visible))
+
+    def full_range(self, start, stop, n_points, view):
+        """Determines the range of points plotted without decimation. A margin of points is included on each side
+        of the view so small changes in the axis limits do not require the data to be set again.
+
+        Parameters
+        ----------
+        start: int
+            Index of first point in view
+        stop: int
+            Index after the last point in view
+        n_points: int
+            Number of points in the full data
+        view: tuple
+            Start, stop, and number of blocks of the plotted data
+
+        Returns
+        -------
+        view: tuple
+            Start, stop, and number of blocks of the data to plot
+        """
+
+        # Keep the plotted data if they cover the view and are not much larger than the view with its margin
+        margin = int(np.ceil(self.margin * (stop - start)))
+        if view is not None and view[2] == 1 and view[0] <= start and view[1] >= stop \
+                and view[1] - view[0] <= stop - start + 4 * margin:
+            return view
+        return max(start - margin, 0), min(stop + margin, n_points), 1
+
+    def update_line(self, item):
+        """Sets the data of a line to the decimated data in the current view.
+
+        Parameters
+        ----------
+        item: dict
+            Registered line
+        """
+
+        x_lim = np.sort(self.ax.get_xlim())
+        y_lim = np.sort(self.ax.get_ylim())
+        with np.errstate(invalid='ignore'):
+            visible = np.logical_and(item['x'] >= x_lim[0], item['x'] <= x_lim[1])
+            if item['xy']:
+                visible = np.logical_and(visible, np.logical_and(item['y'] >= y_lim[0], item['y'] <= y_lim[1]))
+        start, stop = self.visible_range(visible)
+
+        n_pixels = self.n_pixels()
+        if stop - start <= self.points_per_pixel * n_pixels:
+            # Plot all data in view
+            view = self.full_range(start, stop, len(visible), item['view'])
+        else:
+            view = (start, stop, n_pixels)
+
+        if view != item['view']:
+            item['view'] = view
+            if view[2] == 1:
+                item['idx'] = np.arange(view[0], view[1])
+                item['line'].set_data(item['x'][view[0]:view[1]], item['y'][view[0]:view[1]])
+            else:
+                series = [item['x'], item['y']] if item['xy'] else [item['y']]
+                item['idx'] = self.decimate_idx(series, start, stop, n_pixels)
+                item['line'].set_data(item['x'][item['idx']], item['y'][item['idx']])
+
+    def update_mesh(self, x_lim=None):
+        """Plots the mesh aggregated for the current view.
+
+        Parameters
+        ----------
+        x_lim: tuple
+            Limits of the x axis used instead of the axis limits
+        """
+
+        x_plt = self.mesh['x']
+        n_ensembles = x_plt.shape[1] // 2
+        x_center = 0.5 * (x_plt[0, 0::2] + x_plt[0, 1::2])
+        if x_lim is None:
+            x_lim = self.ax.get_xlim()
+        x_lim = np.sort(x_lim)
+        start, stop = self.visible_range(np.logical_and(x_center >= x_lim[0], x_center <= x_lim[1]))
+
+        n_pixels = self.n_pixels()
+        if stop - start <= n_pixels:
+            view = self.full_range(start, stop, n_ensembles, self.mesh['view'])
+        else:
+            view = (start, stop, n_pixels)
+
+        if view != self.mesh['view']:
+            self.mesh['view'] = view
+            if view[2] == 1:
+                x, y, c = [data[:, 2 * view[0]:2 * view[1]] for data in (x_plt, self.mesh['y'], self.mesh['c'])]
+            else:
+                x, y, c = self.aggregate_mesh(x_plt, self.mesh['y'], self.mesh['c'], view[0], view[1], view[2])
+            if self.mesh['quad_mesh'] is not None:
+                self.mesh['quad_mesh'].remove()
+            self.mesh['quad_mesh'] = self.ax.pcolormesh(x, y, c, **self.mesh['kwargs'])
+
+    @staticmethod
+    def decimate_idx(series, start, stop, n_blocks):
+        """Selects the points to plot by dividing the points into blocks and keeping the first, last, minimum, and
+        maximum of each block. The first invalid point of a block is kept so gaps in lines are shown.
+
+        Parameters
+        ----------
+        series: list
+            Data arrays used to select the minimum and maximum
+        start: int
+            Index of first point
+        stop: int
+            Index after the last point
+        n_blocks: int
+            Number of blocks
+
+        Returns
+        -------
+        idx: np.array(int)
+            Index of the selected points
+        """
+
+        n_points = stop - start
+        block = int(np.ceil(n_points / n_blocks))
+        if block <= 1:
+            return np.arange(start, stop)
+
+        # Blocks of indices with the last block padded using the last point
+        idx = np.arange(start, stop)
+        idx = np.hstack([idx, np.tile(stop - 1, (-n_points) % block)]).reshape(-1, block)
+        rows = np.arange(idx.shape[0])
+
+        keep = [idx[:, 0], idx[:, -1]]
+        for data in series:
+            values = data[idx]
+            invalid = np.isnan(values)
+            keep.append(idx[rows, np.argmin(np.where(invalid, np.inf, values), axis=1)])
+            keep.append(idx[rows, np.argmax(np.where(invalid, -np.inf, values), axis=1)])
+            has_invalid = np.any(invalid, axis=1)
+            keep.append(idx[rows[has_invalid], np.argmax(invalid[has_invalid], axis=1)])
+
+        return np.unique(np.hstack(keep))
+
+    @staticmethod
+    def aggregate_mesh(x_plt, y_plt, c_plt, start, stop, n_blocks):
+        """Aggregates a color contour mesh into blocks of ensembles. Each block extends from the start of its first
+        ensemble to the end of its last ensemble, uses the cells of its middle ensemble, and is colored by the mean
+        of the valid data in each cell.
+
+        Parameters
+        ----------
+        x_plt: np.array
+            Data in meshgrid format used for the contour x variable, two columns for each ensemble
+        y_plt: np.array
+            Data in meshgrid format used for the contour y variable
+        c_plt: np.array
+            Data in meshgrid format used to determine colors in plot, values less than -900 are invalid
+        start: int
+            Index of first ensemble
+        stop: int
+            Index after the last ensemble
+        n_blocks: int
+            Number of blocks
+
+        Returns
+        -------
+        x_plt: np.array
+            Aggregated data used for the contour x variable
+        y_plt: np.array
+            Aggregated data used for the contour y variable
+        c_plt: np.array
+            Aggregated data used to determine colors in plot
+        """
+
+        n_ensembles = stop - start
+        block = int(np.ceil(n_ensembles / n_blocks))
+        if block <= 1:
+            return x_plt[:, 2 * start:2 * stop], y_plt[:, 2 * start:2 * stop], c_plt[:, 2 * start:2 * stop]
+
+        n_rows = x_plt.shape[0]
+        first = np.arange(start, stop, block)
+        last = np.minimum(first + block - 1, stop - 1)
+        middle = (first + last) // 2
+
+        x_agg = np.stack([x_plt[:, 2 * first], x_plt[:, 2 * last + 1]], axis=2).reshape(n_rows, -1)
+        y_agg = np.repeat(y_plt[:, 2 * middle], 2, axis=1)
+
+        # Mean of valid data in each block, the last block is padded with invalid data
+        c = c_plt[:, 2 * start:2 * stop:2]
+        valid = c > -900
+        n_pad = (-n_ensembles) % block
+        c = np.hstack([np.where(valid, c, 0), np.zeros((n_rows, n_pad))]).reshape(n_rows, -1, block)
+        valid = np.hstack([valid, np.zeros((n_rows, n_pad), dtype=bool)]).reshape(n_rows, -1, block)
+        n_valid = np.sum(valid, axis=2)
+        c_mean = np.tile(-999., n_valid.shape)
+        c_mean[n_valid > 0] = np.sum(c, axis=2)[n_valid > 0] / n_valid[n_valid > 0]
+        c_agg = np.repeat(c_mean, 2, axis=1)
+
+        return x_agg, y_agg, c_agg
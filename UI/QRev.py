@@ -1,6 +1,7 @@
 import sys
 import copy
 import os
+import multiprocessing
 import shutil
 import simplekml
 import webbrowser
@@ -20,6 +21,7 @@ from Classes.Python2Matlab import Python2Matlab
 from Classes.Sensors import Sensors
 from Classes.MovingBedTests import MovingBedTests
 from Classes.CoordError import CoordError
+from Classes.ParsedDataCache import ParsedDataCache
 import UI.QRev_gui as QRev_gui
 from UI.selectFile import SaveMeasurementDialog
 from UI.OpenMeasurementDialog import OpenMeasurementDialog
@@ -103,6 +105,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         Dictionary containing units coversions and labels for length, area, velocity, and discharge
     save_stylesheet: bool
         Indicates whether to save a stylesheet with the measurement
+    n_workers: int
+        Number of processes used to load transects and run the Oursin simulations, 0 uses one process per cpu
     icon_caution: QtGui.QIcon
         Caution icon
     icon_warning: QtGui.QIcon
@@ -354,7 +358,7 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         self.setupUi(self)
 
         # Set version of QRev
-        self.QRev_version = 'QRev 4.23'
+        self.QRev_version = Measurement.qrev_version
         self.setWindowTitle(self.QRev_version)
         self.setWindowIcon(QtGui.QIcon('QRev.ico'))
 
@@ -387,6 +391,22 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
             self.sticky_settings.new('StyleSheet', False)
             self.save_stylesheet = False
 
+        # Number of processes used to load transects and run the Oursin simulations, 0 uses one process per cpu
+        try:
+            self.n_workers = self.sticky_settings.get('Workers')
+        except KeyError:
+            self.sticky_settings.new('Workers', 0)
+            self.n_workers = 0
+
+        # Cache of parsed raw data, only used if a cache folder has been set
+        self.parsed_data_cache = None
+        try:
+            cache_folder = self.sticky_settings.get('CacheFolder')
+            if cache_folder:
+                self.parsed_data_cache = ParsedDataCache(cache_dir=cache_folder)
+        except KeyError:
+            pass
+
         # Set initial change switch to false
         self.change = False
 
@@ -640,6 +660,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         # If a selection is made begin loading
         if len(select.type) > 0:
             self.tab_all.setEnabled(False)
+            # Plotting meshes of the previous measurement are no longer needed
+            WTContour.clear_mesh_cache()
             # Load and process Sontek data
             if select.type == 'SonTek':
                 with self.wait_cursor():
@@ -650,7 +672,9 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                         self.meas = Measurement(in_file=select.fullName,
                                                 source='SonTek',
                                                 proc_type='QRev',
-                                                run_oursin=self.run_oursin)
+                                                run_oursin=self.run_oursin,
+                                                n_workers=self.n_workers,
+                                                cache=self.parsed_data_cache)
                     except CoordError as error:
                         self.popup_message(error.text)
             # Load and process Sontek data
@@ -662,7 +686,9 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                     self.meas = Measurement(in_file=select.fullName,
                                             source='Nortek',
                                             proc_type='QRev',
-                                            run_oursin=self.run_oursin)
+                                            run_oursin=self.run_oursin,
+                                            n_workers=self.n_workers,
+                                            cache=self.parsed_data_cache)
 
             # Load and process TRDI data
             elif select.type == 'TRDI':
@@ -674,7 +700,9 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                                             source='TRDI',
                                             proc_type='QRev',
                                             checked=select.checked,
-                                            run_oursin=self.run_oursin)
+                                            run_oursin=self.run_oursin,
+                                            n_workers=self.n_workers,
+                                            cache=self.parsed_data_cache)
 
             # Load and process Rowe data
             elif select.type == 'Rowe':
@@ -685,7 +713,9 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                     self.meas = Measurement(in_file=select.fullName[0],
                                             source='Rowe',
                                             proc_type='QRev',
-                                            checked=select.checked)
+                                            checked=select.checked,
+                                            n_workers=self.n_workers,
+                                            cache=self.parsed_data_cache)
 
             # Load QRev data
             elif select.type == 'QRev':
@@ -711,17 +741,20 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                             self.meas = Measurement(in_file=mat_data,
                                                     source='QRev',
                                                     proc_type='None',
-                                                    run_oursin=self.run_oursin)
+                                                    run_oursin=self.run_oursin,
+                                                    n_workers=self.n_workers)
                         else:
                             self.meas = Measurement(in_file=mat_data,
                                                     source='QRev',
                                                     proc_type='QRev',
-                                                    run_oursin=self.run_oursin)
+                                                    run_oursin=self.run_oursin,
+                                                    n_workers=self.n_workers)
                 else:
                     self.meas = Measurement(in_file=mat_data,
                                             source='QRev',
                                             proc_type='None',
-                                            run_oursin=self.run_oursin)
+                                            run_oursin=self.run_oursin,
+                                            n_workers=self.n_workers)
 
             if self.meas is not None:
                 with self.wait_cursor():
@@ -4959,8 +4992,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         # Save discharge from previous settings
         old_discharge = copy.deepcopy(self.meas.discharge)
 
-        # Apply new settings
-        self.meas.apply_settings(settings=s)
+        # Apply new settings, only the processing affected by the changed settings is recomputed
+        self.meas.apply_settings(settings=s, incremental=True)
 
         # Update table
         self.update_bt_table(old_discharge=old_discharge, new_discharge=self.meas.discharge)
@@ -5761,8 +5794,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         # Save discharge from previous settings
         old_discharge = copy.deepcopy(self.meas.discharge)
 
-        # Apply new settings
-        self.meas.apply_settings(settings=s)
+        # Apply new settings, only the processing affected by the changed settings is recomputed
+        self.meas.apply_settings(settings=s, incremental=True)
 
         # Update table
         self.update_gps_table(old_discharge=old_discharge, new_discharge=self.meas.discharge)
@@ -6737,8 +6770,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         # Save discharge from previous settings
         old_discharge = copy.deepcopy(self.meas.discharge)
 
-        # Apply new settings
-        self.meas.apply_settings(settings=s)
+        # Apply new settings, only the processing affected by the changed settings is recomputed
+        self.meas.apply_settings(settings=s, incremental=True)
 
         # Update table
         self.update_depth_table(old_discharge=old_discharge, new_discharge=self.meas.discharge)
@@ -7480,8 +7513,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
         # Save discharge from previous settings
         old_discharge = copy.deepcopy(self.meas.discharge)
 
-        # Apply new settings
-        self.meas.apply_settings(settings=s)
+        # Apply new settings, only the processing affected by the changed settings is recomputed
+        self.meas.apply_settings(settings=s, incremental=True)
 
         # Update table
         self.update_wt_table(old_discharge=old_discharge, new_discharge=self.meas.discharge)
@@ -9754,7 +9787,7 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                 self.meas.oursin.user_specified_u['u_invalid_water_user'] = new_value
 
             # Compute new uncertainty values
-            self.meas.oursin.compute_oursin(meas=self.meas)
+            self.meas.oursin.compute_oursin(meas=self.meas, n_workers=self.meas.n_workers)
 
             # Update
             self.uncertainty_results_table()
@@ -9803,7 +9836,7 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
                 self.meas.oursin.user_advanced_settings['compass_error_user'] = new_value
 
             # Compute new uncertainty values
-            self.meas.oursin.compute_oursin(meas=self.meas)
+            self.meas.oursin.compute_oursin(meas=self.meas, n_workers=self.meas.n_workers)
 
             # Update
             self.uncertainty_results_table()
@@ -10805,6 +10838,8 @@ class QRev(QtWidgets.QMainWindow, QRev_gui.Ui_MainWindow):
 # Main
 # ====
 if __name__ == "__main__":
+    # Required for the process pools used to load measurements when QRev is run as a frozen executable
+    multiprocessing.freeze_support()
     app = QtWidgets.QApplication(sys.argv)
     window = QRev()
     # if len(sys.argv) > 1:
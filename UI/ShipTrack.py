@@ -1,5 +1,6 @@
 import numpy as np
 from PyQt5 import QtCore
+from UI.LevelOfDetail import LevelOfDetail
 
 
 class Shiptrack(object):
@@ -36,6 +37,8 @@ class Shiptrack(object):
             Index to data cursor connection
         annot: Annotation
             Annotation object for data cursor
+        lod: LevelOfDetail
+            Object of LevelOfDetail used to plot the ship tracks at the screen resolution
         """
 
     def __init__(self, canvas):
@@ -63,6 +66,7 @@ class Shiptrack(object):
         self.vector_ref = None
         self.hover_connection = None
         self.annot = None
+        self.lod = None
 
     def create(self, transect, units,
                cb=False, cb_bt=None, cb_gga=None, cb_vtg=None, cb_vectors=None,
@@ -107,6 +111,7 @@ class Shiptrack(object):
 
         # Configure axis
         self.fig.ax = self.fig.add_subplot(1, 1, 1)
+        self.lod = LevelOfDetail(self.fig.ax)
 
         # Set margins and padding for figure
         self.fig.subplots_adjust(left=0.18, bottom=0.18, right=0.98, top=0.98, wspace=0.1, hspace=0)
@@ -139,6 +144,7 @@ class Shiptrack(object):
         self.bt = self.fig.ax.plot(ship_data_bt['track_x_m'] * units['L'], ship_data_bt['track_y_m'] * units['L'],
                                    color='r',
                                    label='BT')
+        self.lod.add_line(self.bt[0], xy=True)
 
         if edge_start is not None \
                 and not np.alltrue(np.isnan(ship_data_bt['track_x_m'])) \
@@ -200,6 +206,7 @@ class Shiptrack(object):
                 self.vtg = self.fig.ax.plot(ship_data_vtg['track_x_m'] * units['L'],
                                             ship_data_vtg['track_y_m'] * units['L'],
                                             color='g', label='VTG')
+                self.lod.add_line(self.vtg[0], xy=True)
 
                 # if len(ship_data_vtg['track_x_m']) > 0:
                 if not np.alltrue(np.isnan(ship_data_vtg['track_x_m'])):
@@ -251,6 +258,7 @@ class Shiptrack(object):
                 self.gga = self.fig.ax.plot(ship_data_gga['track_x_m'] * units['L'],
                                             ship_data_gga['track_y_m'] * units['L'],
                                             color='b', label='GGA')
+                self.lod.add_line(self.gga[0], xy=True)
 
                 # if len(ship_data_gga['track_x_m']) > 0:
                 if not np.alltrue(np.isnan(ship_data_gga['track_x_m'])):
@@ -644,7 +652,9 @@ class Shiptrack(object):
                 self.annot._y = -40
         self.annot.xy = pos
         if self.vector_ref == ref_label:
-            v = np.sqrt(vector_ref.U[ind["ind"][0]]**2 + vector_ref.V[ind["ind"][0]]**2)
+            # Index of the ensemble in the full data
+            idx = self.lod.full_index(plt_ref, ind["ind"][0])
+            v = np.sqrt(vector_ref.U[idx]**2 + vector_ref.V[idx]**2)
             text = '{} x: {:.2f}, y: {:.2f}, \n v: {:.1f}'.format(ref_label, pos[0], pos[1], v)
         else:
             text = '{} x: {:.2f}, y: {:.2f}'.format(ref_label, pos[0], pos[1])
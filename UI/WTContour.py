@@ -1,5 +1,7 @@
+import weakref
 import numpy as np
 import matplotlib.cm as cm
+from UI.LevelOfDetail import LevelOfDetail
 
 
 class WTContour(object):
@@ -23,8 +25,24 @@ class WTContour(object):
         Cell depths to plot in user specified units
     speed_plt: np.ndarray(float)
         Water speeds to plot in user specified units
+    lod: LevelOfDetail
+        Object of LevelOfDetail used to plot the mesh at the screen resolution
+    mesh_cache: WeakKeyDictionary
+        Plotting meshes of each plotted transect keyed by data type and edge. The transect is weakly referenced so
+        the meshes are released with the transect.
     """
 
+    # Plotting meshes are shared by all contour plots, the oldest mesh of a transect is removed when the limit is
+    # reached
+    mesh_cache = weakref.WeakKeyDictionary()
+    mesh_cache_size = 20
+
+    @staticmethod
+    def clear_mesh_cache():
+        """Removes the plotting meshes of all transects."""
+
+        WTContour.mesh_cache.clear()
+
     def __init__(self, canvas):
         """Initialize object using the specified canvas.
 
@@ -43,6 +61,7 @@ class WTContour(object):
         self.x_plt = None
         self.cell_plt = None
         self.speed_plt = None
+        self.lod = None
 
     def create(self, transect, units, invalid_data=None, n_ensembles=None, edge_start=None, max_limit=0):
         """Create the axes and lines for the figure.
@@ -102,9 +121,10 @@ class WTContour(object):
             cmap = cm.get_cmap('viridis')
             cmap.set_under('white')
 
-            # Generate color contour
-            c = self.fig.ax.pcolormesh(self.x_plt, self.cell_plt, self.speed_plt, cmap=cmap, vmin=min_limit,
-                                       vmax=max_limit)
+            # Generate color contour at the screen resolution, the full mesh is used for the data cursor
+            self.lod = LevelOfDetail(self.fig.ax)
+            c = self.lod.add_mesh(self.x_plt, self.cell_plt, self.speed_plt, cmap=cmap, vmin=min_limit,
+                                  vmax=max_limit)
 
             # Add color bar and axis labels
             cb = self.fig.colorbar(c, pad=0.02)
@@ -188,6 +208,25 @@ class WTContour(object):
         depth: np.array
             Depth data used to plot the cross section bottom
         """
+        # Use the previous mesh if the transect has not been processed since it was created. Processing replaces
+        # the velocity and depth arrays so they identify the processing state.
+        depth_selected = getattr(transect.depths, transect.depths.selected)
+        if data_type == 'Processed':
+            sources = (transect.in_transect_idx, transect.w_vel.u_processed_mps, transect.w_vel.v_processed_mps)
+        else:
+            sources = (transect.in_transect_idx, transect.w_vel.u_mps, transect.w_vel.v_mps)
+        sources = sources + (depth_selected.depth_processed_m, depth_selected.depth_cell_depth_m,
+                             depth_selected.depth_cell_size_m)
+        key = (data_type, n_ensembles, edge_start)
+        transect_cache = WTContour.mesh_cache.setdefault(transect, {})
+        cached = transect_cache.get(key)
+        if cached is not None and all(item is cached_item for item, cached_item in zip(sources, cached['sources'])):
+            if (invalid_data is None and cached['invalid_data'] is None) or \
+                    (invalid_data is not None and cached['invalid_data'] is not None
+                     and np.array_equal(invalid_data, cached['invalid_data'])):
+                return cached['mesh']
+        invalid_data_in = None if invalid_data is None else np.copy(invalid_data)
+
         in_transect_idx = transect.in_transect_idx
 
         # Get data from transect
@@ -248,67 +287,71 @@ class WTContour(object):
         if invalid_data is not None:
             speed[invalid_data] = -999
 
-        # Set x variable to ensembles
-        x = np.tile(ensembles, (cell_size.shape[0], 1))
-        n_ensembles = x.shape[1]
+        x_plt, cell_plt, speed_plt = WTContour.contour_mesh(ensembles, cell_depth, cell_size, speed)
+        mesh = (x_plt, cell_plt, speed_plt, ensembles, depth)
+
+        # Save mesh, the cached data must not reference the transect so it can be released
+        transect_cache.pop(key, None)
+        if len(transect_cache) >= WTContour.mesh_cache_size:
+            transect_cache.pop(next(iter(transect_cache)))
+        transect_cache[key] = {'sources': sources, 'invalid_data': invalid_data_in, 'mesh': mesh}
 
-        # Prep data in x direction
-        j = -1
-        x_xpand = np.tile(np.nan, (cell_size.shape[0], 2 * cell_size.shape[1]))
-        cell_depth_xpand = np.tile(np.nan, (cell_size.shape[0], 2 * cell_size.shape[1]))
-        cell_size_xpand = np.tile(np.nan, (cell_size.shape[0], 2 * cell_size.shape[1]))
-        speed_xpand = np.tile(np.nan, (cell_size.shape[0], 2 * cell_size.shape[1]))
-        depth_xpand = np.array([np.nan] * (2 * cell_size.shape[1]))
+        return mesh
+
+    @staticmethod
+    def contour_mesh(ensembles, cell_depth, cell_size, speed):
+        """Creates the mesh for the color contour plot. Each cell is plotted from half way to the previous
+        ensemble to half way to the next ensemble and from the top to the bottom of the cell.
+
+        Parameters
+        ----------
+        ensembles: np.array(int)
+            Ensemble numbers
+        cell_depth: np.ndarray(float)
+            Depth to the center of each cell
+        cell_size: np.ndarray(float)
+            Size of each cell
+        speed: np.ndarray(float)
+            Water speed in each cell, -999 for invalid data
+
+        Returns
+        -------
+        x_plt: np.array
+            Data in meshgrid format used for the contour x variable
+        cell_plt: np.array
+            Data in meshgrid format used for the contour y variable
+        speed_plt: np.array
+            Data in meshgrid format used to determine colors in plot
+        """
+
+        n_cells = cell_size.shape[0]
 
         # Center ensembles in grid
-        for n in range(n_ensembles):
-            if n == 0:
-                try:
-                    half_back = np.abs(0.5 * (x[:, n + 1] - x[:, n]))
-                    half_forward = half_back
-                except IndexError:
-                    half_back = x[:,0] - 0.5
-                    half_forward = x[:,0] + 0.5
-            elif n == n_ensembles - 1:
-                half_forward = np.abs(0.5 * (x[:, n] - x[:, n - 1]))
-                half_back = half_forward
-            else:
-                half_back = np.abs(0.5 * (x[:, n] - x[:, n - 1]))
-                half_forward = np.abs(0.5 * (x[:, n + 1] - x[:, n]))
-            j += 1
-            x_xpand[:, j] = x[:, n] - half_back
-            cell_depth_xpand[:, j] = cell_depth[:, n]
-            speed_xpand[:, j] = speed[:, n]
-            cell_size_xpand[:, j] = cell_size[:, n]
-            depth_xpand[j] = depth[n]
-            j += 1
-            x_xpand[:, j] = x[:, n] + half_forward
-            cell_depth_xpand[:, j] = cell_depth[:, n]
-            speed_xpand[:, j] = speed[:, n]
-            cell_size_xpand[:, j] = cell_size[:, n]
-            depth_xpand[j] = depth[n]
-
-        # Create plotting mesh grid
-        n_cells = x.shape[0]
-        j = -1
-        x_plt = np.tile(np.nan, (2 * cell_size.shape[0], 2 * cell_size.shape[1]))
-        speed_plt = np.tile(np.nan, (2 * cell_size.shape[0], 2 * cell_size.shape[1]))
-        cell_plt = np.tile(np.nan, (2 * cell_size.shape[0], 2 * cell_size.shape[1]))
-        for n in range(n_cells):
-            j += 1
-            x_plt[j, :] = x_xpand[n, :]
-            cell_plt[j, :] = cell_depth_xpand[n, :] - 0.5 * cell_size_xpand[n, :]
-            speed_plt[j, :] = speed_xpand[n, :]
-            j += 1
-            x_plt[j, :] = x_xpand[n, :]
-            cell_plt[j, :] = cell_depth_xpand[n, :] + 0.5 * cell_size_xpand[n, :]
-            speed_plt[j, :] = speed_xpand[n, :]
+        if len(ensembles) > 1:
+            half_width = np.abs(0.5 * np.diff(ensembles))
+            half_back = np.hstack([half_width[0], half_width])
+            half_forward = np.hstack([half_width, half_width[-1]])
+        else:
+            half_back = ensembles - 0.5
+            half_forward = ensembles + 0.5
+
+        # Prep data in x direction with the start and end of each ensemble
+        x_xpand = np.stack([ensembles - half_back, ensembles + half_forward], axis=1).reshape(1, -1)
+        cell_depth_xpand = np.repeat(cell_depth, 2, axis=1)
+        cell_size_xpand = np.repeat(cell_size, 2, axis=1)
+        speed_xpand = np.repeat(speed, 2, axis=1)
+
+        # Create plotting mesh grid with the top and bottom of each cell
+        x_plt = np.tile(x_xpand, (2 * n_cells, 1))
+        cell_plt = np.stack([cell_depth_xpand - 0.5 * cell_size_xpand, cell_depth_xpand + 0.5 * cell_size_xpand],
+                            axis=1).reshape(2 * n_cells, -1)
+        speed_plt = np.repeat(speed_xpand, 2, axis=0)
 
         cell_plt[np.isnan(cell_plt)] = 0
         speed_plt[np.isnan(speed_plt)] = -999
         x_plt[np.isnan(x_plt)] = 0
 
-        return x_plt, cell_plt, speed_plt, ensembles, depth
+        return x_plt, cell_plt, speed_plt
 
     def hover(self, event):
         """Determines if the user has selected a location with data and makes
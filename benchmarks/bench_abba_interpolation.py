@@ -0,0 +1,78 @@
+"""
+Benchmark of the abba interpolation (MiscLibs.abba_2d_interpolation.abba_idw_interpolation) on a synthetic transect.
+The transect has a variable depth and cell size, randomly invalid cells (30% by default), and groups of invalid
+ensembles.
+
+Usage: python benchmarks/bench_abba_interpolation.py [--cells n] [--ens n] [--invalid percent] [--repeat n]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from MiscLibs.abba_2d_interpolation import abba_idw_interpolation
+
+
+def synthetic_transect(n_cells, n_ens, invalid, seed=0):
+    """Creates the data for a synthetic transect.
+
+    Parameters
+    ----------
+    n_cells: int
+        Number of cells in each ensemble
+    n_ens: int
+        Number of ensembles
+    invalid: float
+        Fraction of cells that are invalid
+    seed: int
+        Seed for random number generator
+
+    Returns
+    -------
+    kwargs: dict
+        Keyword arguments for abba_idw_interpolation
+    """
+
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 1.5, n_ens))
+    depth = 1 + 6 * np.sin(np.pi * (np.arange(n_ens) + 0.5) / n_ens) + rng.normal(0, 0.2, n_ens)
+    cell_size = np.tile(rng.choice([0.1, 0.25, 0.5], n_ens), (n_cells, 1))
+    cell_depth = 0.5 + np.cumsum(cell_size, axis=0) - cell_size / 2
+    cells_above_sl = cell_depth + cell_size / 2 < 0.94 * depth[np.newaxis, :]
+
+    valid = rng.random((n_cells, n_ens)) > invalid
+    for start in rng.integers(0, n_ens, n_ens // 40):
+        valid[:, start:start + rng.integers(1, 6)] = False
+
+    u = rng.normal(0, 1, (n_cells, n_ens))
+    v = rng.normal(0, 1, (n_cells, n_ens))
+    u[np.logical_not(valid)] = np.nan
+    v[np.logical_not(valid)] = np.nan
+
+    return {'data_list': [u, v], 'valid_data': valid, 'cells_above_sl': cells_above_sl, 'y_centers': cell_depth,
+            'y_cell_size': cell_size, 'y_depth': depth, 'x_shiptrack': x, 'normalize': True}
+
+
+def main(argv):
+    options = {'--cells': 60, '--ens': 1500, '--invalid': 30, '--repeat': 5}
+    for option in options:
+        if option in argv:
+            idx = argv.index(option)
+            options[option] = int(argv[idx + 1])
+
+    kwargs = synthetic_transect(options['--cells'], options['--ens'], options['--invalid'] / 100)
+    n_targets = np.sum(np.logical_and(np.logical_not(kwargs['valid_data']), kwargs['cells_above_sl']))
+
+    best = np.inf
+    for _ in range(options['--repeat']):
+        start = time.perf_counter()
+        abba_idw_interpolation(**kwargs)
+        best = min(best, time.perf_counter() - start)
+
+    print('%d cells, %d ensembles, %d invalid cells interpolated: %.1f ms'
+          % (options['--cells'], options['--ens'], n_targets, best * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
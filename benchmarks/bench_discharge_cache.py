@@ -0,0 +1,89 @@
+"""
+Benchmark and regression check of the discharge components cached by QComp.transect_components. The discharge of
+each checked transect of a measurement is computed for several extrapolation methods, once with the cached
+components discarded before each computation and once reusing the cached components, and the totals are compared.
+
+Usage: python benchmarks/bench_discharge_cache.py measurement_file [--source TRDI|Rowe] [--repeat n]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Classes.Measurement import Measurement
+from Classes.QComp import QComp
+
+# Top method, bottom method, and exponent for each computation
+methods = [('Power', 'Power', 0.1667), ('Constant', 'No Slip', 0.1667), ('3-Point', 'No Slip', 0.1667),
+           ('Power', 'Power', 0.1), ('Power', 'Power', 0.3), ('Constant', 'No Slip', 0.25)]
+
+
+def compute(transect, mb_tests, clear):
+    """Computes the total discharge of the transect for each extrapolation method.
+
+    Parameters
+    ----------
+    transect: TransectData
+        Object of TransectData
+    mb_tests: list
+        List of MovingBedTests objects
+    clear: bool
+        Indicates if the cached components are discarded before each computation
+
+    Returns
+    -------
+    total: np.array(float)
+        Total discharge for each method
+    """
+
+    total = np.tile(np.nan, len(methods))
+    for n, (top_method, bot_method, exponent) in enumerate(methods):
+        if clear:
+            transect.processed_data_changed()
+        q = QComp()
+        q.populate_data(data_in=transect, moving_bed_data=mb_tests, top_method=top_method, bot_method=bot_method,
+                        exponent=exponent)
+        total[n] = q.total
+    return total
+
+
+def main(argv):
+    source = 'TRDI'
+    if '--source' in argv:
+        idx = argv.index('--source')
+        source = argv[idx + 1]
+        del argv[idx:idx + 2]
+    repeat = 3
+    if '--repeat' in argv:
+        idx = argv.index('--repeat')
+        repeat = int(argv[idx + 1])
+        del argv[idx:idx + 2]
+
+    meas = Measurement(in_file=argv[0], source=source, proc_type='QRev')
+
+    print('%-40s %12s %12s  %s' % ('Transect', 'cleared (s)', 'cached (s)', 'Max difference'))
+    failed = False
+    for idx in meas.checked_transect_idx:
+        transect = meas.transects[idx]
+
+        t_cleared = np.inf
+        t_cached = np.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            q_cleared = compute(transect, meas.mb_tests, clear=True)
+            t_cleared = min(t_cleared, time.perf_counter() - start)
+
+            start = time.perf_counter()
+            q_cached = compute(transect, meas.mb_tests, clear=False)
+            t_cached = min(t_cached, time.perf_counter() - start)
+
+        diff = np.nanmax(np.abs(q_cleared - q_cached))
+        failed = failed or diff > 0
+        print('%-40s %12.4f %12.4f  %g' % (os.path.basename(transect.file_name)[-40:], t_cleared, t_cached, diff))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
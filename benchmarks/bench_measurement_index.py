@@ -0,0 +1,69 @@
+"""
+Benchmark and regression check of MeasurementIndex. The folders below root are indexed without a stored index and
+then refreshed from the stored index. With --check, the number of ensembles of each transect file in the index is
+compared with the number of ensembles from reading the file with Pd0TRDI or RtbRowe.
+
+Usage: python benchmarks/bench_measurement_index.py root [--check]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Classes.MeasurementIndex import MeasurementIndex
+from Classes.Pd0TRDI_2 import Pd0TRDI
+from Classes.RtbRowe import RtbRowe
+
+
+def reader_ensembles(file_name, file_type):
+    """Number of ensembles from reading the transect file."""
+
+    if file_type == 'TRDI':
+        return Pd0TRDI(file_name, fields='summary').Sensor.date.shape[0]
+    return RtbRowe(file_name, fields='summary').num_ens
+
+
+def main(argv):
+    check = '--check' in argv
+    if check:
+        argv.remove('--check')
+    root = argv[0]
+
+    # Remove stored indexes so the first scan reads every file
+    for folder, _, names in os.walk(root):
+        if MeasurementIndex.index_name in names:
+            os.remove(os.path.join(folder, MeasurementIndex.index_name))
+
+    start = time.perf_counter()
+    indexes = MeasurementIndex.scan(root)
+    t_scan = time.perf_counter() - start
+
+    start = time.perf_counter()
+    MeasurementIndex.scan(root)
+    t_refresh = time.perf_counter() - start
+
+    n_measurements = sum([len(index.projects) for index in indexes])
+    n_files = sum([len(index.raw_files) for index in indexes])
+    print('%d measurements, %d transect files' % (n_measurements, n_files))
+    print('scan (s) %10.3f' % t_scan)
+    print('refresh (s) %7.3f' % t_refresh)
+
+    failed = False
+    if check:
+        print('%-40s %10s %10s' % ('File', 'index', 'reader'))
+        for index in indexes:
+            for project in index.projects.values():
+                for transect in project.get('transects', []) + project.get('mbt_transects', []):
+                    for name in transect['files']:
+                        if name not in index.raw_files:
+                            continue
+                        n_index = index.raw_files[name]['n_ensembles']
+                        n_reader = reader_ensembles(os.path.join(index.folder, name), project['type'])
+                        failed = failed or n_index != n_reader
+                        print('%-40s %10d %10d' % (name[-40:], n_index, n_reader))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
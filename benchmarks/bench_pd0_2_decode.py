@@ -0,0 +1,122 @@
+"""
+Regression check and benchmark of the columnar decoding of data stored by cell and beam in Pd0TRDI_2. The Wt and
+Surface arrays from reading each file are compared with decoding each ensemble with decode_pd0_bytearray, which is
+how decode_all previously decoded the file.
+
+Usage: python benchmarks/bench_pd0_2_decode.py file1.pd0 [file2.pd0 ...] [--repeat n]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Classes.Pd0TRDI_2 import Pd0TRDI
+
+# Decoded data key and field for each compared array
+compare = {('Wt', 'vel_mps'): ('velocity', 'data'),
+           ('Wt', 'corr'): ('correlation', 'data'),
+           ('Wt', 'rssi'): ('echo_intensity', 'data'),
+           ('Wt', 'pergd'): ('percent_good', 'data'),
+           ('Surface', 'vel_mps'): ('surface_velocity', 'velocity'),
+           ('Surface', 'corr'): ('surface_correlation', 'correlation'),
+           ('Surface', 'rssi'): ('surface_intensity', 'rssi'),
+           ('Surface', 'pergd'): ('surface_percent_good', 'percent_good')}
+
+
+def reference_decode(file_name, pd0):
+    """Decodes the data stored by cell and beam one ensemble at a time.
+
+    Parameters
+    ----------
+    file_name: str
+        Full name including path of pd0 file
+    pd0: Pd0TRDI
+        Object of Pd0TRDI for the same file, used for the decoders and array sizes
+
+    Returns
+    -------
+    ref: dict
+        Screened and converted arrays keyed by object and attribute
+    """
+
+    with open(file_name, 'rb') as f:
+        pd0_bytes = bytearray(f.read())
+    file_info = len(pd0_bytes)
+
+    ref = {}
+    for obj, attr in compare:
+        ref[(obj, attr)] = np.tile(np.nan, getattr(getattr(pd0, obj), attr).shape)
+
+    start_byte = 0
+    n = 0
+    ensemble_number = 0
+    while start_byte < file_info:
+        data = Pd0TRDI.decode_pd0_bytearray(pd0.data_decoders, pd0_bytes[start_byte:])
+        if data['checksum'] and 'fixed_leader' in data and 'variable_leader' in data:
+            # Adjust index for lost ensembles
+            if ensemble_number > 0:
+                n = n + data['variable_leader']['ensemble_number'] - ensemble_number
+            for (obj, attr), (key, field) in compare.items():
+                if key in data and len(data[key][field]) > 0:
+                    values = np.array(data[key][field]).T
+                    ref[(obj, attr)][:values.shape[0], :values.shape[1], n] = values
+            start_byte = start_byte + data['header']['number_of_bytes'] + 2
+            ensemble_number = data['variable_leader']['ensemble_number']
+        else:
+            start_byte = Pd0TRDI.find_next(pd0_bytes, start_byte, file_info)
+
+    # Screen and convert as in Pd0TRDI.screen_and_convert
+    for key, values in ref.items():
+        values[values == -32768] = np.nan
+        if key[1] == 'vel_mps':
+            ref[key] = values / 1000
+
+    return ref
+
+
+def max_difference(a, b):
+    """Maximum absolute difference between two arrays, ignoring matching nans."""
+
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if a.shape != b.shape:
+        return np.inf
+    if np.any(np.isnan(a) != np.isnan(b)):
+        return np.inf
+    diff = np.abs(a - b)
+    return np.nanmax(diff) if np.any(np.isfinite(diff)) else 0.
+
+
+def main(argv):
+    repeat = 3
+    if '--repeat' in argv:
+        idx = argv.index('--repeat')
+        repeat = int(argv[idx + 1])
+        del argv[idx:idx + 2]
+
+    print('%-40s %10s %10s %14s  %s' % ('File', 'MB', 'read (s)', 'reference (s)', 'Max difference'))
+    failed = False
+    for file_name in argv:
+        size = os.path.getsize(file_name) / 2**20
+
+        t_read = np.inf
+        pd0 = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            pd0 = Pd0TRDI(file_name)
+            t_read = min(t_read, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        ref = reference_decode(file_name, pd0)
+        t_ref = time.perf_counter() - start
+
+        diff = max([max_difference(getattr(getattr(pd0, obj), attr), ref[(obj, attr)]) for obj, attr in compare])
+        failed = failed or diff > 0
+        print('%-40s %10.2f %10.3f %14.3f  %g' % (os.path.basename(file_name)[-40:], size, t_read, t_ref, diff))
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,83 @@
+"""
+Benchmark comparing the memory mapped pd0 reader (Pd0TRDI.pd0_read_mmap) with the original file based
+reader (Pd0TRDI.pd0_read) on the same files.
+
+Usage: python benchmarks/bench_pd0_read.py file1.pd0 [file2.pd0 ...] [--repeat n]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Classes.Pd0TRDI import Pd0TRDI
+
+
+def time_reader(file_name, engine, repeat):
+    """Reads the file with the specified engine and returns the minimum time and the last object.
+
+    Parameters
+    ----------
+    file_name: str
+        Full name including path of pd0 file
+    engine: str
+        Reader engine ('mmap' or 'file')
+    repeat: int
+        Number of times to read the file
+
+    Returns
+    -------
+    best: float
+        Minimum time in seconds
+    pd0: Pd0TRDI
+        Object of Pd0TRDI
+    """
+
+    best = np.inf
+    pd0 = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pd0 = Pd0TRDI(file_name, engine=engine)
+        best = min(best, time.perf_counter() - start)
+    return best, pd0
+
+
+def max_difference(a, b):
+    """Maximum absolute difference between two arrays, ignoring matching nans."""
+
+    a = np.asarray(a, dtype=float)
+    b = np.asarray(b, dtype=float)
+    if a.shape != b.shape:
+        return np.inf
+    diff = np.abs(a - b)
+    mismatch_nan = np.isnan(a) != np.isnan(b)
+    if np.any(mismatch_nan):
+        return np.inf
+    return np.nanmax(diff) if np.any(np.isfinite(diff)) else 0.
+
+
+def main(argv):
+    repeat = 3
+    if '--repeat' in argv:
+        idx = argv.index('--repeat')
+        repeat = int(argv[idx + 1])
+        del argv[idx:idx + 2]
+
+    compare = (('Wt', 'vel_mps'), ('Wt', 'corr'), ('Wt', 'rssi'), ('Wt', 'pergd'),
+               ('Bt', 'depth_m'), ('Bt', 'vel_mps'), ('Sensor', 'heading_deg'), ('Sensor', 'pitch_deg'),
+               ('Sensor', 'roll_deg'), ('Sensor', 'temperature_deg_c'), ('Cfg', 'wn'), ('Cfg', 'ws_cm'),
+               ('Cfg', 'dist_bin1_cm'), ('Gps2', 'lat_deg'), ('Gps2', 'lon_deg'))
+
+    print('%-40s %10s %10s %10s %8s  %s' % ('File', 'MB', 'file (s)', 'mmap (s)', 'Speedup', 'Max difference'))
+    for file_name in argv:
+        size = os.path.getsize(file_name) / 2**20
+        t_file, pd0_file = time_reader(file_name, 'file', repeat)
+        t_mmap, pd0_mmap = time_reader(file_name, 'mmap', repeat)
+        diff = max([max_difference(getattr(getattr(pd0_mmap, obj), attr), getattr(getattr(pd0_file, obj), attr))
+                    for obj, attr in compare])
+        print('%-40s %10.2f %10.3f %10.3f %8.1f  %g' % (os.path.basename(file_name)[-40:], size, t_file, t_mmap,
+                                                        t_file / t_mmap, diff))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,97 @@
+"""
+Micro-benchmark of the RtbRowe water profile dataset decoders (Wt.decode_vel, decode_rssi, decode_corr and
+decode_pgb). Each decoder is timed on a synthetic dataset block and compared with reading the same block one
+value at a time with RtbRowe.get_float / RtbRowe.get_int32, which is how the datasets were previously decoded.
+
+Usage: python benchmarks/bench_rtb_decode.py [--bins n] [--beams n] [--repeat n]
+"""
+import os
+import sys
+import time
+import struct
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Classes.RtbRowe import RtbRowe, Wt
+
+
+def dataset_block(name, values, ds_type):
+    """Creates the bytes of a dataset with a header.
+
+    Parameters
+    ----------
+    name: str
+        Dataset name
+    values: np.array
+        Dataset values [beam, bin]
+    ds_type: int
+        Dataset type (10 float, 20 int)
+
+    Returns
+    -------
+    block: bytes
+        Dataset bytes
+    """
+
+    dtype = '<f4' if ds_type == 10 else '<i4'
+    header = struct.pack('<5i', ds_type, values.shape[1], values.shape[0], 0, 8) + name.encode().ljust(8, b'\x00')
+    return header + values.astype(dtype).tobytes()
+
+
+def per_value(block, num_values, ds_type):
+    """Reads each value of the dataset individually."""
+
+    pointer = RtbRowe.get_base_data_size(8)
+    for _ in range(num_values):
+        if ds_type == 10:
+            RtbRowe.get_float(pointer, RtbRowe.BYTES_IN_FLOAT, block)
+        else:
+            RtbRowe.get_int32(pointer, RtbRowe.BYTES_IN_INT32, block)
+        pointer += 4
+
+
+def best_time(function, repeat):
+    """Minimum time in seconds of repeated calls to function."""
+
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(argv):
+    options = {'--bins': 100, '--beams': 4, '--repeat': 20}
+    for option in options:
+        if option in argv:
+            idx = argv.index(option)
+            options[option] = int(argv[idx + 1])
+    num_bins = options['--bins']
+    num_beams = options['--beams']
+    repeat = options['--repeat']
+
+    rng = np.random.default_rng(0)
+    vel = rng.normal(0, 1, (num_beams, num_bins))
+    vel[rng.random(vel.shape) < 0.3] = RtbRowe.BAD_VEL
+    datasets = (('decode_vel', 'E000001', vel, 10, {}),
+                ('decode_rssi', 'E000004', rng.uniform(20, 90, (num_beams, num_bins)), 10, {}),
+                ('decode_corr', 'E000005', rng.uniform(0, 1, (num_beams, num_bins)), 10, {'num_repeats': 2}),
+                ('decode_pgb', 'E000006', rng.integers(0, 10, (num_beams, num_bins)), 20, {'pings_per_ens': 10}))
+
+    print('%d beams, %d bins' % (num_beams, num_bins))
+    print('%-12s %-4s %14s %14s %8s' % ('Dataset', 'Fmt', 'per value (us)', 'decoder (us)', 'Speedup'))
+    for method, name, values, ds_type, kwargs in datasets:
+        block = dataset_block(name, values, ds_type)
+        t_values = best_time(lambda: per_value(block, values.size, ds_type), repeat)
+        for pd0_format in (False, True):
+            wt = Wt(num_beams=num_beams, num_bins=num_bins, num_ens=1, pd0_format=pd0_format)
+            decoder = getattr(wt, method)
+            t_decode = best_time(lambda: decoder(ens_bytes=block, ens_index=0, num_elements=num_bins,
+                                                 element_multiplier=num_beams, **kwargs), repeat)
+            print('%-12s %-4s %14.1f %14.1f %8.1f' % (method, 'PD0' if pd0_format else 'RTB', t_values * 1e6,
+                                                      t_decode * 1e6, t_values / t_decode))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,291 @@
+import copy
+import struct
+import warnings
+from types import SimpleNamespace
+import numpy as np
+import pytest
+import Classes.Measurement
+from Classes.Measurement import Measurement
+
+# Configuration of each transect in the mmt file
+mmt_config = {'DS_Cor_Spd_Sound': 0, 'DS_Scale_Factor': 1, 'DS_Transducer_Depth': 0, 'DS_Transducer_Offset': 0,
+              'DS_Use_Process': 0, 'Edge_Begin_Left_Bank': 1, 'Edge_Begin_Manual_Discharge': 0,
+              'Edge_Begin_Method_Distance': 0, 'Edge_Begin_Shore_Distance': 3.0, 'Edge_End_Manual_Discharge': 0,
+              'Edge_End_Method_Distance': 0, 'Edge_End_Shore_Distance': 4.0, 'Ext_Heading_Offset': 0,
+              'Ext_Heading_Use': False, 'Fixed_Commands': [], 'Fixed_Commands_RiverPro': [],
+              'Fixed_Commands_RiverRay': [], 'Fixed_Commands_StreamPro': [], 'Offsets_Magnetic_Variation': 0.0,
+              'Offsets_Transducer_Depth': 0.3, 'Proc_BT_Error_Vel_Threshold': 9.9, 'Proc_BT_Up_Vel_Threshold': 9.9,
+              'Proc_Fixed_Speed_Of_Sound': 1500, 'Proc_River_Depth_Source': 4, 'Proc_Salinity': 0,
+              'Proc_Screen_Depth': 0, 'Proc_Speed_of_Sound_Correction': 0, 'Proc_Use_3_Beam_BT': 1,
+              'Proc_Use_3_Beam_WT': 1, 'Proc_Use_Weighted_Mean_Depth': 1, 'Proc_WT_Error_Velocity_Threshold': 9.9,
+              'Proc_WT_Up_Vel_Threshold': 9.9, 'Q_Bottom_Method': 0, 'Q_Left_Edge_Coeff': 0.3535,
+              'Q_Left_Edge_Type': 0, 'Q_Power_Curve_Coeff': 0.1667, 'Q_Right_Edge_Coeff': 0.91, 'Q_Right_Edge_Type': 1,
+              'Q_Shore_Left_Ens_Count': 10, 'Q_Shore_Pings_Avg': 10, 'Q_Shore_Right_Ens_Count': 10, 'Q_Top_Method': 0,
+              'User_Commands': [], 'Wizard_Commands': []}
+
+# Changed settings, the transect stages invalidated, and the interpolation forced to abba. The synthetic data have no
+# GPS data or gaps, so the processing, navigation, and interpolation changes only check the invalidated stages.
+setting_changes = {'processing': ({'Processing': 'WR2'},
+                                  {'processing', 'navigation', 'bt', 'gps', 'depth', 'wt', 'interpolation', 'edges'},
+                                  True),
+                   'navigation': ({'CompTracks': 'On'}, {'navigation', 'depth', 'wt', 'interpolation'}, True),
+                   'bt_filter': ({'BTwFilter': 'Manual', 'BTwFilterThreshold': 0.01},
+                                 {'bt', 'depth', 'wt', 'interpolation'}, True),
+                   'bt_interpolation': ({'BTInterpolation': 'Hold9'}, {'bt', 'depth', 'wt', 'interpolation'}, True),
+                   'depth_average': ({'depthAvgMethod': 'Simple'}, {'depth', 'wt', 'interpolation'}, True),
+                   'depth_interpolation': ({'depthInterpolation': 'HoldLast'}, {'depth', 'wt', 'interpolation'},
+                                           True),
+                   'wt_filter': ({'WTwFilter': 'Manual', 'WTwFilterThreshold': 0.005}, {'wt', 'interpolation'},
+                                 True),
+                   'wt_excluded': ({'WTExcludedDistance': 1.0}, {'wt', 'interpolation'}, True),
+                   'wt_interpolation': ({'WTEnsInterpolation': 'None', 'WTCellInterpolation': 'TRDI'},
+                                        {'interpolation'}, False),
+                   'edges': ({'edgeRecEdgeMethod': 'Variable'}, {'edges'}, True)}
+
+
+def pd0_ensemble(ens_num, time_sec, n_cells, depth_m, bt_beam_mmps, wt_beam_mmps, heading, rng):
+    """Create the bytes of a pd0 ensemble in beam coordinates.
+
+    Parameters
+    ----------
+    ens_num: int
+        Ensemble number
+    time_sec: float
+        Time since the start of the transect in seconds
+    n_cells: int
+        Number of depth cells
+    depth_m: float
+        Depth below the transducer
+    bt_beam_mmps: np.array(float)
+        Bottom track velocity for each beam in mm/s
+    wt_beam_mmps: np.array(float)
+        Water velocity for each beam and cell in mm/s
+    heading: float
+        Heading in degrees
+    rng: np.random.Generator
+        Random number generator
+
+    Returns
+    -------
+    ensemble: bytes
+        Ensemble including header and checksum
+    """
+
+    data_types = []
+
+    # Fixed leader for a 600 kHz Rio Grande with 0.25 m cells in beam coordinates
+    fl = bytearray(59)
+    fl[2] = 10
+    fl[3] = 17
+    fl[4] = 0b01000011
+    fl[5] = 0b01000001
+    fl[8] = 4
+    fl[9] = n_cells
+    struct.pack_into('<HHH', fl, 10, 1, 25, 25)
+    fl[16:20] = bytes([12, 64, 1, 0])
+    struct.pack_into('<H', fl, 20, 2000)
+    fl[25] = 0b00000111
+    fl[30] = 0b01111111
+    fl[31] = 0b00111101
+    struct.pack_into('<HH', fl, 32, 60, 30)
+    fl[36:39] = bytes([1, 5, 50])
+    struct.pack_into('<H', fl, 40, 10)
+    struct.pack_into('<I', fl, 54, 1234)
+    fl[58] = 20
+    data_types.append(bytes(fl))
+
+    # Variable leader
+    vl = bytearray(65)
+    struct.pack_into('<HH', vl, 0, 0x0080, ens_num)
+    time_bytes = bytes([int(10 + time_sec // 3600), int((time_sec % 3600) // 60), int(time_sec % 60), 0])
+    vl[4:11] = bytes([23, 5, 6]) + time_bytes
+    struct.pack_into('<HHHhhHh', vl, 14, 1500, 3, int(heading * 100) % 36000, int(rng.integers(-100, 100)),
+                     int(rng.integers(-100, 100)), 0, 1500)
+    vl[30] = 50
+    vl[57:65] = bytes([20, 23, 5, 6]) + time_bytes
+    data_types.append(bytes(vl))
+
+    # Water track, cells below the side lobe cutoff are invalid
+    vel = wt_beam_mmps.astype('<i2').T.copy()
+    vel[rng.random(vel.shape) < 0.05] = -32768
+    vel[0.9 + 0.25 * np.arange(n_cells) > depth_m * 0.94, :] = -32768
+    data_types.append(struct.pack('<H', 0x0100) + vel.tobytes())
+    data_types.append(struct.pack('<H', 0x0200) + np.full(n_cells * 4, 120, 'u1').tobytes())
+    data_types.append(struct.pack('<H', 0x0300) + rng.integers(60, 120, n_cells * 4).astype('u1').tobytes())
+    data_types.append(struct.pack('<H', 0x0400) + np.full(n_cells * 4, 100, 'u1').tobytes())
+
+    # Bottom track with some invalid ensembles and beams
+    bt = bytearray(85)
+    struct.pack_into('<HH', bt, 0, 0x0600, 1)
+    bt[6:10] = bytes([220, 30, 0, 5])
+    struct.pack_into('<H', bt, 10, 1000)
+    range_cm = np.full(4, (depth_m - 0.3) / np.cos(np.radians(20)) * 100) * (1 + rng.normal(0, 0.02, 4))
+    bt_vel = bt_beam_mmps.astype('<i2')
+    if rng.random() < 0.06:
+        range_cm[:] = 0
+        bt_vel[:] = -32768
+    elif rng.random() < 0.05:
+        bt_vel[rng.integers(0, 4)] = -32768
+    bt[16:24] = range_cm.astype('<u2').tobytes()
+    bt[24:32] = bt_vel.tobytes()
+    bt[32:44] = bytes([250] * 4 + [100] * 8)
+    bt[72:76] = bytes([150] * 4)
+    data_types.append(bytes(bt))
+
+    # Header with the address offsets of the data types
+    offsets = []
+    n_bytes = 6 + 2 * len(data_types)
+    for data_type in data_types:
+        offsets.append(n_bytes)
+        n_bytes += len(data_type)
+    ensemble = bytearray(struct.pack('<BBHBB', 0x7f, 0x7f, n_bytes, 0, len(data_types)))
+    ensemble += struct.pack('<%dH' % len(data_types), *offsets)
+    for data_type in data_types:
+        ensemble += data_type
+
+    return bytes(ensemble) + struct.pack('<H', sum(ensemble) & 0xFFFF)
+
+
+def write_transect(file_name, n_ensembles, seed, direction):
+    """Write a pd0 file for a transect across a channel that is deepest in the middle with a power law velocity profile.
+
+    Parameters
+    ----------
+    file_name: str
+        Full name including path of pd0 file
+    n_ensembles: int
+        Number of ensembles
+    seed: int
+        Seed of the random number generator
+    direction: int
+        1 for a transect starting on the left bank, -1 for a transect starting on the right bank
+    """
+
+    rng = np.random.default_rng(seed)
+    n_cells = 30
+
+    # Beam to instrument transformation for 20 degree beams
+    a = 1 / (2 * np.sin(np.radians(20)))
+    b = 1 / (4 * np.cos(np.radians(20)))
+    d = a / np.sqrt(2)
+    inst_to_beam = np.linalg.inv(np.array([[a, -a, 0, 0], [0, 0, -a, a], [b, b, b, b], [d, d, -d, -d]]))
+
+    pd0_bytes = bytearray()
+    heading = 90. if direction == 1 else 270.
+    cell_depth = 0.9 + 0.25 * np.arange(n_cells)
+    for n in range(n_ensembles):
+        fraction = (n + 0.5) / n_ensembles
+        depth = 0.8 + 4.0 * np.sin(np.pi * fraction) + rng.normal(0, 0.05)
+
+        # The boat moves forward at 1 m/s and the water flows to starboard or port
+        boat = np.array([0, 1.0 + rng.normal(0, 0.05), 0, 0])
+        profile = 0.9 * np.clip(1 - cell_depth / max(depth, 0.5), 0.01, 1) ** (1 / 6) \
+            * np.sin(np.pi * fraction) ** 0.5 + 0.05
+        water = np.zeros((4, n_cells))
+        water[0] = direction * profile + rng.normal(0, 0.05, n_cells)
+        water[1] = rng.normal(0, 0.05, n_cells)
+
+        pd0_bytes += pd0_ensemble(n + 1, n * 1.0, n_cells, depth, -inst_to_beam @ boat * 1000,
+                                  inst_to_beam @ (water - boat[:, None]) * 1000, heading + rng.normal(0, 1), rng)
+
+    with open(file_name, 'wb') as f:
+        f.write(pd0_bytes)
+
+
+class SyntheticMMT(object):
+    """Replaces MMTtrdi to load the synthetic transects in a folder without an mmt file."""
+
+    folder = None
+    files = ['q0.pd0', 'q1.pd0', 'q2.pd0']
+
+    def __init__(self, mmt_file):
+        self.path = self.folder
+        self.site_info = {'Name': 'Synthetic', 'Number': '1', 'Remarks': '', 'ADCPSerialNmb': '1234',
+                          'Water_Temperature': -32768}
+        self.qaqc = {}
+        self.mbt_transects = []
+        self.transects = [SimpleNamespace(Files=[file], Checked=1, active_config=dict(mmt_config),
+                                          field_config=dict(mmt_config), Notes=[]) for file in self.files]
+
+
+@pytest.fixture(scope='module')
+def measurement(tmp_path_factory):
+    """Measurement of synthetic transects processed with the default QRev settings."""
+    folder = tmp_path_factory.mktemp('apply_settings')
+    for n, file in enumerate(SyntheticMMT.files):
+        write_transect(str(folder / file), n_ensembles=250 + 40 * n, seed=n, direction=1 - 2 * (n % 2))
+
+    SyntheticMMT.folder = str(folder)
+    mmt_trdi = Classes.Measurement.MMTtrdi
+    Classes.Measurement.MMTtrdi = SyntheticMMT
+    try:
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            meas = Measurement(in_file=str(folder / 'synthetic.mmt'), source='TRDI', proc_type='QRev')
+    finally:
+        Classes.Measurement.MMTtrdi = mmt_trdi
+    return meas
+
+
+def processed_results(meas):
+    """Processed data and discharge of each transect used to compare the processing."""
+
+    results = []
+    for transect, discharge in zip(meas.transects, meas.discharge):
+        results.append({'boat_u': transect.boat_vel.bt_vel.u_processed_mps,
+                        'boat_valid': transect.boat_vel.bt_vel.valid_data,
+                        'depth': transect.depths.bt_depths.depth_processed_m,
+                        'water_u': transect.w_vel.u_processed_mps,
+                        'water_valid': transect.w_vel.valid_data,
+                        'edge_method': transect.edges.rec_edge_method,
+                        'discharge': [discharge.total, discharge.top, discharge.middle, discharge.bottom,
+                                      discharge.left, discharge.right]})
+    results.append({'exponent': meas.extrap_fit.sel_fit[-1].exponent,
+                    'q_sensitivity': vars(meas.extrap_fit.q_sensitivity)})
+    return results
+
+
+def assert_same_results(actual, desired):
+    """Assert that all processed data and discharges are the same."""
+
+    for n, (actual_item, desired_item) in enumerate(zip(actual, desired)):
+        for key, value in desired_item.items():
+            if isinstance(value, dict):
+                for name in value:
+                    np.testing.assert_array_equal(actual_item[key][name], value[name],
+                                                  err_msg='%d %s.%s' % (n, key, name))
+            else:
+                np.testing.assert_array_equal(actual_item[key], value, err_msg='%d %s' % (n, key))
+
+
+@pytest.mark.parametrize('change', sorted(setting_changes))
+def test_incremental_matches_full(measurement, change):
+    """Test that recomputing only the invalidated stages gives the same results as reprocessing all stages"""
+    changed_settings, stages, force_abba = setting_changes[change]
+    settings = measurement.current_settings()
+    settings.update(changed_settings)
+
+    meas_incremental = copy.deepcopy(measurement)
+    meas_full = copy.deepcopy(measurement)
+    transect_stages, _ = meas_incremental.invalidated_stages(settings)
+    assert all([transect == stages for transect in transect_stages])
+
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        meas_incremental.apply_settings(copy.deepcopy(settings), force_abba=force_abba, incremental=True)
+        meas_full.apply_settings(copy.deepcopy(settings), force_abba=force_abba)
+
+    assert_same_results(processed_results(meas_incremental), processed_results(meas_full))
+
+
+def test_unchanged_settings(measurement):
+    """Test that applying the current settings invalidates no stage and leaves the results unchanged"""
+    meas = copy.deepcopy(measurement)
+    settings = meas.current_settings()
+
+    transect_stages, meas_stages = meas.invalidated_stages(settings)
+    assert all([len(stages) == 0 for stages in transect_stages])
+    assert meas_stages == set()
+
+    meas.apply_settings(settings, incremental=True)
+    assert_same_results(processed_results(meas), processed_results(measurement))
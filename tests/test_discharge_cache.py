@@ -0,0 +1,156 @@
+from types import SimpleNamespace
+import numpy as np
+import pytest
+from Classes.QComp import QComp
+from Classes.TransectData import TransectData
+
+# Discharge attributes compared
+discharge_attrs = ('total', 'top', 'middle', 'bottom', 'left', 'right')
+
+
+def synthetic_transect(n_cells=25, n_ensembles=200, seed=0):
+    """Create a transect with random processed data and the attributes used by QComp.
+
+    Parameters
+    ----------
+    n_cells: int
+        Number of depth cells
+    n_ensembles: int
+        Number of ensembles
+    seed: int
+        Seed of the random number generator
+
+    Returns
+    -------
+    transect: TransectData
+        Object of TransectData
+    """
+
+    rng = np.random.default_rng(seed)
+    u = rng.normal(1, 0.2, (n_cells, n_ensembles))
+    v = rng.normal(0.1, 0.2, (n_cells, n_ensembles))
+    valid = rng.random((n_cells, n_ensembles)) > 0.2
+    u[np.logical_not(valid)] = np.nan
+    valid_data = np.zeros((8, n_cells, n_ensembles), bool)
+    valid_data[0] = valid
+    cell_size = np.tile(0.25, (n_cells, n_ensembles))
+    cell_depth = 0.5 + np.cumsum(cell_size, 0)
+    depth = 2 + 4 * rng.random(n_ensembles)
+    boat_u = rng.normal(0, 1, n_ensembles)
+    boat_u[rng.random(n_ensembles) < 0.1] = np.nan
+
+    transect = TransectData()
+    transect.adcp = SimpleNamespace(manufacturer='TRDI')
+    transect.w_vel = SimpleNamespace(u_processed_mps=u, v_processed_mps=v, cells_above_sl=cell_depth < depth - 0.3,
+                                     valid_data=valid_data)
+    transect.boat_vel = SimpleNamespace(selected='bt_vel', composite='Off',
+                                        bt_vel=SimpleNamespace(u_processed_mps=boat_u,
+                                                               v_processed_mps=rng.normal(1, 0.1, n_ensembles),
+                                                               interpolate='Linear',
+                                                               valid_data=np.ones((9, n_ensembles), bool)))
+    transect.depths = SimpleNamespace(selected='bt_depths', composite=False,
+                                      bt_depths=SimpleNamespace(depth_cell_size_m=cell_size,
+                                                                depth_cell_depth_m=cell_depth,
+                                                                depth_processed_m=depth,
+                                                                valid_data=np.ones(n_ensembles, bool)))
+    transect.date_time = SimpleNamespace(ens_duration_sec=np.tile(1.0, n_ensembles))
+    transect.edges = SimpleNamespace(vel_method='MeasMag', rec_edge_method='Fixed',
+                                     left=SimpleNamespace(type='Triangular', distance_m=3., cust_coef=0.5,
+                                                          number_ensembles=10, user_discharge_cms=None),
+                                     right=SimpleNamespace(type='Rectangular', distance_m=4., cust_coef=0.5,
+                                                           number_ensembles=10, user_discharge_cms=None))
+    transect.extrap = SimpleNamespace(top_method='Power', bot_method='Power', exponent=0.1667)
+    transect.start_edge = 'Left'
+    transect.in_transect_idx = np.arange(n_ensembles)
+    return transect
+
+
+def discharge(transect, **kwargs):
+    """Discharge of the transect computed by QComp.populate_data."""
+    q = QComp()
+    q.populate_data(transect, **kwargs)
+    return q
+
+
+def uncached_discharge(transect, **kwargs):
+    """Discharge of the transect computed without the cached components."""
+    transect.discharge_cache = None
+    q = discharge(transect, **kwargs)
+    transect.discharge_cache = None
+    return q
+
+
+def assert_same_discharge(actual, desired):
+    """Assert that the discharge components are the same."""
+    for attr in discharge_attrs:
+        np.testing.assert_array_equal(getattr(actual, attr), getattr(desired, attr), err_msg=attr)
+
+
+def test_components_reused():
+    """Test that the components are computed once and reused when only the extrapolation methods change"""
+    transect = synthetic_transect()
+    discharge(transect)
+    components = transect.discharge_cache
+
+    for top_method, bot_method, exponent in [('Constant', 'No Slip', 0.1667), ('3-Point', 'No Slip', 0.25),
+                                             ('Power', 'Power', 0.1)]:
+        q = discharge(transect, top_method=top_method, bot_method=bot_method, exponent=exponent)
+        assert transect.discharge_cache is components
+        assert_same_discharge(q, uncached_discharge(transect, top_method=top_method, bot_method=bot_method,
+                                                    exponent=exponent))
+        transect.discharge_cache = components
+
+
+def test_invalidated_by_processed_data_changed():
+    """Test that the components are computed again after processed_data_changed"""
+    transect = synthetic_transect()
+    q_before = discharge(transect)
+    components = transect.discharge_cache
+
+    # Data changed in place are not detected until processed_data_changed is called
+    transect.w_vel.u_processed_mps *= 2
+    discharge(transect)
+    assert transect.discharge_cache is components
+
+    transect.processed_data_changed()
+    assert transect.discharge_cache is None
+    q_after = discharge(transect)
+    assert transect.discharge_cache is not components
+    assert transect.discharge_cache['key'][0] == components['key'][0] + 1
+    assert not np.isclose(q_after.total, q_before.total)
+    assert_same_discharge(q_after, uncached_discharge(transect))
+
+
+@pytest.mark.parametrize('attr, value', [('start_edge', 'Right'), ('boat_vel.selected', 'gga_vel'),
+                                         ('depths.selected', 'vb_depths')])
+def test_invalidated_by_key(attr, value):
+    """Test that changing the start edge, navigation reference, or depth reference computes the components again"""
+    transect = synthetic_transect()
+    discharge(transect)
+    components = transect.discharge_cache
+
+    # The new reference has the same data so the discharge can be compared
+    obj, _, name = attr.rpartition('.')
+    obj = transect if obj == '' else getattr(transect, obj)
+    if name == 'selected':
+        setattr(obj, value, getattr(obj, obj.selected))
+    setattr(obj, name, value)
+
+    q = discharge(transect)
+    assert transect.discharge_cache is not components
+    assert_same_discharge(q, uncached_discharge(transect))
+
+
+def test_copy_keeps_original_cache():
+    """Test that components computed for a changed copy of a transect do not replace those of the original"""
+    transect = synthetic_transect()
+    q_original = discharge(transect)
+    components = transect.discharge_cache
+
+    transect_copy = transect.scenario(['w_vel'])
+    transect_copy.w_vel.u_processed_mps = transect_copy.w_vel.u_processed_mps * 2
+    transect_copy.processed_data_changed()
+    discharge(transect_copy)
+
+    assert transect.discharge_cache is components
+    assert_same_discharge(discharge(transect), q_original)
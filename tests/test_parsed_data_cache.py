@@ -0,0 +1,97 @@
+import os
+import numpy as np
+import pytest
+from Classes.ParsedDataCache import ParsedDataCache
+from Classes.Pd0TRDI_2 import Pd0TRDI
+from test_pd0_read import write_pd0, assert_same_objects
+
+
+class CountingReader(object):
+    """Reader that counts the number of times a file is parsed."""
+
+    n_reads = 0
+
+    def __init__(self, file_name, scale=1):
+        CountingReader.n_reads += 1
+        with open(file_name, 'rb') as f:
+            self.data = np.frombuffer(f.read(), dtype=np.uint8).astype(float) * scale
+        self.file_name = file_name
+
+
+@pytest.fixture
+def raw_file(tmp_path):
+    """Raw data file read by CountingReader."""
+    file_name = str(tmp_path / 'raw.bin')
+    with open(file_name, 'wb') as f:
+        f.write(bytes(range(100)))
+    CountingReader.n_reads = 0
+    return file_name
+
+
+def test_cache_hit(raw_file, tmp_path):
+    """Test that a file read a second time is loaded from the cache"""
+    cache = ParsedDataCache(cache_dir=str(tmp_path / 'cache'))
+    first = cache.load(CountingReader, raw_file)
+    second = cache.load(CountingReader, raw_file)
+
+    assert CountingReader.n_reads == 1
+    assert len(os.listdir(cache.cache_dir)) == 1
+    np.testing.assert_array_equal(second.data, first.data)
+
+
+def test_cache_miss_when_file_changes(raw_file, tmp_path):
+    """Test that a changed file or different reader arguments are parsed again"""
+    cache = ParsedDataCache(cache_dir=str(tmp_path / 'cache'))
+    cache.load(CountingReader, raw_file)
+
+    # Same size, contents changed
+    with open(raw_file, 'wb') as f:
+        f.write(bytes(range(100, 200)))
+    data = cache.load(CountingReader, raw_file)
+    assert CountingReader.n_reads == 2
+    np.testing.assert_array_equal(data.data, np.arange(100, 200))
+
+    data = cache.load(CountingReader, raw_file, scale=2)
+    assert CountingReader.n_reads == 3
+    np.testing.assert_array_equal(data.data, np.arange(100, 200) * 2)
+
+
+def test_load_when_cache_cannot_be_written(raw_file, tmp_path):
+    """Test that the file is still loaded when the cache folder cannot be created"""
+    not_a_folder = tmp_path / 'cache'
+    not_a_folder.write_bytes(b'')
+    cache = ParsedDataCache(cache_dir=str(not_a_folder))
+
+    data = cache.load(CountingReader, raw_file)
+    data = cache.load(CountingReader, raw_file)
+
+    assert CountingReader.n_reads == 2
+    np.testing.assert_array_equal(data.data, np.arange(100))
+
+
+def test_corrupt_cache_file(raw_file, tmp_path):
+    """Test that a cache file that cannot be read is replaced"""
+    cache = ParsedDataCache(cache_dir=str(tmp_path / 'cache'))
+    cache_file = cache.cache_file(CountingReader, raw_file)
+    os.makedirs(cache.cache_dir)
+    with open(cache_file, 'wb') as f:
+        f.write(b'not a cache file')
+
+    cache.load(CountingReader, raw_file)
+    data = cache.load(CountingReader, raw_file)
+
+    assert CountingReader.n_reads == 1
+    np.testing.assert_array_equal(data.data, np.arange(100))
+
+
+def test_pd0_round_trip(tmp_path):
+    """Test that a pd0 file loaded from the cache has the same data as the parsed file"""
+    file_name = str(tmp_path / 'cached.pd0')
+    write_pd0(file_name, variable=True, nmea=True, surface=True, lost=True)
+    cache = ParsedDataCache(cache_dir=str(tmp_path / 'cache'))
+
+    cache.load(Pd0TRDI, file_name, fields='discharge')
+    cached = cache.read(cache.cache_file(Pd0TRDI, file_name, {'fields': 'discharge'}))
+
+    assert cached is not None
+    assert_same_objects(cached, Pd0TRDI(file_name))
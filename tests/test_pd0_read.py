@@ -0,0 +1,275 @@
+import struct
+import numpy as np
+import pytest
+from Classes.Pd0TRDI import Pd0TRDI
+from Classes.Pd0TRDI_2 import Pd0TRDI as Pd0TRDI2
+
+# Objects of the reader compared between the reader paths
+reader_objects = ('Hdr', 'Inst', 'Cfg', 'Sensor', 'Wt', 'Bt', 'Gps', 'Gps2', 'Surface', 'AutoMode', 'Nmea')
+
+# Synthetic files used for the comparisons
+file_cases = {'fixed_cells': dict(),
+              'variable_cells': dict(variable=True),
+              'nmea': dict(nmea=True),
+              'surface_cells': dict(surface=True),
+              'lost_ensembles': dict(variable=True, nmea=True, surface=True, lost=True)}
+
+
+def pd0_ensemble(ens_num, n_cells, n_surface_cells, nmea, rng):
+    """Create the bytes of one pd0 ensemble with random data.
+
+    Parameters
+    ----------
+    ens_num: int
+        Ensemble number
+    n_cells: int
+        Number of depth cells
+    n_surface_cells: int
+        Number of surface cells, None if there are no surface cells
+    nmea: bool
+        Indicates if a DBT sentence is included
+    rng: np.random.Generator
+        Random number generator
+
+    Returns
+    -------
+    ensemble: bytes
+        Ensemble including header and checksum
+    """
+
+    data_types = []
+
+    # Fixed leader
+    fl = bytearray(59)
+    fl[2] = 51
+    fl[3] = 3
+    fl[4] = 0b11001010
+    fl[5] = 0b01000001
+    fl[8] = 4
+    fl[9] = n_cells
+    struct.pack_into('<H', fl, 12, 25)
+    fl[25] = 0x1f
+    struct.pack_into('<H', fl, 32, 50)
+    struct.pack_into('<I', fl, 54, 1234)
+    fl[58] = 20
+    data_types.append(bytes(fl))
+
+    # Variable leader
+    vl = bytearray(66)
+    struct.pack_into('<HH', vl, 0, 0x0080, ens_num)
+    struct.pack_into('<HHHhhHh', vl, 14, 1500, 10, rng.integers(0, 36000), rng.integers(-500, 500),
+                     rng.integers(-500, 500), 0, 1500)
+    vl[57:65] = bytes([20, 21, 5, 6, 7, 8, 9, 10])
+    data_types.append(bytes(vl))
+
+    # Water track velocity, correlation, echo intensity, percent good, and status
+    vel = rng.integers(-3000, 3000, n_cells * 4).astype('<i2')
+    vel[rng.random(n_cells * 4) < 0.1] = -32768
+    data_types.append(struct.pack('<H', 0x0100) + vel.tobytes())
+    for leader_id in (0x0200, 0x0300, 0x0400, 0x0500):
+        data_types.append(struct.pack('<H', leader_id) + rng.integers(0, 256, n_cells * 4).astype('u1').tobytes())
+
+    # Bottom track with WinRiver 10.06 GPS data, the altitude spans both sides of the 32768 offset
+    bt = bytearray(85)
+    struct.pack_into('<HH', bt, 0, 0x0600, rng.integers(0, 65536))
+    struct.pack_into('<i', bt, 12, rng.integers(-2**31, 2**31))
+    bt[16:32] = rng.integers(0, 256, 16).astype('u1').tobytes()
+    struct.pack_into('<HH', bt, 44, rng.integers(0, 65536), rng.integers(0, 65536))
+    data_types.append(bytes(bt))
+
+    # Surface cells
+    if n_surface_cells is not None:
+        data_types.append(struct.pack('<HBHH', 0x0010, n_surface_cells, 10, 30))
+        vel = rng.integers(-3000, 3000, n_surface_cells * 4).astype('<i2')
+        data_types.append(struct.pack('<H', 0x0110) + vel.tobytes())
+        for leader_id in (0x0210, 0x0310, 0x0410, 0x0510):
+            data_types.append(struct.pack('<H', leader_id)
+                              + rng.integers(0, 256, n_surface_cells * 4).astype('u1').tobytes())
+
+    # NMEA DBT sentence
+    if nmea:
+        sentence = '$SDDBT,%d.1,f,1.2,M,0.6,F*%02X\r\n' % (rng.integers(0, 1000), rng.integers(0, 255))
+        data_types.append(struct.pack('<HH', 0x2100, 0) + sentence.encode())
+
+    # Header with the address offsets of the data types
+    offsets = []
+    n_bytes = 6 + 2 * len(data_types)
+    for data_type in data_types:
+        offsets.append(n_bytes)
+        n_bytes += len(data_type)
+    ensemble = bytearray(struct.pack('<BBHBB', 0x7f, 0x7f, n_bytes, 0, len(data_types)))
+    ensemble += struct.pack('<%dH' % len(data_types), *offsets)
+    for data_type in data_types:
+        ensemble += data_type
+
+    return bytes(ensemble) + struct.pack('<H', sum(ensemble) & 0xFFFF)
+
+
+def write_pd0(file_name, n_ensembles=60, variable=False, nmea=False, surface=False, lost=False, garbage=False,
+              seed=0):
+    """Write a synthetic pd0 file.
+
+    Parameters
+    ----------
+    file_name: str
+        Full name including path of pd0 file
+    n_ensembles: int
+        Number of ensembles written
+    variable: bool
+        Indicates if the number of depth cells changes during the file
+    nmea: bool
+        Indicates if DBT sentences are included in some ensembles
+    surface: bool
+        Indicates if surface cells are included
+    lost: bool
+        Indicates if there are gaps in the ensemble numbers
+    garbage: bool
+        Indicates if bytes that are not an ensemble are included between some ensembles
+    seed: int
+        Seed of the random number generator
+    """
+
+    rng = np.random.default_rng(seed)
+    pd0_bytes = bytearray()
+    ens_num = 1
+    for n in range(n_ensembles):
+        n_cells = 20 + n // 10 if variable else 30
+        n_surface_cells = int(rng.integers(1, 6)) if surface else None
+        if garbage and n % 17 == 5:
+            pd0_bytes += b'\x01\x7f\x02garbage'
+        if lost and n % 23 == 7:
+            ens_num += 2
+        pd0_bytes += pd0_ensemble(ens_num, n_cells, n_surface_cells, nmea and rng.random() < 0.7, rng)
+        ens_num += 1
+    with open(file_name, 'wb') as f:
+        f.write(pd0_bytes)
+
+
+def assert_same_values(actual, desired, err_msg):
+    """Assert that two decoded values, including all attributes of objects, are the same."""
+
+    if isinstance(desired, np.ndarray):
+        np.testing.assert_array_equal(actual, desired, err_msg=err_msg)
+    elif hasattr(desired, '__dict__'):
+        for name, value in vars(desired).items():
+            assert_same_values(getattr(actual, name), value, err_msg + '.' + name)
+    else:
+        assert actual == desired, err_msg
+
+
+def assert_same_objects(actual, desired):
+    """Assert that every attribute of every reader object is the same."""
+
+    for obj in reader_objects:
+        assert_same_values(getattr(actual, obj), getattr(desired, obj), obj)
+
+
+@pytest.fixture(params=sorted(file_cases))
+def pd0_file(request, tmp_path):
+    """Synthetic pd0 file for each file case."""
+    file_name = str(tmp_path / (request.param + '.pd0'))
+    write_pd0(file_name, **file_cases[request.param])
+    return file_name
+
+
+def test_mmap_matches_file_reader(pd0_file):
+    """Test that the memory mapped reader decodes the same data as the file based reader"""
+    assert_same_objects(Pd0TRDI(pd0_file, engine='mmap'), Pd0TRDI(pd0_file, engine='file'))
+
+
+def test_gps_altitude_sign(tmp_path):
+    """Test that altitudes below the 32768 offset are negative rather than wrapped around"""
+    file_name = str(tmp_path / 'gps.pd0')
+    write_pd0(file_name)
+    pd0_mmap = Pd0TRDI(file_name, engine='mmap')
+    pd0_file = Pd0TRDI(file_name, engine='file')
+
+    # Altitude read directly from the bottom track data type of each ensemble
+    with open(file_name, 'rb') as f:
+        pd0_bytes = f.read()
+    alt = []
+    start = 0
+    while start < len(pd0_bytes):
+        n_bytes, _, n_types = struct.unpack_from('<HBB', pd0_bytes, start + 2)
+        offsets = struct.unpack_from('<%dH' % n_types, pd0_bytes, start + 6)
+        for offset in offsets:
+            if struct.unpack_from('<H', pd0_bytes, start + offset)[0] == 0x0600:
+                alt.append(struct.unpack_from('<H', pd0_bytes, start + offset + 44)[0])
+        start += n_bytes + 2
+    alt_m = (np.array(alt) - 32768) / 10
+
+    assert np.any(alt_m < 0) and np.any(alt_m > 0)
+    np.testing.assert_array_equal(pd0_mmap.Gps.alt_m, alt_m)
+    np.testing.assert_array_equal(pd0_file.Gps.alt_m, alt_m)
+
+
+@pytest.mark.parametrize('garbage', [False, True])
+def test_columnar_matches_per_ensemble_decode(pd0_file, garbage):
+    """Test that the data stored by cell and beam gathered for all ensembles by Pd0TRDI_2 match decoding each
+    ensemble with decode_pd0_bytearray"""
+    if garbage:
+        write_pd0(pd0_file, variable=True, nmea=True, surface=True, lost=True, garbage=True, seed=1)
+    pd0 = Pd0TRDI2(pd0_file)
+
+    # Decoded data key and field for each array
+    compare = {('Wt', 'vel_mps'): ('velocity', 'data'),
+               ('Wt', 'corr'): ('correlation', 'data'),
+               ('Wt', 'rssi'): ('echo_intensity', 'data'),
+               ('Wt', 'pergd'): ('percent_good', 'data'),
+               ('Surface', 'vel_mps'): ('surface_velocity', 'velocity'),
+               ('Surface', 'corr'): ('surface_correlation', 'correlation'),
+               ('Surface', 'rssi'): ('surface_intensity', 'rssi'),
+               ('Surface', 'pergd'): ('surface_percent_good', 'percent_good')}
+    desired = {key: np.tile(np.nan, getattr(getattr(pd0, key[0]), key[1]).shape) for key in compare}
+
+    with open(pd0_file, 'rb') as f:
+        pd0_bytes = bytearray(f.read())
+    file_info = len(pd0_bytes)
+    start_byte = 0
+    n = 0
+    ensemble_number = 0
+    while start_byte < file_info:
+        data = Pd0TRDI2.decode_pd0_bytearray(pd0.data_decoders, pd0_bytes[start_byte:])
+        if data['checksum'] and 'fixed_leader' in data and 'variable_leader' in data:
+            # Adjust index for lost ensembles
+            if ensemble_number > 0:
+                n = n + data['variable_leader']['ensemble_number'] - ensemble_number
+            for key, (data_key, field) in compare.items():
+                if data_key in data and len(data[data_key][field]) > 0:
+                    values = np.array(data[data_key][field]).T
+                    desired[key][:values.shape[0], :values.shape[1], n] = values
+            start_byte = start_byte + data['header']['number_of_bytes'] + 2
+            ensemble_number = data['variable_leader']['ensemble_number']
+        else:
+            start_byte = Pd0TRDI2.find_next(pd0_bytes, start_byte, file_info)
+
+    for (obj, attr), values in desired.items():
+        values[values == -32768] = np.nan
+        if attr == 'vel_mps':
+            values = values / 1000
+        np.testing.assert_array_equal(getattr(getattr(pd0, obj), attr), values, err_msg=obj + '.' + attr)
+
+
+def test_summary_fields(tmp_path):
+    """Test that a summary read decodes the bottom track and decodes the other objects on first access"""
+    file_name = str(tmp_path / 'summary.pd0')
+    write_pd0(file_name, nmea=True, surface=True)
+    pd0_full = Pd0TRDI2(file_name)
+    pd0_summary = Pd0TRDI2(file_name, fields='summary')
+
+    assert 'Bt' in vars(pd0_summary)
+    assert pd0_summary.pending_fields == {'wt', 'gps', 'surface', 'auto_mode'}
+    assert_same_objects(pd0_summary, pd0_full)
+    assert pd0_summary.pending_fields == set()
+
+
+def test_pending_fields_missing_file(tmp_path):
+    """Test that a field group that cannot be decoded because the file was removed raises AttributeError"""
+    file_name = str(tmp_path / 'removed.pd0')
+    write_pd0(file_name)
+    pd0 = Pd0TRDI2(file_name, fields='summary')
+    (tmp_path / 'removed.pd0').unlink()
+
+    assert not hasattr(pd0, 'Wt')
+    with pytest.raises(AttributeError, match='removed.pd0'):
+        _ = pd0.Wt
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+from MiscLibs.robust_loess import rloess, nearest_neighbors, compute_loess, robust_weights, eps
+
+
+def rloess_per_point(x, y, span):
+    """Robust loess smooth computed one point at a time with nearest_neighbors and compute_loess, as rloess
+    computed it before the regressions were solved together. The x values must be sorted."""
+
+    smoothed_values = np.copy(y)
+    y_nan = np.isnan(y)
+    lower_bound = np.zeros(len(y)).astype(int)
+    upper_bound = np.zeros(len(y)).astype(int)
+
+    # Non-robust smooth
+    for n in range(len(y)):
+        if n > 0 and x[n] == x[n - 1]:
+            smoothed_values[n] = smoothed_values[n - 1]
+            lower_bound[n] = lower_bound[n - 1]
+            upper_bound[n] = upper_bound[n - 1]
+        else:
+            neighbors_idx = nearest_neighbors(span, n, x, np.logical_not(y_nan))
+            lower_bound[n] = np.min(neighbors_idx)
+            upper_bound[n] = np.max(neighbors_idx)
+            smoothed_values[n] = compute_loess(x, y, neighbors_idx, n)
+
+    # Robust cycles
+    max_absy_eps = np.max(np.abs(y)) * eps
+    for cycle in range(4):
+        r_weights = robust_weights(y - smoothed_values, max_absy_eps)
+        for n in range(len(y)):
+            if n > 0 and x[n] == x[n - 1]:
+                smoothed_values[n] = smoothed_values[n - 1]
+            elif not np.isnan(smoothed_values[n]):
+                neighbors_idx = np.arange(lower_bound[n], upper_bound[n] + 1)
+                neighbors_idx = neighbors_idx[np.logical_not(y_nan[neighbors_idx])]
+                if np.any(r_weights[neighbors_idx] <= 0):
+                    neighbors_idx = nearest_neighbors(span, n, x, r_weights > 0)
+                smoothed_values[n] = compute_loess(x, y, neighbors_idx, n, r_weights)
+
+    return smoothed_values
+
+
+def smooth_cases():
+    """Data sets with nearly degenerate neighbors and a well conditioned data set."""
+
+    rng = np.random.default_rng(0)
+    x = np.sort(rng.random(200)) * 100
+    cases = {'two_x_values': (np.repeat([0., 1.], 6), rng.normal(size=12)),
+             'three_x_values': (np.repeat([0., 1., 2.5], 5), rng.normal(size=15)),
+             'three_x_values_outlier': (np.repeat([0., 1., 2.5], 5), np.append(rng.normal(size=14), 50.)),
+             'flat_with_outlier': (np.arange(20.), np.append(np.ones(10), np.append(40., np.ones(9)))),
+             'steps': (np.arange(30.), np.repeat([1., 5., 2.], 10)),
+             'nan_gaps': (np.arange(25.), np.where(np.isin(np.arange(25), [5, 7, 10, 12, 16, 19]), np.nan,
+                                                   rng.normal(size=25))),
+             'repeated_x_nan_gaps': (np.repeat(np.arange(8.), 3),
+                                     np.where(rng.random(24) < 0.3, np.nan, rng.normal(size=24))),
+             'random': (x, np.sin(x / 10) + rng.normal(size=200) * 0.1)}
+    return cases
+
+
+@pytest.mark.parametrize('span', [3, 4, 5, 7, 10])
+@pytest.mark.parametrize('case', sorted(smooth_cases()))
+def test_rloess_matches_per_point(case, span):
+    """Test that solving the regressions together matches solving each regression with least squares"""
+    x, y = smooth_cases()[case]
+    if span == 3 and np.any(np.isnan(y)):
+        # Every fit interpolates 3 points, so all robust weights are zero and the per point smooth fails
+        pytest.skip('per point smooth has no neighbors with weight')
+    np.testing.assert_allclose(rloess(x, y, span), rloess_per_point(x, y, span), rtol=0, atol=1e-8)